@@ -10,8 +10,7 @@ import numpy as np
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'services'))
 
-from services.climate_data_loader import ClimateDataLoader
-from services.climate_risk_assessment import IPCCRiskAssessmentService
+from services.assessment_snapshot import get_snapshot
 from services.climate_assessment_reporter import ClimateAssessmentReporter
 
 def analyze_priority_scoring():
@@ -19,20 +18,18 @@ def analyze_priority_scoring():
     
     # Initialize services
     base_path = "suhi_analysis_output"
-    data_loader = ClimateDataLoader(base_path=base_path)
-    assessment_service = IPCCRiskAssessmentService(data_loader)
     
-    # Get all city assessments
-    city_risk_profiles = assessment_service.assess_all_cities()
+    # Get all city assessments from the shared snapshot
+    city_risk_profiles = get_snapshot(base_path).results
     
     print("PRIORITY SCORE ANALYSIS")
     print("=" * 60)
     
     # Extract data for priority calculation
     cities = list(city_risk_profiles.keys())
-    overall_risk_scores = [city_risk_profiles[city].overall_risk_score for city in cities]
-    adaptive_capacity_scores = [city_risk_profiles[city].adaptive_capacity_score for city in cities]
-    populations = [city_risk_profiles[city].population or 0 for city in cities]
+    overall_risk_scores = city_risk_profiles.column('overall_risk_score').tolist()
+    adaptive_capacity_scores = city_risk_profiles.column('adaptive_capacity_score').tolist()
+    populations = np.nan_to_num(city_risk_profiles.column('population')).astype(int).tolist()
     
     # Replicate the quantile scaling function
     def qscale(series, x, lo=0.1, hi=0.9):
@@ -118,14 +115,14 @@ def analyze_exposure_scoring():
     
     # Initialize services
     base_path = "suhi_analysis_output"
-    data_loader = ClimateDataLoader(base_path=base_path)
-    assessment_service = IPCCRiskAssessmentService(data_loader)
+    snapshot = get_snapshot(base_path)
+    data_loader = snapshot.data_loader
     
     print("\n\nEXPOSURE SCORE ANALYSIS")
     print("=" * 60)
     
     # Get all cities and their data
-    all_data = data_loader.load_all_data()
+    all_data = snapshot.data
     cities = list(all_data['population_data'].keys())
     
     print("STEP 1: Raw Exposure Components")
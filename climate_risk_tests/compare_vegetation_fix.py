@@ -6,16 +6,14 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'services'))
 
-from services.climate_data_loader import ClimateDataLoader
-from services.climate_risk_assessment import IPCCRiskAssessmentService
+from services.assessment_snapshot import get_snapshot
 
 def compare_vegetation_fix():
     """Compare key cities before/after vegetation accessibility fix"""
     
     # Initialize services
     base_path = "suhi_analysis_output"
-    data_loader = ClimateDataLoader(base_path=base_path)
-    assessment_service = IPCCRiskAssessmentService(data_loader)
+    assessment_service = get_snapshot(base_path).service
     
     # Test key cities
     test_cities = ['Andijan', 'Bukhara', 'Tashkent', 'Samarkand', 'Nurafshon']
@@ -6,8 +6,7 @@ Helps identify potential issues with climate hazard and vulnerability scoring
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from services.climate_data_loader import ClimateDataLoader
-from services.climate_risk_assessment import IPCCRiskAssessmentService
+from services.assessment_snapshot import get_snapshot
 
 
 def analyze_hazard_vulnerability():
@@ -35,12 +34,11 @@ def analyze_hazard_vulnerability():
     else:
         print(f"Using data base_path: {base_path}")
     
-    # Initialize services
-    data_loader = ClimateDataLoader(str(base_path))
-    risk_assessor = IPCCRiskAssessmentService(data_loader)
-    
-    # Load data
-    data = data_loader.load_all_data()
+    # Scored-state snapshot (runs one assessment only if none is current)
+    snapshot = get_snapshot(base_path)
+    data_loader = snapshot.data_loader
+    risk_assessor = snapshot.service
+    data = snapshot.data
     
     print("\n" + "="*100)
     print("HAZARD SCORE & VULNERABILITY ANALYSIS")
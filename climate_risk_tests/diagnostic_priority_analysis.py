@@ -6,8 +6,7 @@ Helps understand why priority rankings differ from pure risk rankings
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from services.climate_data_loader import ClimateDataLoader
-from services.climate_risk_assessment import IPCCRiskAssessmentService
+from services.assessment_snapshot import get_snapshot
 from services.climate_assessment_reporter import ClimateAssessmentReporter
 
 
@@ -37,35 +36,23 @@ def analyze_priority_methodology():
         print(f"Using data base_path: {base_path}")
     
     # Initialize services
-    data_loader = ClimateDataLoader(str(base_path))
-    risk_assessor = IPCCRiskAssessmentService(data_loader)
     reporter = ClimateAssessmentReporter(str(base_path / "climate_assessment"))
     
-    # Run assessment
-    city_risk_profiles = risk_assessor.assess_all_cities()
+    # Scored results from the shared snapshot (runs one assessment only if none is current)
+    city_risk_profiles = get_snapshot(base_path).results
     
     if not city_risk_profiles:
         print("No city data available for analysis")
         return
     
-    # Extract raw data for analysis
-    cities = list(city_risk_profiles.keys())
-    data_rows = []
-    
-    for city in cities:
-        metrics = city_risk_profiles[city]
-        data_rows.append({
-            'City': city,
-            'Population': metrics.population or 0,
-            'Hazard_Score': metrics.hazard_score,
-            'Exposure_Score': metrics.exposure_score,
-            'Vulnerability_Score': metrics.vulnerability_score,
-            'Adaptive_Capacity_Score': metrics.adaptive_capacity_score,
-            'Overall_Risk_Score': metrics.overall_risk_score,
-            'Adaptability_Score': metrics.adaptability_score
-        })
-    
-    df = pd.DataFrame(data_rows)
+    # Extract raw data for analysis (column view of the metrics store)
+    df = city_risk_profiles.to_frame([
+        'population', 'hazard_score', 'exposure_score', 'vulnerability_score',
+        'adaptive_capacity_score', 'overall_risk_score', 'adaptability_score'
+    ]).reset_index()
+    df.columns = ['City', 'Population', 'Hazard_Score', 'Exposure_Score', 'Vulnerability_Score',
+                  'Adaptive_Capacity_Score', 'Overall_Risk_Score', 'Adaptability_Score']
+    df['Population'] = df['Population'].fillna(0).astype(int)
     
     # Calculate priority scores using same methodology as reporter
     priority_scores = reporter._calculate_priority_scores(city_risk_profiles)
@@ -4,7 +4,7 @@ Quick diagnostic to examine temperature data structure
 
 import json
 from pathlib import Path
-from services.climate_data_loader import ClimateDataLoader
+from services.assessment_snapshot import get_snapshot
 
 def examine_temp_data_structure():
     """Examine the structure of temperature data to understand why hazard scores are zero"""
@@ -12,8 +12,7 @@ def examine_temp_data_structure():
     repo_root = Path(__file__).resolve().parent
     base_path = repo_root / "suhi_analysis_output"
     
-    data_loader = ClimateDataLoader(str(base_path))
-    data = data_loader.load_all_data()
+    data = get_snapshot(base_path).data
     
     print("TEMPERATURE DATA STRUCTURE ANALYSIS")
     print("="*60)
@@ -10,8 +10,7 @@ issues with result generation and ensure data accuracy.
 import traceback
 import json
 from pathlib import Path
-from services.climate_data_loader import ClimateDataLoader
-from services.climate_risk_assessment import IPCCRiskAssessmentService
+from services.assessment_snapshot import get_snapshot
 
 def debug_climate_assessment():
     """Debug the climate assessment execution step by step"""
@@ -44,12 +43,12 @@ def debug_climate_assessment():
         else:
             print(f"✅ Using data base_path: {base_path}")
 
-        data_loader = ClimateDataLoader(str(base_path))
-        print("✅ Data loader initialized successfully")
+        snapshot = get_snapshot(base_path)
+        print(f"✅ Assessment snapshot loaded ({snapshot.manifest['created']})")
         
         # Step 2: Initialize risk assessor
         print("\n2️⃣ INITIALIZING RISK ASSESSOR...")
-        risk_assessor = IPCCRiskAssessmentService(data_loader)
+        risk_assessor = snapshot.service
         print("✅ Risk assessor initialized successfully")
         
         # Step 3: Check data availability
@@ -101,7 +100,7 @@ def debug_climate_assessment():
         # Step 5: Test all cities assessment
         print("\n5️⃣ TESTING ALL CITIES ASSESSMENT...")
         try:
-            all_results = risk_assessor.assess_all_cities()
+            all_results = snapshot.results
             print(f"   ✅ Assessment completed for {len(all_results)} cities")
             
             # Verify results quality
@@ -11,19 +11,23 @@ import json
 import numpy as np
 import pandas as pd
 from pathlib import Path
+from services.assessment_snapshot import load_snapshot
 
 def analyze_risk_calculation():
     """Analyze the IPCC AR6 risk calculation and its impact on risk categorization"""
     
-    # Load assessment results
+    # Load assessment results (scored-state snapshot if current, else the exported JSON)
+    snapshot = load_snapshot("suhi_analysis_output")
     results_file = Path("suhi_analysis_output/climate_assessment/climate_risk_assessment_results.json")
     
-    if not results_file.exists():
+    if snapshot is not None:
+        data = snapshot.results.to_records()
+    elif not results_file.exists():
         print("❌ Assessment results not found!")
         return
-    
-    with open(results_file, 'r') as f:
-        data = json.load(f)
+    else:
+        with open(results_file, 'r') as f:
+            data = json.load(f)
     
     print("=" * 80)
     print("🔍 DETAILED RISK CALCULATION ANALYSIS")
@@ -34,6 +34,15 @@ try:
 except Exception:
     _KALEIDO_OK = False
 
+# Parallel renderer (charts saved outside a render pass are written in-process)
+from services.chart_rendering import ChartRenderer
+
+# Shared tidy SUHI table (optional: charts fall back to the nested JSON)
+try:
+    from services.analyzer import build_suhi_batch_table
+except Exception:
+    build_suhi_batch_table = None
+
 
 def safe_write_image(fig, path, width, height, scale):
     """Write PNG if kaleido is available; otherwise skip without crashing."""
@@ -68,13 +77,18 @@ def safe_float(value, default=None):
 
 
 class ComprehensiveChartGenerator:
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, render_workers: Optional[int] = None):
         self.base_path = Path(base_path)
         self.output_path = self.base_path / "plots"
         self.output_path.mkdir(parents=True, exist_ok=True)
         
+        # Chart rendering (set up in generate_all_charts)
+        self.render_workers = render_workers
+        self.renderer = None
+        
         # Data containers
         self.suhi_data = {}
+        self.suhi_table = None  # tidy city x year table built from suhi_data
         self.lulc_data = []
         self.nightlights_data = []
         self.temperature_data = {}
@@ -113,10 +127,15 @@ class ComprehensiveChartGenerator:
             print(f"✓ Loaded SUHI data for {len(self.suhi_data)} cities")
             
             # Extract cities and years
-            for city, years_data in self.suhi_data.items():
-                self.cities.add(city)
-                for year in years_data.keys():
-                    self.years.add(int(year))
+            if build_suhi_batch_table is not None:
+                self.suhi_table = build_suhi_batch_table(self.suhi_data)
+                self.cities.update(self.suhi_table['city'].unique())
+                self.years.update(int(y) for y in self.suhi_table['year'].unique())
+            else:
+                for city, years_data in self.suhi_data.items():
+                    self.cities.add(city)
+                    for year in years_data.keys():
+                        self.years.add(int(year))
         
         # Load LULC analysis summary
         lulc_file = self.base_path / "reports" / "lulc_analysis_summary.json"
@@ -168,6 +187,16 @@ class ComprehensiveChartGenerator:
         else:
             print(f"✓ Analysis scope: {len(self.cities)} cities, 0 years (no year data found)")
 
+    def _save_chart(self, fig, name: str, width: int, height: int, scale: float = 2) -> Path:
+        """Queue the chart on the renderer, or write HTML/PNG directly if none is active"""
+        html_file = self.output_path / f"{name}.html"
+        if self.renderer is not None:
+            self.renderer.submit(fig, name, width=width, height=height, scale=scale)
+        else:
+            fig.write_html(str(html_file))
+            safe_write_image(fig, self.output_path / f"{name}.png", width=width, height=height, scale=scale)
+        return html_file
+
     def create_suhi_trends_with_confidence(self):
         """Create SUHI trends over time with confidence intervals"""
         if not self.suhi_data:
@@ -283,10 +312,7 @@ class ComprehensiveChartGenerator:
         fig.update_yaxes(title_text="SUHI Nighttime (°C)", row=2, col=1)
         
         # Save
-        html_file = self.output_path / "01_suhi_trends_with_confidence.html"
-        png_file = self.output_path / "01_suhi_trends_with_confidence.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=800, scale=2)
+        html_file = self._save_chart(fig, "01_suhi_trends_with_confidence", width=1200, height=800)
         print(f"✓ Saved SUHI trends chart: {html_file.name}")
         return fig
 
@@ -379,10 +405,7 @@ class ComprehensiveChartGenerator:
         fig.update_yaxes(title_text="Temperature (°C)", row=1, col=2)
         
         # Save
-        html_file = self.output_path / "02_urban_rural_temperature_comparison.html"
-        png_file = self.output_path / "02_urban_rural_temperature_comparison.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=600, scale=2)
+        html_file = self._save_chart(fig, "02_urban_rural_temperature_comparison", width=1200, height=600)
         print(f"✓ Saved temperature comparison chart: {html_file.name}")
         return fig
 
@@ -459,10 +482,7 @@ class ComprehensiveChartGenerator:
         )
         
         # Save
-        html_file = self.output_path / "03_lulc_change_analysis.html"
-        png_file = self.output_path / "03_lulc_change_analysis.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1000, height=600, scale=2)
+        html_file = self._save_chart(fig, "03_lulc_change_analysis", width=1000, height=600)
         print(f"✓ Saved LULC change analysis: {html_file.name}")
         return fig
 
@@ -558,10 +578,7 @@ class ComprehensiveChartGenerator:
         )
         
         # Save
-        html_file = self.output_path / "04_nightlights_vs_suhi.html"
-        png_file = self.output_path / "04_nightlights_vs_suhi.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1000, height=600, scale=2)
+        html_file = self._save_chart(fig, "04_nightlights_vs_suhi", width=1000, height=600)
         print(f"✓ Saved nightlights vs SUHI analysis: {html_file.name}")
         return fig
 
@@ -686,10 +703,7 @@ class ComprehensiveChartGenerator:
         fig.add_hline(y=0, line_dash="dash", line_color="black", opacity=0.5, row=2, col=2)
         
         # Save
-        html_file = self.output_path / "05_spatial_relationships_dashboard.html"
-        png_file = self.output_path / "05_spatial_relationships_dashboard.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=800, scale=2)
+        html_file = self._save_chart(fig, "05_spatial_relationships_dashboard", width=1200, height=800)
         print(f"✓ Saved spatial relationships dashboard: {html_file.name}")
         return fig
 
@@ -837,10 +851,7 @@ class ComprehensiveChartGenerator:
         fig.update_yaxes(title_text="SUHI Night (°C)", row=3, col=2)
         
         # Save
-        html_file = self.output_path / "06_comprehensive_suhi_analysis.html"
-        png_file = self.output_path / "06_comprehensive_suhi_analysis.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=1000, scale=2)
+        html_file = self._save_chart(fig, "06_comprehensive_suhi_analysis", width=1200, height=1000)
         print(f"✓ Saved comprehensive SUHI analysis: {html_file.name}")
         return fig
 
@@ -911,10 +922,7 @@ class ComprehensiveChartGenerator:
         )
         
         # Save
-        html_file = self.output_path / "07_summary_statistics_table.html"
-        png_file = self.output_path / "07_summary_statistics_table.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=400 + len(df) * 25, scale=2)
+        html_file = self._save_chart(fig, "07_summary_statistics_table", width=1200, height=400 + len(df) * 25)
         print(f"✓ Saved summary statistics table: {html_file.name}")
         return fig
 
@@ -1071,10 +1079,7 @@ class ComprehensiveChartGenerator:
         fig.update_yaxes(title_text="Climate Risk Score", row=2, col=2)
         
         # Save
-        html_file = self.output_path / "08_climate_impact_assessment.html"
-        png_file = self.output_path / "08_climate_impact_assessment.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=800, scale=2)
+        html_file = self._save_chart(fig, "08_climate_impact_assessment", width=1200, height=800)
         print(f"✓ Saved climate impact assessment: {html_file.name}")
         return fig
 
@@ -1239,10 +1244,7 @@ class ComprehensiveChartGenerator:
         fig.update_yaxes(title_text="Number of Cities", row=2, col=2)
         
         # Save
-        html_file = self.output_path / "09_policy_recommendations.html"
-        png_file = self.output_path / "09_policy_recommendations.png"
-        fig.write_html(str(html_file))
-        safe_write_image(fig, png_file, width=1200, height=800, scale=2)
+        html_file = self._save_chart(fig, "09_policy_recommendations", width=1200, height=800)
         print(f"✓ Saved policy recommendations chart: {html_file.name}")
         return fig
 
@@ -1259,8 +1261,9 @@ class ComprehensiveChartGenerator:
             print("❌ No data available for analysis")
             return
         
-        # Generate all charts
+        # Generate all charts (figures are built here, files are rendered in a worker pool)
         charts = []
+        self.renderer = ChartRenderer(self.output_path, max_workers=self.render_workers, write_png=_KALEIDO_OK)
         
         print("\n📊 Generating charts...")
         charts.append(self.create_suhi_trends_with_confidence())
@@ -1273,6 +1276,10 @@ class ComprehensiveChartGenerator:
         charts.append(self.create_climate_impact_assessment())
         charts.append(self.create_policy_recommendations_chart())
         
+        if self.renderer is not None:
+            self.renderer.render_all()
+            self.renderer = None
+        
         # Count outputs
         html_count = len(list(self.output_path.glob("*.html")))
         png_count = len(list(self.output_path.glob("*.png")))
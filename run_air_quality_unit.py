@@ -21,11 +21,11 @@ ROOT = Path(__file__).parent
 sys.path.insert(0, str(ROOT))
 
 import argparse
-import json
 from datetime import datetime
 
 from services.gee import initialize_gee
-from services.air_quality import run_city_air_quality_analysis
+from services.air_quality import run_city_air_quality_analysis, AirQualityAnalyzer
+from services import result_io
 from services.utils import UZBEKISTAN_CITIES, create_output_directories
 
 
@@ -44,6 +44,8 @@ def parse_args():
     p.add_argument('--real-only', action='store_true', help='Require real satellite data; fail if GEE or fetches fail')
     p.add_argument('--output-dir', type=str, default=None, help='Custom output directory')
     p.add_argument('--verbose', action='store_true', help='Enable verbose output')
+    p.add_argument('--shared-composites', action='store_true',
+                   help='Reduce all cities from one national composite per pollutant and period')
     return p.parse_args()
 
 
@@ -97,6 +99,16 @@ def main():
         'recommendations': []
     }
 
+    shared = {}
+    if args.shared_composites:
+        analyzer = AirQualityAnalyzer()
+        for year in range(start_year, end_year + 1):
+            print(f"🌐 Reducing national composites for {year} ({len(cities)} cities)...")
+            try:
+                shared[str(year)] = analyzer.shared_zone_stats(cities, year)
+            except Exception as e:
+                print(f"   ⚠️ Shared composites failed for {year}, using per-city composites: {e}")
+
     # Analyze each city
     for city in cities:
         print(f"🏙️  Analyzing {city}...")
@@ -106,7 +118,8 @@ def main():
                 base_path=base,
                 city_name=city,
                 start_year=start_year,
-                end_year=end_year
+                end_year=end_year,
+                shared=shared
             )
 
             all_results[city] = city_results
@@ -145,22 +158,19 @@ def main():
             for year, year_data in city_results.get('yearly_results', {}).items():
                 if 'error' not in year_data:
                     year_file = city_dir / f"air_quality_{year}.json"
-                    with open(year_file, 'w', encoding='utf-8') as f:
-                        json.dump(year_data, f, indent=2, ensure_ascii=False)
+                    result_io.write_json(year_data, year_file)
                     if args.verbose:
                         print(f"   💾 Saved {year} results to {year_file}")
 
             # Save combined assessment file (like water scarcity)
             combined_file = city_dir / "air_quality_assessment.json"
-            with open(combined_file, 'w', encoding='utf-8') as f:
-                json.dump(city_results, f, indent=2, ensure_ascii=False)
+            result_io.write_json(city_results, combined_file)
             print(f"   💾 Saved combined assessment to {combined_file}")
 
             # Save individual city results in old format if --export-json is specified
             if args.export_json:
                 city_file = air_quality_dir / f"{city}_air_quality_{start_year}_{end_year}.json"
-                with open(city_file, 'w', encoding='utf-8') as f:
-                    json.dump(city_results, f, indent=2, ensure_ascii=False)
+                result_io.write_json(city_results, city_file)
                 print(f"   💾 Saved detailed results to {city_file}")
 
         except Exception as e:
@@ -200,8 +210,7 @@ def main():
             'city_results': all_results
         }
 
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary_report, f, indent=2, ensure_ascii=False)
+        result_io.write_json(summary_report, summary_file)
 
         print(f"\n📊 Summary report saved to {summary_file}")
 
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Interactive Climate Risk Assessment Session Runner
+Runs the IPCC AR6 assessment once and serves weight/indicator/city what-if
+queries from the resident indicator matrix over local HTTP.
+
+Examples:
+  curl 'http://127.0.0.1:8765/query?drop=dust&renormalize=1'
+  curl 'http://127.0.0.1:8765/query?weights={"hazard":{"heat":0.5}}&cities=Tashkent,Nukus'
+  curl -X POST http://127.0.0.1:8765/query -d '{"drop": ["vulnerability.air_pollution"]}'
+"""
+
+import argparse
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.climate_data_loader import ClimateDataLoader
+from services.climate_risk_assessment import IPCCRiskAssessmentService
+from services.assessment_session import AssessmentSession, serve_session
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve interactive climate risk queries')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    base_path = os.path.dirname(os.path.abspath(__file__))
+    data_loader = ClimateDataLoader(base_path)
+    assessment_service = IPCCRiskAssessmentService(data_loader)
+
+    print("\n🔍 Building assessment session...")
+    session = AssessmentSession(assessment_service)
+    mismatches = session.check_baseline()
+    if mismatches:
+        raise SystemExit("Session baseline does not reproduce the assessment:\n  " + "\n  ".join(mismatches))
+    baseline = session.baseline()
+    print(f"📊 {len(session.cities)} cities loaded; top risk: {', '.join(baseline['ranking'][:3])}")
+
+    serve_session(session, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
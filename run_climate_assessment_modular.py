@@ -7,6 +7,7 @@ from pathlib import Path
 from services.climate_data_loader import ClimateDataLoader
 from services.climate_risk_assessment import IPCCRiskAssessmentService
 from services.climate_assessment_reporter import ClimateAssessmentReporter
+from services.metrics_store import METRIC_FIELDS
 
 
 class IPCCClimateRiskAssessment:
@@ -43,8 +44,34 @@ class IPCCClimateRiskAssessment:
         print(f"\n[OK] Assessment complete. Results saved to: {self.output_path}")
         return self.city_risk_profiles
 
+    def run_year_resolved_assessment(self, normalize: str = 'year'):
+        """Score every city-year in one pass and export risk trajectories"""
+        from services.risk_panel import RiskPanel
+        if self.risk_assessor is None:
+            self.risk_assessor = IPCCRiskAssessmentService(self.data_loader)
+        panel = RiskPanel(self.risk_assessor, results=self.city_risk_profiles or None)
+        trajectories = panel.export(self.output_path / "risk_trajectories.json", normalize=normalize)
+        self.reporter.create_risk_trajectory_chart(trajectories)
+        print(f"[OK] Risk trajectories for {len(panel.cities)} cities x {len(panel.years)} years: {trajectories['output_file']}")
+        return trajectories
 
-def main():
+
+def run_component_query(base_path: Path, components):
+    """Score only the requested components, reading just the datasets they need"""
+    from services import result_io
+    assessor = IPCCRiskAssessmentService(ClimateDataLoader(str(base_path)), lazy=True)
+    results = assessor.query(components)
+    computed = [n for n in assessor.indicator_graph.resolve(components) if n != 'social']
+    output_file = base_path / "climate_assessment" / f"climate_risk_{'_'.join(components)}.json"
+    result_io.write_json(results.to_records(['city', 'population', 'gdp_per_capita_usd'] + computed),
+                         output_file, compression=None, indent=2)
+    print(f"[OK] Computed {len(computed)} indicators for {len(results)} cities "
+          f"(datasets read: {', '.join(sorted(assessor.data.loaded_keys()))})")
+    print(f"[OK] Results saved to: {output_file}")
+    return results
+
+
+def main(year_resolved: bool = False, normalize: str = 'year', components=None):
     """Main execution function for climate risk assessment"""
     from pathlib import Path
 
@@ -71,6 +98,9 @@ def main():
     else:
         print(f"Using data base_path: {base_path}")
 
+    if components:
+        return run_component_query(base_path, components)
+
     # Create assessment instance
     assessment = IPCCClimateRiskAssessment(str(base_path))
 
@@ -81,73 +111,28 @@ def main():
     import json
     output_file = base_path / "climate_assessment" / "climate_risk_assessment_results.json"
     with open(output_file, 'w', encoding='utf-8') as f:
-        # Convert ClimateRiskMetrics objects to dictionaries
-        results_dict = {}
-        for city, metrics in results.items():
-            results_dict[city] = {
-                'city': metrics.city,
-                'population': metrics.population,
-                'gdp_per_capita_usd': metrics.gdp_per_capita_usd,
-                'hazard_score': metrics.hazard_score,
-                'exposure_score': metrics.exposure_score,
-                'vulnerability_score': metrics.vulnerability_score,
-                'adaptive_capacity_score': metrics.adaptive_capacity_score,
-                'heat_hazard': metrics.heat_hazard,
-                'dry_hazard': metrics.dry_hazard,
-                'dust_hazard': metrics.dust_hazard,
-                'pluvial_hazard': metrics.pluvial_hazard,
-                'air_quality_hazard': metrics.air_quality_hazard,
-                'population_exposure': metrics.population_exposure,
-                'gdp_exposure': metrics.gdp_exposure,
-                'viirs_exposure': metrics.viirs_exposure,
-                'income_vulnerability': metrics.income_vulnerability,
-                'veg_access_vulnerability': metrics.veg_access_vulnerability,
-                'fragmentation_vulnerability': metrics.fragmentation_vulnerability,
-                'bio_trend_vulnerability': metrics.bio_trend_vulnerability,
-                'air_pollution_vulnerability': metrics.air_pollution_vulnerability,
-                'water_access_vulnerability': metrics.water_access_vulnerability,
-                'healthcare_access_vulnerability': metrics.healthcare_access_vulnerability,
-                'education_access_vulnerability': metrics.education_access_vulnerability,
-                'sanitation_vulnerability': metrics.sanitation_vulnerability,
-                'building_age_vulnerability': metrics.building_age_vulnerability,
-                'gdp_adaptive_capacity': metrics.gdp_adaptive_capacity,
-                'greenspace_adaptive_capacity': metrics.greenspace_adaptive_capacity,
-                'services_adaptive_capacity': metrics.services_adaptive_capacity,
-                'air_quality_adaptive_capacity': metrics.air_quality_adaptive_capacity,
-                'social_infrastructure_capacity': metrics.social_infrastructure_capacity,
-                'water_system_capacity': metrics.water_system_capacity,
-                'overall_risk_score': metrics.overall_risk_score,
-                'adaptability_score': metrics.adaptability_score,
-                'current_suhi_intensity': metrics.current_suhi_intensity,
-                'temperature_trend': metrics.temperature_trend,
-                'suhi_trend': metrics.suhi_trend,
-                'built_area_percentage': metrics.built_area_percentage,
-                'green_space_accessibility': metrics.green_space_accessibility,
-                'economic_capacity': metrics.economic_capacity,
-                'co_level': metrics.co_level,
-                'no2_level': metrics.no2_level,
-                'o3_level': metrics.o3_level,
-                'so2_level': metrics.so2_level,
-                'ch4_level': metrics.ch4_level,
-                'aerosol_index': metrics.aerosol_index,
-                'air_quality_trend': metrics.air_quality_trend,
-                'health_risk_score': metrics.health_risk_score,
-                'water_supply_risk': metrics.water_supply_risk,
-                'water_demand_risk': metrics.water_demand_risk,
-                'overall_water_scarcity_score': metrics.overall_water_scarcity_score,
-                'water_scarcity_level': metrics.water_scarcity_level,
-                'aridity_index': metrics.aridity_index,
-                'climatic_water_deficit': metrics.climatic_water_deficit,
-                'drought_frequency': metrics.drought_frequency,
-                'surface_water_change': metrics.surface_water_change,
-                'cropland_fraction': metrics.cropland_fraction
-            }
+        # Column store -> per-city dictionaries (HEV intermediates are not exported)
+        results_dict = results.to_records([n for n in METRIC_FIELDS if n not in ('hev_score', 'hev_adj_score')])
         json.dump(results_dict, f, indent=2, ensure_ascii=False)
     
     print(f"[OK] Results saved to: {output_file}")
     
+    # Scored-state snapshot shared by the diagnostics/validation scripts
+    from services.assessment_snapshot import write_snapshot
+    write_snapshot(assessment.risk_assessor, results)
+    
+    if year_resolved:
+        assessment.run_year_resolved_assessment(normalize=normalize)
+    
     return results
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description='IPCC AR6 climate risk assessment')
+    parser.add_argument('--year-resolved', action='store_true', help='Also score every city-year and export risk trajectories')
+    parser.add_argument('--normalize', choices=['year', 'panel'], default='year', help='Normalize ranked indicators per year or across the panel')
+    parser.add_argument('--components', nargs='+', choices=['hazard', 'exposure', 'vulnerability', 'adaptive_capacity'],
+                        help='Only compute these components (loads just the data they need; skips reports)')
+    args = parser.parse_args()
+    main(year_resolved=args.year_resolved, normalize=args.normalize, components=args.components)
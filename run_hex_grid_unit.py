@@ -0,0 +1,54 @@
+"""Runner for the hex-grid sub-city risk unit.
+
+Usage:
+  python run_hex_grid_unit.py --cities Tashkent Nukus --year 2023 --cell-size 500
+
+Writes one cell × indicator CSV per city/year to
+`suhi_analysis_output/hex_grid/` and a JSON summary with the top hotspot cells.
+"""
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so local `services` package is importable
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+import argparse
+
+from services.gee import initialize_gee
+from services.hex_grid import run_city_hex, HEX_CONFIG
+from services.utils import UZBEKISTAN_CITIES, create_output_directories
+from services import result_io
+
+
+def main():
+    p = argparse.ArgumentParser(description='Run hex-grid sub-city indicators and risk scoring')
+    p.add_argument('--cities', nargs='*', help='Cities to process (default: all)')
+    p.add_argument('--year', type=int, default=2023)
+    p.add_argument('--cell-size', type=float, default=HEX_CONFIG['cell_size_m'], help='Hexagon radius in metres')
+    p.add_argument('--workers', type=int, default=HEX_CONFIG['max_workers'], help='Concurrent reduceRegions batches')
+    args = p.parse_args()
+
+    if not initialize_gee():
+        print("GEE initialization failed or was cancelled. Authenticate and try again.")
+        return
+
+    out_dir = create_output_directories()['base'] / 'hex_grid'
+    summary = {}
+    for city in args.cities or list(UZBEKISTAN_CITIES.keys()):
+        print(f"Hex grid for {city} {args.year} ({args.cell_size:.0f} m)...")
+        try:
+            res = run_city_hex(city, args.year, args.cell_size, out_dir, args.workers)
+            res.pop('matrix', None)
+            print(f"   {res.get('cells', 0)} cells in {res.get('elapsed_s', 0)} s")
+        except Exception as e:
+            res = {'city': city, 'year': args.year, 'error': str(e)}
+            print(f"   Failed: {e}")
+        summary[city] = res
+
+    path = result_io.write_json(summary, out_dir / f'hex_grid_summary_{args.year}.json')
+    print(f"Wrote summary: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Runner for the local MODIS LST datacube.
+
+Usage:
+  python run_lst_cube_unit.py --cities Tashkent --start-year 2017 --end-year 2024
+  python run_lst_cube_unit.py --query-only --year 2023
+  python run_lst_cube_unit.py --query-only --atlas   # warm-season heat maps, all cities × years
+
+Ingests (or extends) each city's MOD11A2 cube under
+`suhi_analysis_output/data/lst_cube/` and prints warm-season urban/rural
+day and night statistics computed locally from the cube. With --atlas it also
+renders the cities × years warm-season heat-map atlas from the cubes.
+"""
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so local `services` package is importable
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+import argparse
+
+from services.utils import UZBEKISTAN_CITIES, ANALYSIS_CONFIG
+
+
+def main():
+    p = argparse.ArgumentParser(description='Build and query local MODIS LST cubes')
+    p.add_argument('--cities', nargs='*', help='Cities to process (default: all)')
+    p.add_argument('--start-year', type=int, default=2017)
+    p.add_argument('--end-year', type=int, default=2024)
+    p.add_argument('--year', type=int, default=None, help='Year to summarize (default: end year)')
+    p.add_argument('--workers', type=int, default=8, help='Concurrent scene downloads')
+    p.add_argument('--query-only', action='store_true', help='Skip ingestion and only query existing cubes')
+    p.add_argument('--atlas', action='store_true', help='Render warm-season day LST maps for every city and year')
+    args = p.parse_args()
+
+    from services.lst_cube import ingest_city_cube, run_parallel
+    cities = args.cities or list(UZBEKISTAN_CITIES.keys())
+
+    if not args.query_only:
+        from services.gee import initialize_gee
+        if not initialize_gee():
+            print("GEE initialization failed or was cancelled. Authenticate and try again.")
+            return
+        for city in cities:
+            res = ingest_city_cube(city, args.start_year, args.end_year, max_workers=args.workers)
+            print(f"{city}: +{res['new_scenes']} scenes ({res['skipped_existing']} cached, {len(res['failed'])} failed)")
+
+    year = args.year or args.end_year
+    warm = ANALYSIS_CONFIG['warm_months']
+    for band in ('day', 'night'):
+        urban = run_parallel(cities, 'zonal_stats', band=band, zone='urban_core', months=warm, years=[year])
+        rural = run_parallel(cities, 'zonal_stats', band=band, zone='rural_ring', months=warm, years=[year])
+        print(f"\nWarm-season {band} LST {year} (urban / rural / SUHI, °C)")
+        for city in cities:
+            u, r = urban.get(city, {}).get('mean'), rural.get(city, {}).get('mean')
+            if u is None or r is None:
+                print(f"  {city:<12} n/a")
+            else:
+                print(f"  {city:<12} {u:6.2f} / {r:6.2f} / {u - r:+.2f}")
+
+    if args.atlas:
+        from services.heat_map_atlas import render_cube_atlas
+        render_cube_atlas(cities, range(args.start_year, args.end_year + 1), band='day', months=warm)
+
+
+if __name__ == '__main__':
+    main()
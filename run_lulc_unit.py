@@ -30,6 +30,7 @@ from services import gee
 from services.utils import create_output_directories, UZBEKISTAN_CITIES
 from services import lulc
 from services import lulc_analysis
+from services.tidy_export import export_tidy
 
 
 # ... helper functions moved to `services.lulc` - root runner keeps only orchestration
@@ -108,6 +109,7 @@ def main():
         with open(analysis_file, 'w', encoding='utf-8') as f:
             json.dump(analysis_results, f, indent=2)
         print('Saved analysis summary:', analysis_file)
+        export_tidy('lulc_analysis', analysis_results, analysis_file.parent)
 
 
 if __name__ == '__main__':
@@ -15,6 +15,7 @@ import json
 from services import analyze_nightlights, gee
 from services import nightlight
 from services.utils import create_output_directories, UZBEKISTAN_CITIES, ANALYSIS_CONFIG
+from services.tidy_export import export_tidy
 
 
 def parse_args():
@@ -26,6 +27,8 @@ def parse_args():
     p.add_argument('--cities', nargs='*', help='List of cities (default: all configured cities)')
     p.add_argument('--start-year', type=int, default=2016)
     p.add_argument('--end-year', type=int, default=2024)
+    p.add_argument('--multi-year', action='store_true', help='One stacked image, reduction and download per city; render thumbnails locally')
+    p.add_argument('--shared-composites', action='store_true', help='Reduce all cities from one national VIIRS composite per year')
     return p.parse_args()
 
 
@@ -42,12 +45,14 @@ def main():
     cities = args.cities if args.cities else list(UZBEKISTAN_CITIES.keys())
 
     # Run batch that computes stats in EE and writes one JSON per city
-    summaries = nightlight.run_batch_viirs(cities, years, out_dirs['base'])
+    summaries = nightlight.run_batch_viirs(cities, years, out_dirs['base'], multi_year=args.multi_year,
+                                           shared=args.shared_composites)
     # Save a compact summary aggregating per-city JSON paths
     out_file = out_dirs['base'] / 'nightlights_summary.json'
     with open(out_file, 'w', encoding='utf-8') as f:
         json.dump(summaries, f, indent=2)
     print(f"Saved nightlight summary: {out_file}")
+    export_tidy('nightlights', summaries, out_dirs['base'])
 
     # Create a simple report with dataset metadata
     report_md = out_dirs['base'] / 'nightlights_report.md'
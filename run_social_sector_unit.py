@@ -25,6 +25,10 @@ def main():
     p.add_argument('--end-year', type=int, default=None)
     p.add_argument('--cities', nargs='*', help='Cities to process')
     p.add_argument('--verbose', action='store_true')
+    p.add_argument('--accessibility', action='store_true',
+                   help='Compute distance-to-nearest-facility grids and coverage per city')
+    p.add_argument('--cell-size', type=float, default=200.0,
+                   help='Accessibility grid cell size in metres (100-250 recommended)')
     args = p.parse_args()
 
     ok = initialize_gee()
@@ -32,7 +36,11 @@ def main():
         print("GEE initialization failed or was cancelled. Authenticate and try again.")
         return
 
-    results = run_batch_social_analysis(cities=args.cities, verbose=args.verbose)
+    results = run_batch_social_analysis(
+        cities=args.cities, verbose=args.verbose, accessibility=args.accessibility,
+        accessibility_cell_m=args.cell_size,
+        accessibility_dir=ROOT / 'suhi_analysis_output' / 'social_sector' / 'accessibility' if args.accessibility else None,
+    )
 
     # Save results
     save_social_analysis_results(results)
@@ -58,6 +66,12 @@ def main():
             print(f"  Sanitation - Electricity: {sanitation.get('electricity_access', 0)}%, "
                   f"Water: {sanitation.get('water_access', 0)}%, "
                   f"Internet: {sanitation.get('internet_access', 0)}%")
+
+        access = summary.get('accessibility', {}).get('facility_types', {})
+        for ftype, stats in access.items():
+            median = stats.get('percentiles_m', {}).get('p50')
+            if median is not None:
+                print(f"  Nearest {ftype}: median {median:.0f} m, coverage {stats.get('coverage', {})}")
         print()
 
 
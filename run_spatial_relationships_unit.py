@@ -23,6 +23,7 @@ import ee
 from services.utils import create_output_directories
 from services.gee import initialize_gee
 from services.spatial_relationships import run_for_cities
+from services.tidy_export import export_tidy
 
 
 def analyze_city(city: str, year: int = None, scale: int = None) -> Dict[str, Any]:
@@ -186,6 +187,7 @@ def main(cities: List[str] = None, years: List[int] = None, scale: int = None):
     with open(out_file, 'w', encoding='utf-8') as fh:
         json.dump(result, fh, indent=2)
     print(f"Wrote report: {out_file}")
+    export_tidy('spatial_relationships', result, out_file.parent)
 
 
 if __name__ == '__main__':
@@ -12,7 +12,8 @@ sys.path.insert(0, str(ROOT))
 import argparse
 import json
 from services.gee import initialize_gee
-from services.suhi_unit import run_batch
+from services.suhi_unit import run_batch, export_suhi_tiles
+from services.tidy_export import export_tidy
 from services.utils import UZBEKISTAN_CITIES
 
 
@@ -22,6 +23,8 @@ def parse_args():
     p.add_argument('--start-year', type=int, default=2016)
     p.add_argument('--end-year', type=int, default=2024)
     p.add_argument('--download-scale', type=int, default=100, help='Download scale in meters')
+    p.add_argument('--export-tiles', choices=['local', 'drive'], help='Also export tiled SUHI rasters (local COG mosaic or Drive tasks)')
+    p.add_argument('--tile-workers', type=int, default=4, help='Concurrent tile downloads for --export-tiles local')
     return p.parse_args()
 
 
@@ -50,6 +53,13 @@ def main():
         print('Wrote SUHI batch summary to', out_file)
     except Exception:
         print('Failed to write SUHI batch summary')
+    export_tidy('suhi_batch', results, reports_dir)
+    if args.export_tiles:
+        base = Path('suhi_analysis_output')
+        for c in cities:
+            for y in years:
+                res = export_suhi_tiles(base, c, y, mode=args.export_tiles, max_workers=args.tile_workers)
+                print(c, y, res.get('generated', {}).get('mosaic') or res.get('generated', {}).get('task_manifest'), res.get('error', ''))
 
 if __name__ == '__main__':
     main()
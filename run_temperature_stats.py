@@ -15,14 +15,18 @@ if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
 from services.gee import initialize_gee
-from services.temperature import compute_temperature_statistics
+from services.temperature import compute_temperature_statistics, compute_seasonal_stats_all_cities
 from services.utils import UZBEKISTAN_CITIES, create_output_directories
 import json
 import time
 
 
-def run_temperature_statistics_batch(cities=None, years=None):
-    """Run comprehensive temperature statistics for specified cities and years."""
+def run_temperature_statistics_batch(cities=None, years=None, shared=False):
+    """Run comprehensive temperature statistics for specified cities and years.
+    
+    With ``shared`` the summer season summary of all cities is reduced from one
+    national MODIS composite per year instead of one composite per city.
+    """
     
     # Initialize Google Earth Engine using the existing service
     if not initialize_gee():
@@ -50,6 +54,14 @@ def run_temperature_statistics_batch(cities=None, years=None):
     
     print(f"📊 Computing temperature statistics for {len(cities)} cities and {len(years)} years...")
     
+    seasonal_by_year = {}
+    if shared:
+        for year in years:
+            try:
+                seasonal_by_year[year] = compute_seasonal_stats_all_cities(cities, year)
+            except Exception as e:
+                print(f"⚠️  Shared seasonal composite failed for {year}, using per-city composites: {e}")
+    
     total_combinations = len(cities) * len(years)
     current_combination = 0
     
@@ -63,7 +75,8 @@ def run_temperature_statistics_batch(cities=None, years=None):
             try:
                 # Compute temperature statistics
                 start_time = time.time()
-                temp_stats = compute_temperature_statistics(city, year, base_dirs['base'])
+                temp_stats = compute_temperature_statistics(city, year, base_dirs['base'],
+                                                            seasonal_stats=seasonal_by_year.get(year, {}).get(city))
                 computation_time = time.time() - start_time
                 
                 if 'error' not in temp_stats:
@@ -138,6 +151,8 @@ def main():
     parser.add_argument('--cities', nargs='+', help='List of cities to process (default: all)')
     parser.add_argument('--years', type=int, nargs='+', help='List of years to process (default: 2016-2024)')
     parser.add_argument('--test', action='store_true', help='Run test with single city/year')
+    parser.add_argument('--shared-composites', action='store_true',
+                        help='Reduce all cities from one national MODIS summer composite per year')
     
     args = parser.parse_args()
     
@@ -150,7 +165,7 @@ def main():
         cities = args.cities
         years = args.years
     
-    run_temperature_statistics_batch(cities, years)
+    run_temperature_statistics_batch(cities, years, shared=args.shared_composites)
 
 
 if __name__ == '__main__':
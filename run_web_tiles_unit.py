@@ -0,0 +1,39 @@
+"""Runner for the XYZ web-tile export.
+
+Usage:
+  python run_web_tiles_unit.py
+  python run_web_tiles_unit.py --layers suhi esri_lulc --cities Tashkent --years 2023 2024
+  python run_web_tiles_unit.py --force --pmtiles
+
+Renders the downloaded SUHI/LST/NDVI/VIIRS/ESRI rasters under
+`suhi_analysis_output/` into tile pyramids in `suhi_analysis_output/tiles/`.
+Unchanged sources are skipped and only changed tiles are rewritten.
+"""
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so local `services` package is importable
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+import argparse
+
+from services.web_tiles import export_tiles, LAYERS
+
+
+def main():
+    p = argparse.ArgumentParser(description='Render analysis rasters into XYZ tile pyramids')
+    p.add_argument('--layers', nargs='*', choices=sorted(LAYERS), help='Layers to render (default: all)')
+    p.add_argument('--cities', nargs='*', help='Cities to render (default: all)')
+    p.add_argument('--years', nargs='*', type=int, help='Years to render (default: all found)')
+    p.add_argument('--workers', type=int, default=None, help='Worker processes (default: cores - 1)')
+    p.add_argument('--force', action='store_true', help='Re-render sources even if unchanged')
+    p.add_argument('--pmtiles', action='store_true', help='Also pack each pyramid as a .pmtiles archive')
+    args = p.parse_args()
+
+    export_tiles(layers=args.layers, cities=args.cities, years=args.years, max_workers=args.workers,
+                 force=args.force, pmtiles=args.pmtiles or None)
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,7 @@ from pathlib import Path
 import json
 from .utils import DATASETS, GEE_CONFIG, ANALYSIS_CONFIG, rate_limiter, make_json_safe
 from .utils import UZBEKISTAN_CITIES
+from .trends import trends_for_series
 
 
 class AirQualityAnalyzer:
@@ -369,9 +370,81 @@ class AirQualityAnalyzer:
         
         return health_results
 
+    def shared_zone_stats(self, cities: List[str], year: int,
+                          pollutants: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Annual and seasonal urban/rural stats for all cities from national composites.
+
+        Each pollutant's annual and four seasonal means are built once over the
+        country (`composites.CompositeRegistry`) and reduced for every city in one
+        stacked `reduceRegions`; monthly image counts come from one request.
+        Returns ``{city: {pollutant: {...}}}`` as consumed by
+        `batch_process_monthly_data_optimized(shared=...)`.
+        """
+        from .composites import get_registry, SEASONS
+        registry = get_registry()
+        reducer = ee.Reducer.mean().combine(
+            reducer2=ee.Reducer.stdDev(), sharedInputs=True
+        ).combine(
+            reducer2=ee.Reducer.minMax(), sharedInputs=True
+        ).combine(
+            reducer2=ee.Reducer.count(), sharedInputs=True
+        )
+        out: Dict[str, Dict[str, Any]] = {city: {} for city in cities}
+        for pollutant_name in pollutants or list(self.pollutants):
+            dataset = f"s5p_{pollutant_name}"
+            band = self.pollutants[pollutant_name]['band']
+            sizes = registry.image_counts(dataset, [f"{year}-{m:02d}" for m in range(1, 13)])
+            month_sizes = {f"{year}_{p[-2:]}": n for p, n in sizes.items()}
+            valid = {k[-2:] for k, n in month_sizes.items() if n > 0}
+            periods = [str(year)] + [f"{year}-{s}" for s in SEASONS]
+            # Same un-eroded zones as `get_city_geometry`
+            reduced = registry.reduce(dataset, periods, cities, reducer=reducer, erosion_m=0)
+            for city in cities:
+                by_period = reduced.get(city, {})
+                annual = {}
+                for zone, key in (('urban_core', 'urban'), ('rural_ring', 'rural')):
+                    stats = by_period.get(str(year), {}).get(zone, {}).get(band)
+                    if stats is None:
+                        continue
+                    zone_stats = {
+                        'mean': stats.get('mean'),
+                        'stdDev': stats.get('stdDev'),
+                        'min': stats.get('min'),
+                        'max': stats.get('max'),
+                        'count': stats.get('count'),
+                        'valid_pixels': stats.get('count', 0),
+                        'months_with_data': len(valid)
+                    }
+                    zone_stats.update(self._calculate_confidence_intervals(zone_stats))
+                    annual[key] = zone_stats
+                seasonal = {}
+                for season, season_months in SEASONS.items():
+                    zones = by_period.get(f"{year}-{season}")
+                    if not zones:
+                        seasonal[season] = {'error': 'No data for season'}
+                        continue
+                    months_with_data = sum(1 for m in season_months if f"{m:02d}" in valid)
+                    seasonal[season] = {key: {'mean': zones.get(zone, {}).get(band, {}).get('mean'),
+                                              'count': zones.get(zone, {}).get(band, {}).get('count'),
+                                              'months_with_data': months_with_data}
+                                        for zone, key in (('urban_core', 'urban'), ('rural_ring', 'rural'))}
+                out[city][pollutant_name] = {
+                    'annual': annual or {'error': 'No valid data'},
+                    'seasonal': seasonal,
+                    'sizes': month_sizes,
+                    'completeness': len(valid) / 12,
+                    'valid_months': len(valid)
+                }
+        return out
+
     def batch_process_monthly_data_optimized(self, city_name: str, year: int,
-                                           months: Optional[List[int]] = None) -> Dict[str, Any]:
-        """HIGHLY OPTIMIZED batch processing - minimizes getInfo() calls and uses proper S5P scale"""
+                                           months: Optional[List[int]] = None,
+                                           shared: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """HIGHLY OPTIMIZED batch processing - minimizes getInfo() calls and uses proper S5P scale
+
+        ``shared`` is this city's entry of `shared_zone_stats`; pollutants found there
+        skip the per-city composites (full-year runs only).
+        """
 
         print(f"� HIGH-PERFORMANCE batch processing air quality for {city_name} in {year}...")
 
@@ -407,25 +480,35 @@ class AirQualityAnalyzer:
             print(f"   📊 Processing {pollutant_name}...")
 
             try:
-                # 🔥 OPTIMIZATION 1: Batch all monthly data collection server-side
-                monthly_data = self._collect_all_monthly_data_server_side(
-                    pollutant_name, year, months, geometries['combined']
-                )
-
-                if not monthly_data['collections']:
-                    results['pollutants'][pollutant_name] = {'error': 'No valid data for any month'}
-                    print(f"   ⚠️ No valid {pollutant_name} data for {city_name} {year}")
-                    continue
-
-                # 🔥 OPTIMIZATION 2: Single batched annual stats for both urban/rural
-                annual_stats = self._calculate_batched_annual_stats(
-                    monthly_data['collections'], zones_fc, config['band']
-                )
-
-                # 🔥 OPTIMIZATION 3: Single batched seasonal stats
-                seasonal_stats = self._calculate_batched_seasonal_stats(
-                    monthly_data['collections'], zones_fc, config['band']
-                )
+                shared_entry = (shared or {}).get(pollutant_name) if len(months) == 12 else None
+                if shared_entry is not None:
+                    monthly_data = {'sizes': shared_entry['sizes'], 'completeness': shared_entry['completeness']}
+                    if not shared_entry['valid_months']:
+                        results['pollutants'][pollutant_name] = {'error': 'No valid data for any month'}
+                        print(f"   ⚠️ No valid {pollutant_name} data for {city_name} {year}")
+                        continue
+                    annual_stats = shared_entry['annual']
+                    seasonal_stats = shared_entry['seasonal']
+                else:
+                    # 🔥 OPTIMIZATION 1: Batch all monthly data collection server-side
+                    monthly_data = self._collect_all_monthly_data_server_side(
+                        pollutant_name, year, months, geometries['combined']
+                    )
+
+                    if not monthly_data['collections']:
+                        results['pollutants'][pollutant_name] = {'error': 'No valid data for any month'}
+                        print(f"   ⚠️ No valid {pollutant_name} data for {city_name} {year}")
+                        continue
+
+                    # 🔥 OPTIMIZATION 2: Single batched annual stats for both urban/rural
+                    annual_stats = self._calculate_batched_annual_stats(
+                        monthly_data['collections'], zones_fc, config['band']
+                    )
+
+                    # 🔥 OPTIMIZATION 3: Single batched seasonal stats
+                    seasonal_stats = self._calculate_batched_seasonal_stats(
+                        monthly_data['collections'], zones_fc, config['band']
+                    )
 
                 # Process results
                 pollutant_results = {
@@ -894,8 +977,11 @@ class AirQualityAnalyzer:
 
 
 def run_city_air_quality_analysis(base_path: Path, city_name: str, start_year: int,
-                                 end_year: int) -> Dict[str, Any]:
-    """Run comprehensive air quality analysis for a city across multiple years"""
+                                 end_year: int, shared: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Run comprehensive air quality analysis for a city across multiple years
+
+    ``shared`` maps year -> `AirQualityAnalyzer.shared_zone_stats` output for that year.
+    """
 
     analyzer = AirQualityAnalyzer()
 
@@ -911,7 +997,8 @@ def run_city_air_quality_analysis(base_path: Path, city_name: str, start_year: i
     # Analyze each year
     for year in range(start_year, end_year + 1):
         try:
-            yearly_result = analyzer.batch_process_monthly_data_optimized(city_name, year)
+            yearly_result = analyzer.batch_process_monthly_data_optimized(
+                city_name, year, shared=(shared or {}).get(str(year), {}).get(city_name))
             results['yearly_results'][str(year)] = yearly_result
             print(f"✅ Completed HIGH-PERFORMANCE air quality analysis for {city_name} {year}")
         except Exception as e:
@@ -955,32 +1042,26 @@ def run_city_air_quality_analysis(base_path: Path, city_name: str, start_year: i
                             pollutant_trends['annual_means'].append(float(mean_value))
                             pollutant_trends['years'].append(int(year))
 
-                # Calculate trend if we have enough data points
-                if len(pollutant_trends['annual_means']) >= 2:  # FIXED: Need at least 2 points for trend
-                    try:
-                        means = np.array(pollutant_trends['annual_means'])
-                        years = np.array(pollutant_trends['years'])
-
-                        # Simple linear regression
-                        slope, intercept = np.polyfit(years, means, 1)
-
-                        # Calculate R-squared
-                        y_pred = slope * years + intercept
-                        ss_res = np.sum((means - y_pred) ** 2)
-                        ss_tot = np.sum((means - np.mean(means)) ** 2)
-                        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
-
-                        pollutant_trends['trend_slope'] = slope
-                        pollutant_trends['trend_intercept'] = intercept
-                        pollutant_trends['r_squared'] = r_squared
-                        pollutant_trends['trend_direction'] = 'increasing' if slope > 0 else 'decreasing'
-                        pollutant_trends['trend_significance'] = 'strong' if r_squared > 0.7 else 'moderate' if r_squared > 0.5 else 'weak'
-
-                    except Exception as e:
-                        pollutant_trends['trend_error'] = str(e)
-
                 trends[pollutant] = pollutant_trends
 
+            # Fit all pollutant series in one batched call (OLS, Theil–Sen, Mann–Kendall)
+            fits = trends_for_series({p: (t['years'], t['annual_means']) for p, t in trends.items()}, n_boot=1000)
+            for pollutant, pollutant_trends in trends.items():
+                fit = fits[pollutant]
+                slope = fit['ols_slope']
+                if slope is None:
+                    continue
+                r_squared = fit['r_squared']
+                pollutant_trends['trend_slope'] = slope
+                pollutant_trends['trend_intercept'] = fit['ols_intercept']
+                pollutant_trends['r_squared'] = r_squared
+                pollutant_trends['trend_direction'] = 'increasing' if slope > 0 else 'decreasing'
+                pollutant_trends['trend_significance'] = 'strong' if r_squared > 0.7 else 'moderate' if r_squared > 0.5 else 'weak'
+                pollutant_trends['theil_sen_slope'] = fit['theil_sen_slope']
+                pollutant_trends['p_value'] = fit['p_value']
+                pollutant_trends['mann_kendall_p'] = fit['mk_p']
+                pollutant_trends['slope_ci'] = [fit.get('slope_ci_low'), fit.get('slope_ci_high')]
+
         results['trends'] = trends
 
     # Generate summary
@@ -12,17 +12,12 @@ import numpy as np
 import math
 import datetime
 
-try:
-    import rasterio
-    from rasterio import Affine
-    HAS_RASTERIO = True
-except Exception:
-    HAS_RASTERIO = False
-
 from PIL import Image
 import matplotlib.pyplot as plt
 
 from .utils import create_output_directories, ANALYSIS_CONFIG
+from . import raster_io
+from .trends import trends_for_series
 
 
 def find_image_for_city_year(base_dir: Path, city: str, year: int) -> Optional[Path]:
@@ -42,26 +37,22 @@ def find_image_for_city_year(base_dir: Path, city: str, year: int) -> Optional[P
     return None
 
 
-def _load_image_array(path: Path) -> Dict[str, Any]:
+def _load_image_array(path: Path, max_size: Optional[int] = None) -> Dict[str, Any]:
     """Load an image file to numpy array and return metadata.
 
+    ``max_size`` (long-side pixels) lets COG inputs be read from the coarsest
+    sufficient overview instead of full resolution.
+
     Returns dict with: array (2D float), pixel_area_m2 (if known or None), nodata
     """
     meta = {'path': str(path), 'pixel_area_m2': None, 'nodata': None}
-    if path.suffix.lower() in ['.tif', '.tiff'] and HAS_RASTERIO:
-        with rasterio.open(path) as src:
-            arr = src.read(1).astype(float)
-            transform = src.transform
-            # approximate pixel area in m^2 when CRS is in meters
-            try:
-                # pixel width = transform.a, pixel height = -transform.e
-                pix_w = abs(transform.a)
-                pix_h = abs(transform.e)
-                meta['pixel_area_m2'] = pix_w * pix_h
-            except Exception:
-                meta['pixel_area_m2'] = None
-            meta['nodata'] = src.nodata
-            return {'array': arr, 'meta': meta}
+    if path.suffix.lower() in ['.tif', '.tiff'] and raster_io.HAS_RASTERIO:
+        # nodata is already mapped to NaN by the reader
+        arr, rmeta = raster_io.read_raster(path, max_size=max_size)
+        # approximate pixel area in m^2 when CRS is in meters (scaled for overview reads)
+        meta['pixel_area_m2'] = rmeta.get('pixel_area')
+        meta['overview_factor'] = rmeta.get('overview_factor', 1)
+        return {'array': arr, 'meta': meta}
     else:
         # load with PIL, convert to grayscale float
         im = Image.open(path).convert('L')
@@ -106,14 +97,18 @@ def compute_image_statistics(arr: np.ndarray, meta: Dict[str, Any], lit_threshol
     return stats
 
 
-def analyze_city_year(base_dir: Path, city: str, year: int, lit_threshold: float = 1.0) -> Dict[str, Any]:
-    """Analyze available image for a city-year and produce stats and histogram plot."""
+def analyze_city_year(base_dir: Path, city: str, year: int, lit_threshold: float = 1.0,
+                      max_size: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze available image for a city-year and produce stats and histogram plot.
+
+    Pass ``max_size`` for coarse dashboard stats read from a COG overview.
+    """
     out = {'city': city, 'year': year, 'timestamp': datetime.datetime.utcnow().isoformat()}
     img_path = find_image_for_city_year(base_dir, city, year)
     if not img_path:
         out['error'] = 'image not found'
         return out
-    loaded = _load_image_array(img_path)
+    loaded = _load_image_array(img_path, max_size=max_size)
     arr = loaded['array']
     meta = loaded['meta']
     stats = compute_image_statistics(arr, meta, lit_threshold=lit_threshold)
@@ -142,18 +137,19 @@ def analyze_city_year(base_dir: Path, city: str, year: int, lit_threshold: float
     return out
 
 
-def analyze_cities_years(base_dir: Path, cities: List[str], years: List[int], lit_threshold: float = 1.0) -> List[Dict[str, Any]]:
+def analyze_cities_years(base_dir: Path, cities: List[str], years: List[int], lit_threshold: float = 1.0,
+                         max_size: Optional[int] = None) -> List[Dict[str, Any]]:
     results = []
     for city in cities:
         for y in years:
             print(f"Analyzing {city} {y}...")
-            res = analyze_city_year(base_dir, city, y, lit_threshold=lit_threshold)
+            res = analyze_city_year(base_dir, city, y, lit_threshold=lit_threshold, max_size=max_size)
             results.append(res)
     return results
 
 
 def analyze_trends(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Compute simple linear trends of lit area per city from results list."""
+    """Lit-area trends per city from results list, fitted for all cities in one batch."""
     city_map: Dict[str, List] = {}
     for r in results:
         city = r.get('city')
@@ -162,21 +158,17 @@ def analyze_trends(results: List[Dict[str, Any]]) -> Dict[str, Any]:
         if r.get('stats'):
             lit_area = r['stats'].get('lit_area_km2')
         city_map.setdefault(city, []).append((year, lit_area))
-    trends = {}
+    series = {}
     for city, entries in city_map.items():
-        # filter valid entries
-        pts = sorted(entries, key=lambda x: x[0])
-        years = [p[0] for p in pts if p[1] is not None]
-        areas = [p[1] for p in pts if p[1] is not None]
-        if len(years) >= 2:
-            # linear fit
-            try:
-                coef = np.polyfit(years, areas, 1)
-                slope = float(coef[0])
-                intercept = float(coef[1])
-                trends[city] = {'slope_km2_per_year': slope, 'intercept': intercept, 'n_years': len(years)}
-            except Exception as e:
-                trends[city] = {'error': str(e)}
+        pts = sorted((p for p in entries if p[0] is not None and p[1] is not None), key=lambda x: x[0])
+        series[city] = ([p[0] for p in pts], [p[1] for p in pts])
+    fits = trends_for_series(series)
+    trends = {}
+    for city, fit in fits.items():
+        if fit['n'] >= 2 and fit['ols_slope'] is not None:
+            trends[city] = {'slope_km2_per_year': fit['ols_slope'], 'intercept': fit['ols_intercept'],
+                            'n_years': fit['n'], 'theil_sen_slope': fit['theil_sen_slope'],
+                            'mann_kendall_p': fit['mk_p']}
         else:
             trends[city] = {'error': 'insufficient data'}
     return trends
@@ -1,15 +1,50 @@
 """Comprehensive SUHI analysis and statistical processing."""
 import json
 import pandas as pd
-import numpy as np
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import warnings
 from datetime import datetime
-import scipy.stats as stats
+from .trends import series_trend
 
 warnings.filterwarnings('ignore')
 
+SUHI_TABLE_COLUMNS = ['city', 'year', 'suhi', 'urban_mean', 'rural_mean']
+SUHI_BATCH_TABLE_COLUMNS = ['city', 'year', 'suhi_day', 'suhi_night', 'day_urban_mean', 'day_rural_mean',
+                            'night_urban_mean', 'night_rural_mean']
+
+
+def build_suhi_table(cities_data: Dict[str, Dict[Any, Dict[str, Any]]]) -> pd.DataFrame:
+    """Flatten ``{city: {year: *_results.json}}`` into one tidy row per city-year.
+
+    Columns follow SUHI_TABLE_COLUMNS; missing values are NaN so aggregates can be
+    computed with vectorized groupby operations.
+    """
+    records = []
+    for city, years_data in cities_data.items():
+        for year, data in years_data.items():
+            suhi = data.get('suhi') if isinstance(data, dict) else None
+            records.append((city, int(year),
+                            suhi.get('intensity') if isinstance(suhi, dict) else None,
+                            data.get('urban_mean'), data.get('rural_mean')))
+    df = pd.DataFrame.from_records(records, columns=SUHI_TABLE_COLUMNS)
+    for col in SUHI_TABLE_COLUMNS[2:]:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def build_suhi_batch_table(suhi_batch: Dict[str, Dict[str, Dict[str, Any]]]) -> pd.DataFrame:
+    """Flatten ``suhi_batch_summary.json`` (``{city: {year: {'stats': {...}}}}``) into a tidy table."""
+    records = []
+    for city, years_data in suhi_batch.items():
+        for year, data in years_data.items():
+            st = data.get('stats', {}) if isinstance(data, dict) else {}
+            records.append((city, int(year), *(st.get(c) for c in SUHI_BATCH_TABLE_COLUMNS[2:])))
+    df = pd.DataFrame.from_records(records, columns=SUHI_BATCH_TABLE_COLUMNS)
+    for col in SUHI_BATCH_TABLE_COLUMNS[2:]:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
 
 class SUHIAnalyzer:
     """
@@ -21,6 +56,7 @@ class SUHIAnalyzer:
         self.data_path = Path(data_path)
         self.cities_data = {}
         self.temporal_data = {}
+        self.table: Optional[pd.DataFrame] = None
         self.comparative_stats = {}
         self.summary_report = {}
         
@@ -61,6 +97,7 @@ class SUHIAnalyzer:
                     except json.JSONDecodeError as e:
                         print(f"Warning: Could not load trends for {city}: {e}")
             
+            self.table = build_suhi_table(self.cities_data)
             print(f"Loaded data for {len(cities)} cities")
             return True
             
@@ -71,121 +108,91 @@ class SUHIAnalyzer:
     def calculate_comparative_statistics(self) -> Dict[str, Any]:
         """Calculate comparative statistics across all cities and years."""
         try:
+            table = self.table if self.table is not None else build_suhi_table(self.cities_data)
             stats_summary = {
                 'total_cities': len(self.cities_data),
-                'years_analyzed': set(),
+                'years_analyzed': set(int(y) for y in table['year'].unique()),
                 'suhi_statistics': {},
                 'temperature_statistics': {},
                 'trend_analysis': {},
+                'yearly_statistics': {},
                 'regional_comparison': {}
             }
             
-            # Collect all data points
-            all_suhi_values = []
-            all_urban_temps = []
-            all_rural_temps = []
-            yearly_data = {}
-            city_comparisons = {}
-            
-            for city, years_data in self.cities_data.items():
-                city_comparisons[city] = {}
-                
-                for year, data in years_data.items():
-                    stats_summary['years_analyzed'].add(year)
-                    
-                    # Extract SUHI data
-                    if 'suhi' in data and isinstance(data['suhi'], dict):
-                        suhi_intensity = data['suhi'].get('intensity', 0)
-                        if suhi_intensity > 0:  # Valid SUHI value
-                            all_suhi_values.append(suhi_intensity)
-                            city_comparisons[city][year] = {
-                                'suhi': suhi_intensity,
-                                'urban_temp': data.get('urban_mean', 0),
-                                'rural_temp': data.get('rural_mean', 0)
-                            }
-                            
-                            # Collect temperature data
-                            urban_temp = data.get('urban_mean', 0)
-                            rural_temp = data.get('rural_mean', 0)
-                            if urban_temp > 0:
-                                all_urban_temps.append(urban_temp)
-                            if rural_temp > 0:
-                                all_rural_temps.append(rural_temp)
-                            
-                            # Group by year
-                            if year not in yearly_data:
-                                yearly_data[year] = {'suhi': [], 'urban': [], 'rural': []}
-                            yearly_data[year]['suhi'].append(suhi_intensity)
-                            yearly_data[year]['urban'].append(urban_temp)
-                            yearly_data[year]['rural'].append(rural_temp)
+            # Valid SUHI observations only
+            valid = table[table['suhi'] > 0]
             
             # Calculate SUHI statistics
-            if all_suhi_values:
+            if not valid.empty:
+                suhi = valid['suhi']
+                q25, q75 = suhi.quantile([0.25, 0.75])
                 stats_summary['suhi_statistics'] = {
-                    'mean': np.mean(all_suhi_values),
-                    'median': np.median(all_suhi_values),
-                    'std': np.std(all_suhi_values),
-                    'min': np.min(all_suhi_values),
-                    'max': np.max(all_suhi_values),
-                    'percentile_25': np.percentile(all_suhi_values, 25),
-                    'percentile_75': np.percentile(all_suhi_values, 75),
-                    'count': len(all_suhi_values)
+                    'mean': float(suhi.mean()),
+                    'median': float(suhi.median()),
+                    'std': float(suhi.std(ddof=0)),
+                    'min': float(suhi.min()),
+                    'max': float(suhi.max()),
+                    'percentile_25': float(q25),
+                    'percentile_75': float(q75),
+                    'count': int(suhi.size)
                 }
             
             # Calculate temperature statistics
-            if all_urban_temps and all_rural_temps:
+            urban = valid.loc[valid['urban_mean'] > 0, 'urban_mean']
+            rural = valid.loc[valid['rural_mean'] > 0, 'rural_mean']
+            if not urban.empty and not rural.empty:
                 stats_summary['temperature_statistics'] = {
-                    'urban_mean': np.mean(all_urban_temps),
-                    'rural_mean': np.mean(all_rural_temps),
-                    'urban_std': np.std(all_urban_temps),
-                    'rural_std': np.std(all_rural_temps),
-                    'temp_difference': np.mean(all_urban_temps) - np.mean(all_rural_temps)
+                    'urban_mean': float(urban.mean()),
+                    'rural_mean': float(rural.mean()),
+                    'urban_std': float(urban.std(ddof=0)),
+                    'rural_std': float(rural.std(ddof=0)),
+                    'temp_difference': float(urban.mean() - rural.mean())
                 }
             
-            # Trend analysis by year
-            if len(yearly_data) > 1:
-                years = sorted(yearly_data.keys())
-                annual_means = []
-                for year in years:
-                    if yearly_data[year]['suhi']:
-                        annual_means.append(np.mean(yearly_data[year]['suhi']))
-                
-                if len(annual_means) > 1:
-                    # Calculate trend
-                    slope, intercept, r_value, p_value, std_err = stats.linregress(years, annual_means)
-                    stats_summary['trend_analysis'] = {
-                        'slope': slope,
-                        'r_squared': r_value**2,
-                        'p_value': p_value,
-                        'trend_direction': 'increasing' if slope > 0 else 'decreasing',
-                        'significant': p_value < 0.05,
-                        'annual_change': slope
-                    }
+            # Per-year aggregates and trend analysis by year
+            by_year = valid.groupby('year')['suhi']
+            yearly = pd.DataFrame({
+                'mean': by_year.mean(), 'median': by_year.median(),
+                'p25': by_year.quantile(0.25), 'p75': by_year.quantile(0.75),
+                'count': by_year.size()
+            }).sort_index()
+            if not yearly.empty:
+                yearly['rolling_mean_3yr'] = yearly['mean'].rolling(3, min_periods=1).mean()
+                stats_summary['yearly_statistics'] = {
+                    int(y): {k: float(v) for k, v in row.items()} for y, row in yearly.iterrows()
+                }
+            if len(yearly) > 1:
+                fit = series_trend(yearly.index.to_numpy(dtype=float), yearly['mean'].to_numpy(), n_boot=1000)
+                slope, p_value = fit['ols_slope'], fit['p_value']
+                stats_summary['trend_analysis'] = {
+                    'slope': slope,
+                    'r_squared': fit['r_squared'],
+                    'p_value': p_value,
+                    'trend_direction': 'increasing' if slope > 0 else 'decreasing',
+                    'significant': bool(p_value is not None and p_value < 0.05),
+                    'annual_change': slope,
+                    'theil_sen_slope': fit['theil_sen_slope'],
+                    'mann_kendall_p': fit['mk_p'],
+                    'slope_ci': [fit.get('slope_ci_low'), fit.get('slope_ci_high')]
+                }
             
             # Regional comparison (identify strongest/weakest heat islands)
-            if city_comparisons:
-                city_averages = {}
-                for city, years in city_comparisons.items():
-                    if years:
-                        avg_suhi = np.mean([data['suhi'] for data in years.values()])
-                        city_averages[city] = avg_suhi
+            city_averages = valid.groupby('city', sort=False)['suhi'].mean()
+            if not city_averages.empty:
+                strongest_uhi = city_averages.idxmax()
+                weakest_uhi = city_averages.idxmin()
                 
-                if city_averages:
-                    strongest_uhi = max(city_averages, key=city_averages.get)
-                    weakest_uhi = min(city_averages, key=city_averages.get)
-                    
-                    stats_summary['regional_comparison'] = {
-                        'strongest_heat_island': {
-                            'city': strongest_uhi,
-                            'average_suhi': city_averages[strongest_uhi]
-                        },
-                        'weakest_heat_island': {
-                            'city': weakest_uhi,
-                            'average_suhi': city_averages[weakest_uhi]
-                        },
-                        'city_rankings': sorted(city_averages.items(), 
-                                              key=lambda x: x[1], reverse=True)
-                    }
+                stats_summary['regional_comparison'] = {
+                    'strongest_heat_island': {
+                        'city': strongest_uhi,
+                        'average_suhi': float(city_averages[strongest_uhi])
+                    },
+                    'weakest_heat_island': {
+                        'city': weakest_uhi,
+                        'average_suhi': float(city_averages[weakest_uhi])
+                    },
+                    'city_rankings': [(c, float(v)) for c, v in city_averages.sort_values(ascending=False, kind='stable').items()]
+                }
             
             self.comparative_stats = stats_summary
             return stats_summary
@@ -229,22 +236,19 @@ class SUHIAnalyzer:
                 }
             
             # City profiles
-            for city, years_data in self.cities_data.items():
-                if years_data:
-                    city_suhi_values = []
-                    for year, data in years_data.items():
-                        if 'suhi' in data and isinstance(data['suhi'], dict):
-                            suhi_val = data['suhi'].get('intensity', 0)
-                            if suhi_val > 0:
-                                city_suhi_values.append(suhi_val)
-                    
-                    if city_suhi_values:
-                        report['city_profiles'][city] = {
-                            'average_suhi': round(np.mean(city_suhi_values), 2),
-                            'suhi_variability': round(np.std(city_suhi_values), 2),
-                            'years_analyzed': len(years_data),
-                            'trend': 'increasing' if len(city_suhi_values) > 1 and city_suhi_values[-1] > city_suhi_values[0] else 'stable/decreasing'
-                        }
+            table = self.table if self.table is not None else build_suhi_table(self.cities_data)
+            valid = table[table['suhi'] > 0].sort_values(['city', 'year'])
+            years_per_city = table.groupby('city')['year'].size()
+            by_city = valid.groupby('city', sort=False)['suhi']
+            profiles = pd.DataFrame({'mean': by_city.mean(), 'std': by_city.std(ddof=0),
+                                     'first': by_city.first(), 'last': by_city.last(), 'n': by_city.size()})
+            for city, row in profiles.iterrows():
+                report['city_profiles'][city] = {
+                    'average_suhi': round(float(row['mean']), 2),
+                    'suhi_variability': round(float(row['std']), 2),
+                    'years_analyzed': int(years_per_city.get(city, 0)),
+                    'trend': 'increasing' if row['n'] > 1 and row['last'] > row['first'] else 'stable/decreasing'
+                }
             
             # Generate recommendations based on findings
             recommendations = []
@@ -0,0 +1,293 @@
+"""
+Interactive assessment session for IPCC AR6 risk exploration
+Keeps the normalized indicator matrix in memory and re-scores cities for
+weight overrides, dropped indicators and city subsets without re-running
+the full assessment.
+"""
+
+import copy
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Any, Iterable
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from .climate_risk_assessment import IPCCRiskAssessmentService, ClimateRiskMetrics
+from .metrics_store import MetricsStore
+
+
+# Component -> {weight key: ClimateRiskMetrics attribute}, matching the service weights
+COMPONENT_INDICATORS = {
+    'hazard': {
+        'heat': 'heat_hazard',
+        'dry': 'dry_hazard',
+        'pluv': 'pluvial_hazard',
+        'dust': 'dust_hazard',
+        'air_quality': 'air_quality_hazard',
+    },
+    'exposure': {
+        'population': 'population_exposure',
+        'gdp': 'gdp_exposure',
+        'viirs': 'viirs_exposure',
+    },
+    'vulnerability': {
+        'income_inv': 'income_vulnerability',
+        'veg_access': 'veg_access_vulnerability',
+        'fragment': 'fragmentation_vulnerability',
+        'delta_bio_veg': 'bio_trend_vulnerability',
+        'water_scarcity': 'water_scarcity_vulnerability',
+        'water_access': 'water_access_vulnerability',
+        'healthcare_access': 'healthcare_access_vulnerability',
+        'education_access': 'education_access_vulnerability',
+        'sanitation': 'sanitation_vulnerability',
+        'building_age': 'building_age_vulnerability',
+        'air_pollution': 'air_pollution_vulnerability',
+    },
+    'adaptive_capacity': {
+        'gdp_pc': 'gdp_adaptive_capacity',
+        'greenspace': 'greenspace_adaptive_capacity',
+        'services': 'services_adaptive_capacity',
+        'social_infrastructure': 'social_infrastructure_capacity',
+        'water_system': 'water_system_capacity',
+        'air_quality_management': 'air_quality_adaptive_capacity',
+    },
+}
+
+# Indicators that only enter a composite when social sector data exists (and the ones they replace)
+SOCIAL_ONLY = {
+    'vulnerability': {'water_access', 'healthcare_access', 'education_access', 'sanitation', 'building_age'},
+    'adaptive_capacity': {'social_infrastructure', 'water_system'},
+}
+NON_SOCIAL_ONLY = {
+    'vulnerability': {'water_scarcity'},
+}
+
+
+class AssessmentSession:
+    """Resident indicator matrix with memoized re-scoring queries"""
+
+    def __init__(self, service: IPCCRiskAssessmentService,
+                 results: Optional[Dict[str, ClimateRiskMetrics]] = None):
+        self.service = service
+        results = results if results is not None else service.assess_all_cities()
+        store = MetricsStore.coerce(results)
+        self.results = store
+        self.cities: List[str] = list(results.keys())
+        self._city_index = {c: i for i, c in enumerate(self.cities)}
+        self.base_weights = {
+            'hazard': dict(service.hazard_weights),
+            'exposure': dict(service.exposure_weights),
+            'vulnerability': dict(service.vulnerability_weights),
+            'adaptive_capacity': dict(service.adaptive_capacity_weights),
+        }
+
+        # Social sector availability decides which indicators participate per city
+        has_social = np.array([bool(service._load_social_sector_data(c)) for c in self.cities])
+
+        self.matrices: Dict[str, np.ndarray] = {}
+        self.masks: Dict[str, np.ndarray] = {}
+        for component, indicators in COMPONENT_INDICATORS.items():
+            keys = list(indicators)
+            self.matrices[component] = store.matrix([indicators[k] for k in keys])
+            mask = np.ones((len(self.cities), len(keys)), dtype=float)
+            for j, k in enumerate(keys):
+                if k in SOCIAL_ONLY.get(component, ()):
+                    mask[:, j] = has_social
+                elif k in NON_SOCIAL_ONLY.get(component, ()):
+                    mask[:, j] = ~has_social
+            self.masks[component] = mask
+
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(weights, drop, cities, renormalize) -> str:
+        return json.dumps({
+            'w': {c: dict(sorted(w.items())) for c, w in sorted((weights or {}).items())},
+            'd': sorted(drop or []),
+            'c': sorted(cities) if cities is not None else None,
+            'r': bool(renormalize),
+        }, sort_keys=True)
+
+    @staticmethod
+    def _validate(weights, drop, cities) -> None:
+        """Reject malformed query parameters with ValueError (HTTP 400) before any scoring."""
+        if weights is not None:
+            if not isinstance(weights, dict):
+                raise ValueError("weights must be an object {component: {indicator: weight}}")
+            unknown = [c for c in weights if c not in COMPONENT_INDICATORS]
+            if unknown:
+                raise ValueError(f"Unknown weight components: {', '.join(map(str, unknown))}")
+            bad = [c for c, w in weights.items() if not isinstance(w, dict)]
+            if bad:
+                raise ValueError(f"weights for {', '.join(bad)} must be an object {{indicator: weight}}")
+        for name, value in (('drop', drop), ('cities', cities)):
+            if value is not None and (not isinstance(value, list) or not all(isinstance(v, str) for v in value)):
+                raise ValueError(f"{name} must be a list of strings")
+
+    def _weight_vector(self, component: str, overrides: Dict[str, float], dropped: Iterable[str],
+                       renormalize: bool) -> np.ndarray:
+        keys = list(COMPONENT_INDICATORS[component])
+        unknown = [k for k in (overrides or {}) if k not in keys]
+        if unknown:
+            raise ValueError(f"Unknown {component} indicators: {', '.join(unknown)}")
+        weights = dict(self.base_weights[component])
+        weights.update(overrides or {})
+        base_total = sum(self.base_weights[component].get(k, 0.0) for k in keys)
+        w = np.array([0.0 if k in dropped else float(weights.get(k, 0.0)) for k in keys])
+        if renormalize and w.sum() > 0:
+            w *= base_total / w.sum()
+        return w
+
+    def query(self, weights: Optional[Dict[str, Dict[str, float]]] = None,
+              drop: Optional[List[str]] = None, cities: Optional[List[str]] = None,
+              renormalize: bool = False) -> Dict[str, Any]:
+        """Re-score cities with weight overrides, dropped indicators and/or a city subset.
+
+        weights: {'hazard': {'heat': 0.6}, ...} overrides merged into the service weights
+        drop: indicator keys to exclude, either 'dust' or 'hazard.dust'
+        cities: restrict scoring to these cities (indicators keep their all-city normalization)
+        renormalize: rescale remaining weights so each component keeps its original weight total
+        """
+        self._validate(weights, drop, cities)
+        key = self._signature(weights, drop, cities, renormalize)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        unknown = [c for c in (cities or []) if c not in self._city_index]
+        if unknown:
+            raise KeyError(f"Unknown cities: {', '.join(unknown)}")
+        all_keys = {k for indicators in COMPONENT_INDICATORS.values() for k in indicators}
+        bad_drop = [d for d in (drop or []) if d.split('.', 1)[-1] not in all_keys]
+        if bad_drop:
+            raise ValueError(f"Unknown indicators to drop: {', '.join(bad_drop)}")
+        rows = np.array([self._city_index[c] for c in cities]) if cities is not None else np.arange(len(self.cities))
+        names = [self.cities[i] for i in rows]
+
+        scores = {}
+        for component in COMPONENT_INDICATORS:
+            dropped = {d.split('.', 1)[-1] for d in (drop or [])
+                       if '.' not in d or d.split('.', 1)[0] == component}
+            w = self._weight_vector(component, (weights or {}).get(component, {}), dropped, renormalize)
+            scores[component] = (self.matrices[component][rows] * self.masks[component][rows]) @ w
+
+        hev = scores['hazard'] * scores['exposure'] * scores['vulnerability']
+        hev_adj = hev * (1.0 - scores['adaptive_capacity'])
+        risk = np.clip(hev_adj, 0.0, 1.0)
+        adaptability = np.clip(scores['adaptive_capacity'] / (1.0 + risk + 1e-6), 0.0, 1.0)
+        order = np.argsort(-risk, kind='stable')
+        rank = np.empty_like(order)
+        rank[order] = np.arange(1, len(order) + 1)
+
+        result = {
+            'cities': {
+                name: {
+                    'hazard_score': float(scores['hazard'][i]),
+                    'exposure_score': float(scores['exposure'][i]),
+                    'vulnerability_score': float(scores['vulnerability'][i]),
+                    'adaptive_capacity_score': float(scores['adaptive_capacity'][i]),
+                    'hev_score': float(np.clip(hev[i], 0.0, 1.0)),
+                    'overall_risk_score': float(risk[i]),
+                    'adaptability_score': float(adaptability[i]),
+                    'risk_rank': int(rank[i]),
+                }
+                for i, name in enumerate(names)
+            },
+            'ranking': [names[i] for i in order],
+        }
+        with self._lock:
+            self._cache[key] = result
+        return copy.deepcopy(result)
+
+    def baseline(self) -> Dict[str, Any]:
+        """Scores with the service's own weights (matches assess_all_cities)"""
+        return self.query()
+
+    def check_baseline(self, tol: float = 1e-6) -> List[str]:
+        """Compare the baseline query with the assessed results; returns 'city.score' mismatches"""
+        fields = ('hazard_score', 'exposure_score', 'vulnerability_score',
+                  'adaptive_capacity_score', 'overall_risk_score')
+        baseline = self.baseline()['cities']
+        mismatches = []
+        for name in fields:
+            expected = self.results.column(name).astype(float)
+            for city, value in zip(self.cities, expected):
+                if abs(baseline[city][name] - value) > tol:
+                    mismatches.append(f"{city}.{name}: session {baseline[city][name]:.4f} != assessment {value:.4f}")
+        return mismatches
+
+
+def _make_handler(session: AssessmentSession):
+    class SessionHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _run(self, params: Dict[str, Any]):
+            if not isinstance(params, dict):
+                self._send(400, {'error': 'request body must be a JSON object'})
+                return
+            try:
+                result = session.query(weights=params.get('weights'), drop=params.get('drop'),
+                                       cities=params.get('cities'), renormalize=bool(params.get('renormalize', False)))
+                self._send(200, result)
+            except (KeyError, ValueError, TypeError) as e:
+                self._send(400, {'error': str(e)})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/cities':
+                self._send(200, {'cities': session.cities, 'weights': session.base_weights})
+                return
+            if url.path != '/query':
+                self._send(404, {'error': 'use /query or /cities'})
+                return
+            qs = parse_qs(url.query)
+            try:
+                params = {
+                    'weights': json.loads(qs['weights'][0]) if 'weights' in qs else None,
+                    'drop': qs['drop'][0].split(',') if 'drop' in qs else None,
+                    'cities': qs['cities'][0].split(',') if 'cities' in qs else None,
+                    'renormalize': qs.get('renormalize', ['0'])[0] in ('1', 'true'),
+                }
+            except json.JSONDecodeError as e:
+                self._send(400, {'error': f'invalid weights JSON: {e}'})
+                return
+            self._run(params)
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/query':
+                self._send(404, {'error': 'use /query'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                params = json.loads(self.rfile.read(length) or b'{}')
+            except json.JSONDecodeError as e:
+                self._send(400, {'error': f'invalid JSON body: {e}'})
+                return
+            self._run(params)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SessionHandler
+
+
+def serve_session(session: AssessmentSession, host: str = '127.0.0.1', port: int = 8765) -> None:
+    """Serve session queries over local HTTP (GET /query?weights=...&drop=...&cities=..., POST /query)"""
+    server = ThreadingHTTPServer((host, port), _make_handler(session))
+    print(f"Assessment session listening on http://{host}:{port}/query")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,177 @@
+"""
+Versioned on-disk snapshot of a scored IPCC AR6 assessment
+One assessment run writes the loaded inputs, every indicator and the final
+metrics under ``<base_path>/climate_assessment/snapshot/``; diagnostics and
+validation scripts then open that snapshot instead of re-parsing every
+dataset and re-scoring all cities.
+
+Layout:
+  manifest.json   version, input fingerprint, cities, column names, text fields
+  metrics.npy     cities × numeric ClimateRiskMetrics fields (float64, memory-mapped on load)
+  inputs.pkl      the loaded datasets, normalization cache and water scarcity data
+
+The manifest is written last, so a snapshot without one is incomplete.
+A snapshot is reused only when its version and input fingerprint match; the
+fingerprint covers the input folders, the ExternalData reference bundle
+sources and the scoring code version.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+import datetime
+import os
+import pickle
+
+import numpy as np
+
+from .climate_data_loader import ClimateDataLoader, DATASET_LOADERS
+from .climate_risk_assessment import IPCCRiskAssessmentService, SCORING_VERSION
+from .metrics_store import MetricsStore, METRIC_FIELDS, TEXT_FIELDS
+from . import result_io
+
+SNAPSHOT_VERSION = 2
+
+SNAPSHOT_CONFIG = {
+    "dirname": "snapshot",
+    # Input locations (relative to base_path) whose changes invalidate a snapshot
+    "input_paths": ("temperature", "suhi", "lulc_analysis", "nightlights", "reports",
+                    "water_scarcity", "social_sector"),
+}
+
+NUMERIC_FIELDS = [n for n in METRIC_FIELDS if n not in TEXT_FIELDS]
+
+
+def snapshot_dir(base_path) -> Path:
+    return Path(base_path) / "climate_assessment" / SNAPSHOT_CONFIG["dirname"]
+
+
+def input_fingerprint(base_path) -> Dict[str, Any]:
+    """Per input location [file count, total bytes, latest mtime], reference source digests, scoring version"""
+    from .reference_bundle import load_bundle
+    out: Dict[str, Any] = {}
+    for rel in SNAPSHOT_CONFIG["input_paths"]:
+        root = Path(base_path) / rel
+        files = [p for p in root.rglob("*") if p.is_file()] if root.exists() else []
+        stats = [p.stat() for p in files]
+        out[rel] = [len(stats), sum(s.st_size for s in stats), max((s.st_mtime for s in stats), default=0.0)]
+    # Population/GDP and facility inputs come from ExternalData, outside base_path
+    out["reference_bundle"] = {k: (v or {}).get("sha256") for k, v in load_bundle().manifest["sources"].items()}
+    out["scoring_version"] = SCORING_VERSION
+    return out
+
+
+def _write_atomic(path: Path, write) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def write_snapshot(service: IPCCRiskAssessmentService, results: MetricsStore, path: Optional[Path] = None) -> Path:
+    """Write the scored state of ``service``/``results``; returns the snapshot directory"""
+    results = MetricsStore.coerce(results)
+    base_path = service.data_loader.base_path
+    out = Path(path) if path else snapshot_dir(base_path)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / "manifest.json"
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    matrix = np.column_stack([results.column(n).astype(float) for n in NUMERIC_FIELDS]) if len(results) else \
+        np.zeros((0, len(NUMERIC_FIELDS)))
+    _write_atomic(out / "metrics.npy", lambda f: np.save(f, np.ascontiguousarray(matrix)))
+
+    inputs = {
+        "data": {name: service.data[name] for name in DATASET_LOADERS},
+        "cache": dict(service.data["cache"]),
+        "water_scarcity_data": service.water_scarcity_data,
+    }
+    _write_atomic(out / "inputs.pkl", lambda f: pickle.dump(inputs, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "base_path": str(base_path),
+        "fingerprint": input_fingerprint(base_path),
+        "cities": results.cities,
+        "numeric_fields": NUMERIC_FIELDS,
+        "text_fields": {n: results.column(n).tolist() for n in METRIC_FIELDS if n in TEXT_FIELDS},
+    }
+    result_io.write_json(manifest, manifest_path, compression=None, indent=2)
+    print(f"[OK] Wrote assessment snapshot: {out}")
+    return out
+
+
+class AssessmentSnapshot:
+    """Read-only view of a written snapshot; inputs are unpickled on first use
+
+    ``results`` columns are read-only memory maps of metrics.npy; writing a
+    metric (e.g. rescoring in place) copies that column into memory first, so
+    the snapshot on disk is never modified.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.manifest = result_io.read_json(self.path / "manifest.json")
+        self.cities: List[str] = self.manifest["cities"]
+        matrix = np.load(self.path / "metrics.npy", mmap_mode="r")
+        columns = {n: matrix[:, j] for j, n in enumerate(self.manifest["numeric_fields"])}
+        columns.update({n: np.array(v, dtype=object) for n, v in self.manifest["text_fields"].items()})
+        self.results = MetricsStore.from_columns(self.cities, columns)
+        self._inputs = None
+        self._data = None
+        self._service = None
+
+    @property
+    def inputs(self) -> Dict[str, Any]:
+        if self._inputs is None:
+            with open(self.path / "inputs.pkl", "rb") as f:
+                self._inputs = pickle.load(f)
+        return self._inputs
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Same structure as ``ClimateDataLoader.load_all_data()``"""
+        if self._data is None:
+            self._data = dict(self.inputs["data"], cache=self.inputs["cache"])
+        return self._data
+
+    @property
+    def data_loader(self) -> ClimateDataLoader:
+        return self.service.data_loader
+
+    @property
+    def service(self) -> IPCCRiskAssessmentService:
+        """Assessment service over the snapshot inputs (no dataset is re-read)"""
+        if self._service is None:
+            loader = ClimateDataLoader(self.manifest["base_path"])
+            loader.restore(self.inputs["data"], self.inputs["cache"])
+            self._service = IPCCRiskAssessmentService(loader, data=self.data,
+                                                      water_scarcity_data=self.inputs["water_scarcity_data"])
+        return self._service
+
+
+def load_snapshot(base_path, check_inputs: bool = True) -> Optional[AssessmentSnapshot]:
+    """Open the snapshot under ``base_path`` if complete, current-version and (optionally) up to date"""
+    path = snapshot_dir(base_path)
+    try:
+        manifest = result_io.read_json(path / "manifest.json")
+    except Exception:
+        return None
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        print(f"Snapshot version {manifest.get('version')} != {SNAPSHOT_VERSION}; ignoring {path}")
+        return None
+    if check_inputs and manifest.get("fingerprint") != input_fingerprint(base_path):
+        print(f"Snapshot inputs changed since {manifest.get('created')}; ignoring {path}")
+        return None
+    return AssessmentSnapshot(path)
+
+
+def get_snapshot(base_path, rebuild: bool = False) -> AssessmentSnapshot:
+    """Current snapshot for ``base_path``, running and snapshotting one assessment if needed"""
+    snapshot = None if rebuild else load_snapshot(base_path)
+    if snapshot is None:
+        service = IPCCRiskAssessmentService(ClimateDataLoader(str(base_path)))
+        write_snapshot(service, service.assess_all_cities())
+        snapshot = AssessmentSnapshot(snapshot_dir(base_path))
+    return snapshot
@@ -18,6 +18,7 @@ from . import lulc
 from . import error_assessment
 from .utils import UZBEKISTAN_CITIES, create_output_directories, ANALYSIS_CONFIG
 from .temperature import load_landsat_thermal
+from .landsat import city_composite
 
 
 def _format_date_range_for_months(year: int, months: List[int]) -> Tuple[str, str]:
@@ -33,35 +34,6 @@ def _format_date_range_for_months(year: int, months: List[int]) -> Tuple[str, st
     return start, end
 
 
-def _compute_seasonal_ndvi_evi(start_date: str, end_date: str, geometry: ee.Geometry, cloud_threshold: int = 20) -> ee.Image:
-    """Builds a median composite over Landsat 8/9 SR, returning NDVI and EVI bands.
-
-    Bands expected in the collection: SR_B2 (blue), SR_B4 (red), SR_B5 (nir).
-    """
-    from .utils import DATASETS
-
-    def proc(img):
-        qa = img.select('QA_PIXEL')
-        mask = (qa.bitwiseAnd(1<<3).eq(0).And(qa.bitwiseAnd(1<<4).eq(0)))
-        optical = img.select(['SR_B2','SR_B4','SR_B5']).multiply(0.0000275).add(-0.2).clamp(0,1)
-        blue = optical.select('SR_B2')
-        red = optical.select('SR_B4')
-        nir = optical.select('SR_B5')
-        ndvi = nir.subtract(red).divide(nir.add(red)).rename('NDVI')
-        # EVI formula tuned for Landsat SR
-        evi = nir.subtract(red).multiply(2.5).divide(nir.add(red.multiply(6)).subtract(blue.multiply(7.5)).add(1)).rename('EVI')
-        return ee.Image.cat([ndvi, evi]).updateMask(mask)
-
-    l8 = ee.ImageCollection(DATASETS['landsat8'])
-    l9 = ee.ImageCollection(DATASETS['landsat9'])
-    col = (l8.merge(l9)
-           .filterDate(start_date, end_date)
-           .filterBounds(geometry)
-           .filter(ee.Filter.lt('CLOUD_COVER', cloud_threshold))
-           .map(proc))
-    return col.median().clip(geometry)
-
-
 def ndvi_to_biomass_model(ndvi_mean: Optional[float], preset: str = 'central_asia', params: dict = None) -> Optional[float]:
         """Convert NDVI mean to biomass (t/ha) using a simple, configurable model.
 
@@ -148,8 +120,8 @@ def run_city_auxiliary(base: Path, city: str, year: int, download_scale: int = 3
         # Vegetation indices
         if verbose:
             t0 = time.time(); print(f"[aux] {city} {year}: computing seasonal NDVI/EVI {summer_start}..{summer_end}")
-        summer_veg = _compute_seasonal_ndvi_evi(summer_start, summer_end, region, cloud_threshold)
-        winter_veg = _compute_seasonal_ndvi_evi(winter_start, winter_end, region, cloud_threshold)
+        summer_veg = city_composite(city, year, 'summer', cloud_threshold=cloud_threshold).select(['NDVI', 'EVI']).clip(region)
+        winter_veg = city_composite(city, year, 'winter', cloud_threshold=cloud_threshold).select(['NDVI', 'EVI']).clip(region)
         if verbose:
             print(f"[aux] {city} {year}: NDVI/EVI composite built in {time.time()-t0:.1f}s (server-side op)")
 
@@ -184,7 +156,7 @@ def run_city_auxiliary(base: Path, city: str, year: int, download_scale: int = 3
         # Use lulc._download_image_geturl for consistent behaviour
         def _dl(img, out_dir: Path, fname: str) -> Optional[str]:
             try:
-                p = lulc._download_image_geturl(img, region, download_scale, out_dir, fname)
+                p = lulc._download_image_geturl(img, region, download_scale, out_dir, fname, cog_resampling='average')
                 return str(p) if p else None
             except Exception:
                 return None
@@ -0,0 +1,154 @@
+"""Parallel Plotly chart rendering with warm static-export workers.
+
+Chart builders stay in the parent process: they build the figure, hand it to
+``ChartRenderer.submit`` and move on. The renderer serializes each figure to
+its JSON spec, hashes it, and only queues charts whose spec (and therefore
+input data) changed since the last run. Queued charts are written to
+HTML/PNG in a process pool whose workers keep one static-export engine
+(kaleido) alive for their whole lifetime.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+MANIFEST_NAME = ".render_manifest.json"
+
+_WORKER_KALEIDO_OK = False
+
+
+def _start_export_engine() -> bool:
+    """Start (and keep) the kaleido engine for the current process."""
+    try:
+        import kaleido  # noqa: F401
+        import plotly.graph_objects as go
+        import plotly.io as pio
+    except Exception:
+        return False
+    try:
+        if hasattr(kaleido, 'start_sync_server'):
+            # kaleido >= 1.0 exposes a persistent browser-backed server
+            kaleido.start_sync_server(silence_warnings=True)
+        if hasattr(pio, 'kaleido') and getattr(pio.kaleido, 'scope', None) is not None:
+            pio.kaleido.scope.mathjax = None
+        # One tiny export boots the engine so the first real chart pays nothing
+        go.Figure().to_image(format='png', width=10, height=10)
+        return True
+    except Exception:
+        return False
+
+
+def _init_worker():
+    global _WORKER_KALEIDO_OK
+    _WORKER_KALEIDO_OK = _start_export_engine()
+
+
+def _render_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Render one serialized figure to HTML and (optionally) PNG."""
+    import plotly.io as pio
+    result = {'name': job['name'], 'hash': job['hash'], 'html': False, 'png': False, 'error': None}
+    try:
+        fig = pio.from_json(job['spec'])
+        fig.write_html(job['html_path'])
+        result['html'] = True
+        if job['png_path']:
+            if _WORKER_KALEIDO_OK:
+                fig.write_image(job['png_path'], width=job['width'], height=job['height'], scale=job['scale'])
+                result['png'] = True
+            else:
+                result['error'] = 'Kaleido not available, PNG export skipped'
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+class ChartRenderer:
+    """Hash-aware scheduler that renders queued Plotly figures in a process pool."""
+
+    def __init__(self, output_path, max_workers: Optional[int] = None, write_png: bool = True,
+                 force: bool = False):
+        self.output_path = Path(output_path)
+        self.output_path.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers if max_workers is not None else max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.write_png = write_png
+        self.force = force
+        self.manifest_path = self.output_path / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+        self.jobs: List[Dict[str, Any]] = []
+        self.skipped: List[str] = []
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.force or not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self):
+        tmp = self.manifest_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def submit(self, fig, name: str, width: int, height: int, scale: float = 2) -> bool:
+        """Queue ``fig`` for rendering as ``<name>.html``/``<name>.png``.
+
+        Returns False when the chart is skipped because its spec hash matches the
+        last successful render and the output files still exist.
+        """
+        spec = fig.to_json()
+        digest = hashlib.sha1(f"{spec}|{width}|{height}|{scale}|{self.write_png}".encode('utf-8')).hexdigest()
+        html_path = self.output_path / f"{name}.html"
+        png_path = self.output_path / f"{name}.png"
+        previous = self.manifest.get(name, {})
+        outputs_exist = html_path.exists() and (not self.write_png or (previous.get('png') and png_path.exists()))
+        if previous.get('hash') == digest and outputs_exist:
+            self.skipped.append(name)
+            return False
+        self.jobs.append({
+            'name': name,
+            'hash': digest,
+            'spec': spec,
+            'html_path': str(html_path),
+            'png_path': str(png_path) if self.write_png else None,
+            'width': width,
+            'height': height,
+            'scale': scale,
+        })
+        return True
+
+    def render_all(self) -> Dict[str, Any]:
+        """Render all queued charts and update the manifest."""
+        jobs, self.jobs = self.jobs, []
+        results = []
+        if jobs and self.max_workers <= 1:
+            _init_worker()
+            results = [_render_job(job) for job in jobs]
+        elif jobs:
+            workers = min(self.max_workers, len(jobs))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = [pool.submit(_render_job, job) for job in jobs]
+                for future in as_completed(futures):
+                    results.append(future.result())
+
+        for res in results:
+            if res['error']:
+                print(f"Warning: {res['name']}: {res['error']}")
+            if res['html']:
+                self.manifest[res['name']] = {'hash': res['hash'], 'png': res['png']}
+        if results:
+            self._save_manifest()
+
+        summary = {
+            'rendered': sorted(r['name'] for r in results if r['html']),
+            'failed': sorted(r['name'] for r in results if not r['html']),
+            'skipped': sorted(self.skipped),
+        }
+        self.skipped = []
+        print(f"🖼️  Rendered {len(summary['rendered'])} charts, skipped {len(summary['skipped'])} unchanged"
+              + (f", {len(summary['failed'])} failed" if summary['failed'] else ""))
+        return summary
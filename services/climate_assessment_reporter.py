@@ -11,14 +11,18 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 from .climate_risk_assessment import ClimateRiskMetrics
+from .metrics_store import MetricsStore
+from .chart_rendering import ChartRenderer
 
 
 class ClimateAssessmentReporter:
     """Service for generating climate assessment reports and visualizations"""
     
-    def __init__(self, output_path: str):
+    def __init__(self, output_path: str, render_workers: Optional[int] = None):
         self.output_path = Path(output_path)
         self.output_path.mkdir(parents=True, exist_ok=True)
+        self.render_workers = render_workers
+        self.renderer = None
     
     def generate_comprehensive_report(self, city_risk_profiles: Dict[str, ClimateRiskMetrics]):
         """Generate all reports and visualizations"""
@@ -28,15 +32,31 @@ class ClimateAssessmentReporter:
         
         print("Generating comprehensive climate assessment report...")
         
-        # Generate visualizations
+        # Generate visualizations (figures built here, files rendered in a worker pool)
+        self.renderer = ChartRenderer(self.output_path, max_workers=self.render_workers)
         self.create_risk_assessment_dashboard(city_risk_profiles)
         self.create_adaptability_ranking_table(city_risk_profiles)
+        self.renderer.render_all()
+        self.renderer = None
         
         # Generate text report
         self.generate_assessment_summary(city_risk_profiles)
         
         print(f"[SUCCESS] Reports generated and saved to: {self.output_path}")
     
+    def _save_chart(self, fig, name: str, width: int, height: int, scale: float = 2) -> Path:
+        """Queue the chart on the active renderer, or write HTML/PNG directly"""
+        html_file = self.output_path / f"{name}.html"
+        if self.renderer is not None:
+            self.renderer.submit(fig, name, width=width, height=height, scale=scale)
+            return html_file
+        fig.write_html(str(html_file))
+        try:
+            fig.write_image(str(self.output_path / f"{name}.png"), width=width, height=height, scale=scale)
+        except Exception as e:
+            print(f"Warning: Could not save PNG: {e}")
+        return html_file
+    
     def create_risk_assessment_dashboard(self, city_risk_profiles: Dict[str, ClimateRiskMetrics]):
         """Create comprehensive climate risk assessment dashboard"""
         if not city_risk_profiles:
@@ -44,14 +64,15 @@ class ClimateAssessmentReporter:
             return None
         
         # Prepare data for visualization
-        cities = list(city_risk_profiles.keys())
-        hazard_scores = [city_risk_profiles[city].hazard_score for city in cities]
-        exposure_scores = [city_risk_profiles[city].exposure_score for city in cities]
-        vulnerability_scores = [city_risk_profiles[city].vulnerability_score for city in cities]
-        adaptive_capacity_scores = [city_risk_profiles[city].adaptive_capacity_score for city in cities]
-        overall_risk_scores = [city_risk_profiles[city].overall_risk_score for city in cities]
-        adaptability_scores = [city_risk_profiles[city].adaptability_score for city in cities]
-        populations = [city_risk_profiles[city].population or 0 for city in cities]
+        store = MetricsStore.coerce(city_risk_profiles)
+        cities = store.cities
+        hazard_scores = store.column('hazard_score').tolist()
+        exposure_scores = store.column('exposure_score').tolist()
+        vulnerability_scores = store.column('vulnerability_score').tolist()
+        adaptive_capacity_scores = store.column('adaptive_capacity_score').tolist()
+        overall_risk_scores = store.column('overall_risk_score').tolist()
+        adaptability_scores = store.column('adaptability_score').tolist()
+        populations = np.nan_to_num(store.column('population')).tolist()
         
         # Create comprehensive dashboard
         fig = make_subplots(
@@ -272,18 +293,41 @@ class ClimateAssessmentReporter:
         fig.update_yaxes(title_text="<b>Population</b>", row=3, col=2, showgrid=True, gridwidth=1, gridcolor='lightgray')
         
         # Save
-        html_file = self.output_path / "ipcc_climate_risk_assessment.html"
-        png_file = self.output_path / "ipcc_climate_risk_assessment.png"
-        fig.write_html(str(html_file))
-        
-        try:
-            fig.write_image(str(png_file), width=1600, height=1200, scale=2)
-        except Exception as e:
-            print(f"Warning: Could not save PNG: {e}")
+        html_file = self._save_chart(fig, "ipcc_climate_risk_assessment", width=1600, height=1200)
         
         print(f"[OK] Saved climate risk assessment dashboard: {html_file.name}")
         return fig
     
+    def create_risk_trajectory_chart(self, trajectories: Dict[str, Any]):
+        """Line chart of year-resolved overall risk per city (from RiskPanel.trajectories)"""
+        cities = trajectories.get('cities', {})
+        if not cities:
+            return None
+        years = [str(y) for y in trajectories.get('years', [])]
+        
+        fig = go.Figure()
+        for city, entry in cities.items():
+            fig.add_trace(go.Scatter(
+                x=[int(y) for y in years],
+                y=[entry['years'][y]['overall_risk_score'] for y in years],
+                mode='lines+markers',
+                name=city
+            ))
+        fig.update_layout(
+            title=dict(
+                text=f"Overall Climate Risk Trajectories<br><sub>Year-resolved indicators, {trajectories.get('normalize')} normalization</sub>",
+                x=0.5, font=dict(size=16)
+            ),
+            xaxis_title="Year",
+            yaxis_title="Overall Risk Score",
+            height=700,
+            width=1200
+        )
+        
+        html_file = self._save_chart(fig, "risk_trajectories", width=1200, height=700)
+        print(f"[OK] Saved risk trajectory chart: {html_file.name}")
+        return fig
+    
     def create_adaptability_ranking_table(self, city_risk_profiles: Dict[str, ClimateRiskMetrics]):
         """Create detailed adaptability ranking table"""
         if not city_risk_profiles:
@@ -353,14 +397,7 @@ class ClimateAssessmentReporter:
         )
         
         # Save
-        html_file = self.output_path / "adaptability_ranking_table.html"
-        png_file = self.output_path / "adaptability_ranking_table.png"
-        fig.write_html(str(html_file))
-        
-        try:
-            fig.write_image(str(png_file), width=1600, height=600 + len(df) * 35, scale=2)
-        except Exception as e:
-            print(f"Warning: Could not save PNG: {e}")
+        html_file = self._save_chart(fig, "adaptability_ranking_table", width=1600, height=600 + len(df) * 35)
         
         print(f"[OK] Saved adaptability ranking table: {html_file.name}")
         return fig
@@ -376,8 +413,9 @@ class ClimateAssessmentReporter:
         print("="*80)
         
         # Summary statistics
-        risk_scores = [metrics.overall_risk_score for metrics in city_risk_profiles.values()]
-        adapt_scores = [metrics.adaptability_score for metrics in city_risk_profiles.values()]
+        store = MetricsStore.coerce(city_risk_profiles)
+        risk_scores = store.column('overall_risk_score')
+        adapt_scores = store.column('adaptability_score')
         
         print(f"\n[ASSESSMENT SUMMARY]:")
         print(f"   Cities Assessed: {len(city_risk_profiles)}")
@@ -438,10 +476,11 @@ class ClimateAssessmentReporter:
     
     def _calculate_priority_scores(self, city_risk_profiles: Dict[str, ClimateRiskMetrics]) -> List[float]:
         """Calculate priority scores for cities using IPCC AR6 framework approach"""
-        cities = list(city_risk_profiles.keys())
-        overall_risk_scores = [city_risk_profiles[city].overall_risk_score for city in cities]
-        adaptive_capacity_scores = [city_risk_profiles[city].adaptive_capacity_score for city in cities]
-        populations = [city_risk_profiles[city].population or 0 for city in cities]
+        store = MetricsStore.coerce(city_risk_profiles)
+        cities = store.cities
+        overall_risk_scores = store.column('overall_risk_score').tolist()
+        adaptive_capacity_scores = store.column('adaptive_capacity_score').tolist()
+        populations = np.nan_to_num(store.column('population')).tolist()
         
         # Normalize components using min-max scaling (0-1 range)
         def normalize(values):
@@ -118,6 +118,57 @@ UZBEK_CITIES_DATA = {
     "Nurafshon":  {"pop_2024": 56200,   "area_km2": 10.66,  "gdp_per_capita": 1972.3},
 }
 
+# Dataset key -> (loader method, attribute holding the loaded data)
+DATASET_LOADERS = {
+    'temperature_data': ('_load_temperature_data', 'temperature_data'),
+    'suhi_data': ('_load_suhi_data', 'suhi_data'),
+    'lulc_data': ('_load_lulc_data', 'lulc_data'),
+    'spatial_data': ('_load_spatial_data', 'spatial_data'),
+    'nightlights_data': ('_load_nightlights_data', 'nightlights_data'),
+    'air_quality_data': ('_load_air_quality_data', 'air_quality_data'),
+    'population_data': ('_initialize_population_data', 'population_data'),
+}
+
+# Normalization cache key -> datasets it is derived from
+CACHE_SOURCES = {
+    'population': ('population_data',),
+    'density': ('population_data',),
+    'gdp': ('population_data',),
+    'built_pct': ('lulc_data',),
+    'nightlights': ('nightlights_data',),
+    'veg_patches': ('population_data', 'spatial_data'),
+}
+
+
+class LazyDataView(dict):
+    """dict whose registered keys are produced by a factory on first access
+    
+    Keys set directly (e.g. derived caches) behave like a plain dict entry.
+    """
+    
+    def __init__(self, factories: Dict[str, Any]):
+        super().__init__()
+        self._factories = dict(factories)
+    
+    def _ensure(self, key):
+        if key in self._factories and not dict.__contains__(self, key):
+            dict.__setitem__(self, key, self._factories[key]())
+    
+    def __getitem__(self, key):
+        self._ensure(key)
+        return dict.__getitem__(self, key)
+    
+    def get(self, key, default=None):
+        self._ensure(key)
+        return dict.get(self, key, default)
+    
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._factories
+    
+    def loaded_keys(self) -> List[str]:
+        return list(dict.keys(self))
+
+
 class ClimateDataLoader:
     """Service for loading and preprocessing climate assessment data"""
     
@@ -131,19 +182,32 @@ class ClimateDataLoader:
         self.air_quality_data = {}
         self.population_data = {}
         self._cache = {}
-        
+        self._loaded = set()
+        
+    def load(self, dataset: str):
+        """Load one dataset (see DATASET_LOADERS) once and return it"""
+        method, attr = DATASET_LOADERS[dataset]
+        if dataset not in self._loaded:
+            getattr(self, method)()
+            self._loaded.add(dataset)
+        return getattr(self, attr)
+    
+    def restore(self, data: Dict[str, Any], cache: Optional[Dict[str, Any]] = None):
+        """Adopt previously loaded datasets (e.g. from a snapshot) so `load` skips the disk"""
+        for dataset, (_, attr) in DATASET_LOADERS.items():
+            if dataset in data:
+                setattr(self, attr, data[dataset])
+                self._loaded.add(dataset)
+        if cache is not None:
+            self._cache = cache
+    
     def load_all_data(self) -> Dict[str, Any]:
         """Load all available urban analysis data and return summary"""
         print("Loading urban climate data for risk assessment...")
         
         # Load each data type
-        self._load_temperature_data()
-        self._load_suhi_data()
-        self._load_lulc_data()
-        self._load_spatial_data()
-        self._load_nightlights_data()
-        self._load_air_quality_data()
-        self._initialize_population_data()
+        for dataset in DATASET_LOADERS:
+            self.load(dataset)
         self._initialize_data_cache()
         
         return {
@@ -157,6 +221,15 @@ class ClimateDataLoader:
             'cache': self._cache
         }
     
+    def lazy_data(self) -> LazyDataView:
+        """Same keys as `load_all_data`, but each dataset (and each normalization
+        cache entry) is read from disk only when first accessed"""
+        factories = {name: (lambda name=name: self.load(name)) for name in DATASET_LOADERS}
+        factories['cache'] = lambda: LazyDataView(
+            {key: (lambda key=key: self._cache_values(key)) for key in CACHE_SOURCES}
+        )
+        return LazyDataView(factories)
+    
     def _load_temperature_data(self):
         """Load temperature statistics data (preferred over SUHI for detailed analysis)"""
         self.temperature_data = {}
@@ -321,145 +394,63 @@ class ClimateDataLoader:
         print(f"[OK] Initialized assessment for {len(self.population_data)} cities using user-provided data")
     
     def _load_user_population_data(self):
-        """Load user-provided population data from Excel file"""
-        import pandas as pd
-        import os
-        
-        user_data = {}
+        """Supplemental population data from the compiled reference bundle (see `reference_bundle`)"""
+        from .reference_bundle import load_bundle
         
         try:
-            excel_path = os.path.join(self.base_path, '..', 'ExternalData', 'uzbekistan_pop_grp.xlsx')
-            if not os.path.exists(excel_path):
-                print("[WARNING] User population data file not found, using hardcoded values")
-                return user_data
-            
-            # Read the Excel file
-            pop_df = pd.read_excel(excel_path)
-            
-            # City to region mapping for Uzbekistan cities
-            city_region_mapping = {
-                'Tashkent': ['Tashkent city', 'Tashkent region'],
-                'Samarkand': ['Samarkand region'],
-                'Bukhara': ['Bukhara region'],
-                'Andijan': ['Andijan region'],
-                'Namangan': ['Namangan region'],
-                'Fergana': ['Fergana region'],
-                'Nukus': ['Republic of Karakalpakstan'],
-                'Urgench': ['Khorezm region'],
-                'Jizzakh': ['Jizzakh region'],
-                'Qarshi': ['Kashkadarya region'],
-                'Navoiy': ['Navoi region'],
-                'Termez': ['Surkhandarya region'],
-                'Gulistan': ['Syrdarya region'],
-                'Nurafshon': ['Tashkent region']  # Nurafshon is in Tashkent region
-            }
-            
-            # Extract population data (assuming population is in thousands)
-            for city, regions in city_region_mapping.items():
-                for region in regions:
-                    # Look for the region in the first column
-                    matches = pop_df[pop_df.iloc[:, 0].astype(str).str.contains(region.replace(' region', '').replace(' Republic of ', ''), case=False, na=False)]
-                    
-                    if not matches.empty:
-                        # Get the population value (assuming it's in column 1, in thousands)
-                        pop_value = matches.iloc[0, 1]  # Population in thousands
-                        if pd.notna(pop_value):
-                            try:
-                                # Convert to actual population (multiply by 1000)
-                                # Handle pandas/numpy scalar types
-                                if hasattr(pop_value, 'item'):
-                                    pop_value = pop_value.item()
-                                elif not isinstance(pop_value, (int, float)):
-                                    pop_value = str(pop_value)
-                                actual_pop = float(pop_value) * 1000
-                            except (ValueError, TypeError) as conv_error:
-                                print(f"[WARNING] Could not convert population value {pop_value}: {conv_error}")
-                                continue
-                            
-                            # Estimate GDP per capita (using regional averages)
-                            gdp_estimates = {
-                                'Tashkent': 4000,  # Capital city
-                                'Samarkand': 2500,  # Historic city
-                                'Bukhara': 2200,    # Tourism-dependent
-                                'Andijan': 2000,    # Agricultural region
-                                'Namangan': 1900,   # Industrial region
-                                'Fergana': 1800,    # Agricultural valley
-                                'Nukus': 1600,      # Remote region
-                                'Urgench': 1700,    # Agricultural region
-                                'Jizzakh': 1800,    # Mixed economy
-                                'Qarshi': 1900,     # Agricultural
-                                'Navoiy': 2800,     # Mining region
-                                'Termez': 1700,     # Border region
-                                'Gulistan': 1600,   # Agricultural
-                                'Nurafshon': 3500   # Suburban to capital
-                            }
-                            
-                            user_data[city] = {
-                                'population': int(actual_pop),
-                                'gdp_per_capita': gdp_estimates.get(city, 2000)
-                            }
-                            break  # Use first match found
-            
-            if user_data:
-                print(f"[SUCCESS] Loaded user population data for {len(user_data)} cities")
-            else:
-                print("[WARNING] No user population data could be extracted from Excel file")
-            
+            source_dir = (Path(self.base_path) / '..' / 'ExternalData').resolve()
+            return load_bundle(source_dir).supplemental_population
         except Exception as e:
             print(f"[ERROR] Failed to load user population data: {e}")
-        
-        return user_data
-    
+            return {}
+
     def _initialize_data_cache(self):
         """Initialize data cache for percentile-based normalization"""
-        self._cache = {}
-        
-        # Cache all population values for percentile normalization
-        populations = []
-        densities = []
-        gdp_values = []
-        
-        for city_data in self.population_data.values():
-            if city_data.population_2024:
-                populations.append(city_data.population_2024)
-            if city_data.density_per_km2:
-                densities.append(city_data.density_per_km2)
-            if city_data.gdp_per_capita_usd:
-                gdp_values.append(city_data.gdp_per_capita_usd)
-        
-        self._cache['population'] = populations
-        self._cache['density'] = densities
-        self._cache['gdp'] = gdp_values
-        
-        # Cache built area percentages
-        built_pcts = []
-        for lulc_city in self.lulc_data:
-            areas = lulc_city.get('areas_m2', {})
-            if areas:
-                years = sorted([int(y) for y in areas.keys()])
-                if years:
-                    latest_year = str(years[-1])
-                    built_pct = areas[latest_year].get('Built_Area', {}).get('percentage')
-                    if built_pct is not None:
-                        built_pcts.append(built_pct)
+        self._cache = {key: self._cache_values(key) for key in CACHE_SOURCES}
         
-        self._cache['built_pct'] = built_pcts
-        
-        # Cache nightlights values
-        nightlights = []
+        print(f"[OK] Initialized data cache for percentile normalization")
+    
+    def _cache_values(self, key: str) -> List[float]:
+        """Values of one normalization cache entry (loads its source datasets)"""
+        for dataset in CACHE_SOURCES[key]:
+            self.load(dataset)
+        
+        # Population, density and GDP values for percentile normalization
+        if key in ('population', 'density', 'gdp'):
+            attr = {'population': 'population_2024', 'density': 'density_per_km2', 'gdp': 'gdp_per_capita_usd'}[key]
+            return [getattr(city_data, attr) for city_data in self.population_data.values()
+                    if getattr(city_data, attr)]
+        
+        # Built area percentages
+        if key == 'built_pct':
+            built_pcts = []
+            for lulc_city in self.lulc_data:
+                areas = lulc_city.get('areas_m2', {})
+                if areas:
+                    years = sorted([int(y) for y in areas.keys()])
+                    if years:
+                        latest_year = str(years[-1])
+                        built_pct = areas[latest_year].get('Built_Area', {}).get('percentage')
+                        if built_pct is not None:
+                            built_pcts.append(built_pct)
+            return built_pcts
+        
+        # Nightlights values
+        if key == 'nightlights':
+            nightlights = []
+            for nl_city in self.nightlights_data:
+                years_data = nl_city.get('years', {})
+                if years_data:
+                    years = sorted([int(y) for y in years_data.keys()])
+                    if years:
+                        latest_year = str(years[-1])
+                        urban_nl = years_data[latest_year].get('stats', {}).get('urban_core', {}).get('mean')
+                        if urban_nl is not None:
+                            nightlights.append(urban_nl)
+            return nightlights
+        
+        # Vegetation patch counts for green capacity
         veg_patch_counts = []
-        
-        for nl_city in self.nightlights_data:
-            years_data = nl_city.get('years', {})
-            if years_data:
-                years = sorted([int(y) for y in years_data.keys()])
-                if years:
-                    latest_year = str(years[-1])
-                    urban_nl = years_data[latest_year].get('stats', {}).get('urban_core', {}).get('mean')
-                    if urban_nl is not None:
-                        nightlights.append(urban_nl)
-        
-        # Cache vegetation patch counts for green capacity
         for city in self.population_data.keys():
             spatial_city_data = self.spatial_data.get('per_year', {}).get(city, {})
             if spatial_city_data:
@@ -469,11 +460,7 @@ class ClimateDataLoader:
                     veg_patches = spatial_city_data[latest_year].get('veg_patches', {}).get('patch_count', 0)
                     if veg_patches > 0:
                         veg_patch_counts.append(veg_patches)
-        
-        self._cache['nightlights'] = nightlights
-        self._cache['veg_patches'] = veg_patch_counts
-        
-        print(f"[OK] Initialized data cache for percentile normalization")
+        return veg_patch_counts
     
     @staticmethod
     def pct_norm(values, x, lo=0.1, hi=0.9, invert=False, fallback=0.0):
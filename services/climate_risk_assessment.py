@@ -5,10 +5,18 @@ Implements the IPCC AR6 framework for urban climate risk assessment
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterable, TYPE_CHECKING
 from dataclasses import dataclass
 
 from .climate_data_loader import ClimateDataLoader, CityPopulationData
+from .trends import trends_for_series, series_trend
+
+if TYPE_CHECKING:
+    from .indicator_graph import IndicatorGraph
+    from .metrics_store import MetricsStore
+
+# Bump whenever an indicator, weight or composite formula changes (invalidates assessment snapshots)
+SCORING_VERSION = 1
 
 
 @dataclass
@@ -53,6 +61,7 @@ class ClimateRiskMetrics:
     water_demand_risk: float = 0.0
     overall_water_scarcity_score: float = 0.0
     water_scarcity_level: str = "Unknown"
+    water_scarcity_vulnerability: float = 0.0
     aridity_index: float = 0.0
     climatic_water_deficit: float = 0.0
     drought_frequency: float = 0.0
@@ -101,12 +110,21 @@ class ClimateRiskMetrics:
 class IPCCRiskAssessmentService:
     """Service for computing IPCC AR6-based climate risk assessments"""
     
-    def __init__(self, data_loader: ClimateDataLoader):
+    def __init__(self, data_loader: ClimateDataLoader, lazy: bool = False,
+                 data: Optional[Dict[str, Any]] = None, water_scarcity_data: Optional[Dict[str, Dict]] = None):
         self.data_loader = data_loader
-        self.data = data_loader.load_all_data()
+        # Lazy mode reads each dataset from disk only when an indicator first needs it;
+        # ``data`` adopts already loaded inputs (e.g. from an assessment snapshot)
+        if data is not None:
+            self.data = data
+        else:
+            self.data = data_loader.lazy_data() if lazy else data_loader.load_all_data()
+        self._graph = None
         
         # Load water scarcity data
-        self.water_scarcity_data = self._load_water_scarcity_data()
+        self._water_scarcity_data = water_scarcity_data
+        if water_scarcity_data is None and not lazy:
+            self._water_scarcity_data = self._load_water_scarcity_data()
         
         # IPCC AR6 risk thresholds and weights
         self.risk_thresholds = {
@@ -156,6 +174,12 @@ class IPCCRiskAssessmentService:
             'air_quality_management': 0.15  # Air quality management and monitoring capacity
         }
     
+    @property
+    def water_scarcity_data(self) -> Dict[str, Dict]:
+        if self._water_scarcity_data is None:
+            self._water_scarcity_data = self._load_water_scarcity_data()
+        return self._water_scarcity_data
+    
     def _load_water_scarcity_data(self) -> Dict[str, Dict]:
         """Load water scarcity assessment data from existing JSON files"""
         try:
@@ -205,17 +229,22 @@ class IPCCRiskAssessmentService:
             print(f"Warning: Could not load water scarcity data: {e}")
             return {}
     
-    def assess_all_cities(self) -> Dict[str, ClimateRiskMetrics]:
-        """Run full climate risk assessment for all cities"""
+    def assess_all_cities(self) -> 'MetricsStore':
+        """Run full climate risk assessment for all cities
+        
+        Returns a columnar MetricsStore; indexing it by city yields a row proxy
+        with the ClimateRiskMetrics attributes.
+        """
+        from .metrics_store import MetricsStore
         print("Running IPCC AR6-based climate risk assessment...")
         
         # Assess all cities from population data (which includes all UZBEKISTAN_CITIES)
         all_cities = list(self.data['population_data'].keys())
         
-        results = {}
+        results = MetricsStore(all_cities)
         for city in all_cities:
             print(f"Assessing {city}...")
-            results[city] = self.assess_city_climate_risk(city)
+            results.set_row(city, self.assess_city_climate_risk(city))
         
         print(f"[OK] Completed assessment for {len(results)} cities")
         
@@ -224,15 +253,49 @@ class IPCCRiskAssessmentService:
             print("No city data available; skipping distribution sanity checks.")
             return results
 
-        ac = [m.adaptive_capacity_score for m in results.values()]
-        rk = [m.overall_risk_score for m in results.values()]
-        pr = [(r ** 0.8) * ((1 - a) ** 0.6) for r, a in zip(rk, ac)]
+        ac = results.column('adaptive_capacity_score')
+        rk = results.column('overall_risk_score')
+        pr = (rk ** 0.8) * ((1 - ac) ** 0.6)
         print(f"AC median={np.median(ac):.3f}  IQR=({np.quantile(ac,0.25):.3f},{np.quantile(ac,0.75):.3f})")
         print(f"Risk median={np.median(rk):.3f}  IQR=({np.quantile(rk,0.25):.3f},{np.quantile(rk,0.75):.3f})")
         print(f"Priority median={np.median(pr):.3f}  IQR=({np.quantile(pr,0.25):.3f},{np.quantile(pr,0.75):.3f})")
 
         return results
     
+    @property
+    def indicator_graph(self) -> 'IndicatorGraph':
+        """Memoized dependency graph of the assessment indicators"""
+        if self._graph is None:
+            from .indicator_graph import IndicatorGraph
+            self._graph = IndicatorGraph(self)
+        return self._graph
+    
+    def query(self, targets: Iterable[str] = ('hazard',), cities: Optional[List[str]] = None) -> 'MetricsStore':
+        """Compute only the indicators needed for ``targets`` (components or indicator names)
+        
+        Uses the memoized indicator graph, so zero-weight indicators are skipped
+        and, on a lazy service, only the datasets of the required nodes are read.
+        Columns that were not needed keep their ClimateRiskMetrics defaults;
+        evaluated nodes that are not metric fields are kept in ``results.extras``.
+        """
+        from .metrics_store import MetricsStore, METRIC_FIELDS
+        values = self.indicator_graph.evaluate(targets, cities)
+        results = MetricsStore(values.keys())
+        fields = set(METRIC_FIELDS)
+        population_data = self.data['population_data']
+        for city, row in values.items():
+            proxy = results[city]
+            if city in population_data:
+                proxy.population = population_data[city].population_2024
+                proxy.gdp_per_capita_usd = population_data[city].gdp_per_capita_usd
+            for name, value in row.items():
+                if name in fields:
+                    setattr(proxy, name, value)
+                else:
+                    # Intermediate graph nodes without a metric column
+                    results.extras.setdefault(city, {})[name] = value
+        return results
+    
     def assess_city_climate_risk(self, city: str) -> ClimateRiskMetrics:
         """Assess climate risk for a single city using IPCC AR6 framework"""
         metrics = ClimateRiskMetrics(city=city)
@@ -387,8 +450,8 @@ class IPCCRiskAssessmentService:
         elif mean_summer_temp > 34:
             very_hot_days = 15      # Moderately hot summer
 
-        # Temperature trend analysis (warming rate)
-        temp_trends = []
+        # Temperature trend analysis (warming rate), day and night fitted together
+        temp_series = {}
         for temp_type in ['day', 'night']:
             values = []
             years_list = []
@@ -403,12 +466,11 @@ class IPCCRiskAssessmentService:
                     values.append(temp_val)
                     years_list.append(int(year))
 
-            if len(values) >= 3:  # Need at least 3 points for reliable trend
-                try:
-                    trend = np.polyfit(years_list, values, 1)[0]  # °C per year
-                    temp_trends.append(trend)
-                except:
-                    pass
+            temp_series[temp_type] = (years_list, values)
+
+        # Need at least 3 points for reliable trend; slopes are °C per year
+        fits = trends_for_series(temp_series, min_points=3)
+        temp_trends = [f['ols_slope'] for f in fits.values() if f['ols_slope'] is not None]
 
         avg_temp_trend = np.mean(temp_trends) if temp_trends else 0.0
 
@@ -480,16 +542,14 @@ class IPCCRiskAssessmentService:
         # Calculate trend if enough data
         trend_score = 0.0
         if len(suhi_values) >= 3:
-            try:
-                trend = np.polyfit(years[-len(suhi_values):], suhi_values, 1)[0]
+            trend = series_trend(years[-len(suhi_values):], suhi_values)['ols_slope']
+            if trend is not None:
                 if trend > 0.1:
                     trend_score = 1.0
                 elif trend > 0.05:
                     trend_score = 0.6
                 elif trend > 0.02:
                     trend_score = 0.3
-            except:
-                pass
         
         return min(1.0, 0.7 * intensity_score + 0.3 * trend_score)
     
@@ -946,8 +1006,8 @@ class IPCCRiskAssessmentService:
         
         return metrics
     
-    def _calculate_air_quality_hazard(self, city: str) -> float:
-        """Calculate air quality hazard component"""
+    def _calculate_air_quality_hazard(self, city: str, year: Optional[str] = None) -> float:
+        """Calculate air quality hazard component (latest year unless ``year`` is given)"""
         if city not in self.data.get('air_quality_data', {}):
             # Do not use a default moderate hazard when data is missing; return 0.0
             print(f"Warning: No air quality data for {city} - air quality hazard set to 0.0")
@@ -960,6 +1020,8 @@ class IPCCRiskAssessmentService:
         
         if 'yearly_results' in air_data:
             years = sorted([int(y) for y in air_data['yearly_results'].keys() if y.isdigit()])
+            if year is not None:
+                years = [int(year)] if str(year) in air_data['yearly_results'] else []
             if years:
                 latest_year = str(years[-1])
                 year_data = air_data['yearly_results'][latest_year]
@@ -1033,29 +1095,39 @@ class IPCCRiskAssessmentService:
             return metrics
         
         # Population exposure (E_pop) - exposed population
-        # Use built area fraction as proxy for exposure (people in developed areas)
+        metrics.population_exposure = self._calculate_population_exposure(city)
+        
+        # GDP exposure (E_gdp) - total GDP at risk (population × GDP_per_capita × exposed_share)
+        metrics.gdp_exposure = self._calculate_gdp_exposure(city)
+        
+        # VIIRS exposure (E_viirs) - urban radiance
+        metrics.viirs_exposure = self._calculate_viirs_exposure(city)
+        
+        return metrics
+    
+    @staticmethod
+    def _built_area_fraction(population: float) -> float:
+        """Built area fraction as proxy for exposure (people in developed areas)"""
         # For now, use population-based estimates since LULC data may not be available
-        if population_data.population_2024 > 1000000:  # Large cities
-            built_area_fraction = 0.7
-        elif population_data.population_2024 > 300000:  # Medium cities  
-            built_area_fraction = 0.5
+        if population > 1000000:  # Large cities
+            return 0.7
+        elif population > 300000:  # Medium cities
+            return 0.5
         else:  # Small cities
-            built_area_fraction = 0.3
-            
-        exposed_population = population_data.population_2024 * built_area_fraction
+            return 0.3
+    
+    def _calculate_population_exposure(self, city: str) -> float:
+        """Population exposure (E_pop): percentile rank of the exposed population"""
+        current_pop_data = self.data['population_data'].get(city)
+        if not current_pop_data:
+            return 0.0
         
         # Initialize exposed population cache if needed
         if 'exposed_population' not in self.data['cache']:
             exposed_pops = []
             for pop_data in self.data['population_data'].values():
                 if pop_data.population_2024:
-                    if pop_data.population_2024 > 1000000:
-                        city_built_fraction = 0.7
-                    elif pop_data.population_2024 > 300000:
-                        city_built_fraction = 0.5
-                    else:
-                        city_built_fraction = 0.3
-                    exposed_pops.append(pop_data.population_2024 * city_built_fraction)
+                    exposed_pops.append(pop_data.population_2024 * self._built_area_fraction(pop_data.population_2024))
             self.data['cache']['exposed_population'] = exposed_pops
 
         # FIX: Use safe_percentile_norm instead of winsorized_pct_norm to prevent zeros
@@ -1064,35 +1136,29 @@ class IPCCRiskAssessmentService:
         
         # Get the index for current city by matching population data
         pop_city_index = -1
-        current_pop_data = self.data['population_data'].get(city)
-        if current_pop_data:
-            for i, pop_data in enumerate(self.data['population_data'].values()):
-                if pop_data.population_2024 == current_pop_data.population_2024:
-                    pop_city_index = i
-                    break
+        for i, pop_data in enumerate(self.data['population_data'].values()):
+            if pop_data.population_2024 == current_pop_data.population_2024:
+                pop_city_index = i
+                break
         
         if pop_city_index >= 0 and pop_city_index < len(safe_normalized_pop):
-            metrics.population_exposure = safe_normalized_pop[pop_city_index]
-        else:
-            metrics.population_exposure = 0.05  # Floor instead of 0.0        # GDP exposure (E_gdp) - total GDP at risk (population × GDP_per_capita × exposed_share)
-        # FIX: Now uses exposed GDP instead of total GDP
-        exposed_gdp = population_data.population_2024 * population_data.gdp_per_capita_usd * built_area_fraction
+            return safe_normalized_pop[pop_city_index]
+        return 0.05  # Floor instead of 0.0
+    
+    def _calculate_gdp_exposure(self, city: str) -> float:
+        """GDP exposure (E_gdp): percentile rank of the exposed GDP"""
+        current_pop_data = self.data['population_data'].get(city)
+        if not current_pop_data:
+            return 0.0
         
+        # FIX: Now uses exposed GDP instead of total GDP
         if 'exposed_gdp' not in self.data['cache']:
             # Initialize exposed_gdp cache if not present
             exposed_gdps = []
             for pop_data in self.data['population_data'].values():
                 if pop_data.population_2024 and pop_data.gdp_per_capita_usd:
-                    # Get built area fraction for this city based on population
-                    if pop_data.population_2024 > 1000000:  # Large cities
-                        city_built_fraction = 0.7
-                    elif pop_data.population_2024 > 300000:  # Medium cities  
-                        city_built_fraction = 0.5
-                    else:  # Small cities
-                        city_built_fraction = 0.3
-                    
-                    exposed_gdp_city = pop_data.population_2024 * pop_data.gdp_per_capita_usd * city_built_fraction
-                    exposed_gdps.append(exposed_gdp_city)
+                    city_built_fraction = self._built_area_fraction(pop_data.population_2024)
+                    exposed_gdps.append(pop_data.population_2024 * pop_data.gdp_per_capita_usd * city_built_fraction)
             self.data['cache']['exposed_gdp'] = exposed_gdps
         
         # FIX: Use safe_percentile_norm instead of winsorized_pct_norm
@@ -1102,23 +1168,15 @@ class IPCCRiskAssessmentService:
         
         # Get the index for current city by matching population data
         city_index = -1
-        current_pop_data = self.data['population_data'].get(city)
-        if current_pop_data:
-            for i, pop_data in enumerate(self.data['population_data'].values()):
-                if (pop_data.population_2024 == current_pop_data.population_2024 and 
-                    pop_data.gdp_per_capita_usd == current_pop_data.gdp_per_capita_usd):
-                    city_index = i
-                    break
+        for i, pop_data in enumerate(self.data['population_data'].values()):
+            if (pop_data.population_2024 == current_pop_data.population_2024 and 
+                pop_data.gdp_per_capita_usd == current_pop_data.gdp_per_capita_usd):
+                city_index = i
+                break
         
         if city_index >= 0 and city_index < len(safe_normalized):
-            metrics.gdp_exposure = safe_normalized[city_index]
-        else:
-            metrics.gdp_exposure = 0.5  # Fallback
-        
-        # VIIRS exposure (E_viirs) - urban radiance
-        metrics.viirs_exposure = self._calculate_viirs_exposure(city)
-        
-        return metrics
+            return safe_normalized[city_index]
+        return 0.5  # Fallback
     
     def _calculate_vulnerability_components(self, city: str, metrics: ClimateRiskMetrics) -> ClimateRiskMetrics:
         """Calculate individual vulnerability components using IPCC AR6 framework"""
@@ -1127,11 +1185,7 @@ class IPCCRiskAssessmentService:
             return metrics
         
         # Income vulnerability (V_income_inv) - inverted GDP per capita
-        metrics.income_vulnerability = self.data_loader.pct_norm(
-            self.data['cache']['gdp'], 
-            population_data.gdp_per_capita_usd, 
-            invert=True
-        )
+        metrics.income_vulnerability = self._calculate_income_vulnerability(city)
         
         # Vegetation access vulnerability (V_veg_access)
         metrics.veg_access_vulnerability = self._calculate_veg_access_vulnerability(city)
@@ -1145,56 +1199,58 @@ class IPCCRiskAssessmentService:
         # Water scarcity vulnerability (V_water_scarcity)
         metrics.water_scarcity_vulnerability = self._calculate_water_scarcity_vulnerability(city)
         
-        # Air pollution vulnerability (V_air_pollution) - based on PM2.5 levels or air quality hazard
-        metrics.air_pollution_vulnerability = 0.0
-        if city in self.data['air_quality_data']:
-            air_data = self.data['air_quality_data'][city]
-            if 'pm25' in air_data:
-                pm25_level = air_data['pm25']
-                # Higher PM2.5 levels = higher vulnerability
-                metrics.air_pollution_vulnerability = min(1.0, pm25_level / 35.0)  # 35 µg/m³ as threshold for high risk
-            else:
-                # Use air quality hazard as proxy for air pollution vulnerability
-                air_hazard = self._calculate_air_quality_hazard(city)
-                # Calculate air pollution vulnerability based on population density and built area
+        # Air pollution vulnerability (V_air_pollution)
+        metrics.air_pollution_vulnerability = self._calculate_air_pollution_vulnerability(city)
+        
+        return metrics
+    
+    def _calculate_income_vulnerability(self, city: str) -> float:
+        """Income vulnerability (V_income_inv) - inverted GDP per capita"""
         population_data = self.data['population_data'].get(city)
-        if population_data:
-            density = population_data.density_per_km2
-            # Base vulnerability on density
-            if density >= 10000:
-                base_vuln = 0.9
-            elif density >= 5000:
-                base_vuln = 0.7
-            elif density >= 2000:
-                base_vuln = 0.5
-            elif density >= 1000:
-                base_vuln = 0.4
-            else:
-                base_vuln = 0.3
-            
-            # Adjust for built environment
-            for lulc_city in self.data['lulc_data']:
-                if lulc_city.get('city') == city:
-                    areas = lulc_city.get('areas_m2', {})
-                    if areas:
-                        latest_year = max(areas.keys(), key=lambda x: int(x))
-                        built_pct = areas[latest_year].get('Built_Area', {}).get('percentage', 30)
-                        if built_pct >= 60:
-                            built_modifier = 0.15
-                        elif built_pct >= 40:
-                            built_modifier = 0.1
-                        elif built_pct >= 25:
-                            built_modifier = 0.0
-                        else:
-                            built_modifier = -0.1
-                        metrics.air_pollution_vulnerability = min(1.0, max(0.1, base_vuln + built_modifier))
-                        break
-            else:
-                metrics.air_pollution_vulnerability = base_vuln
+        if not population_data:
+            return 0.0
+        return self.data_loader.pct_norm(
+            self.data['cache']['gdp'], 
+            population_data.gdp_per_capita_usd, 
+            invert=True
+        )
+    
+    def _calculate_air_pollution_vulnerability(self, city: str) -> float:
+        """Air pollution vulnerability from population density and built environment"""
+        population_data = self.data['population_data'].get(city)
+        if not population_data:
+            return 0.5
+        
+        density = population_data.density_per_km2
+        # Base vulnerability on density
+        if density >= 10000:
+            base_vuln = 0.9
+        elif density >= 5000:
+            base_vuln = 0.7
+        elif density >= 2000:
+            base_vuln = 0.5
+        elif density >= 1000:
+            base_vuln = 0.4
         else:
-            metrics.air_pollution_vulnerability = 0.5
+            base_vuln = 0.3
         
-        return metrics
+        # Adjust for built environment
+        for lulc_city in self.data['lulc_data']:
+            if lulc_city.get('city') == city:
+                areas = lulc_city.get('areas_m2', {})
+                if areas:
+                    latest_year = max(areas.keys(), key=lambda x: int(x))
+                    built_pct = areas[latest_year].get('Built_Area', {}).get('percentage', 30)
+                    if built_pct >= 60:
+                        built_modifier = 0.15
+                    elif built_pct >= 40:
+                        built_modifier = 0.1
+                    elif built_pct >= 25:
+                        built_modifier = 0.0
+                    else:
+                        built_modifier = -0.1
+                    return min(1.0, max(0.1, base_vuln + built_modifier))
+        return base_vuln
     
     def _calculate_adaptive_capacity_components(self, city: str, metrics: ClimateRiskMetrics) -> ClimateRiskMetrics:
         """Calculate individual adaptive capacity components using IPCC AR6 framework"""
@@ -1203,10 +1259,7 @@ class IPCCRiskAssessmentService:
             return metrics
         
         # GDP per capita adaptive capacity (AC_gdp_pc)
-        metrics.gdp_adaptive_capacity = self.data_loader.winsorized_pct_norm(
-            self.data['cache']['gdp'], 
-            population_data.gdp_per_capita_usd
-        )
+        metrics.gdp_adaptive_capacity = self._calculate_gdp_adaptive_capacity(city)
         
         # Greenspace adaptive capacity (AC_greenspace)
         metrics.greenspace_adaptive_capacity = self._calculate_greenspace_adaptive_capacity(city)
@@ -1219,6 +1272,16 @@ class IPCCRiskAssessmentService:
         
         return metrics
         
+    def _calculate_gdp_adaptive_capacity(self, city: str) -> float:
+        """GDP per capita adaptive capacity (AC_gdp_pc)"""
+        population_data = self.data['population_data'].get(city)
+        if not population_data:
+            return 0.0
+        return self.data_loader.winsorized_pct_norm(
+            self.data['cache']['gdp'], 
+            population_data.gdp_per_capita_usd
+        )
+    
     def _calculate_air_quality_adaptive_capacity(self, city: str) -> float:
         """Calculate air quality management adaptive capacity"""
         population_data = self.data['population_data'].get(city)
@@ -1309,12 +1372,9 @@ class IPCCRiskAssessmentService:
                     suhi_values = [self.data['suhi_data'][city][str(y)]['stats'].get('suhi_night', 0) for y in years]
                     temp_values = [self.data['suhi_data'][city][str(y)]['stats'].get('night_urban_mean', 0) for y in years]
                     
-                    try:
-                        metrics.suhi_trend = np.polyfit(years, suhi_values, 1)[0]
-                        metrics.temperature_trend = np.polyfit(years, temp_values, 1)[0]
-                    except:
-                        metrics.suhi_trend = 0.0
-                        metrics.temperature_trend = 0.0
+                    fits = trends_for_series({'suhi': (years, suhi_values), 'temperature': (years, temp_values)})
+                    metrics.suhi_trend = fits['suhi']['ols_slope'] or 0.0
+                    metrics.temperature_trend = fits['temperature']['ols_slope'] or 0.0
         
         # LULC data - populate built area percentage
         for lulc_city in self.data['lulc_data']:
@@ -1436,6 +1496,29 @@ class IPCCRiskAssessmentService:
         return metrics
     
     # Individual hazard calculation methods
+    @staticmethod
+    def _heat_indicator(year_data: Dict) -> float:
+        """Composite heat indicator for one year of temperature statistics"""
+        summer_data = year_data.get('summer_season_summary', {})
+        urban_day = summer_data.get('urban', {}).get('day', {})
+        rural_day = summer_data.get('rural', {}).get('day', {})
+        
+        # Calculate SUHI intensity
+        urban_temp = urban_day.get('mean', 30)
+        rural_temp = rural_day.get('mean', 30)
+        current_suhi = urban_temp - rural_temp
+        
+        # Get summer max temperature
+        summer_max = urban_day.get('max', 35)
+        
+        # Calculate temperature trend (simplified)
+        temp_trend = max(0, summer_max - 35) * 0.1
+        
+        # Composite heat indicator
+        return (current_suhi * 0.5 + 
+                temp_trend * 0.3 + 
+                (summer_max - 35) * 0.2)
+    
     def _calculate_heat_hazard(self, city: str) -> float:
         """Calculate heat hazard with relative temperature scaling (FIXED)"""
         
@@ -1445,68 +1528,11 @@ class IPCCRiskAssessmentService:
         
         for city_name in list(self.data['population_data'].keys()):
             temp_data = self.data['temperature_data'].get(city_name, {})
-            if temp_data:
-                # Get latest year's data from nested structure
-                latest_year = max(temp_data.keys()) if temp_data else None
-                if latest_year:
-                    year_data = temp_data[latest_year]
-                    summer_data = year_data.get('summer_season_summary', {})
-                    urban_data = summer_data.get('urban', {})
-                    rural_data = summer_data.get('rural', {})
-                    
-                    urban_day = urban_data.get('day', {})
-                    rural_day = rural_data.get('day', {})
-                    
-                    # Calculate SUHI intensity
-                    urban_temp = urban_day.get('mean', 30)
-                    rural_temp = rural_day.get('mean', 30)
-                    current_suhi = urban_temp - rural_temp
-                    
-                    # Get summer max temperature
-                    summer_max = urban_day.get('max', 35)
-                    
-                    # Calculate temperature trend (simplified)
-                    temp_trend = max(0, summer_max - 35) * 0.1
-                    
-                    # Composite heat indicator
-                    heat_indicator = (current_suhi * 0.5 + 
-                                    temp_trend * 0.3 + 
-                                    (summer_max - 35) * 0.2)
-                    
-                    all_temp_values.append(heat_indicator)
-                else:
-                    all_temp_values.append(0)
-            else:
-                all_temp_values.append(0)
+            # Get latest year's data from nested structure
+            latest_year = max(temp_data.keys()) if temp_data else None
+            all_temp_values.append(self._heat_indicator(temp_data[latest_year]) if latest_year else 0)
             all_city_names.append(city_name)
         
-        # Get current city's value
-        current_temp_data = self.data['temperature_data'].get(city, {})
-        if current_temp_data:
-            latest_year = max(current_temp_data.keys()) if current_temp_data else None
-            if latest_year:
-                year_data = current_temp_data[latest_year]
-                summer_data = year_data.get('summer_season_summary', {})
-                urban_data = summer_data.get('urban', {})
-                rural_data = summer_data.get('rural', {})
-                
-                urban_day = urban_data.get('day', {})
-                rural_day = rural_data.get('day', {})
-                
-                urban_temp = urban_day.get('mean', 30)
-                rural_temp = rural_day.get('mean', 30)
-                current_suhi = urban_temp - rural_temp
-                summer_max = urban_day.get('max', 35)
-                temp_trend = max(0, summer_max - 35) * 0.1
-                
-                current_heat = (current_suhi * 0.5 + 
-                              temp_trend * 0.3 + 
-                              (summer_max - 35) * 0.2)
-            else:
-                current_heat = 0
-        else:
-            current_heat = 0
-        
         # Apply safe percentile normalization to prevent max-pegging
         normalized_heat = self.data_loader.safe_percentile_norm(
             all_temp_values, floor=0.05, ceiling=0.95
@@ -1577,14 +1603,11 @@ class IPCCRiskAssessmentService:
                                 veg_trends.append(total_veg)
                             
                             if len(veg_trends) >= 3:
-                                try:
-                                    veg_trend = np.polyfit(range(len(veg_trends)), veg_trends, 1)[0]
-                                    # Negative trend = higher dry hazard
-                                    if veg_trend < 0:
-                                        trend_penalty = min(0.3, abs(veg_trend) * 0.1)
-                                        dry_score = min(1.0, dry_score + trend_penalty)
-                                except:
-                                    pass
+                                veg_trend = series_trend(range(len(veg_trends)), veg_trends)['ols_slope']
+                                # Negative trend = higher dry hazard
+                                if veg_trend is not None and veg_trend < 0:
+                                    trend_penalty = min(0.3, abs(veg_trend) * 0.1)
+                                    dry_score = min(1.0, dry_score + trend_penalty)
                 break
         
         return dry_score
@@ -1821,12 +1844,14 @@ class IPCCRiskAssessmentService:
             return normalized_viirs[city_index]
         else:
             return 0.5
-    def _calculate_veg_access_vulnerability(self, city: str) -> float:
-        """Calculate vegetation access vulnerability"""
+    def _calculate_veg_access_vulnerability(self, city: str, year: Optional[str] = None) -> float:
+        """Calculate vegetation access vulnerability (latest year unless ``year`` is given)"""
         veg_vuln = 0.0
         spatial_city_data = self.data['spatial_data'].get('per_year', {}).get(city, {})
         if spatial_city_data:
             years = sorted([int(y) for y in spatial_city_data.keys()])
+            if year is not None:
+                years = [int(year)] if str(year) in spatial_city_data else []
             if years:
                 latest_year = str(years[-1])
                 veg_distance_m = spatial_city_data[latest_year].get('vegetation_accessibility', {}).get('city', {}).get('mean', 1000)
@@ -1859,19 +1884,15 @@ class IPCCRiskAssessmentService:
     def _calculate_bio_trend_vulnerability(self, city: str) -> float:
         """Calculate bio trend vulnerability with missing data imputation (FIXED)"""
         
-        # Collect vegetation trend data for all cities
-        all_bio_trends = []
-        all_city_names = []
-        raw_values = []
+        # Collect vegetation percentage series for all cities, then fit them in one batch
+        all_city_names = list(self.data['population_data'].keys())
+        lulc_by_city = {}
+        for lulc_city in self.data['lulc_data']:
+            lulc_by_city.setdefault(lulc_city.get('city'), lulc_city)
+        veg_series = {}
         
-        for city_name in list(self.data['population_data'].keys()):
-            # Find LULC data for this city to calculate vegetation trend
-            lulc_city_data = None
-            for lulc_city in self.data['lulc_data']:
-                if lulc_city.get('city') == city_name:
-                    lulc_city_data = lulc_city
-                    break
-            
+        for city_name in all_city_names:
+            lulc_city_data = lulc_by_city.get(city_name)
             if lulc_city_data:
                 areas = lulc_city_data.get('areas_m2', {})
                 if areas and len(areas) >= 2:  # Need at least 2 years for trend
@@ -1885,26 +1906,17 @@ class IPCCRiskAssessmentService:
                                    year_data.get('Crops', {}).get('percentage', 0) +
                                    year_data.get('Grass', {}).get('percentage', 0))
                         veg_percentages.append(total_veg)
-                    
-                    # Calculate trend
-                    if len(veg_percentages) >= 2:
-                        try:
-                            import numpy as np
-                            veg_trend = np.polyfit(years, veg_percentages, 1)[0]
-                            
-                            # Convert trend to vulnerability (negative trend = higher vulnerability)
-                            bio_vulnerability = max(0, -veg_trend * 10)  # Scale negative trend to positive vulnerability
-                            raw_values.append(bio_vulnerability)
-                        except:
-                            raw_values.append(None)  # Mark as missing
-                    else:
-                        raw_values.append(None)  # Mark as missing
-                else:
-                    raw_values.append(None)  # Mark as missing
-            else:
+                    veg_series[city_name] = (years, veg_percentages)
+        
+        veg_fits = trends_for_series(veg_series)
+        raw_values = []
+        for city_name in all_city_names:
+            veg_trend = veg_fits.get(city_name, {}).get('ols_slope')
+            if veg_trend is None:
                 raw_values.append(None)  # Mark as missing
-            
-            all_city_names.append(city_name)
+            else:
+                # Convert trend to vulnerability (negative trend = higher vulnerability)
+                raw_values.append(max(0, -veg_trend * 10))  # Scale negative trend to positive vulnerability
         
         # Impute missing values with median of valid values
         valid_values = [v for v in raw_values if v is not None]
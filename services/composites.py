@@ -0,0 +1,226 @@
+"""Country-wide composite registry shared by the nightlight, temperature and air quality units.
+
+The per-city units build the same global composites once per city (a VIIRS
+median per city-year, an LST median per zone, a Sentinel-5P mean per
+city-month). The registry instead builds every dataset's yearly, seasonal and
+monthly composite once over the national extent and memoizes it. Many periods
+are stacked as bands of one image, and every city's urban-core / rural-ring
+zones are reduced from that stack by a single `reduceRegions` call per page of
+features. This scales to 100+ cities.
+
+Periods are strings: ``'2020'`` (calendar year), ``'2020-07'`` (month) or
+``'2020-summer'`` (a season within that calendar year, see SEASONS).
+`CompositeRegistry.download_national` optionally saves a coarse national
+GeoTIFF of a composite for local reuse.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
+import threading
+
+import ee
+
+from .utils import UZBEKISTAN_CITIES, DATASETS, ANALYSIS_CONFIG, GEE_CONFIG, create_analysis_zones, rate_limiter
+
+COMPOSITE_CONFIG = {
+    "extent": [55.9, 37.1, 73.2, 45.6],   # Uzbekistan bounding box (W, S, E, N)
+    "tile_scale": GEE_CONFIG.get("tile_scale", 4),
+    "max_features_per_request": 300,      # zone features per reduceRegions page
+    "national_dir": Path(__file__).parent.parent / "suhi_analysis_output" / "data" / "national_composites",
+    "national_scale": 2000,               # metres per pixel of downloaded national copies
+}
+
+# Seasons as in `AirQualityAnalyzer._calculate_batched_seasonal_stats` (months of the same calendar year)
+SEASONS = {
+    'winter': (12, 1, 2),
+    'spring': (3, 4, 5),
+    'summer': (6, 7, 8),
+    'autumn': (9, 10, 11),
+}
+
+
+@dataclass(frozen=True)
+class CompositeSpec:
+    """How to composite one dataset: ``prepare`` maps the reduced image to the output bands."""
+    collection: str
+    bands: Tuple[str, ...]
+    reducer: str = 'median'
+    scale: int = 1000
+    select: Optional[Tuple[str, ...]] = None
+    prepare: Optional[Callable[[ee.Image], ee.Image]] = None
+
+
+def _modis_lst_celsius(img: ee.Image) -> ee.Image:
+    """Same scaling and clamping as `temperature.load_modis_lst`."""
+    day = img.select('LST_Day_1km').multiply(0.02).subtract(273.15).rename('LST_Day_MODIS').clamp(-20, 60)
+    night = img.select('LST_Night_1km').multiply(0.02).subtract(273.15).rename('LST_Night_MODIS').clamp(-20, 50)
+    return ee.Image.cat([day, night])
+
+
+def _composite_specs() -> Dict[str, CompositeSpec]:
+    specs = {
+        'viirs': CompositeSpec(DATASETS['viirs_monthly'], ('viirs',), 'median',
+                               ANALYSIS_CONFIG.get('target_resolution_m', 500),
+                               prepare=lambda img: img.select([0]).rename('viirs')),
+        'modis_lst': CompositeSpec(DATASETS['modis_lst'], ('LST_Day_MODIS', 'LST_Night_MODIS'), 'median',
+                                   GEE_CONFIG.get('scale_modis', 1000), select=('LST_Day_1km', 'LST_Night_1km'),
+                                   prepare=_modis_lst_celsius),
+    }
+    from .air_quality import AirQualityAnalyzer
+    for name, cfg in AirQualityAnalyzer().pollutants.items():
+        # Sentinel-5P native footprint; same scale as the per-city air quality reductions
+        specs[f"s5p_{name}"] = CompositeSpec(DATASETS[cfg['dataset']], (cfg['band'],), 'mean', 7500,
+                                             select=(cfg['band'],))
+    return specs
+
+
+def parse_period(period: str) -> Tuple[str, str, Optional[Tuple[int, ...]]]:
+    """``(start, end, months)`` for a period string; ``end`` is exclusive, ``months`` filters seasons."""
+    period = str(period)
+    year, _, rest = period.partition('-')
+    y = int(year)
+    if not rest:
+        return f"{y}-01-01", f"{y + 1}-01-01", None
+    if rest in SEASONS:
+        return f"{y}-01-01", f"{y + 1}-01-01", SEASONS[rest]
+    m = int(rest)
+    end = f"{y}-{m + 1:02d}-01" if m < 12 else f"{y + 1}-01-01"
+    return f"{y}-{m:02d}-01", end, None
+
+
+def season_for_months(months: Iterable[int]) -> Optional[str]:
+    """Season name whose months equal ``months`` (e.g. the configured warm months), else None."""
+    months = tuple(months)
+    return next((name for name, ms in SEASONS.items() if ms == months), None)
+
+
+def zone_features(cities: Iterable[str], erosion_m: int = 100) -> List[ee.Feature]:
+    """Urban-core and rural-ring features (properties ``city``, ``zone``) for every city."""
+    features = []
+    for city in cities:
+        zones = create_analysis_zones(UZBEKISTAN_CITIES[city], erosion_distance=erosion_m)
+        for zone in ('urban_core', 'rural_ring'):
+            features.append(ee.Feature(zones[zone], {'city': city, 'zone': zone}))
+    return features
+
+
+def default_reducer() -> ee.Reducer:
+    return ee.Reducer.mean().combine(ee.Reducer.stdDev(), None, True).combine(ee.Reducer.count(), None, True)
+
+
+class CompositeRegistry:
+    """Builds each (dataset, period) composite once over the national extent and reduces all cities from it."""
+
+    def __init__(self, extent: Optional[List[float]] = None):
+        self.extent = list(extent or COMPOSITE_CONFIG["extent"])
+        self.region = ee.Geometry.Rectangle(self.extent)
+        self.specs = _composite_specs()
+        self._images: Dict[Tuple[str, str], ee.Image] = {}
+        self._sizes: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    # Composites ---------------------------------------------------------------
+    def collection(self, dataset: str, period: str) -> ee.ImageCollection:
+        spec = self.specs[dataset]
+        start, end, months = parse_period(period)
+        col = ee.ImageCollection(spec.collection).filterDate(start, end).filterBounds(self.region)
+        if months:
+            # calendarRange wraps when start > end (winter: Dec, Jan, Feb)
+            col = col.filter(ee.Filter.calendarRange(months[0], months[-1], 'month'))
+        return col.select(list(spec.select)) if spec.select else col
+
+    def composite(self, dataset: str, period: str) -> ee.Image:
+        """National composite of ``dataset`` for ``period`` (built once, then memoized)."""
+        key = (dataset, str(period))
+        with self._lock:
+            if key not in self._images:
+                spec = self.specs[dataset]
+                col = self.collection(dataset, period)
+                img = col.mean() if spec.reducer == 'mean' else col.median()
+                if spec.prepare is not None:
+                    img = spec.prepare(img)
+                self._images[key] = img.clip(self.region)
+            return self._images[key]
+
+    def image_counts(self, dataset: str, periods: Iterable[str]) -> Dict[str, int]:
+        """Input image count per period (one getInfo for all periods not seen before)."""
+        periods = [str(p) for p in periods]
+        missing = [p for p in periods if (dataset, p) not in self._sizes]
+        if missing:
+            rate_limiter.wait()
+            sizes = ee.List([self.collection(dataset, p).size() for p in missing]).getInfo()
+            with self._lock:
+                self._sizes.update({(dataset, p): int(n) for p, n in zip(missing, sizes)})
+        return {p: self._sizes[(dataset, p)] for p in periods}
+
+    def stack(self, dataset: str, periods: Iterable[str]) -> Tuple[Optional[ee.Image], List[Tuple[str, str]]]:
+        """One band ``c<j>`` per (period, band) with data; returns (image, [(period, band), ...])."""
+        counts = self.image_counts(dataset, periods)
+        layers = [(p, b) for p, n in counts.items() if n > 0 for b in self.specs[dataset].bands]
+        if not layers:
+            return None, []
+        # Indexed names keep reducer outputs (``c<j>_<stat>``) unambiguous across periods
+        return ee.Image.cat([self.composite(dataset, p).select([b], [f"c{j}"])
+                             for j, (p, b) in enumerate(layers)]), layers
+
+    # Zonal reduction ------------------------------------------------------------
+    def reduce(self, dataset: str, periods: Iterable[str], cities: Optional[List[str]] = None,
+               reducer: Optional[ee.Reducer] = None, scale: Optional[int] = None,
+               erosion_m: int = 100) -> Dict[str, Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]]:
+        """``{city: {period: {zone: {band: {stat: value}}}}}`` for all cities' zones.
+
+        Stats are the reducer output names (``mean``, ``stdDev``, ``count`` by
+        default). Periods without input images are left out.
+        """
+        cities = list(cities or UZBEKISTAN_CITIES)
+        image, layers = self.stack(dataset, periods)
+        out: Dict[str, Dict[str, Any]] = {c: {} for c in cities}
+        if image is None:
+            return out
+        spec = self.specs[dataset]
+        single = len(layers) == 1
+        features = zone_features(cities, erosion_m)
+        page = COMPOSITE_CONFIG["max_features_per_request"]
+        for i in range(0, len(features), page):
+            rate_limiter.wait()
+            info = image.reduceRegions(collection=ee.FeatureCollection(features[i:i + page]),
+                                       reducer=reducer or default_reducer(), scale=scale or spec.scale,
+                                       tileScale=COMPOSITE_CONFIG["tile_scale"]).getInfo()
+            for feature in info.get('features', []):
+                props = feature.get('properties', {})
+                city, zone = props.pop('city', None), props.pop('zone', None)
+                if city not in out:
+                    continue
+                for j, (period, band) in enumerate(layers):
+                    # Single-band images give unprefixed reducer outputs
+                    prefix = '' if single else f"c{j}_"
+                    stats = {k[len(prefix):]: v for k, v in props.items() if k.startswith(prefix)}
+                    out[city].setdefault(period, {}).setdefault(zone, {})[band] = stats
+        return out
+
+    # Local copies -----------------------------------------------------------------
+    def national_path(self, dataset: str, period: str, scale: Optional[int] = None) -> Path:
+        scale = int(scale or COMPOSITE_CONFIG["national_scale"])
+        return Path(COMPOSITE_CONFIG["national_dir"]) / f"{dataset}_{period}_{scale}m.tif"
+
+    def download_national(self, dataset: str, period: str, scale: Optional[int] = None,
+                          overwrite: bool = False) -> Optional[Path]:
+        """Coarse national GeoTIFF of a composite; an existing local copy is reused."""
+        path = self.national_path(dataset, period, scale)
+        if path.exists() and not overwrite:
+            return path
+        from .nightlight import download_viirs_geotiff
+        w, s, e, n = self.extent
+        ring = [[[w, s], [e, s], [e, n], [w, n], [w, s]]]
+        return download_viirs_geotiff(self.composite(dataset, period).toFloat(), ring,
+                                      int(scale or COMPOSITE_CONFIG["national_scale"]), path.parent, path.stem)
+
+
+_REGISTRY: Optional[CompositeRegistry] = None
+
+
+def get_registry() -> CompositeRegistry:
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = CompositeRegistry()
+    return _REGISTRY
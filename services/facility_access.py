@@ -0,0 +1,209 @@
+"""Facility accessibility surfaces for the social sector unit.
+
+Builds distance-to-nearest-facility grids (hospitals, schools, kindergardens)
+over each city at 100–250 m cells. Facility coordinates are indexed once in a
+KD-tree on unit-sphere (ECEF) vectors, so chord lengths convert exactly to
+great-circle distances at any extent; grid cells are queried in fixed-size
+chunks. City runs return coverage fractions and distance percentiles;
+`national_accessibility` streams row bands through a fixed-bin histogram so a
+country-wide grid (millions of cells) runs in bounded memory.
+"""
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .utils import UZBEKISTAN_CITIES
+from . import raster_io
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = 111320.0
+
+FACILITY_TYPES = ('hospitals', 'schools', 'kindergardens')
+
+# Walking/short-drive service radii used for coverage fractions
+COVERAGE_THRESHOLDS_M = {
+    'hospitals': (1000, 2000, 5000),
+    'schools': (500, 1000, 2000),
+    'kindergardens': (500, 1000, 2000),
+}
+DISTANCE_PERCENTILES = (10, 25, 50, 75, 90, 95)
+
+# Approximate national extent (lon_min, lat_min, lon_max, lat_max)
+UZBEKISTAN_BOUNDS = (55.9, 37.1, 73.2, 45.6)
+
+QUERY_CHUNK = 1_000_000
+HIST_BIN_M = 25.0
+HIST_MAX_M = 200_000.0
+
+
+def _to_unit_xyz(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    lon_r = np.radians(np.asarray(lon, dtype=float))
+    lat_r = np.radians(np.asarray(lat, dtype=float))
+    cos_lat = np.cos(lat_r)
+    return np.column_stack((cos_lat * np.cos(lon_r), cos_lat * np.sin(lon_r), np.sin(lat_r)))
+
+
+def load_facility_points(external_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Extract (lon, lat) arrays per facility type from ``social_sector.load_external_data`` output."""
+    compiled = external_data.get('facility_points')
+    if compiled is not None:
+        return {t: np.asarray(compiled[t], dtype=float).reshape(-1, 2) for t in FACILITY_TYPES}
+
+    points: Dict[str, List[Tuple[float, float]]] = {t: [] for t in FACILITY_TYPES}
+
+    for feature in external_data.get('schools', {}).get('features', []):
+        geom = feature.get('geometry')
+        if geom and geom.get('type') == 'Point':
+            coords = geom.get('coordinates', [])
+            if len(coords) >= 2 and coords[0] and coords[1]:
+                points['schools'].append((coords[0], coords[1]))
+
+    for key, ftype in (('hospitals', 'hospitals'), ('kindergardens_gov', 'kindergardens'),
+                       ('kindergardens_private', 'kindergardens')):
+        for item in external_data.get(key, []):
+            lat, lon = item.get('lat'), item.get('long')
+            if lat and lon:
+                points[ftype].append((float(lon), float(lat)))
+
+    return {t: np.asarray(v, dtype=float).reshape(-1, 2) for t, v in points.items()}
+
+
+class FacilityIndex:
+    """KD-tree over facility locations answering chunked nearest-distance queries."""
+
+    def __init__(self, lonlat: np.ndarray):
+        self.count = int(len(lonlat))
+        self.tree = cKDTree(_to_unit_xyz(lonlat[:, 0], lonlat[:, 1])) if self.count else None
+
+    def nearest_m(self, lon: np.ndarray, lat: np.ndarray, chunk_size: int = QUERY_CHUNK) -> np.ndarray:
+        """Great-circle distance (m) from each point to its nearest facility (inf when none exist)."""
+        lon = np.asarray(lon, dtype=float).ravel()
+        lat = np.asarray(lat, dtype=float).ravel()
+        out = np.full(lon.size, np.inf, dtype=np.float32)
+        if self.tree is None:
+            return out
+        for i in range(0, lon.size, chunk_size):
+            chord, _ = self.tree.query(_to_unit_xyz(lon[i:i + chunk_size], lat[i:i + chunk_size]), k=1, workers=-1)
+            out[i:i + chunk_size] = 2.0 * EARTH_RADIUS_M * np.arcsin(np.minimum(chord / 2.0, 1.0))
+        return out
+
+
+def build_facility_indices(external_data: Dict[str, Any]) -> Dict[str, FacilityIndex]:
+    return {t: FacilityIndex(pts) for t, pts in load_facility_points(external_data).items()}
+
+
+def _grid_axes(bounds: Tuple[float, float, float, float], cell_m: float) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """Cell-centre lon/lat axes for a regular lat/lon grid of roughly ``cell_m`` cells."""
+    lon_min, lat_min, lon_max, lat_max = bounds
+    dlat = cell_m / METERS_PER_DEGREE
+    dlon = cell_m / (METERS_PER_DEGREE * np.cos(np.radians((lat_min + lat_max) / 2.0)))
+    lons = np.arange(lon_min + dlon / 2.0, lon_max, dlon)
+    lats = np.arange(lat_max - dlat / 2.0, lat_min, -dlat)  # north-up rows
+    return lons, lats, dlon, dlat
+
+
+def city_grid(city: str, cell_m: float = 200.0):
+    """Regular lat/lon grid over the city's buffer with a mask of cells inside it."""
+    info = UZBEKISTAN_CITIES[city]
+    r_deg_lat = info['buffer_m'] / METERS_PER_DEGREE
+    r_deg_lon = info['buffer_m'] / (METERS_PER_DEGREE * np.cos(np.radians(info['lat'])))
+    bounds = (info['lon'] - r_deg_lon, info['lat'] - r_deg_lat, info['lon'] + r_deg_lon, info['lat'] + r_deg_lat)
+    lons, lats, dlon, dlat = _grid_axes(bounds, cell_m)
+    lon2d, lat2d = np.meshgrid(lons, lats)
+    dx = (lon2d - info['lon']) * METERS_PER_DEGREE * np.cos(np.radians(info['lat']))
+    dy = (lat2d - info['lat']) * METERS_PER_DEGREE
+    inside = (dx ** 2 + dy ** 2) <= info['buffer_m'] ** 2
+    return lon2d, lat2d, inside, (lons[0] - dlon / 2.0, lats[0] + dlat / 2.0, dlon, dlat)
+
+
+def summarize_distances(distances: np.ndarray, thresholds_m: Iterable[float]) -> Dict[str, Any]:
+    d = distances[np.isfinite(distances)]
+    if d.size == 0:
+        return {'cells': int(distances.size), 'coverage': {}, 'percentiles_m': {}, 'mean_m': None, 'max_m': None}
+    return {
+        'cells': int(distances.size),
+        'coverage': {f'within_{int(t)}m': float(np.mean(distances <= t)) for t in thresholds_m},
+        'percentiles_m': {f'p{p}': float(v) for p, v in zip(DISTANCE_PERCENTILES, np.percentile(d, DISTANCE_PERCENTILES))},
+        'mean_m': float(d.mean()),
+        'max_m': float(d.max()),
+    }
+
+
+def _write_distance_raster(path: Path, grid: np.ndarray, origin: Tuple[float, float, float, float]) -> Optional[Path]:
+    if not raster_io.HAS_RASTERIO:
+        return None
+    import rasterio
+    from rasterio.transform import from_origin
+    west, north, dlon, dlat = origin
+    data = np.where(np.isfinite(grid), grid, raster_io.FLOAT_NODATA).astype(np.float32)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with rasterio.open(path, 'w', driver='GTiff', width=data.shape[1], height=data.shape[0], count=1,
+                       dtype='float32', crs='EPSG:4326', transform=from_origin(west, north, dlon, dlat),
+                       nodata=raster_io.FLOAT_NODATA) as dst:
+        dst.write(data, 1)
+    return raster_io.to_cog(path, resampling='average')
+
+
+def city_accessibility(city: str, indices: Dict[str, FacilityIndex], cell_m: float = 200.0,
+                       output_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Distance-to-nearest-facility grid for one city with coverage and percentile summaries.
+
+    When ``output_dir`` is given, each facility type's grid is also written as a COG
+    (``{city}_{type}_distance_{cell}m.tif``; cells outside the buffer are nodata).
+    """
+    if city not in UZBEKISTAN_CITIES:
+        return {'error': f'City {city} not found in configuration'}
+    lon2d, lat2d, inside, origin = city_grid(city, cell_m)
+    out: Dict[str, Any] = {'cell_size_m': cell_m, 'grid_shape': list(inside.shape), 'facility_types': {}}
+    for ftype, index in indices.items():
+        dist = np.full(inside.shape, np.nan, dtype=np.float32)
+        dist[inside] = index.nearest_m(lon2d[inside], lat2d[inside])
+        entry = summarize_distances(dist[inside], COVERAGE_THRESHOLDS_M.get(ftype, (1000,)))
+        entry['facilities_indexed'] = index.count
+        if output_dir is not None:
+            tif = _write_distance_raster(Path(output_dir) / f"{city}_{ftype}_distance_{int(cell_m)}m.tif", dist, origin)
+            entry['raster'] = str(tif) if tif else None
+        out['facility_types'][ftype] = entry
+    return out
+
+
+def national_accessibility(indices: Dict[str, FacilityIndex], bounds: Tuple[float, float, float, float] = UZBEKISTAN_BOUNDS,
+                           cell_m: float = 250.0, chunk_size: int = QUERY_CHUNK) -> Dict[str, Any]:
+    """Country-wide coverage/percentiles from row bands of ``chunk_size`` cells (memory stays O(chunk))."""
+    lons, lats, _, _ = _grid_axes(bounds, cell_m)
+    rows_per_band = max(1, chunk_size // max(1, lons.size))
+    edges = np.arange(0.0, HIST_MAX_M + HIST_BIN_M, HIST_BIN_M)
+    hist = {t: np.zeros(edges.size, dtype=np.int64) for t in indices}  # last bin collects > HIST_MAX_M
+    for r0 in range(0, lats.size, rows_per_band):
+        lon2d, lat2d = np.meshgrid(lons, lats[r0:r0 + rows_per_band])
+        for ftype, index in indices.items():
+            d = index.nearest_m(lon2d, lat2d, chunk_size)
+            d = d[np.isfinite(d)]
+            hist[ftype] += np.bincount(np.minimum((d // HIST_BIN_M).astype(np.int64), edges.size - 1),
+                                       minlength=edges.size)
+
+    out: Dict[str, Any] = {'cell_size_m': cell_m, 'cells': int(lons.size * lats.size), 'facility_types': {}}
+    for ftype, h in hist.items():
+        total = h.sum()
+        if total == 0:
+            out['facility_types'][ftype] = {'coverage': {}, 'percentiles_m': {}}
+            continue
+        cdf = np.cumsum(h) / total
+        upper = edges + HIST_BIN_M  # cell distances are <= the bin's upper edge
+        out['facility_types'][ftype] = {
+            'facilities_indexed': indices[ftype].count,
+            'coverage': {f'within_{int(t)}m': float(cdf[min(int(t // HIST_BIN_M) - 1, edges.size - 1)])
+                         for t in COVERAGE_THRESHOLDS_M.get(ftype, (1000,))},
+            'percentiles_m': {f'p{p}': float(upper[np.searchsorted(cdf, p / 100.0)]) for p in DISTANCE_PERCENTILES},
+        }
+    return out
+
+
+def run_batch_accessibility(external_data: Dict[str, Any], cities: Optional[List[str]] = None,
+                            cell_m: float = 200.0, output_dir: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """Build facility indices once and compute accessibility for each city."""
+    indices = build_facility_indices(external_data)
+    return {city: city_accessibility(city, indices, cell_m, output_dir)
+            for city in (cities if cities is not None else list(UZBEKISTAN_CITIES.keys()))}
@@ -0,0 +1,254 @@
+"""Batch static heat-map renderer (city × year atlas).
+
+`visualization.create_professional_heat_map` builds a new cartopy figure for
+every map. It also re-reads and re-projects the Natural Earth features each
+time. The atlas does the expensive parts once instead:
+
+- The LAND/COASTLINE/BORDERS/RIVERS geometries are read once and clipped to
+  the national extent in `prepare_basemap`. The result is cached as a pickle
+  under ``ATLAS_CONFIG["basemap_cache"]``.
+- Each pool worker builds one Agg figure template: a PlateCarree GeoAxes with
+  the basemap, gridlines and a colorbar.
+- Per city, the worker sets the extent and colour limits and draws the static
+  background once.
+- Per year, the worker restores that background, blits only the animated
+  artists (raster, city marker, title), and writes the canvas buffer.
+
+Rasters come either from arrays supplied by the caller (`array_job`) or from
+the local LST cubes (`cube_job`, see `lst_cube`). Colour limits are shared
+across a city's years, so the maps are comparable.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import os
+import pickle
+
+import numpy as np
+
+ATLAS_CONFIG = {
+    "basemap_extent": [55.0, 36.5, 74.0, 46.0],   # Uzbekistan with margin (W, S, E, N)
+    "basemap_scale": '10m',
+    "basemap_cache": Path('suhi_analysis_output') / 'data' / 'basemap',
+    "out_dir": Path('suhi_analysis_output') / 'plots' / 'heat_map_atlas',
+    "figsize": (12, 9),
+    "dpi": 150,
+    "clim_percentiles": (2, 98),
+}
+
+# Layer -> (Natural Earth category, name, add_geometries style); styles as in create_professional_heat_map
+BASEMAP_LAYERS = {
+    'land': ('physical', 'land', dict(facecolor='lightgray', edgecolor='none', alpha=0.5)),
+    'coastline': ('physical', 'coastline', dict(facecolor='none', edgecolor='black', linewidth=0.5)),
+    'borders': ('cultural', 'admin_0_boundary_lines_land', dict(facecolor='none', edgecolor='black', linewidth=0.5)),
+    'rivers': ('physical', 'rivers_lake_centerlines', dict(facecolor='none', edgecolor='lightblue', linewidth=0.5)),
+}
+
+TEMPERATURE_COLORS = ['#2166ac', '#4393c3', '#92c5de', '#d1e5f0',
+                      '#f7f7f7', '#fdbf6f', '#ff7f00', '#e31a1c', '#800026']
+
+
+def temperature_cmap():
+    import matplotlib.colors as mcolors
+    return mcolors.LinearSegmentedColormap.from_list('temperature', TEMPERATURE_COLORS, N=256)
+
+
+def heat_map_extent(city_info: Dict[str, Any]) -> List[float]:
+    """``[west, east, south, north]`` of a city map (``buffer_km`` around the centre, default 10 km)."""
+    lat = city_info.get('lat', 0)
+    lon = city_info.get('lon', 0)
+    buffer_km = city_info.get('buffer_km', 10)
+    lat_buffer = buffer_km / 111  # 1 degree lat ≈ 111 km
+    lon_buffer = buffer_km / (111 * np.cos(np.radians(lat)))
+    return [lon - lon_buffer, lon + lon_buffer, lat - lat_buffer, lat + lat_buffer]
+
+
+# Basemap --------------------------------------------------------------------------
+def _write_atomic(path: Path, write) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def prepare_basemap(extent: Optional[List[float]] = None, scale: Optional[str] = None,
+                    use_cache: bool = True) -> Dict[str, list]:
+    """Natural Earth geometries per BASEMAP_LAYERS entry, clipped to ``extent`` (W, S, E, N)."""
+    extent = list(extent or ATLAS_CONFIG["basemap_extent"])
+    scale = scale or ATLAS_CONFIG["basemap_scale"]
+    cache = Path(ATLAS_CONFIG["basemap_cache"]) / f"basemap_{scale}_{'_'.join(f'{v:g}' for v in extent)}.pkl"
+    if use_cache and cache.exists():
+        try:
+            with open(cache, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Warning: ignoring unreadable basemap cache {cache}: {e}")
+
+    import cartopy.io.shapereader as shpreader
+    from shapely.geometry import box
+    clip = box(*extent)
+    layers: Dict[str, list] = {}
+    for name, (category, ne_name, _) in BASEMAP_LAYERS.items():
+        try:
+            path = shpreader.natural_earth(resolution=scale, category=category, name=ne_name)
+            clipped = (g.intersection(clip) for g in shpreader.Reader(path).geometries() if g.intersects(clip))
+            layers[name] = [g for g in clipped if not g.is_empty]
+        except Exception as e:
+            print(f"Warning: basemap layer {name} unavailable: {e}")
+            layers[name] = []
+
+    if use_cache:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(cache, lambda f: pickle.dump(layers, f, protocol=pickle.HIGHEST_PROTOCOL))
+    return layers
+
+
+# Figure template --------------------------------------------------------------------
+class HeatMapTemplate:
+    """One reusable Agg figure: static basemap/gridlines/colorbar, animated raster/marker/title."""
+
+    def __init__(self, basemap: Dict[str, list], figsize: Tuple[float, float], dpi: int):
+        import cartopy.crs as ccrs
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.proj = ccrs.PlateCarree()
+        self.dpi = dpi
+        self.fig = Figure(figsize=figsize, dpi=dpi, facecolor='white')
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_axes([0.06, 0.05, 0.8, 0.84], projection=self.proj)
+        cax = self.fig.add_axes([0.88, 0.12, 0.022, 0.7])
+        for name, geoms in basemap.items():
+            if geoms:
+                self.ax.add_geometries(geoms, crs=self.proj, **BASEMAP_LAYERS[name][2])
+        self.image = self.ax.imshow(np.zeros((2, 2)), extent=[0, 1, 0, 1], cmap=temperature_cmap(), alpha=0.7,
+                                    transform=self.proj, interpolation='bilinear', animated=True)
+        self.marker, = self.ax.plot([0], [0], marker='*', color='yellow', markersize=15, markeredgecolor='black',
+                                    markeredgewidth=1, transform=self.proj, animated=True)
+        self.title = self.fig.suptitle('', fontsize=16, fontweight='bold', y=0.95, animated=True)
+        self.cbar = self.fig.colorbar(self.image, cax=cax)
+        self.cbar.set_label('Land Surface Temperature (°C)', rotation=270, labelpad=20, fontsize=12)
+        gl = self.ax.gridlines(draw_labels=True, alpha=0.3)
+        gl.top_labels = False
+        gl.right_labels = False
+
+    def render_city(self, job: Dict[str, Any], out_dir: Path) -> List[Dict[str, Any]]:
+        """Draw the city background once, then blit and write one PNG per raster."""
+        from matplotlib.image import imsave
+
+        rasters = [(year, np.asarray(arr, dtype=float), ext) for year, arr, ext in job['rasters']]
+        finite = [a[np.isfinite(a)] for _, a, _ in rasters]
+        finite = np.concatenate(finite) if finite else np.array([])
+        if finite.size == 0:
+            return [{'city': job['city'], 'year': year, 'error': 'no valid pixels'} for year, _, _ in rasters]
+        lo, hi = np.percentile(finite, ATLAS_CONFIG["clim_percentiles"])
+        if hi <= lo:
+            hi = lo + 1.0
+
+        self.ax.set_extent(job['extent'], crs=self.proj)
+        self.image.set_clim(lo, hi)
+        self.cbar.update_normal(self.image)
+        self.marker.set_data([job['lon']], [job['lat']])
+        self.canvas.draw()
+        background = self.canvas.copy_from_bbox(self.fig.bbox)
+
+        results = []
+        for year, arr, ext in rasters:
+            path = Path(out_dir) / f"{job['city']}_{year}_{job.get('label', 'lst')}_heat_map.png"
+            try:
+                self.canvas.restore_region(background)
+                self.image.set_data(np.ma.masked_invalid(arr))
+                self.image.set_extent(ext or job['extent'])
+                self.title.set_text(f"Land Surface Temperature Map - {job['city']} {year}")
+                self.ax.draw_artist(self.image)
+                self.ax.draw_artist(self.marker)
+                self.fig.draw_artist(self.title)
+                imsave(path, np.asarray(self.canvas.buffer_rgba()), dpi=self.dpi)
+                results.append({'city': job['city'], 'year': year, 'path': str(path)})
+            except Exception as e:
+                results.append({'city': job['city'], 'year': year, 'error': str(e)})
+        return results
+
+
+# Jobs -------------------------------------------------------------------------------
+def array_job(city: str, rasters: Dict[int, np.ndarray], city_info: Optional[Dict[str, Any]] = None,
+              extent: Optional[List[float]] = None, label: str = 'lst') -> Dict[str, Any]:
+    """Render job for in-memory rasters ``{year: 2-D array}`` covering ``extent`` (W, E, S, N)."""
+    if city_info is None:
+        from .utils import UZBEKISTAN_CITIES
+        city_info = UZBEKISTAN_CITIES[city]
+    extent = list(extent or heat_map_extent(city_info))
+    return {'city': city, 'lon': city_info['lon'], 'lat': city_info['lat'], 'extent': extent, 'label': label,
+            'rasters': [(year, arr, None) for year, arr in sorted(rasters.items())]}
+
+
+def cube_job(city: str, years: Iterable[int], band: str = 'day', months: Optional[Iterable[int]] = None,
+             root: Optional[str] = None) -> Dict[str, Any]:
+    """Render job read from the city's LST cube; loaded in the worker that renders it."""
+    return {'city': city, 'cube': {'years': list(years), 'band': band,
+                                   'months': list(months) if months is not None else None, 'root': root}}
+
+
+def _load_cube_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    from .lst_cube import LSTCube
+    spec = job['cube']
+    cube = LSTCube(job['city'], Path(spec['root']) if spec['root'] else None)
+    g = cube.grid
+    extent = [g['west'], g['west'] + g['width'] * g['dlon'], g['north'] - g['height'] * g['dlat'], g['north']]
+    rasters = {y: cube.composite(spec['band'], cube.time_mask(months=spec['months'], years=[y]))
+               for y in spec['years']}
+    return array_job(job['city'], rasters, extent=extent, label=f"lst_{spec['band']}")
+
+
+# Worker pool -------------------------------------------------------------------------
+_WORKER_TEMPLATE: Optional[HeatMapTemplate] = None
+
+
+def _init_worker(basemap: Dict[str, list], figsize: Tuple[float, float], dpi: int):
+    global _WORKER_TEMPLATE
+    import matplotlib
+    matplotlib.use('Agg')
+    _WORKER_TEMPLATE = HeatMapTemplate(basemap, figsize, dpi)
+
+
+def _render_job(job: Dict[str, Any], out_dir: str) -> List[Dict[str, Any]]:
+    try:
+        if 'cube' in job:
+            job = _load_cube_job(job)
+        return _WORKER_TEMPLATE.render_city(job, Path(out_dir))
+    except Exception as e:
+        return [{'city': job.get('city'), 'error': str(e)}]
+
+
+def render_heat_maps(jobs: List[Dict[str, Any]], out_dir: Optional[Path] = None,
+                     max_workers: Optional[int] = None, basemap: Optional[Dict[str, list]] = None) -> List[Dict[str, Any]]:
+    """Render every job (one city, many years) across a process pool; returns one record per map."""
+    out_dir = Path(out_dir or ATLAS_CONFIG["out_dir"])
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if basemap is None:
+        basemap = prepare_basemap()
+    max_workers = max_workers if max_workers is not None else max(1, min(len(jobs), (os.cpu_count() or 2) - 1))
+
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(basemap, ATLAS_CONFIG["figsize"], ATLAS_CONFIG["dpi"])) as pool:
+        futures = [pool.submit(_render_job, job, str(out_dir)) for job in jobs]
+        for fut in as_completed(futures):
+            results.extend(fut.result())
+    results.sort(key=lambda r: (str(r.get('city')), r.get('year') or 0))
+    failed = [r for r in results if r.get('error')]
+    print(f"[OK] Heat-map atlas: {len(results) - len(failed)} maps in {out_dir}"
+          + (f" ({len(failed)} failed)" if failed else ""))
+    return results
+
+
+def render_cube_atlas(cities: Iterable[str], years: Iterable[int], band: str = 'day',
+                      months: Optional[Iterable[int]] = None, out_dir: Optional[Path] = None,
+                      max_workers: Optional[int] = None, root: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """All cities × years seasonal LST maps from the local cubes (default months: warm season)."""
+    if months is None:
+        from .utils import ANALYSIS_CONFIG
+        months = ANALYSIS_CONFIG['warm_months']
+    years = list(years)
+    jobs = [cube_job(c, years, band, months, str(root) if root else None) for c in cities]
+    return render_heat_maps(jobs, out_dir, max_workers)
@@ -0,0 +1,220 @@
+"""Hex-grid spatial-unit mode: sub-city indicators and relative risk per cell.
+
+Instead of one urban-core / rural-ring pair per city (`utils.create_analysis_zones`),
+the city buffer is tiled with flat-top hexagons (axial ``q_r`` cell ids, computed
+locally so no H3 dependency is needed). LST, NDVI, VIIRS and built-up fraction
+are reduced per cell with `reduceRegions`, paginated into batches sized from a
+pixel budget so each request stays under EE limits, with batches run
+concurrently and split in half on EE errors. The result is a cell × indicator
+DataFrame that `score_cells` turns into per-cell hazard/exposure/vulnerability
+scores for intra-urban hotspot mapping.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import math
+import time
+
+import ee
+import numpy as np
+import pandas as pd
+
+from .utils import UZBEKISTAN_CITIES, GEE_CONFIG
+from .temperature import load_modis_lst
+from .landsat import city_composite
+from .nightlight import load_viirs_monthly
+from .classification import load_esri_classification
+
+METERS_PER_DEGREE = 111320.0
+
+HEX_CONFIG = {
+    "cell_size_m": 500,               # hexagon circumradius
+    "max_pixels_per_request": 2e7,    # pixel budget per reduceRegions batch
+    "max_cells_per_request": 1000,
+    "max_workers": 6,
+    "tile_scale": GEE_CONFIG.get("tile_scale", 4),
+    "retries": 2,
+}
+
+# Indicator groups reduced together at a common scale: (bands, scale_m)
+INDICATOR_GROUPS = {
+    "lst": (["LST_Day_MODIS", "LST_Night_MODIS"], 1000),
+    "viirs": (["viirs"], 500),
+    "ndvi": (["NDVI"], 30),
+    "built": (["built"], 30),
+}
+
+# Per-cell scoring weights (indicators are min-max scaled between their 10th/90th percentiles)
+HEX_RISK_WEIGHTS = {
+    "hazard": {"LST_Day_MODIS": 0.7, "LST_Night_MODIS": 0.3},
+    "exposure": {"viirs": 0.5, "built": 0.5},
+    "vulnerability": {"NDVI": 1.0},  # low vegetation -> higher vulnerability (inverted)
+}
+_INVERTED = {"NDVI"}
+
+
+def hex_cells(city: str, cell_size_m: float = None) -> pd.DataFrame:
+    """Flat-top hexagons covering the city buffer.
+
+    Returns one row per cell with ``cell_id`` (axial ``q_r``), centroid
+    ``lon``/``lat`` and ``ring`` (closed list of [lon, lat] vertices).
+    """
+    size = float(cell_size_m or HEX_CONFIG["cell_size_m"])
+    info = UZBEKISTAN_CITIES[city]
+    lat0, lon0, radius = info["lat"], info["lon"], info["buffer_m"]
+    m_per_deg_lon = METERS_PER_DEGREE * math.cos(math.radians(lat0))
+
+    # Axial coordinates for flat-top hexes: x = 1.5*size*q, y = sqrt(3)*size*(r + q/2)
+    n = int(math.ceil(radius / (1.5 * size))) + 1
+    q, r = np.meshgrid(np.arange(-n, n + 1), np.arange(-2 * n, 2 * n + 1))
+    q, r = q.ravel(), r.ravel()
+    x = 1.5 * size * q
+    y = math.sqrt(3) * size * (r + q / 2.0)
+    keep = x ** 2 + y ** 2 <= radius ** 2
+    q, r, x, y = q[keep], r[keep], x[keep], y[keep]
+
+    angles = np.radians(np.arange(0, 360, 60))
+    vx = x[:, None] + size * np.cos(angles)[None, :]
+    vy = y[:, None] + size * np.sin(angles)[None, :]
+    vlon = lon0 + vx / m_per_deg_lon
+    vlat = lat0 + vy / METERS_PER_DEGREE
+    rings = [[[float(a), float(b)] for a, b in zip(lo, la)] + [[float(lo[0]), float(la[0])]]
+             for lo, la in zip(vlon, vlat)]
+    return pd.DataFrame({
+        "cell_id": [f"{a}_{b}" for a, b in zip(q, r)],
+        "lon": lon0 + x / m_per_deg_lon,
+        "lat": lat0 + y / METERS_PER_DEGREE,
+        "ring": rings,
+    })
+
+
+def build_indicator_image(city: str, year: int, region: ee.Geometry) -> ee.Image:
+    """Stack the per-cell indicators for ``year`` into one image (missing sources are skipped)."""
+    bands = []
+    lst = load_modis_lst(f"{year}-01-01", f"{year}-12-31", region)
+    if lst is not None:
+        bands.append(lst)
+    bands.append(city_composite(city, year, "summer").select("NDVI"))
+    bands.append(load_viirs_monthly(year, region).select([0]).rename("viirs"))
+    esri = load_esri_classification(year, region)
+    if esri is not None:
+        bands.append(esri.select([0]).eq(7).rename("built"))
+    return ee.Image.cat(bands)
+
+
+def batch_size_for(cell_size_m: float, scale_m: float) -> int:
+    """Cells per reduceRegions request so cells × pixels-per-cell stays under the pixel budget."""
+    cell_area = 1.5 * math.sqrt(3) * cell_size_m ** 2
+    pixels_per_cell = max(1.0, cell_area / float(scale_m) ** 2)
+    return int(max(1, min(HEX_CONFIG["max_cells_per_request"],
+                          HEX_CONFIG["max_pixels_per_request"] // pixels_per_cell)))
+
+
+def _reduce_batch(image: ee.Image, cells: pd.DataFrame, bands: List[str], scale: int) -> Dict[str, Dict[str, Any]]:
+    features = [ee.Feature(ee.Geometry.Polygon([ring]), {"cell_id": cid})
+                for cid, ring in zip(cells["cell_id"], cells["ring"])]
+    reducer = ee.Reducer.mean() if len(bands) > 1 else ee.Reducer.mean().setOutputs(bands)
+    fc = image.select(bands).reduceRegions(collection=ee.FeatureCollection(features), reducer=reducer,
+                                           scale=scale, tileScale=HEX_CONFIG["tile_scale"])
+    info = fc.getInfo()
+    return {f["properties"]["cell_id"]: {b: f["properties"].get(b) for b in bands}
+            for f in info.get("features", [])}
+
+
+def _reduce_with_split(image: ee.Image, cells: pd.DataFrame, bands: List[str], scale: int) -> Dict[str, Dict[str, Any]]:
+    """Reduce one batch, retrying transient errors and halving the batch on persistent ones."""
+    for attempt in range(HEX_CONFIG["retries"] + 1):
+        try:
+            return _reduce_batch(image, cells, bands, scale)
+        except Exception as e:
+            last_error = e
+            if attempt < HEX_CONFIG["retries"]:
+                time.sleep(2 ** attempt)
+    if len(cells) == 1:
+        print(f"Warning: reduceRegions failed for cell {cells['cell_id'].iloc[0]}: {last_error}")
+        return {}
+    mid = len(cells) // 2
+    out = _reduce_with_split(image, cells.iloc[:mid], bands, scale)
+    out.update(_reduce_with_split(image, cells.iloc[mid:], bands, scale))
+    return out
+
+
+def reduce_cells(image: ee.Image, cells: pd.DataFrame, cell_size_m: float,
+                 max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Run every indicator group over all cells in paginated, concurrent reduceRegions batches."""
+    available = set(image.bandNames().getInfo())
+    jobs: List[Tuple[List[str], int, pd.DataFrame]] = []
+    for bands, scale in INDICATOR_GROUPS.values():
+        bands = [b for b in bands if b in available]
+        if not bands:
+            continue
+        step = batch_size_for(cell_size_m, scale)
+        jobs.extend((bands, scale, cells.iloc[i:i + step]) for i in range(0, len(cells), step))
+
+    values: Dict[str, Dict[str, Any]] = {cid: {} for cid in cells["cell_id"]}
+    with ThreadPoolExecutor(max_workers=max_workers or HEX_CONFIG["max_workers"]) as pool:
+        futures = [pool.submit(_reduce_with_split, image, batch, bands, scale) for bands, scale, batch in jobs]
+        for fut in as_completed(futures):
+            for cid, vals in fut.result().items():
+                values.setdefault(cid, {}).update(vals)
+
+    matrix = pd.DataFrame.from_dict(values, orient="index").reindex(cells["cell_id"])
+    return pd.concat([cells.set_index("cell_id")[["lon", "lat"]], matrix.astype(float)], axis=1)
+
+
+def _scaled(col: pd.Series, invert: bool = False) -> pd.Series:
+    a, b = col.quantile(0.1), col.quantile(0.9)
+    if not np.isfinite(a) or a == b:
+        return pd.Series(np.nan, index=col.index)
+    z = (col.clip(a, b) - a) / (b - a)
+    return 1.0 - z if invert else z
+
+
+def score_cells(matrix: pd.DataFrame, weights: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+    """Per-cell hazard, exposure, vulnerability and H×E×V relative risk within the city.
+
+    Component scores are weight-normalized over the indicators present for each cell.
+    """
+    weights = weights or HEX_RISK_WEIGHTS
+    scored = matrix.copy()
+    for component, w in weights.items():
+        cols = [c for c in w if c in matrix.columns]
+        if not cols:
+            scored[f"{component}_score"] = np.nan
+            continue
+        scaled = pd.concat([_scaled(matrix[c], c in _INVERTED) for c in cols], axis=1, keys=cols)
+        wv = pd.Series({c: w[c] for c in cols})
+        present = scaled.notna()
+        scored[f"{component}_score"] = (scaled.fillna(0.0) * wv).sum(axis=1) / present.mul(wv).sum(axis=1).replace(0, np.nan)
+    scored["hev_score"] = scored["hazard_score"] * scored["exposure_score"] * scored["vulnerability_score"]
+    scored["risk_rank"] = scored["hev_score"].rank(ascending=False, method="min")
+    return scored
+
+
+def run_city_hex(city: str, year: int, cell_size_m: float = None, output_dir: Optional[Path] = None,
+                 max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Hex-grid indicators and scores for one city/year; writes a CSV matrix when ``output_dir`` is set."""
+    if city not in UZBEKISTAN_CITIES:
+        return {"city": city, "year": year, "error": "city not found"}
+    size = float(cell_size_m or HEX_CONFIG["cell_size_m"])
+    info = UZBEKISTAN_CITIES[city]
+    region = ee.Geometry.Point([info["lon"], info["lat"]]).buffer(info["buffer_m"] + size)
+
+    t0 = time.time()
+    cells = hex_cells(city, size)
+    image = build_indicator_image(city, year, region)
+    scored = score_cells(reduce_cells(image, cells, size, max_workers))
+    out: Dict[str, Any] = {
+        "city": city, "year": year, "cell_size_m": size, "cells": int(len(cells)),
+        "elapsed_s": round(time.time() - t0, 1),
+        "hotspots": scored.sort_values("risk_rank").head(10).reset_index()
+                          [["cell_id", "lon", "lat", "hev_score"]].to_dict(orient="records"),
+    }
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        csv_path = output_dir / f"{city}_hex_{int(size)}m_{year}.csv"
+        scored.to_csv(csv_path, index_label="cell_id")
+        out["matrix_csv"] = str(csv_path)
+    out["matrix"] = scored
+    return out
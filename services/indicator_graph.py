@@ -0,0 +1,198 @@
+"""
+Dependency-aware lazy indicator graph for the IPCC AR6 risk engine
+Every indicator is a node that declares the datasets it reads and the nodes it
+depends on. A query for a set of targets (components such as ``'hazard'`` or
+single indicators) resolves only the required sub-graph, skips zero-weight
+indicators and memoizes node values per city. With a lazy service
+(``IPCCRiskAssessmentService(loader, lazy=True)``) only the datasets of the
+resolved nodes are ever read from disk.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .assessment_session import COMPONENT_INDICATORS, SOCIAL_ONLY, NON_SOCIAL_ONLY
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """One graph node: ``compute(service, city, get)`` where ``get(name)`` returns a dependency"""
+    name: str
+    compute: Callable[[Any, str, Callable[[str], Any]], Any]
+    datasets: Tuple[str, ...] = ()
+    deps: Tuple[str, ...] = ()
+
+
+# Indicator -> (service method, datasets it reads); 'water_scarcity' and
+# 'social_sector' are read by the service itself, the rest via data_loader
+SERVICE_INDICATORS = {
+    'heat_hazard': ('_calculate_heat_hazard', ('population_data', 'temperature_data')),
+    'dry_hazard': ('_calculate_dry_hazard', ('lulc_data',)),
+    'dust_hazard': ('_calculate_dust_hazard', ('population_data', 'lulc_data', 'spatial_data')),
+    'pluvial_hazard': ('_calculate_pluvial_hazard', ('population_data', 'lulc_data')),
+    'air_quality_hazard': ('_calculate_air_quality_hazard', ('air_quality_data',)),
+    'population_exposure': ('_calculate_population_exposure', ('population_data',)),
+    'gdp_exposure': ('_calculate_gdp_exposure', ('population_data',)),
+    'viirs_exposure': ('_calculate_viirs_exposure', ('population_data', 'nightlights_data')),
+    'income_vulnerability': ('_calculate_income_vulnerability', ('population_data',)),
+    'veg_access_vulnerability': ('_calculate_veg_access_vulnerability', ('spatial_data',)),
+    'fragmentation_vulnerability': ('_calculate_fragmentation_vulnerability', ('population_data', 'spatial_data')),
+    'bio_trend_vulnerability': ('_calculate_bio_trend_vulnerability', ('population_data', 'lulc_data')),
+    'water_scarcity_vulnerability': ('_calculate_water_scarcity_vulnerability', ('water_scarcity',)),
+    'air_pollution_vulnerability': ('_calculate_air_pollution_vulnerability', ('population_data', 'lulc_data')),
+    'gdp_adaptive_capacity': ('_calculate_gdp_adaptive_capacity', ('population_data',)),
+    'greenspace_adaptive_capacity': ('_calculate_greenspace_adaptive_capacity', ('lulc_data', 'spatial_data')),
+    'services_adaptive_capacity': ('_calculate_services_adaptive_capacity', ('population_data',)),
+    'air_quality_adaptive_capacity': ('_calculate_air_quality_adaptive_capacity', ('population_data', 'air_quality_data')),
+}
+
+# Social sector indicators, computed from the city's social summary (the 'social' node)
+SOCIAL_INDICATORS = {
+    'water_access_vulnerability': lambda s, city, social: s._calculate_water_access_vulnerability(social.get('sanitation_indicators', {})),
+    'healthcare_access_vulnerability': lambda s, city, social: s._calculate_healthcare_access_vulnerability(social.get('per_capita_metrics', {})),
+    'education_access_vulnerability': lambda s, city, social: s._calculate_education_access_vulnerability(social.get('per_capita_metrics', {})),
+    'sanitation_vulnerability': lambda s, city, social: s._calculate_sanitation_vulnerability(social.get('sanitation_indicators', {})),
+    'building_age_vulnerability': lambda s, city, social: social.get('infrastructure_quality', {}).get('building_age_vulnerability', 0.0),
+    'social_infrastructure_capacity': lambda s, city, social: s._calculate_social_infrastructure_capacity(social.get('per_capita_metrics', {})),
+    'water_system_capacity': lambda s, city, social: s._calculate_water_system_capacity(city, social.get('sanitation_indicators', {})),
+}
+
+WEIGHT_ATTRS = {
+    'hazard': 'hazard_weights',
+    'exposure': 'exposure_weights',
+    'vulnerability': 'vulnerability_weights',
+    'adaptive_capacity': 'adaptive_capacity_weights',
+}
+
+
+def _clip(x: float) -> float:
+    return min(1.0, max(0.0, x))
+
+
+def _service_node(name: str, method: str, datasets: Tuple[str, ...]) -> IndicatorNode:
+    return IndicatorNode(name, lambda s, city, get: getattr(s, method)(city), datasets)
+
+
+def _social_node(name: str, fn) -> IndicatorNode:
+    datasets = ('population_data',) if name == 'water_system_capacity' else ()
+    # Without social sector data the indicator keeps its dataclass default
+    return IndicatorNode(name, lambda s, city, get: fn(s, city, get('social')) if get('social') else 0.0,
+                         datasets, ('social',))
+
+
+def _base_nodes() -> Dict[str, IndicatorNode]:
+    nodes = {'social': IndicatorNode('social', lambda s, city, get: s._load_social_sector_data(city), ('social_sector',))}
+    for name, (method, datasets) in SERVICE_INDICATORS.items():
+        nodes[name] = _service_node(name, method, datasets)
+    for name, fn in SOCIAL_INDICATORS.items():
+        nodes[name] = _social_node(name, fn)
+    nodes['hev_score'] = IndicatorNode(
+        'hev_score', lambda s, city, get: _clip(get('hazard_score') * get('exposure_score') * get('vulnerability_score')),
+        deps=('hazard_score', 'exposure_score', 'vulnerability_score'))
+    nodes['overall_risk_score'] = IndicatorNode(
+        'overall_risk_score', lambda s, city, get: _clip(
+            get('hazard_score') * get('exposure_score') * get('vulnerability_score') * (1.0 - get('adaptive_capacity_score'))),
+        deps=('hazard_score', 'exposure_score', 'vulnerability_score', 'adaptive_capacity_score'))
+    nodes['hev_adj_score'] = IndicatorNode('hev_adj_score', lambda s, city, get: get('overall_risk_score'),
+                                           deps=('overall_risk_score',))
+    nodes['adaptability_score'] = IndicatorNode(
+        'adaptability_score', lambda s, city, get: _clip(get('adaptive_capacity_score') / (1.0 + get('overall_risk_score') + 1e-6)),
+        deps=('adaptive_capacity_score', 'overall_risk_score'))
+    return nodes
+
+
+class IndicatorGraph:
+    """Resolves, plans and evaluates indicator nodes for an IPCCRiskAssessmentService"""
+
+    def __init__(self, service):
+        self.service = service
+        self.nodes: Dict[str, IndicatorNode] = _base_nodes()
+        self._memo: Dict[Tuple[str, str], Any] = {}
+
+    # Graph structure ---------------------------------------------------------
+    def _active_terms(self, component: str) -> List[Tuple[str, str, float]]:
+        """(weight key, indicator, weight) with non-zero weight for a component"""
+        weights = getattr(self.service, WEIGHT_ATTRS[component])
+        return [(key, indicator, float(weights.get(key, 0.0)))
+                for key, indicator in COMPONENT_INDICATORS[component].items() if weights.get(key, 0.0)]
+
+    def node(self, name: str) -> IndicatorNode:
+        """Node by name; component names ('hazard', ...) map to their composite score"""
+        if name in COMPONENT_INDICATORS:
+            name = f'{name}_score'
+        component = name[:-len('_score')] if name.endswith('_score') else None
+        if component in COMPONENT_INDICATORS:
+            # Composite deps follow the current weights so zero-weight indicators are never computed
+            terms = self._active_terms(component)
+            deps = tuple(indicator for _, indicator, _ in terms)
+            if component in SOCIAL_ONLY or component in NON_SOCIAL_ONLY:
+                deps = ('social',) + deps
+            return IndicatorNode(name, lambda s, city, get, component=component: self._composite(component, city, get),
+                                 deps=deps)
+        if name not in self.nodes:
+            raise KeyError(f"Unknown indicator: {name}")
+        return self.nodes[name]
+
+    def _composite(self, component: str, city: str, get: Callable[[str], Any]) -> float:
+        has_social = bool(get('social')) if component in SOCIAL_ONLY or component in NON_SOCIAL_ONLY else False
+        total = 0.0
+        for key, indicator, weight in self._active_terms(component):
+            if key in SOCIAL_ONLY.get(component, ()) and not has_social:
+                continue
+            if key in NON_SOCIAL_ONLY.get(component, ()) and has_social:
+                continue
+            total += weight * get(indicator)
+        return total
+
+    def resolve(self, targets: Iterable[str]) -> List[str]:
+        """Nodes needed for ``targets`` in dependency order"""
+        order: List[str] = []
+        seen: Set[str] = set()
+
+        def visit(name: str):
+            node = self.node(name)
+            if node.name in seen:
+                return
+            seen.add(node.name)
+            for dep in node.deps:
+                visit(dep)
+            order.append(node.name)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def required_datasets(self, targets: Iterable[str]) -> Set[str]:
+        """Datasets read by the nodes needed for ``targets``"""
+        return {ds for name in self.resolve(targets) for ds in self.node(name).datasets}
+
+    # Evaluation --------------------------------------------------------------
+    def value(self, city: str, name: str) -> Any:
+        """Memoized value of one node for one city"""
+        node = self.node(name)
+        key = (city, node.name)
+        if key not in self._memo:
+            self._memo[key] = node.compute(self.service, city, lambda dep: self.value(city, dep))
+        return self._memo[key]
+
+    def evaluate(self, targets: Iterable[str], cities: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """``{city: {node: value}}`` for the nodes actually computed for ``targets``
+        
+        Social-only (or non-social-only) indicators are evaluated only for the
+        cities whose composite uses them.
+        """
+        targets = list(targets)
+        order = self.resolve(targets)
+        if cities is None:
+            cities = list(self.service.data['population_data'].keys())
+        out = {}
+        for city in cities:
+            for target in targets:
+                self.value(city, target)
+            out[city] = {name: self._memo[(city, name)] for name in order
+                         if name != 'social' and (city, name) in self._memo}
+        return out
+
+    def clear(self) -> None:
+        """Drop memoized values (call after changing weights or data)"""
+        self._memo.clear()
@@ -0,0 +1,131 @@
+"""Cloud-masked Landsat 8/9 surface reflectance composites shared across units.
+
+The vegetation, auxiliary and pipeline units all need median composites of
+the same spectral indices over the same city and season. This module builds
+them one way:
+
+  1. scene-level pre-filtering on each collection before the merge: date
+     window, scene (WRS path/row) footprint intersecting the city geometry,
+     and scene cloud cover below the threshold;
+  2. per-image QA masking (cloud shadow and cloud bits) and SR scaling,
+     computing every index band in the same map;
+  3. one median, then at most one resample to the target scale.
+
+`city_composite` memoizes the result per city × season × year (and cloud
+threshold / scale), so every unit in a process shares one image graph.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+import threading
+
+import ee
+
+from .utils import UZBEKISTAN_CITIES, DATASETS, ANALYSIS_CONFIG, create_analysis_zones
+
+LANDSAT_CONFIG = {
+    "collections": ('landsat8', 'landsat9'),
+    "cloud_property": 'CLOUD_COVER',
+    "native_scale": 30,
+    "crs": 'EPSG:4326',
+    "resample_max_pixels": 1024,    # reduceResolution input pixels per output pixel
+}
+
+SR_BANDS = ['SR_B2', 'SR_B3', 'SR_B4', 'SR_B5', 'SR_B6', 'SR_B7']
+
+# Index name -> band math on the scaled SR image
+INDICES = {
+    'NDVI': lambda sr: sr.normalizedDifference(['SR_B5', 'SR_B4']),
+    'NDBI': lambda sr: sr.normalizedDifference(['SR_B6', 'SR_B5']),
+    'NDWI': lambda sr: sr.normalizedDifference(['SR_B3', 'SR_B5']),
+    # EVI coefficients for Landsat SR
+    'EVI': lambda sr: sr.expression('2.5 * (nir - red) / (nir + 6 * red - 7.5 * blue + 1)', {
+        'nir': sr.select('SR_B5'), 'red': sr.select('SR_B4'), 'blue': sr.select('SR_B2')}),
+}
+
+# Months per season; summer follows the configured warm months, winter is Jan-Feb as in the auxiliary unit
+LANDSAT_SEASONS = {
+    'year': tuple(range(1, 13)),
+    'summer': tuple(ANALYSIS_CONFIG.get('warm_months', [6, 7, 8])),
+    'winter': (1, 2),
+}
+
+
+def season_window(year: int, season: str) -> Tuple[str, str]:
+    """``(start, end)`` covering the season's months of ``year``; ``end`` is exclusive."""
+    months = sorted(LANDSAT_SEASONS[season])
+    start = f"{year:04d}-{months[0]:02d}-01"
+    last = months[-1]
+    end = f"{year + 1:04d}-01-01" if last == 12 else f"{year:04d}-{last + 1:02d}-01"
+    return start, end
+
+
+def scene_collection(start_date: str, end_date: str, geometry: ee.Geometry,
+                     cloud_threshold: Optional[float] = None) -> ee.ImageCollection:
+    """Landsat 8+9 SR scenes over ``geometry`` that pass the scene-level cloud filter."""
+    if cloud_threshold is None:
+        cloud_threshold = ANALYSIS_CONFIG['cloud_threshold']
+    scene_filter = ee.Filter.And(
+        ee.Filter.date(start_date, end_date),
+        ee.Filter.bounds(geometry),
+        ee.Filter.lt(LANDSAT_CONFIG["cloud_property"], cloud_threshold),
+    )
+    cols = [ee.ImageCollection(DATASETS[name]).filter(scene_filter) for name in LANDSAT_CONFIG["collections"]]
+    merged = cols[0]
+    for col in cols[1:]:
+        merged = merged.merge(col)
+    return merged.select(SR_BANDS + ['QA_PIXEL'])
+
+
+def _index_mapper(indices: Tuple[str, ...]):
+    def prepare(img):
+        qa = img.select('QA_PIXEL')
+        mask = qa.bitwiseAnd(1 << 3).eq(0).And(qa.bitwiseAnd(1 << 4).eq(0))
+        sr = img.select(SR_BANDS).multiply(0.0000275).add(-0.2).clamp(0, 1)
+        return ee.Image.cat([INDICES[name](sr).rename(name) for name in indices]).updateMask(mask)
+    return prepare
+
+
+def resample(image: ee.Image, target_scale: int) -> ee.Image:
+    """Aggregate a 30 m composite to ``target_scale`` once (mean of the native pixels)."""
+    if int(target_scale) == LANDSAT_CONFIG["native_scale"]:
+        return image
+    crs = LANDSAT_CONFIG["crs"]
+    return (image.setDefaultProjection(crs=crs, scale=LANDSAT_CONFIG["native_scale"])
+            .reduceResolution(reducer=ee.Reducer.mean(), maxPixels=LANDSAT_CONFIG["resample_max_pixels"])
+            .reproject(crs=crs, scale=target_scale))
+
+
+def landsat_composite(start_date: str, end_date: str, geometry: ee.Geometry,
+                      indices: Iterable[str] = ('NDVI', 'NDBI', 'NDWI'), target_scale: int = 30,
+                      cloud_threshold: Optional[float] = None) -> ee.Image:
+    """Median of the per-scene cloud-masked ``indices`` (not memoized)."""
+    indices = tuple(indices)
+    col = scene_collection(start_date, end_date, geometry, cloud_threshold).map(_index_mapper(indices))
+    return resample(col.median(), target_scale)
+
+
+_CACHE: Dict[Tuple, ee.Image] = {}
+_LOCK = threading.Lock()
+
+
+def city_footprint(city: str) -> ee.Geometry:
+    """Geometry whose intersecting scenes cover every unit's region (the full analysis extent)."""
+    return create_analysis_zones(UZBEKISTAN_CITIES[city])['full_extent']
+
+
+def city_composite(city: str, year: int, season: str = 'summer', target_scale: int = 30,
+                   cloud_threshold: Optional[float] = None) -> ee.Image:
+    """NDVI, NDBI, NDWI and EVI composite of ``city`` for ``season`` of ``year``, built once per process."""
+    if cloud_threshold is None:
+        cloud_threshold = ANALYSIS_CONFIG['cloud_threshold']
+    key = (city, int(year), season, int(target_scale), float(cloud_threshold))
+    with _LOCK:
+        if key not in _CACHE:
+            start, end = season_window(int(year), season)
+            _CACHE[key] = landsat_composite(start, end, city_footprint(city), tuple(INDICES),
+                                            target_scale, cloud_threshold)
+        return _CACHE[key]
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
@@ -0,0 +1,318 @@
+"""Local MODIS LST datacube per city for offline seasonal analytics.
+
+`ingest_city_cube` downloads every 8-day MOD11A2 scene for a city once
+(day/night LST as raw uint16 DN plus QC bytes, time × y × x on a fixed
+~1 km lat/lon grid over the urban buffer and rural ring) with concurrent
+`ee.data.computePixels` calls, and appends only missing dates on re-runs.
+Stacks are stored as memory-mapped ``.npy`` arrays next to a ``meta.json``
+(no zarr/netCDF dependency), so time slices are read lazily.
+
+`LSTCube` answers monthly, seasonal, zonal and temporal-variability queries
+with NumPy: new month windows or zones never touch Earth Engine, and
+`run_parallel` spreads per-city queries across cores.
+"""
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+import datetime
+import json
+import math
+import os
+import warnings
+
+import numpy as np
+
+from .utils import UZBEKISTAN_CITIES, DATASETS, ANALYSIS_CONFIG
+
+try:
+    import ee
+except Exception:
+    ee = None
+
+CUBE_VERSION = 1
+CUBE_ROOT = Path('suhi_analysis_output') / 'data' / 'lst_cube'
+MODIS_PIXEL_M = 926.6
+LST_SCALE = 0.02            # DN -> Kelvin
+KELVIN_OFFSET = -273.15
+# Same plausibility clamps as temperature.load_modis_lst
+CLAMP_C = {'day': (-20.0, 60.0), 'night': (-20.0, 50.0)}
+BANDS = {'day': ('LST_Day_1km', 'QC_Day'), 'night': ('LST_Night_1km', 'QC_Night')}
+STAT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _cube_dir(city: str, root: Optional[Path] = None) -> Path:
+    return Path(root or CUBE_ROOT) / city.replace(' ', '_')
+
+
+def city_grid(city: str) -> Dict[str, Any]:
+    """Fixed lat/lon grid covering the city's full analysis extent (buffer + rural ring)."""
+    info = UZBEKISTAN_CITIES[city]
+    radius = info['buffer_m'] + ANALYSIS_CONFIG['rural_buffer_km'] * 1000 + MODIS_PIXEL_M
+    dlat = MODIS_PIXEL_M / 111320.0
+    dlon = MODIS_PIXEL_M / (111320.0 * math.cos(math.radians(info['lat'])))
+    half_w = int(math.ceil(radius / MODIS_PIXEL_M))
+    return {
+        'crs': 'EPSG:4326',
+        'width': 2 * half_w,
+        'height': 2 * half_w,
+        'west': info['lon'] - half_w * dlon,
+        'north': info['lat'] + half_w * dlat,
+        'dlon': dlon,
+        'dlat': dlat,
+    }
+
+
+def _fetch_scene(image_id: str, grid: Dict[str, Any]) -> np.ndarray:
+    img = ee.Image(image_id).select(['LST_Day_1km', 'LST_Night_1km', 'QC_Day', 'QC_Night']).toUint16()
+    return ee.data.computePixels({
+        'expression': img,
+        'fileFormat': 'NUMPY_NDARRAY',
+        'grid': {
+            'dimensions': {'width': grid['width'], 'height': grid['height']},
+            'affineTransform': {'scaleX': grid['dlon'], 'shearX': 0, 'translateX': grid['west'],
+                                'shearY': 0, 'scaleY': -grid['dlat'], 'translateY': grid['north']},
+            'crsCode': grid['crs'],
+        },
+    })
+
+
+def _save_array(path: Path, arr: np.ndarray) -> None:
+    tmp = path.with_name(path.stem + '.tmp.npy')
+    np.save(tmp, arr)
+    os.replace(tmp, path)
+
+
+def ingest_city_cube(city: str, start_year: int, end_year: int, max_workers: int = 8,
+                     root: Optional[Path] = None) -> Dict[str, Any]:
+    """Download (or extend) the city's MOD11A2 cube for ``start_year``..``end_year``."""
+    if ee is None:
+        raise RuntimeError('Earth Engine python API not available in this environment')
+    grid = city_grid(city)
+    cube_dir = _cube_dir(city, root)
+    cube_dir.mkdir(parents=True, exist_ok=True)
+    meta_path = cube_dir / 'meta.json'
+
+    existing = None
+    if meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        if meta.get('version') == CUBE_VERSION and meta.get('grid') == grid:
+            existing = LSTCube(city, root)
+
+    info = UZBEKISTAN_CITIES[city]
+    region = ee.Geometry.Point([info['lon'], info['lat']]).buffer(
+        info['buffer_m'] + ANALYSIS_CONFIG['rural_buffer_km'] * 1000)
+    col = (ee.ImageCollection(DATASETS['modis_lst'])
+           .filterDate(f"{start_year}-01-01", f"{end_year + 1}-01-01")
+           .filterBounds(region))
+    listing = ee.Dictionary({
+        'ids': col.aggregate_array('system:id'),
+        'times': col.aggregate_array('system:time_start'),
+    }).getInfo()
+
+    have = set(existing.dates.astype(str)) if existing is not None else set()
+    todo = []
+    for image_id, t in zip(listing['ids'], listing['times']):
+        day = str(np.datetime64(int(t), 'ms').astype('datetime64[D]'))
+        if day not in have:
+            todo.append((day, image_id))
+
+    scenes: Dict[str, np.ndarray] = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_fetch_scene, image_id, grid): day for day, image_id in todo}
+        for fut in as_completed(futures):
+            try:
+                scenes[futures[fut]] = fut.result()
+            except Exception as e:
+                failed.append({'date': futures[fut], 'error': str(e)})
+
+    if scenes:
+        new_days = sorted(scenes)
+        stacks = {
+            'lst_day': np.stack([scenes[d]['LST_Day_1km'] for d in new_days]).astype(np.uint16),
+            'lst_night': np.stack([scenes[d]['LST_Night_1km'] for d in new_days]).astype(np.uint16),
+            'qc_day': np.stack([scenes[d]['QC_Day'] for d in new_days]).astype(np.uint8),
+            'qc_night': np.stack([scenes[d]['QC_Night'] for d in new_days]).astype(np.uint8),
+        }
+        dates = np.array(new_days, dtype='datetime64[D]')
+        if existing is not None:
+            dates = np.concatenate([existing.dates, dates])
+            stacks = {k: np.concatenate([np.asarray(existing.arrays[k]), v]) for k, v in stacks.items()}
+        order = np.argsort(dates, kind='stable')
+        existing = None  # release memmaps before replacing files
+        for k, v in stacks.items():
+            _save_array(cube_dir / f'{k}.npy', v[order])
+        _save_array(cube_dir / 'dates.npy', dates[order])
+        meta_path.write_text(json.dumps({
+            'version': CUBE_VERSION,
+            'city': city,
+            'dataset': DATASETS['modis_lst'],
+            'grid': grid,
+            'scale_factor': LST_SCALE,
+            'offset_c': KELVIN_OFFSET,
+            'updated': datetime.datetime.now().isoformat(timespec='seconds'),
+        }, indent=2), encoding='utf-8')
+
+    return {'city': city, 'cube_dir': str(cube_dir), 'new_scenes': len(scenes),
+            'skipped_existing': len(listing['ids']) - len(todo), 'failed': failed}
+
+
+class LSTCube:
+    """Memory-mapped MOD11A2 cube for one city with NumPy query helpers."""
+
+    def __init__(self, city: str, root: Optional[Path] = None):
+        self.city = city
+        self.dir = _cube_dir(city, root)
+        self.meta = json.loads((self.dir / 'meta.json').read_text(encoding='utf-8'))
+        self.grid = self.meta['grid']
+        self.dates = np.load(self.dir / 'dates.npy')
+        self.arrays = {k: np.load(self.dir / f'{k}.npy', mmap_mode='r')
+                       for k in ('lst_day', 'lst_night', 'qc_day', 'qc_night')}
+
+    # --- selection -------------------------------------------------------
+    def time_mask(self, months: Optional[Iterable[int]] = None, years: Optional[Iterable[int]] = None,
+                  start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Boolean mask over scenes by calendar month(s), year(s) and/or ISO date range [start, end)."""
+        mask = np.ones(self.dates.shape, dtype=bool)
+        month_of = self.dates.astype('datetime64[M]').astype(int) % 12 + 1
+        year_of = self.dates.astype('datetime64[Y]').astype(int) + 1970
+        if months is not None:
+            mask &= np.isin(month_of, list(months))
+        if years is not None:
+            mask &= np.isin(year_of, list(years))
+        if start is not None:
+            mask &= self.dates >= np.datetime64(start, 'D')
+        if end is not None:
+            mask &= self.dates < np.datetime64(end, 'D')
+        return mask
+
+    def zone_masks(self, erosion_m: float = 100.0) -> Dict[str, np.ndarray]:
+        """Pixel masks equivalent to ``utils.create_analysis_zones`` on the cube grid."""
+        info = UZBEKISTAN_CITIES[self.city]
+        g = self.grid
+        lons = g['west'] + (np.arange(g['width']) + 0.5) * g['dlon']
+        lats = g['north'] - (np.arange(g['height']) + 0.5) * g['dlat']
+        lon2d, lat2d = np.meshgrid(lons, lats)
+        dx = (lon2d - info['lon']) * 111320.0 * math.cos(math.radians(info['lat']))
+        dy = (lat2d - info['lat']) * 111320.0
+        dist = np.hypot(dx, dy)
+        outer = info['buffer_m'] + ANALYSIS_CONFIG['rural_buffer_km'] * 1000
+        return {
+            'urban_core': dist <= info['buffer_m'] - erosion_m,
+            'rural_ring': (dist >= info['buffer_m'] + erosion_m) & (dist <= outer - erosion_m),
+            'full_extent': dist <= outer,
+        }
+
+    def celsius(self, band: str = 'day', tmask: Optional[np.ndarray] = None,
+                max_lst_error: int = 1) -> np.ndarray:
+        """LST in °C (time × y × x, float32) with fill and poor-QC pixels set to NaN.
+
+        Keeps pixels whose mandatory QA is 'good' or 'other quality' and whose
+        LST error flag is <= ``max_lst_error`` (0: <=1 K, 1: <=2 K, 2: <=3 K).
+        """
+        idx = np.flatnonzero(tmask) if tmask is not None else slice(None)
+        dn = np.asarray(self.arrays[f'lst_{band}'][idx])
+        qc = np.asarray(self.arrays[f'qc_{band}'][idx])
+        valid = (dn > 0) & ((qc & 0b11) <= 1) & (((qc >> 6) & 0b11) <= max_lst_error)
+        out = dn.astype(np.float32) * LST_SCALE + KELVIN_OFFSET
+        out[~valid] = np.nan
+        return out
+
+    # --- statistics ------------------------------------------------------
+    def composite(self, band: str = 'day', tmask: Optional[np.ndarray] = None, how: str = 'median') -> np.ndarray:
+        """Per-pixel temporal composite (as load_modis_lst's median composite, with the same clamps)."""
+        stack = self.celsius(band, tmask)
+        if stack.shape[0] == 0:
+            return np.full((self.grid['height'], self.grid['width']), np.nan, dtype=np.float32)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN pixels
+            comp = np.nanmedian(stack, axis=0) if how == 'median' else np.nanmean(stack, axis=0)
+        lo, hi = CLAMP_C[band]
+        return np.where(np.isfinite(comp), np.clip(comp, lo, hi), np.nan)
+
+    @staticmethod
+    def _spatial_stats(values: np.ndarray) -> Dict[str, Any]:
+        v = values[np.isfinite(values)]
+        if v.size == 0:
+            return {}
+        pct = np.percentile(v, STAT_PERCENTILES)
+        return {
+            'mean': float(v.mean()), 'std_dev': float(v.std(ddof=1)) if v.size > 1 else 0.0,
+            'count': int(v.size), 'p10': float(pct[0]), 'p25': float(pct[1]), 'median': float(pct[2]),
+            'p75': float(pct[3]), 'p90': float(pct[4]),
+        }
+
+    def zonal_stats(self, band: str = 'day', zone: str = 'urban_core', months: Optional[Iterable[int]] = None,
+                    years: Optional[Iterable[int]] = None, zone_mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Spatial stats of the composite over a zone (keys match temperature._extract_reducer_stats)."""
+        mask = zone_mask if zone_mask is not None else self.zone_masks()[zone]
+        return self._spatial_stats(self.composite(band, self.time_mask(months, years))[mask])
+
+    def zone_time_series(self, band: str = 'day', zone: str = 'urban_core',
+                         tmask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-scene zone mean (°C) and the matching dates."""
+        mask = self.zone_masks()[zone]
+        stack = self.celsius(band, tmask)[:, mask]
+        counts = np.isfinite(stack).sum(axis=1)
+        means = np.where(counts > 0, np.nansum(stack, axis=1) / np.maximum(counts, 1), np.nan)
+        dates = self.dates[tmask] if tmask is not None else self.dates
+        return dates, means
+
+    def monthly_stats(self, year: int, months: Iterable[int] = range(1, 13)) -> Dict[int, Dict[str, Any]]:
+        """Per-month urban/rural day/night stats, shaped like temperature._compute_monthly_temperature_stats."""
+        zones = self.zone_masks()
+        out = {}
+        for month in months:
+            tmask = self.time_mask(months=[month], years=[year])
+            entry = {'month': month, 'urban': {}, 'rural': {}, 'urban_rural_difference': {}}
+            if not tmask.any():
+                entry['error'] = 'No MODIS LST data available'
+            for band in ('day', 'night'):
+                comp = self.composite(band, tmask)
+                entry['urban'][band] = self._spatial_stats(comp[zones['urban_core']])
+                entry['rural'][band] = self._spatial_stats(comp[zones['rural_ring']])
+                u, r = entry['urban'][band].get('mean'), entry['rural'][band].get('mean')
+                if u is not None and r is not None:
+                    entry['urban_rural_difference'][band] = u - r
+            out[month] = entry
+        return out
+
+    def temporal_uncertainty(self, year: int, months: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """Month-to-month variability of zone means, shaped like temperature._compute_temporal_uncertainty."""
+        months = list(months or ANALYSIS_CONFIG['warm_months'])
+        zones = self.zone_masks()
+        out: Dict[str, Any] = {'urban': {'day': {}, 'night': {}}, 'rural': {'day': {}, 'night': {}}}
+        for band in ('day', 'night'):
+            comps = [self.composite(band, self.time_mask(months=[m], years=[year])) for m in months]
+            for zone, key in (('urban_core', 'urban'), ('rural_ring', 'rural')):
+                temps = np.array([np.nanmean(c[zones[zone]]) for c in comps if np.isfinite(c[zones[zone]]).any()])
+                if temps.size > 1:
+                    mean = float(temps.mean())
+                    out[key][band] = {
+                        'monthly_mean': mean,
+                        'monthly_std': float(temps.std()),
+                        'coefficient_of_variation': float(temps.std() / mean) if mean != 0 else None,
+                        'min_monthly': float(temps.min()),
+                        'max_monthly': float(temps.max()),
+                        'monthly_range': float(temps.max() - temps.min()),
+                        'n_months': int(temps.size),
+                    }
+        return out
+
+
+def _cube_query(city: str, method: str, kwargs: Dict[str, Any], root: Optional[str]) -> Any:
+    return getattr(LSTCube(city, Path(root) if root else None), method)(**kwargs)
+
+
+def run_parallel(cities: List[str], method: str, root: Optional[Path] = None,
+                 max_workers: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+    """Run ``LSTCube(city).<method>(**kwargs)`` for each city across processes."""
+    results: Dict[str, Any] = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_cube_query, c, method, kwargs, str(root) if root else None): c for c in cities}
+        for fut in as_completed(futures):
+            try:
+                results[futures[fut]] = fut.result()
+            except Exception as e:
+                results[futures[fut]] = {'error': str(e)}
+    return results
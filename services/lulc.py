@@ -14,11 +14,18 @@ import requests
 from .utils import UZBEKISTAN_CITIES
 from . import classification
 from . import error_assessment
+from . import raster_io
 from .utils import create_output_directories, make_json_safe
 from pathlib import Path
 
 
-def _download_image_geturl(image, region, scale: int, out_path: Path, file_name: str, crs: str = 'EPSG:4326') -> Optional[Path]:
+def _download_image_geturl(image, region, scale: int, out_path: Path, file_name: str, crs: str = 'EPSG:4326',
+                           cog_resampling: Optional[str] = 'nearest') -> Optional[Path]:
+    """Download ``image`` as GeoTIFF and rewrite it as a COG.
+
+    ``cog_resampling`` sets how overviews are built ('nearest' for class maps,
+    'average' for continuous indices); pass None to keep the raw download.
+    """
     try:
         region_geo = region.bounds().getInfo()['coordinates']
         params = {
@@ -36,6 +43,8 @@ def _download_image_geturl(image, region, scale: int, out_path: Path, file_name:
                 for chunk in r.iter_content(chunk_size=8192):
                     if chunk:
                         fh.write(chunk)
+            if cog_resampling:
+                raster_io.to_cog(p, resampling=cog_resampling)
             return p
         else:
             return None
@@ -0,0 +1,143 @@
+"""
+Columnar container for ClimateRiskMetrics results
+One NumPy column per metric field (float64, or object for text fields) with
+lightweight per-row proxies, so reporters and validators read whole columns
+and results for thousands of spatial units don't cost thousands of objects.
+"""
+
+from collections.abc import Mapping
+from dataclasses import fields, MISSING
+from typing import Dict, List, Optional, Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .climate_risk_assessment import ClimateRiskMetrics
+
+METRIC_FIELDS = [f.name for f in fields(ClimateRiskMetrics)]
+TEXT_FIELDS = {f.name for f in fields(ClimateRiskMetrics) if f.default is MISSING or isinstance(f.default, str)}
+OPTIONAL_FIELDS = {f.name for f in fields(ClimateRiskMetrics) if f.default is None}
+INT_FIELDS = {'population'}
+DEFAULTS = {f.name: f.default for f in fields(ClimateRiskMetrics) if f.default is not MISSING}
+
+
+class MetricsRow:
+    """Attribute view of one row of a MetricsStore (drop-in for ClimateRiskMetrics)"""
+
+    __slots__ = ('_store', '_i')
+
+    def __init__(self, store: 'MetricsStore', i: int):
+        object.__setattr__(self, '_store', store)
+        object.__setattr__(self, '_i', i)
+
+    def __getattr__(self, name: str) -> Any:
+        return self._store._get(name, self._i)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._store._set(name, self._i, value)
+
+    def __repr__(self) -> str:
+        return f"MetricsRow(city={self.city!r}, overall_risk_score={self.overall_risk_score:.3f})"
+
+
+class MetricsStore(Mapping):
+    """City -> MetricsRow mapping backed by one array per ClimateRiskMetrics field"""
+
+    def __init__(self, cities: Iterable[str]):
+        self.cities: List[str] = list(cities)
+        self._index = {c: i for i, c in enumerate(self.cities)}
+        n = len(self.cities)
+        self.columns: Dict[str, np.ndarray] = {}
+        for name in METRIC_FIELDS:
+            if name in TEXT_FIELDS:
+                self.columns[name] = np.full(n, DEFAULTS.get(name), dtype=object)
+            else:
+                default = DEFAULTS.get(name)
+                self.columns[name] = np.full(n, np.nan if default is None else float(default), dtype=float)
+        self.columns['city'][:] = self.cities
+        # Per-city values that have no metric column (e.g. intermediate indicator graph nodes)
+        self.extras: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_metrics(cls, profiles: Mapping) -> 'MetricsStore':
+        store = cls(profiles.keys())
+        for city, metrics in profiles.items():
+            store.set_row(city, metrics)
+        return store
+
+    @classmethod
+    def from_columns(cls, cities: Iterable[str], columns: Mapping) -> 'MetricsStore':
+        """Adopt existing column arrays (e.g. memory-mapped) without copying them"""
+        store = cls(cities)
+        store.columns.update(columns)
+        return store
+
+    @classmethod
+    def coerce(cls, profiles: Mapping) -> 'MetricsStore':
+        """Return ``profiles`` unchanged if it is already a store, else build one"""
+        return profiles if isinstance(profiles, MetricsStore) else cls.from_metrics(profiles)
+
+    # Row access --------------------------------------------------------------
+    def _get(self, name: str, i: int) -> Any:
+        col = self.columns.get(name)
+        if col is None:
+            raise AttributeError(name)
+        v = col[i]
+        if name in TEXT_FIELDS:
+            return v
+        if name in OPTIONAL_FIELDS and np.isnan(v):
+            return None
+        return int(v) if name in INT_FIELDS else float(v)
+
+    def _set(self, name: str, i: int, value: Any) -> None:
+        col = self.columns.get(name)
+        if col is None:
+            raise AttributeError(f"Unknown metric: {name}")
+        if not col.flags.writeable:
+            # Memory-mapped snapshot columns are read-only; copy on first write
+            col = self.columns[name] = np.array(col)
+        col[i] = value if name in TEXT_FIELDS else (np.nan if value is None else float(value))
+
+    def set_row(self, city: str, metrics: ClimateRiskMetrics) -> None:
+        i = self._index[city]
+        for name in METRIC_FIELDS:
+            self._set(name, i, getattr(metrics, name))
+
+    def __getitem__(self, city: str) -> MetricsRow:
+        return MetricsRow(self, self._index[city])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.cities)
+
+    def __len__(self) -> int:
+        return len(self.cities)
+
+    def to_metrics(self, city: str) -> ClimateRiskMetrics:
+        row = self[city]
+        return ClimateRiskMetrics(**{name: getattr(row, name) for name in METRIC_FIELDS})
+
+    # Column access -----------------------------------------------------------
+    def column(self, name: str, cities: Optional[List[str]] = None) -> np.ndarray:
+        """The metric column (a view, not a copy) or its rows for ``cities`` in that order"""
+        col = self.columns[name]
+        if cities is None:
+            return col
+        return col[[self._index[c] for c in cities]]
+
+    def matrix(self, names: List[str]) -> np.ndarray:
+        """cities × len(names) float array of the named columns (missing/NaN -> 0)"""
+        out = np.zeros((len(self.cities), len(names)))
+        for j, name in enumerate(names):
+            if name in self.columns and name not in TEXT_FIELDS:
+                out[:, j] = np.nan_to_num(self.columns[name])
+        return out
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """DataFrame over the column arrays (indexed by city, no copy of the arrays)"""
+        names = columns or [n for n in METRIC_FIELDS if n != 'city']
+        return pd.DataFrame({n: self.columns[n] for n in names}, index=pd.Index(self.cities, name='city'), copy=False)
+
+    def to_records(self, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """JSON-ready ``{city: {metric: value}}`` (NaN optional fields become None)"""
+        names = columns or METRIC_FIELDS
+        return {c: {n: self._get(n, i) for n in names} for i, c in enumerate(self.cities)}
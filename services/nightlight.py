@@ -3,15 +3,22 @@
 Loads VIIRS monthly composites and DMSP when available, computes simple
 statistics (mean radiance), generates thumbnail maps, and exports
 aggregated statistics for reporting.
+
+`run_city_viirs_series` is the per-city multi-year mode: every year's median
+is a band of one image, all zone statistics for all years come back from a
+single combined `reduceRegions` call, and one low-resolution multi-band
+GeoTIFF is downloaded from which thumbnails, histograms and lit-area stats
+are rendered locally.
 """
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import ee
 import numpy as np
 
-from .utils import UZBEKISTAN_CITIES, DATASETS, ANALYSIS_CONFIG, create_analysis_zones, rate_limiter, create_output_directories, make_json_safe, GEE_CONFIG
+from .utils import UZBEKISTAN_CITIES, DATASETS, ANALYSIS_CONFIG, create_analysis_zones, rate_limiter, create_output_directories, GEE_CONFIG
 from . import error_assessment
-from pathlib import Path
+from . import raster_io
+from . import result_io
 
 
 def load_viirs_monthly(year: int, geometry: ee.Geometry) -> ee.Image:
@@ -140,7 +147,8 @@ def download_viirs_geotiff(image: ee.Image, region: ee.Geometry, scale: int, out
     scale for local copies (e.g., 500-2000 m) to keep sizes manageable.
     """
     try:
-        region_geo = region.bounds().getInfo()['coordinates']
+        # ``region`` may already be a list of ring coordinates (avoids a bounds() round trip)
+        region_geo = region if isinstance(region, list) else region.bounds().getInfo()['coordinates']
         params = {
             'scale': int(scale),
             'crs': crs,
@@ -157,6 +165,7 @@ def download_viirs_geotiff(image: ee.Image, region: ee.Geometry, scale: int, out
                 for chunk in r.iter_content(chunk_size=8192):
                     if chunk:
                         fh.write(chunk)
+            raster_io.to_cog(p, resampling='average')
             return p
         else:
             print(f"Download failed: status {r.status_code}")
@@ -189,14 +198,172 @@ def run_city_year_viirs(city_name: str, city_info: Dict[str, Any], year: int, ou
     return result
 
 
-def run_batch_viirs(cities: List[str], years: List[int], output_base: Path) -> List[Dict[str, Any]]:
+VIIRS_PALETTE = ['black', '#0d0887', '#6a00a8', '#b12a90', '#e16462', '#fca636', '#f0f921']
+VIIRS_VIS_RANGE = (0, 50)
+
+
+def build_viirs_stack(years: List[int], geometry: ee.Geometry) -> ee.Image:
+    """One image with the annual VIIRS median of each year as band ``viirs_<year>``."""
+    return ee.Image.cat([load_viirs_monthly(y, geometry).select([0]).rename(f"viirs_{y}") for y in years])
+
+
+def compute_stack_zone_stats(stack: ee.Image, years: List[int], zones: Dict[str, ee.Geometry], scale: int = 500) -> Dict[str, Dict[str, Any]]:
+    """Mean/stdDev/count for every year band and zone from a single reduceRegions call.
+
+    Returns ``{year: {zone: stats, 'uncertainty': {zone: ...}}}`` with the same keys as
+    `compute_nightlight_stats` and `error_assessment.compute_zonal_uncertainty`.
+    """
+    rate_limiter.wait()
+    reducer = ee.Reducer.mean().combine(ee.Reducer.stdDev(), None, True).combine(ee.Reducer.count(), None, True)
+    fc = ee.FeatureCollection([ee.Feature(geom, {'zone': name}) for name, geom in zones.items()])
+    info = stack.reduceRegions(collection=fc, reducer=reducer, scale=scale, tileScale=4).getInfo()
+    props = {f['properties']['zone']: f['properties'] for f in info.get('features', [])}
+
+    # Single-band stacks give unprefixed reducer outputs (mean, stdDev, count)
+    single = len(years) == 1
+    out: Dict[str, Dict[str, Any]] = {}
+    for y in years:
+        prefix = '' if single else f"viirs_{y}_"
+        out[str(y)] = _zone_stats_block({name: tuple(props.get(name, {}).get(prefix + k)
+                                                     for k in ('mean', 'stdDev', 'count')) for name in zones})
+    return out
+
+
+def _zone_stats_block(values: Dict[str, tuple]) -> Dict[str, Any]:
+    """``{zone: stats, 'uncertainty': {zone: ...}}`` from ``{zone: (mean, stdDev, count)}``."""
+    block: Dict[str, Any] = {'uncertainty': {}}
+    for name, (m, sd, c) in values.items():
+        zs = {'mean': float(m) if m is not None else None,
+              'stdDev': float(sd) if sd is not None else None,
+              'count': int(c) if c is not None else None}
+        unc = dict(zs, stdError=None, ci95=(None, None))
+        if zs['stdDev'] is not None and zs['count'] and zs['mean'] is not None:
+            se = zs['stdDev'] / (zs['count'] ** 0.5)
+            unc['stdError'] = float(se)
+            unc['ci95'] = (zs['mean'] - 1.96 * se, zs['mean'] + 1.96 * se)
+        block[name] = zs
+        block['uncertainty'][name] = unc
+    return block
+
+
+def compute_shared_zone_stats(cities: List[str], years: List[int]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """``{city: {year: stats}}`` for all cities from the national VIIRS composites (`composites.CompositeRegistry`).
+
+    Each year's median is built once for the whole country and all cities' zones
+    are reduced together; ``stats`` match `compute_stack_zone_stats`.
+    """
+    from .composites import get_registry
+    reduced = get_registry().reduce('viirs', [str(y) for y in years], cities)
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for city in cities:
+        out[city] = {}
+        for y in years:
+            zones = reduced.get(city, {}).get(str(y))
+            if not zones:
+                out[city][str(y)] = {'error': 'No VIIRS images for year'}
+                continue
+            out[city][str(y)] = _zone_stats_block({
+                name: tuple(zones.get(name, {}).get('viirs', {}).get(k) for k in ('mean', 'stdDev', 'count'))
+                for name in ('urban_core', 'rural_ring')})
+    return out
+
+
+def _city_bounds_coords(city_info: Dict[str, Any], radius_m: float) -> List[List[List[float]]]:
+    """Bounding-box ring of a circular city buffer, computed locally."""
+    dlat = radius_m / 111320.0
+    dlon = radius_m / (111320.0 * np.cos(np.radians(city_info['lat'])))
+    w, e = city_info['lon'] - dlon, city_info['lon'] + dlon
+    s, n = city_info['lat'] - dlat, city_info['lat'] + dlat
+    return [[[w, s], [e, s], [e, n], [w, n], [w, s]]]
+
+
+def render_viirs_stack(tif_path: Path, years: List[int], out_dir: Path, city_name: str,
+                       pixel_area_m2: float, lit_threshold: float = 1.0) -> Dict[str, Dict[str, Any]]:
+    """Thumbnails, histograms and lit-area stats for every year band of a local VIIRS stack."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LinearSegmentedColormap
+    from .analyze_nightlights import compute_image_statistics
+
+    cmap = LinearSegmentedColormap.from_list('viirs', VIIRS_PALETTE)
+    cmap.set_bad('black')
+    hist_dir = out_dir.parent.parent / 'nightlights_analysis' / city_name
+    hist_dir.mkdir(parents=True, exist_ok=True)
+    out: Dict[str, Dict[str, Any]] = {}
+    for band, y in enumerate(years, start=1):
+        arr, _ = raster_io.read_raster(tif_path, band=band)
+        entry: Dict[str, Any] = {}
+        thumb = out_dir / f"viirs_{y}.png"
+        plt.imsave(thumb, arr, cmap=cmap, vmin=VIIRS_VIS_RANGE[0], vmax=VIIRS_VIS_RANGE[1])
+        entry['thumbnail'] = str(thumb)
+        stats = compute_image_statistics(arr, {'pixel_area_m2': pixel_area_m2}, lit_threshold=lit_threshold)
+        entry['local_stats'] = stats
+        hist = stats.get('histogram')
+        if hist:
+            fig, ax = plt.subplots(figsize=(6, 4))
+            bins = np.array(hist['bins'])
+            ax.bar((bins[:-1] + bins[1:]) / 2, hist['counts'], width=np.diff(bins), align='center')
+            ax.set_title(f"{city_name} {y} Radiance Histogram")
+            ax.set_xlabel('Pixel value')
+            ax.set_ylabel('Count')
+            fig.tight_layout()
+            hist_png = hist_dir / f"{city_name}_{y}_histogram.png"
+            fig.savefig(str(hist_png), dpi=150)
+            plt.close(fig)
+            entry['histogram_png'] = str(hist_png)
+        out[str(y)] = entry
+    return out
+
+
+def run_city_viirs_series(city_name: str, city_info: Dict[str, Any], years: List[int], output_base: Path,
+                          download_scale: int = 1000) -> Dict[str, Any]:
+    """Multi-year VIIRS for one city: one stacked image, one reduction, one download.
+
+    Per-year entries match `run_city_year_viirs`'s ``viirs`` block (``stats`` with
+    zone stats and ``uncertainty``, ``thumbnail``) plus locally computed ``local_stats``.
+    """
+    result: Dict[str, Any] = {'city': city_name, 'years': {}}
+    zones = create_analysis_zones(city_info)
+    stack = build_viirs_stack(years, zones['full_extent'])
+    try:
+        stats = compute_stack_zone_stats(stack, years, {'urban_core': zones['urban_core'], 'rural_ring': zones['rural_ring']},
+                                         scale=ANALYSIS_CONFIG.get('target_resolution_m', 500))
+    except Exception as e:
+        stats = {str(y): {'error': str(e)} for y in years}
+    for y in years:
+        result['years'][str(y)] = {'stats': stats[str(y)], 'thumbnail': None}
+
+    out_dir = output_base / 'nightlights' / city_name
+    tif = download_viirs_geotiff(stack.toFloat(), _city_bounds_coords(city_info, city_info['buffer_m']),
+                                 download_scale, out_dir, f"viirs_stack_{years[0]}_{years[-1]}")
+    result['stack_tif'] = str(tif) if tif else None
+    if tif and raster_io.HAS_RASTERIO:
+        try:
+            for y, local in render_viirs_stack(tif, years, out_dir, city_name, float(download_scale) ** 2).items():
+                result['years'][y].update(local)
+        except Exception as e:
+            result['render_error'] = str(e)
+    return result
+
+
+def run_batch_viirs(cities: List[str], years: List[int], output_base: Path, multi_year: bool = False,
+                    shared: bool = False) -> List[Dict[str, Any]]:
     """Run VIIRS for a batch of cities and years, and write one JSON per city.
 
     The output JSON per city will contain yearly entries with stats, uncertainty and
-    thumbnail path where available. Returns a list of per-city summaries.
+    thumbnail path where available. Returns a list of per-city summaries. With
+    ``multi_year`` each city is processed by `run_city_viirs_series`; with ``shared``
+    the zone stats of all cities come from the national composites
+    (`compute_shared_zone_stats`) and thumbnails are cut from the same images.
     """
     out_dirs = create_output_directories()
     summaries = []
+    if shared:
+        try:
+            shared_stats = compute_shared_zone_stats([c for c in cities if c in UZBEKISTAN_CITIES], years)
+        except Exception as e:
+            shared_stats = {c: {str(y): {'error': str(e)} for y in years} for c in cities}
     for city in cities:
         city_info = UZBEKISTAN_CITIES.get(city)
         if not city_info:
@@ -204,22 +371,32 @@ def run_batch_viirs(cities: List[str], years: List[int], output_base: Path) -> L
             continue
         city_results = {'city': city, 'years': {}}
         print(f"Starting VIIRS batch for city: {city}")
-        for y in years:
-            print(f"  Running VIIRS for {city} {y}...")
-            res = run_city_year_viirs(city, city_info, y, out_dirs['base'])
-            # keep only relevant viirs block for compactness
-            city_results['years'][str(y)] = res.get('viirs', res)
+        if shared:
+            from .composites import get_registry
+            out_dir = out_dirs['base'] / 'nightlights' / city
+            for y in years:
+                thumb = create_nightlight_thumbnail(get_registry().composite('viirs', str(y)), city_info['lon'],
+                                                    city_info['lat'], city_info['buffer_m'], out_dir, f"viirs_{y}")
+                city_results['years'][str(y)] = {'stats': shared_stats[city][str(y)],
+                                                 'thumbnail': str(thumb) if thumb else None}
+        elif multi_year:
+            try:
+                city_results = run_city_viirs_series(city, city_info, years, out_dirs['base'])
+            except Exception as e:
+                city_results['error'] = str(e)
+        else:
+            for y in years:
+                print(f"  Running VIIRS for {city} {y}...")
+                res = run_city_year_viirs(city, city_info, y, out_dirs['base'])
+                # keep only relevant viirs block for compactness
+                city_results['years'][str(y)] = res.get('viirs', res)
 
         # save single JSON per city
         try:
             jdir = out_dirs['base'] / 'nightlights' / city
             jdir.mkdir(parents=True, exist_ok=True)
             jfile = jdir / f"{city}_nightlights.json"
-            safe = make_json_safe(city_results)
-            import json
-            with open(jfile, 'w', encoding='utf-8') as fh:
-                json.dump(safe, fh, indent=2)
-            city_results['summary_json'] = str(jfile)
+            city_results['summary_json'] = str(result_io.write_json(city_results, jfile))
         except Exception:
             city_results['summary_json'] = None
 
@@ -1,5 +1,5 @@
 """High-level pipeline that composes service modules into a runnable analysis."""
-from . import gee, classification, temperature, vegetation, suhi, visualization, reporting, utils
+from . import gee, classification, temperature, landsat, suhi, visualization, reporting, utils
 from typing import Dict, Any
 
 
@@ -19,14 +19,14 @@ def run_comprehensive_analysis(city_name: str, year: int) -> Dict[str, Any]:
     except Exception:
         modis_lst = None
     try:
-        vegetation_img = vegetation.calculate_vegetation_indices(start_date, end_date, zones['full_extent'], target_scale=int(optimal_scales.get('scale_landsat', 30)))
+        vegetation_img = landsat.city_composite(city_name, year, 'year', target_scale=int(optimal_scales.get('scale_landsat', 30))).select(['NDVI', 'NDBI', 'NDWI'])
     except Exception:
         vegetation_img = None
     try:
         # adjust GEE_CONFIG temporarily
         original = utils.GEE_CONFIG.copy()
         utils.GEE_CONFIG.update({'scale': optimal_scales['scale'], 'max_pixels': optimal_scales['maxPixels']})
-        suhi_stats = suhi.compute_zonal_suhi(zones, modis_lst, classifications)
+        suhi_stats = suhi.compute_zonal_suhi(zones, modis_lst, classifications, city=city_name)
         utils.GEE_CONFIG.update(original)
     except Exception as e:
         suhi_stats = {'error': str(e)}
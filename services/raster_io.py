@@ -0,0 +1,164 @@
+"""Cloud-Optimized GeoTIFF helpers for downloaded rasters.
+
+`getDownloadURL` returns plain (stripped, uncompressed, overview-less) GeoTIFFs.
+`to_cog` rewrites such a file in place as a tiled, DEFLATE-compressed COG with
+internal overviews and a consistent nodata value, and `read_raster` lets readers
+pick the coarsest overview that still satisfies a requested output size, so
+thumbnails, dashboards and coarse statistics never touch full resolution.
+
+rasterio is optional: without it `to_cog` is a no-op and `read_raster` is
+unavailable (callers already fall back to PIL for PNG thumbnails).
+"""
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+import os
+
+import numpy as np
+
+try:
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.shutil import copy as rio_copy
+    HAS_RASTERIO = True
+except Exception:
+    HAS_RASTERIO = False
+
+# Nodata written into every COG: NaN-free float sentinel; integer rasters use the
+# dtype's extreme value so valid classes (including 0 in binary masks) stay valid
+FLOAT_NODATA = -9999.0
+
+COG_CONFIG = {
+    "blocksize": 512,
+    "compress": "DEFLATE",
+    "min_overview_size": 256,
+}
+
+
+def _overview_factors(width: int, height: int, min_size: int) -> list:
+    factors = []
+    f = 2
+    while max(width, height) / f >= min_size:
+        factors.append(f)
+        f *= 2
+    return factors
+
+
+def is_cog(path: Path) -> bool:
+    """True if ``path`` is already tiled and carries internal overviews."""
+    if not HAS_RASTERIO:
+        return False
+    try:
+        with rasterio.open(path) as src:
+            return bool(src.profile.get('tiled')) and bool(src.overviews(1))
+    except Exception:
+        return False
+
+
+def to_cog(path: Path, resampling: str = 'average', nodata: Optional[float] = None,
+           overwrite: bool = False) -> Path:
+    """Rewrite a GeoTIFF in place as a COG with internal overviews.
+
+    ``resampling`` drives overview generation: use ``'nearest'``/``'mode'`` for
+    categorical rasters (LULC classes, built masks) and ``'average'`` for
+    continuous ones (NDVI, LST, radiance). Source nodata and NaNs are remapped
+    to ``nodata`` (defaults to FLOAT_NODATA for float rasters; integer rasters
+    keep the source nodata, and get none if the source defines none).
+    """
+    path = Path(path)
+    if not HAS_RASTERIO or not path.exists():
+        return path
+    if not overwrite and is_cog(path):
+        return path
+
+    tmp_path = path.with_name(path.stem + '.cog_tmp.tif')
+    staging = path.with_name(path.stem + '.cog_stage.tif')
+    try:
+        with rasterio.open(path) as src:
+            profile = src.profile.copy()
+            data = src.read()
+            src_nodata = src.nodata
+
+        is_float = np.issubdtype(data.dtype, np.floating)
+        if nodata is not None:
+            target_nodata = nodata
+        elif is_float:
+            target_nodata = FLOAT_NODATA
+        else:
+            target_nodata = src_nodata
+        invalid = np.zeros(data.shape, dtype=bool)
+        if src_nodata is not None and not (is_float and np.isnan(src_nodata)):
+            invalid |= data == src_nodata
+        if is_float:
+            invalid |= ~np.isfinite(data)
+        if target_nodata is not None:
+            data = np.where(invalid, np.asarray(target_nodata, dtype=data.dtype), data)
+
+        blocksize = COG_CONFIG['blocksize']
+        profile.update(driver='GTiff', tiled=True, blockxsize=blocksize, blockysize=blocksize,
+                       compress=COG_CONFIG['compress'], predictor=3 if is_float else 2,
+                       nodata=target_nodata, interleave='pixel', BIGTIFF='IF_SAFER')
+        # Stage with overviews, then copy so the overviews are laid out ahead of full-res data
+        with rasterio.open(staging, 'w', **profile) as dst:
+            dst.write(data)
+            factors = _overview_factors(profile['width'], profile['height'], COG_CONFIG['min_overview_size'])
+            if factors:
+                dst.build_overviews(factors, getattr(Resampling, resampling))
+                dst.update_tags(ns='rio_overview', resampling=resampling)
+        rio_copy(staging, tmp_path, driver='GTiff', copy_src_overviews=True, tiled=True,
+                 blockxsize=blocksize, blockysize=blocksize, compress=COG_CONFIG['compress'],
+                 predictor=3 if is_float else 2, BIGTIFF='IF_SAFER')
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Warning: COG conversion failed for {path}: {e}")
+    finally:
+        for p in (staging, tmp_path):
+            if p.exists():
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+    return path
+
+
+def choose_overview_factor(width: int, height: int, overviews: list, max_size: Optional[int]) -> int:
+    """Pick the coarsest available overview whose output still has ``max_size`` pixels on its long side."""
+    if not max_size:
+        return 1
+    best = 1
+    for f in sorted(overviews):
+        if max(width, height) / f >= max_size:
+            best = f
+    return best
+
+
+def read_raster(path: Path, band: int = 1, max_size: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Read one band as float with nodata set to NaN, using an overview when ``max_size`` allows.
+
+    Returns ``(array, meta)`` where meta holds ``transform``, ``crs``, ``nodata``,
+    ``overview_factor`` and ``pixel_area`` (in CRS units², already scaled for the overview).
+    """
+    if not HAS_RASTERIO:
+        raise ImportError("rasterio is required to read GeoTIFFs")
+    with rasterio.open(path) as src:
+        factor = choose_overview_factor(src.width, src.height, src.overviews(band), max_size)
+        out_shape = (max(1, src.height // factor), max(1, src.width // factor))
+        arr = src.read(band, out_shape=out_shape, masked=True).astype(float).filled(np.nan)
+        transform = src.transform * src.transform.scale(src.width / out_shape[1], src.height / out_shape[0])
+        meta = {
+            'transform': transform,
+            'crs': str(src.crs) if src.crs else None,
+            'nodata': src.nodata,
+            'overview_factor': factor,
+            'pixel_area': abs(transform.a) * abs(transform.e),
+        }
+    return arr, meta
+
+
+def convert_directory(root: Path, pattern: str = '*.tif', resampling: str = 'average') -> int:
+    """Convert every matching GeoTIFF under ``root`` to a COG (skips files that already are)."""
+    converted = 0
+    for p in sorted(Path(root).rglob(pattern)):
+        if not is_cog(p):
+            to_cog(p, resampling=resampling)
+            converted += is_cog(p)
+    return converted
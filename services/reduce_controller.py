@@ -0,0 +1,183 @@
+"""Adaptive scale/tileScale controller for `reduceRegion` calls.
+
+`get_optimal_scale_for_city` is a static lookup and callers used to discover
+memory or maxPixels failures only after a full round trip, then blindly
+double the scale. This controller instead:
+
+* predicts the pixel count of a reduction from the zone area and scale
+  before submitting (`estimate_pixels`, `zone_area_m2`),
+* picks scale/tileScale/bestEffort so the request fits `maxPixels` and a
+  per-tile pixel budget (`plan`),
+* escalates through a ladder (more tileScale first, then coarser scale) only
+  on resource errors, and
+* records per-city, per-reducer outcomes in a local JSON history so later
+  runs start from settings known to succeed (`reduce_region`).
+"""
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import datetime
+import json
+import math
+import threading
+
+import ee
+
+from .utils import UZBEKISTAN_CITIES, ANALYSIS_CONFIG, GEE_CONFIG
+
+REDUCE_CONFIG = {
+    "history_path": Path(__file__).parent.parent / "suhi_analysis_output" / "cache" / "reduce_history.json",
+    "max_pixels": GEE_CONFIG["max_pixels"],
+    "pixels_per_tile": 2.5e6,        # comfortable pixels per tile before raising tileScale
+    "tile_scales": (1, 2, 4, 8, 16),
+    "max_scale_steps": 2,            # coarsen scale at most 2× twice
+    "max_failures_kept": 5,
+}
+
+# Substrings of EE error messages that mean "same request, smaller footprint would work"
+_RESOURCE_ERRORS = {
+    "memory": ("memory limit", "out of memory", "user memory"),
+    "max_pixels": ("too many pixels", "maxpixels"),
+    "timeout": ("timed out", "deadline", "computation timeout"),
+}
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """Return the resource error class of an EE exception, or None for non-resource errors."""
+    msg = str(error).lower()
+    for kind, needles in _RESOURCE_ERRORS.items():
+        if any(n in msg for n in needles):
+            return kind
+    return None
+
+
+def zone_area_m2(city: str, zone: str, erosion_m: float = 100.0) -> float:
+    """Area of a `utils.create_analysis_zones` zone computed locally from the city config."""
+    info = UZBEKISTAN_CITIES[city]
+    r = info["buffer_m"]
+    outer = r + ANALYSIS_CONFIG["rural_buffer_km"] * 1000
+    if zone == "urban_core":
+        return math.pi * max(r - erosion_m, 0.0) ** 2
+    if zone == "rural_ring":
+        return math.pi * (max(outer - erosion_m, 0.0) ** 2 - (r + erosion_m) ** 2)
+    if zone == "full_extent":
+        return math.pi * outer ** 2
+    return math.pi * r ** 2
+
+
+def estimate_pixels(area_m2: float, scale: float) -> float:
+    return float(area_m2) / float(scale) ** 2
+
+
+def plan(area_m2: float, base_scale: float) -> Dict[str, Any]:
+    """Smallest scale (>= base) and tileScale that fit the pixel limits for ``area_m2``."""
+    scale = float(base_scale)
+    pixels = estimate_pixels(area_m2, scale)
+    if pixels > REDUCE_CONFIG["max_pixels"]:
+        scale = math.ceil(scale * math.sqrt(pixels / REDUCE_CONFIG["max_pixels"]))
+        pixels = estimate_pixels(area_m2, scale)
+    tile_scale = next((ts for ts in REDUCE_CONFIG["tile_scales"]
+                       if pixels / (ts * ts) <= REDUCE_CONFIG["pixels_per_tile"]),
+                      REDUCE_CONFIG["tile_scales"][-1])
+    return {"scale": scale, "tileScale": tile_scale, "bestEffort": True,
+            "maxPixels": REDUCE_CONFIG["max_pixels"], "predicted_pixels": int(pixels)}
+
+
+def escalation_ladder(start: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Settings to try in order: the start plan, then higher tileScale, then coarser scale."""
+    ladder = [dict(start)]
+    scales = [start["scale"] * 2 ** k for k in range(REDUCE_CONFIG["max_scale_steps"] + 1)]
+    for k, scale in enumerate(scales):
+        for ts in REDUCE_CONFIG["tile_scales"]:
+            if k == 0 and ts <= start["tileScale"]:
+                continue
+            if k > 0 and ts < start["tileScale"]:
+                continue
+            step = dict(start, scale=scale, tileScale=ts)
+            step["predicted_pixels"] = int(start["predicted_pixels"] * (start["scale"] / scale) ** 2)
+            ladder.append(step)
+    return ladder
+
+
+class ReduceHistory:
+    """Thread-safe JSON record of the last successful settings and recent failures per city/reducer."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or REDUCE_CONFIG["history_path"])
+        self._lock = threading.Lock()
+        try:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            self._data = {}
+
+    @staticmethod
+    def key(city: str, reducer_key: str) -> str:
+        return f"{city}|{reducer_key}"
+
+    def known_good(self, city: str, reducer_key: str) -> Optional[Dict[str, Any]]:
+        return self._data.get(self.key(city, reducer_key), {}).get("ok")
+
+    def record(self, city: str, reducer_key: str, settings: Dict[str, Any], error: Optional[str] = None) -> None:
+        with self._lock:
+            entry = self._data.setdefault(self.key(city, reducer_key), {"ok": None, "failures": []})
+            stamp = datetime.datetime.now().isoformat(timespec="seconds")
+            if error is None:
+                entry["ok"] = dict(settings, updated=stamp)
+            else:
+                entry["failures"] = (entry["failures"] + [dict(settings, error=error, at=stamp)])[-REDUCE_CONFIG["max_failures_kept"]:]
+            self._save()
+
+    def _save(self) -> None:
+        from . import result_io
+        try:
+            result_io.write_json(self._data, self.path, compression=None, indent=2)
+        except Exception as e:
+            print(f"Warning: could not save reduce history {self.path}: {e}")
+
+
+_HISTORY: Optional[ReduceHistory] = None
+
+
+def get_history() -> ReduceHistory:
+    global _HISTORY
+    if _HISTORY is None:
+        _HISTORY = ReduceHistory()
+    return _HISTORY
+
+
+def starting_settings(city: str, reducer_key: str, area_m2: float, base_scale: float) -> Dict[str, Any]:
+    """Known-good settings from history when available, otherwise the predicted plan."""
+    predicted = plan(area_m2, base_scale)
+    good = get_history().known_good(city, reducer_key)
+    if good and good.get("scale", 0) >= predicted["scale"]:
+        return dict(predicted, scale=good["scale"], tileScale=good["tileScale"],
+                    predicted_pixels=int(estimate_pixels(area_m2, good["scale"])))
+    return predicted
+
+
+def reduce_region(image: ee.Image, geometry: ee.Geometry, reducer: ee.Reducer, city: str, reducer_key: str,
+                  base_scale: float, area_m2: Optional[float] = None, zone: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run ``image.reduceRegion(...).getInfo()`` with planned settings and history-backed escalation.
+
+    ``reducer_key`` identifies the reduction (e.g. ``"suhi_zonal:urban_core"``) in the
+    history. Provide ``area_m2`` or a ``zone`` name for the pixel prediction.
+    Returns ``(values, settings_used)``; non-resource errors are raised unchanged.
+    """
+    if area_m2 is None:
+        area_m2 = zone_area_m2(city, zone or "urban_core")
+    history = get_history()
+    last_error: Optional[Exception] = None
+    for settings in escalation_ladder(starting_settings(city, reducer_key, area_m2, base_scale)):
+        try:
+            values = image.reduceRegion(reducer=reducer, geometry=geometry, scale=settings["scale"],
+                                        maxPixels=settings["maxPixels"], bestEffort=settings["bestEffort"],
+                                        tileScale=settings["tileScale"]).getInfo()
+        except Exception as e:
+            kind = classify_error(e)
+            if kind is None:
+                raise
+            history.record(city, reducer_key, settings, error=kind)
+            last_error = e
+            continue
+        history.record(city, reducer_key, settings)
+        return values or {}, settings
+    raise last_error if last_error is not None else RuntimeError("reduce_region: empty escalation ladder")
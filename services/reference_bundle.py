@@ -0,0 +1,360 @@
+"""
+Compiled reference-data bundle for population, GDP and facility inputs
+`build_bundle` validates the ExternalData sources (regional population
+workbook, school/hospital/kindergarten facility files) and the built-in city
+table, then compiles them once into ``ExternalData/compiled/``:
+
+  manifest.json    bundle version, per-source size/mtime/sha256, validation counts
+  tables.npz       city table (population, GDP, area, density) and the
+                   workbook-derived supplemental population/GDP columns
+  facilities.npz   (lon, lat) arrays per facility type
+  facilities.pkl   facility records in the `social_sector.load_external_data` layout
+
+`load_bundle` returns the compiled bundle and rebuilds it only when a source
+file (or the built-in city table) changed; stat-identical sources skip hashing.
+When the bundle directory is not writable the sources are compiled in memory.
+pyarrow is only an optional extra here (used by `tidy_export` when
+installed), so the bundle is written with NumPy and pickle and always loads
+without it.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+import datetime
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from . import result_io
+
+BUNDLE_VERSION = 1
+
+REFERENCE_CONFIG = {
+    "source_dir": Path(__file__).parent.parent / "ExternalData",
+    "bundle_dirname": "compiled",
+}
+
+# Bundle key -> source file name in ExternalData
+SOURCES = {
+    "population_workbook": "uzbekistan_pop_grp.xlsx",
+    "schools": "Schools_assessed.json",
+    "hospitals": "Hospitals.json",
+    "kindergardens_gov": "KinderGardenGov.json",
+    "kindergardens_private": "KinderGardenPrivate.json",
+}
+
+_BUNDLES: Dict[Path, 'ReferenceBundle'] = {}
+
+
+def parse_population_workbook(excel_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Supplemental population/GDP per city from the regional population workbook"""
+    user_data = {}
+    
+    try:
+        if not Path(excel_path).exists():
+            print("[WARNING] User population data file not found, using hardcoded values")
+            return user_data
+        
+        # Read the Excel file
+        pop_df = pd.read_excel(excel_path)
+        
+        # City to region mapping for Uzbekistan cities
+        city_region_mapping = {
+            'Tashkent': ['Tashkent city', 'Tashkent region'],
+            'Samarkand': ['Samarkand region'],
+            'Bukhara': ['Bukhara region'],
+            'Andijan': ['Andijan region'],
+            'Namangan': ['Namangan region'],
+            'Fergana': ['Fergana region'],
+            'Nukus': ['Republic of Karakalpakstan'],
+            'Urgench': ['Khorezm region'],
+            'Jizzakh': ['Jizzakh region'],
+            'Qarshi': ['Kashkadarya region'],
+            'Navoiy': ['Navoi region'],
+            'Termez': ['Surkhandarya region'],
+            'Gulistan': ['Syrdarya region'],
+            'Nurafshon': ['Tashkent region']  # Nurafshon is in Tashkent region
+        }
+        
+        # Extract population data (assuming population is in thousands)
+        for city, regions in city_region_mapping.items():
+            for region in regions:
+                # Look for the region in the first column
+                matches = pop_df[pop_df.iloc[:, 0].astype(str).str.contains(region.replace(' region', '').replace(' Republic of ', ''), case=False, na=False)]
+                
+                if not matches.empty:
+                    # Get the population value (assuming it's in column 1, in thousands)
+                    pop_value = matches.iloc[0, 1]  # Population in thousands
+                    if pd.notna(pop_value):
+                        try:
+                            # Convert to actual population (multiply by 1000)
+                            # Handle pandas/numpy scalar types
+                            if hasattr(pop_value, 'item'):
+                                pop_value = pop_value.item()
+                            elif not isinstance(pop_value, (int, float)):
+                                pop_value = str(pop_value)
+                            actual_pop = float(pop_value) * 1000
+                        except (ValueError, TypeError) as conv_error:
+                            print(f"[WARNING] Could not convert population value {pop_value}: {conv_error}")
+                            continue
+                        
+                        # Estimate GDP per capita (using regional averages)
+                        gdp_estimates = {
+                            'Tashkent': 4000,  # Capital city
+                            'Samarkand': 2500,  # Historic city
+                            'Bukhara': 2200,    # Tourism-dependent
+                            'Andijan': 2000,    # Agricultural region
+                            'Namangan': 1900,   # Industrial region
+                            'Fergana': 1800,    # Agricultural valley
+                            'Nukus': 1600,      # Remote region
+                            'Urgench': 1700,    # Agricultural region
+                            'Jizzakh': 1800,    # Mixed economy
+                            'Qarshi': 1900,     # Agricultural
+                            'Navoiy': 2800,     # Mining region
+                            'Termez': 1700,     # Border region
+                            'Gulistan': 1600,   # Agricultural
+                            'Nurafshon': 3500   # Suburban to capital
+                        }
+                        
+                        user_data[city] = {
+                            'population': int(actual_pop),
+                            'gdp_per_capita': gdp_estimates.get(city, 2000)
+                        }
+                        break  # Use first match found
+        
+        if user_data:
+            print(f"[SUCCESS] Loaded user population data for {len(user_data)} cities")
+        else:
+            print("[WARNING] No user population data could be extracted from Excel file")
+        
+    except Exception as e:
+        print(f"[ERROR] Failed to load user population data: {e}")
+    
+    return user_data
+
+
+
+def _city_table_hash() -> str:
+    from .climate_data_loader import UZBEK_CITIES_DATA
+    return hashlib.sha256(json.dumps(UZBEK_CITIES_DATA, sort_keys=True).encode()).hexdigest()
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_state(source_dir: Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Size/mtime/sha256 per source; sha256 is reused from ``previous`` when size and mtime match"""
+    state = {}
+    for key, name in SOURCES.items():
+        path = Path(source_dir) / name
+        if not path.exists():
+            state[key] = None
+            continue
+        st = path.stat()
+        prev = (previous or {}).get(key) or {}
+        if prev.get("size") == st.st_size and prev.get("mtime_ns") == st.st_mtime_ns:
+            digest = prev["sha256"]
+        else:
+            digest = _sha256(path)
+        state[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+    state["city_table"] = {"sha256": _city_table_hash()}
+    return state
+
+
+def _same_sources(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    digests = lambda s: {k: (v or {}).get("sha256") for k, v in s.items()}
+    return digests(a) == digests(b)
+
+
+def _read_facility_sources(source_dir: Path) -> Dict[str, Any]:
+    """Facility records in the layout of `social_sector.load_external_data`"""
+    def read(key):
+        path = Path(source_dir) / SOURCES[key]
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    schools = read("schools")
+    return {
+        "schools": schools if schools is not None else {"type": "FeatureCollection", "features": []},
+        "hospitals": (read("hospitals") or {}).get("result", []),
+        "kindergardens_gov": (read("kindergardens_gov") or {}).get("result", []),
+        "kindergardens_private": (read("kindergardens_private") or {}).get("result", []),
+    }
+
+
+def _validate_facilities(external_data: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Count records per source and those without usable coordinates"""
+    def valid_number(v):
+        try:
+            return np.isfinite(float(v)) and float(v) != 0.0
+        except (TypeError, ValueError):
+            return False
+
+    report = {}
+    features = external_data["schools"].get("features", [])
+    bad = sum(1 for f in features
+              if not (f.get("geometry") or {}).get("type") == "Point"
+              or len((f.get("geometry") or {}).get("coordinates") or []) < 2)
+    report["schools"] = {"records": len(features), "invalid_coordinates": bad}
+    for key in ("hospitals", "kindergardens_gov", "kindergardens_private"):
+        items = external_data[key]
+        bad = sum(1 for it in items if not (valid_number(it.get("lat")) and valid_number(it.get("long"))))
+        report[key] = {"records": len(items), "invalid_coordinates": bad}
+    for key, counts in report.items():
+        if counts["invalid_coordinates"]:
+            print(f"[WARNING] {key}: {counts['invalid_coordinates']} of {counts['records']} records lack valid coordinates")
+    return report
+
+
+def _city_tables(supplemental: Dict[str, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    from .climate_data_loader import UZBEK_CITIES_DATA
+    cities = list(UZBEK_CITIES_DATA)
+    pop = np.array([UZBEK_CITIES_DATA[c].get("pop_2024", 100000) for c in cities], dtype=float)
+    area = np.array([UZBEK_CITIES_DATA[c].get("area_km2", 50.0) for c in cities], dtype=float)
+    sup_cities = list(supplemental)
+    return {
+        "city": np.array(cities, dtype=str),
+        "population": pop,
+        "gdp_per_capita": np.array([UZBEK_CITIES_DATA[c].get("gdp_per_capita", np.nan) for c in cities], dtype=float),
+        "area_km2": area,
+        "density": np.where(area > 0, pop / np.where(area > 0, area, 1.0), 1000.0),
+        "supplemental_city": np.array(sup_cities, dtype=str),
+        "supplemental_population": np.array([supplemental[c]["population"] for c in sup_cities], dtype=np.int64),
+        "supplemental_gdp_per_capita": np.array([supplemental[c]["gdp_per_capita"] for c in sup_cities], dtype=float),
+    }
+
+
+def _write_atomic(path: Path, write) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+def _compile(source_dir: Path) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], Dict[str, Any], Dict[str, Any]]:
+    """(tables, facility points, facility records, validation report) from the sources"""
+    from .facility_access import load_facility_points
+    supplemental = parse_population_workbook(source_dir / SOURCES["population_workbook"])
+    tables = _city_tables(supplemental)
+    external_data = _read_facility_sources(source_dir)
+    validation = {"facilities": _validate_facilities(external_data),
+                  "supplemental_population_cities": len(supplemental)}
+    return tables, load_facility_points(external_data), external_data, validation
+
+
+def _manifest(source_dir: Path, state: Optional[Dict[str, Any]], validation: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": BUNDLE_VERSION,
+        "built": datetime.datetime.now().isoformat(timespec="seconds"),
+        "sources": state or source_state(source_dir),
+        "validation": validation,
+    }
+
+
+def build_bundle(source_dir: Optional[Path] = None, state: Optional[Dict[str, Any]] = None) -> Path:
+    """Validate and compile all reference sources; returns the bundle directory"""
+    source_dir = Path(source_dir or REFERENCE_CONFIG["source_dir"]).resolve()
+    out = source_dir / REFERENCE_CONFIG["bundle_dirname"]
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path = out / "manifest.json"
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    tables, points, external_data, validation = _compile(source_dir)
+
+    _write_atomic(out / "tables.npz", lambda f: np.savez(f, **tables))
+    _write_atomic(out / "facilities.npz", lambda f: np.savez(f, **points))
+    _write_atomic(out / "facilities.pkl", lambda f: pickle.dump(external_data, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+    manifest = _manifest(source_dir, state, validation)
+    result_io.write_json(manifest, manifest_path, compression=None, indent=2)
+    print(f"[OK] Compiled reference bundle: {out}")
+    return out
+
+
+class ReferenceBundle:
+    """Loaded reference bundle; facility records are unpickled on first use"""
+
+    def __init__(self, path: Path):
+        self.path: Optional[Path] = Path(path)
+        self.manifest = result_io.read_json(self.path / "manifest.json")
+        with np.load(self.path / "tables.npz") as z:
+            self.tables = {k: z[k] for k in z.files}
+        with np.load(self.path / "facilities.npz") as z:
+            self.facility_points = {k: z[k] for k in z.files}
+        self._external_data = None
+
+    @classmethod
+    def in_memory(cls, source_dir: Path, state: Optional[Dict[str, Any]] = None) -> 'ReferenceBundle':
+        """Bundle compiled from the sources without writing it (``path`` is None)"""
+        tables, points, external_data, validation = _compile(source_dir)
+        bundle = cls.__new__(cls)
+        bundle.path = None
+        bundle.manifest = _manifest(source_dir, state, validation)
+        bundle.tables = tables
+        bundle.facility_points = points
+        bundle._external_data = dict(external_data, facility_points=points)
+        return bundle
+
+    @property
+    def supplemental_population(self) -> Dict[str, Dict[str, Any]]:
+        """Workbook-derived ``{city: {'population', 'gdp_per_capita'}}``"""
+        t = self.tables
+        return {str(c): {"population": int(p), "gdp_per_capita": float(g)}
+                for c, p, g in zip(t["supplemental_city"], t["supplemental_population"], t["supplemental_gdp_per_capita"])}
+
+    def city_population(self) -> Dict[str, Dict[str, float]]:
+        """``{city: {'population', 'area_km2', 'density'}}`` from the built-in city table"""
+        t = self.tables
+        return {str(c): {"population": float(p), "area_km2": float(a), "density": float(d)}
+                for c, p, a, d in zip(t["city"], t["population"], t["area_km2"], t["density"])}
+
+    @property
+    def external_data(self) -> Dict[str, Any]:
+        """Facility records as returned by `social_sector.load_external_data` (plus compiled points)"""
+        if self._external_data is None:
+            with open(self.path / "facilities.pkl", "rb") as f:
+                self._external_data = pickle.load(f)
+            self._external_data["facility_points"] = self.facility_points
+        return self._external_data
+
+
+def load_bundle(source_dir: Optional[Path] = None, rebuild: bool = False) -> ReferenceBundle:
+    """Compiled bundle for ``source_dir``, rebuilt only when a source changed"""
+    source_dir = Path(source_dir or REFERENCE_CONFIG["source_dir"]).resolve()
+    bundle_dir = source_dir / REFERENCE_CONFIG["bundle_dirname"]
+    try:
+        manifest = result_io.read_json(bundle_dir / "manifest.json")
+    except Exception:
+        manifest = None
+
+    cached = _BUNDLES.get(source_dir)
+    previous = (manifest or {}).get("sources")
+    if previous is None and cached is not None and cached.path is None:
+        previous = cached.manifest["sources"]
+    state = source_state(source_dir, previous)
+    if not rebuild and manifest and manifest.get("version") == BUNDLE_VERSION and _same_sources(previous, state):
+        if cached is not None and cached.manifest.get("built") == manifest.get("built"):
+            return cached
+        bundle = ReferenceBundle(bundle_dir)
+    elif not rebuild and cached is not None and cached.path is None and _same_sources(cached.manifest["sources"], state):
+        return cached
+    else:
+        try:
+            bundle = ReferenceBundle(build_bundle(source_dir, state))
+        except OSError as e:
+            print(f"[WARNING] Cannot write reference bundle to {bundle_dir} ({e}); compiling in memory")
+            bundle = ReferenceBundle.in_memory(source_dir, state)
+    _BUNDLES[source_dir] = bundle
+    return bundle
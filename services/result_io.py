@@ -0,0 +1,274 @@
+"""Shared result writer for unit outputs.
+
+`write_json` replaces the per-unit ``make_json_safe`` + ``json.dump(indent=2)``
+pattern: numpy scalars/arrays, paths and deferred Earth Engine values are
+handled by the encoder hook (EE values resolved in one batched getInfo), the
+file is written to a temp name and atomically renamed, and output can be
+gzip/zstd compressed. Large repeated structures (facility lists, histograms)
+under the requested key paths go to a columnar sidecar next to the main file;
+`read_json` transparently reverses all of this.
+
+orjson and zstandard are optional; without them the stdlib json/gzip path is used.
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+import datetime
+import gzip
+import json
+import os
+
+import numpy as np
+
+from .utils import resolve_ee_values, _UNRESOLVED
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except Exception:
+    HAS_ZSTD = False
+
+RESULT_IO_CONFIG = {
+    "compression": None,   # None, 'gzip' or 'zstd'
+    "indent": None,        # None writes compact JSON
+    "zstd_level": 10,
+    "gzip_level": 6,
+}
+
+_COMPRESSION_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+SIDECAR_KEY = "$sidecar"
+
+
+def _json_default(o: Any, resolved: Dict[int, Any]) -> Any:
+    """Encoder hook for everything json/orjson cannot serialize natively."""
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return None if not np.isfinite(o) else float(o)
+    if isinstance(o, np.bool_):
+        return bool(o)
+    if isinstance(o, (set, frozenset, tuple)):
+        return list(o)
+    if isinstance(o, Path):
+        return str(o)
+    if isinstance(o, (datetime.date, datetime.datetime)):
+        return o.isoformat()
+    if id(o) in resolved:
+        val = resolved[id(o)]
+        return str(o) if val is _UNRESOLVED else val
+    return str(o)
+
+
+def dumps(data: Any, indent: Optional[int] = None, resolved: Optional[Dict[int, Any]] = None) -> bytes:
+    """Serialize ``data`` to UTF-8 JSON bytes with the numpy/EE-aware encoder."""
+    if resolved is None:
+        resolved = resolve_ee_values(data)
+    default = lambda o: _json_default(o, resolved)
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, default=default, option=option)
+        except TypeError:
+            # e.g. non-contiguous arrays or exotic keys: fall through to stdlib json
+            pass
+    return json.dumps(data, default=default, indent=indent, ensure_ascii=False).encode('utf-8')
+
+
+def _is_records(v: Any) -> bool:
+    return isinstance(v, list) and len(v) > 0 and all(isinstance(r, dict) for r in v)
+
+
+def _is_numeric_mapping(v: Any) -> bool:
+    return (isinstance(v, dict) and len(v) > 0
+            and all(isinstance(x, (int, float, np.integer, np.floating)) and not isinstance(x, bool)
+                    for x in v.values()))
+
+
+def _flatten_record(rec: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    flat = {}
+    for k, v in rec.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict) and v:
+            flat.update(_flatten_record(v, key + '.'))
+        else:
+            flat[key] = v
+    return flat
+
+
+def _unflatten_record(flat: Dict[str, Any]) -> Dict[str, Any]:
+    rec: Dict[str, Any] = {}
+    for key, v in flat.items():
+        node = rec
+        parts = key.split('.')
+        for p in parts[:-1]:
+            node = node.setdefault(p, {})
+        node[parts[-1]] = v
+    return rec
+
+
+def _to_columns(v: Any) -> Optional[Dict[str, Any]]:
+    """Columnar block for ``v``, or None when its records can't round-trip as flat columns."""
+    if _is_numeric_mapping(v):
+        return {"kind": "mapping", "keys": [str(k) for k in v.keys()], "values": list(v.values())}
+    rows = [_flatten_record(r) for r in v]
+    names = list(dict.fromkeys(k for r in rows for k in r))
+    # A key that is a nested dict in some rows and a leaf (e.g. None) in others
+    if any(n + '.' == m[:len(n) + 1] for n in names for m in names):
+        return None
+    return {"kind": "records", "rows": len(rows),
+            "columns": {n: [r.get(n) for r in rows] for n in names}}
+
+
+def _from_columns(block: Dict[str, Any]) -> Any:
+    if block.get("kind") == "mapping":
+        return dict(zip(block["keys"], block["values"]))
+    cols = block["columns"]
+    return [_unflatten_record({n: cols[n][i] for n in cols}) for i in range(block["rows"])]
+
+
+def _split_columnar(data: Any, paths: Iterable[str], min_rows: int, sidecar_name: str) -> Tuple[Any, Dict[str, Any]]:
+    """Move record lists / numeric mappings found under ``paths`` into a columnar block dict."""
+    blocks: Dict[str, Any] = {}
+
+    def extract(node: Any, key: str) -> Any:
+        if (_is_records(node) or _is_numeric_mapping(node)) and len(node) >= min_rows:
+            block = _to_columns(node)
+            if block is None:
+                return node
+            blocks[key] = block
+            return {SIDECAR_KEY: sidecar_name, "key": key, "rows": len(node)}
+        if isinstance(node, dict):
+            return {k: extract(v, f"{key}.{k}") for k, v in node.items()}
+        return node
+
+    def walk(node: Any, parts: list, key: str) -> Any:
+        if not parts:
+            return extract(node, key)
+        if not isinstance(node, dict):
+            return node
+        head, rest = parts[0], parts[1:]
+        out = dict(node)
+        for k in (node.keys() if head == '*' else [head]):
+            if k in node:
+                out[k] = walk(node[k], rest, f"{key}.{k}" if key else str(k))
+        return out
+
+    for path in paths:
+        data = walk(data, path.split('.'), '')
+    return data, blocks
+
+
+def _open_write(path: Path, compression: Optional[str]):
+    if compression == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=RESULT_IO_CONFIG['gzip_level'])
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=RESULT_IO_CONFIG['zstd_level']).stream_writer(open(path, 'wb'))
+    return open(path, 'wb')
+
+
+def _write_bytes_atomic(path: Path, payload: bytes, compression: Optional[str]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with _open_write(tmp, compression) as fh:
+            fh.write(payload)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def _resolve_compression(compression: Optional[str]) -> Optional[str]:
+    if compression == 'config':
+        compression = RESULT_IO_CONFIG['compression']
+    if compression == 'zstd' and not HAS_ZSTD:
+        compression = 'gzip'
+    return compression
+
+
+def sidecar_name(path: Path, compression: Optional[str] = 'config') -> str:
+    """File name of the columnar sidecar ``write_json`` uses for ``path``."""
+    path = Path(path)
+    return path.stem + '.columns.json' + _COMPRESSION_SUFFIX.get(_resolve_compression(compression), '')
+
+
+def write_json(data: Any, path: Path, compression: Optional[str] = 'config', indent: Optional[int] = -1,
+               columnar: Optional[Iterable[str]] = None, min_rows: int = 1) -> Path:
+    """Write ``data`` as JSON atomically and return the final path.
+
+    ``compression`` ('gzip'/'zstd'/None, default from RESULT_IO_CONFIG) appends
+    ``.gz``/``.zst`` to ``path``. ``columnar`` lists dotted key paths (``*``
+    matches any key) whose record lists and numeric mappings with at least
+    ``min_rows`` entries are moved to ``<name>.columns.json`` and replaced by a
+    ``{"$sidecar": ..., "key": ...}`` reference.
+    """
+    path = Path(path)
+    compression = _resolve_compression(compression)
+    if indent == -1:
+        indent = RESULT_IO_CONFIG['indent']
+    suffix = _COMPRESSION_SUFFIX.get(compression, '')
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    resolved = resolve_ee_values(data)
+    if columnar:
+        sidecar = path.with_name(sidecar_name(path, compression))
+        data, blocks = _split_columnar(data, columnar, min_rows, sidecar.name)
+        if blocks:
+            _write_bytes_atomic(sidecar, dumps(blocks, resolved=resolved), compression)
+
+    final = path.with_name(path.name + suffix)
+    _write_bytes_atomic(final, dumps(data, indent=indent, resolved=resolved), compression)
+    return final
+
+
+def _read_bytes(path: Path) -> bytes:
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rb') as fh:
+            return fh.read()
+    if path.suffix == '.zst':
+        if not HAS_ZSTD:
+            raise ImportError("zstandard is required to read .zst results")
+        with open(path, 'rb') as fh:
+            return zstandard.ZstdDecompressor().stream_reader(fh).read()
+    return path.read_bytes()
+
+
+def read_json(path: Path, load_sidecar: bool = True) -> Any:
+    """Read a file written by ``write_json`` (plain or compressed), re-inlining sidecar blocks."""
+    path = Path(path)
+    if not path.exists():
+        for suffix in _COMPRESSION_SUFFIX.values():
+            candidate = path.with_name(path.name + suffix)
+            if candidate.exists():
+                path = candidate
+                break
+    data = json.loads(_read_bytes(path))
+    if not load_sidecar:
+        return data
+
+    cache: Dict[str, Dict[str, Any]] = {}
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            if SIDECAR_KEY in node and 'key' in node:
+                name = node[SIDECAR_KEY]
+                if name not in cache:
+                    cache[name] = json.loads(_read_bytes(path.with_name(name)))
+                return _from_columns(cache[name][node['key']])
+            return {k: inline(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [inline(v) for v in node]
+        return node
+
+    return inline(data)
@@ -0,0 +1,184 @@
+"""
+Year-resolved IPCC AR6 risk panel
+Assembles a city × year × indicator tensor per component from the loaded data
+and scores every city-year in one vectorized pass. Indicators with yearly
+sources (heat, air quality, VIIRS, vegetation access) vary by year; all other
+indicators keep their latest assessed value. Ranked indicators are normalized
+per year (across cities) or across the whole panel.
+"""
+
+import json
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+
+from .climate_risk_assessment import IPCCRiskAssessmentService, ClimateRiskMetrics
+from .metrics_store import MetricsStore
+from .assessment_session import COMPONENT_INDICATORS, SOCIAL_ONLY, NON_SOCIAL_ONLY
+from .trends import trends_for_series
+from . import result_io
+
+# Indicators with yearly sources: (component, weight key) -> needs cross-city rank normalization
+YEAR_RESOLVED = {
+    ('hazard', 'heat'): True,
+    ('hazard', 'air_quality'): False,
+    ('exposure', 'viirs'): True,
+    ('vulnerability', 'veg_access'): False,
+}
+
+NORMALIZE_MODES = ('year', 'panel')
+
+
+class RiskPanel:
+    """City × year × indicator tensors with vectorized HEV / adjusted risk scoring"""
+
+    def __init__(self, service: IPCCRiskAssessmentService,
+                 results: Optional[Dict[str, ClimateRiskMetrics]] = None,
+                 years: Optional[List[int]] = None):
+        self.service = service
+        results = results if results is not None else service.assess_all_cities()
+        store = MetricsStore.coerce(results)
+        self.cities: List[str] = list(results.keys())
+        self.years: List[int] = sorted(years) if years else self._available_years()
+        n_city, n_year = len(self.cities), len(self.years)
+
+        has_social = np.array([bool(service._load_social_sector_data(c)) for c in self.cities])
+        self.static: Dict[str, np.ndarray] = {}
+        self.masks: Dict[str, np.ndarray] = {}
+        self.weights: Dict[str, np.ndarray] = {}
+        base_weights = {
+            'hazard': service.hazard_weights,
+            'exposure': service.exposure_weights,
+            'vulnerability': service.vulnerability_weights,
+            'adaptive_capacity': service.adaptive_capacity_weights,
+        }
+        for component, indicators in COMPONENT_INDICATORS.items():
+            keys = list(indicators)
+            self.static[component] = store.matrix([indicators[k] for k in keys])
+            mask = np.ones((n_city, len(keys)), dtype=float)
+            for j, k in enumerate(keys):
+                if k in SOCIAL_ONLY.get(component, ()):
+                    mask[:, j] = has_social
+                elif k in NON_SOCIAL_ONLY.get(component, ()):
+                    mask[:, j] = ~has_social
+            self.masks[component] = mask
+            self.weights[component] = np.array([float(base_weights[component].get(k, 0.0)) for k in keys])
+
+        # Temperature years are int keys in the loader, the JSON-backed sources use str keys
+        self._temperature: Dict[str, Dict[int, Any]] = {
+            city: {int(y): v for y, v in city_years.items() if str(y).isdigit()}
+            for city, city_years in service.data.get('temperature_data', {}).items()
+        }
+
+        # Raw yearly values (NaN where a city-year has no source data)
+        self.raw: Dict[tuple, np.ndarray] = {key: np.full((n_city, n_year), np.nan) for key in YEAR_RESOLVED}
+        for i, city in enumerate(self.cities):
+            for t, year in enumerate(self.years):
+                for key in YEAR_RESOLVED:
+                    self.raw[key][i, t] = self._raw_value(key, city, str(year))
+        self._check_heat_resolved()
+
+    def _check_heat_resolved(self) -> None:
+        """Heat must vary across years wherever the yearly temperature inputs do"""
+        heat = self.raw[('hazard', 'heat')]
+        for i, city in enumerate(self.cities):
+            present = [(t, self._temperature[city][y]) for t, y in enumerate(self.years)
+                       if self._temperature.get(city, {}).get(y)]
+            inputs = {json.dumps(d, sort_keys=True, default=str) for _, d in present}
+            if len(inputs) > 1:
+                values = heat[i, [t for t, _ in present]]
+                assert np.isfinite(values).all() and np.ptp(values) > 0, \
+                    f"{city}: heat hazard is not year-resolved ({values.tolist()})"
+
+    def _available_years(self) -> List[int]:
+        data = self.service.data
+        years = set()
+        for city_years in data.get('temperature_data', {}).values():
+            years.update(int(y) for y in city_years if str(y).isdigit())
+        for nl in data.get('nightlights_data', []):
+            years.update(int(y) for y in nl.get('years', {}) if str(y).isdigit())
+        for aq in data.get('air_quality_data', {}).values():
+            years.update(int(y) for y in aq.get('yearly_results', {}) if str(y).isdigit())
+        return sorted(years)
+
+    def _raw_value(self, key: tuple, city: str, year: str) -> float:
+        data = self.service.data
+        if key == ('hazard', 'heat'):
+            year_data = self._temperature.get(city, {}).get(int(year))
+            return self.service._heat_indicator(year_data) if year_data else np.nan
+        if key == ('hazard', 'air_quality'):
+            if year not in data.get('air_quality_data', {}).get(city, {}).get('yearly_results', {}):
+                return np.nan
+            return self.service._calculate_air_quality_hazard(city, year)
+        if key == ('exposure', 'viirs'):
+            for nl in data['nightlights_data']:
+                if nl.get('city') == city:
+                    stats = nl.get('years', {}).get(year, {}).get('stats', {})
+                    if 'urban_core' in stats:
+                        return float(np.log((stats['urban_core'].get('mean') or 0) + 1))
+                    break
+            return np.nan
+        if key == ('vulnerability', 'veg_access'):
+            if year not in data['spatial_data'].get('per_year', {}).get(city, {}):
+                return np.nan
+            return self.service._calculate_veg_access_vulnerability(city, year)
+        return np.nan
+
+    def _normalize(self, raw: np.ndarray, mode: str) -> np.ndarray:
+        norm = self.service.data_loader.safe_percentile_norm
+        out = np.full(raw.shape, np.nan)
+        valid = np.isfinite(raw)
+        if mode == 'panel':
+            if valid.any():
+                out[valid] = norm(raw[valid], floor=0.05, ceiling=0.95)
+            return out
+        for t in range(raw.shape[1]):
+            col = valid[:, t]
+            if col.any():
+                out[col, t] = norm(raw[col, t], floor=0.05, ceiling=0.95)
+        return out
+
+    def tensors(self, normalize: str = 'year') -> Dict[str, np.ndarray]:
+        """City × year × indicator arrays per component (missing city-years keep the latest value)"""
+        if normalize not in NORMALIZE_MODES:
+            raise ValueError(f"normalize must be one of {NORMALIZE_MODES}")
+        out = {c: np.repeat(m[:, None, :], len(self.years), axis=1) for c, m in self.static.items()}
+        for (component, key), ranked in YEAR_RESOLVED.items():
+            values = self._normalize(self.raw[(component, key)], normalize) if ranked else self.raw[(component, key)]
+            j = list(COMPONENT_INDICATORS[component]).index(key)
+            out[component][:, :, j] = np.where(np.isfinite(values), values, out[component][:, :, j])
+        return out
+
+    def score(self, normalize: str = 'year') -> Dict[str, np.ndarray]:
+        """All composites, HEV, adjusted risk and adaptability as city × year arrays"""
+        tensors = self.tensors(normalize)
+        scores = {f'{c}_score': np.einsum('cyi,ci,i->cy', tensors[c], self.masks[c], self.weights[c])
+                  for c in COMPONENT_INDICATORS}
+        hev = scores['hazard_score'] * scores['exposure_score'] * scores['vulnerability_score']
+        risk = np.clip(hev * (1.0 - scores['adaptive_capacity_score']), 0.0, 1.0)
+        scores['hev_score'] = np.clip(hev, 0.0, 1.0)
+        scores['overall_risk_score'] = risk
+        scores['adaptability_score'] = np.clip(scores['adaptive_capacity_score'] / (1.0 + risk + 1e-6), 0.0, 1.0)
+        return scores
+
+    def trajectories(self, normalize: str = 'year') -> Dict[str, Any]:
+        """Per-city year-by-year scores, year-over-year risk changes and the risk trend"""
+        scores = self.score(normalize)
+        risk = scores['overall_risk_score']
+        fits = trends_for_series({c: (self.years, risk[i]) for i, c in enumerate(self.cities)}, min_points=3)
+        cities = {}
+        for i, city in enumerate(self.cities):
+            cities[city] = {
+                'years': {str(y): {name: float(arr[i, t]) for name, arr in scores.items()}
+                          for t, y in enumerate(self.years)},
+                'risk_change_yoy': {str(y): float(risk[i, t] - risk[i, t - 1]) for t, y in enumerate(self.years) if t > 0},
+                'risk_trend_per_year': fits[city]['ols_slope'],
+                'risk_trend_mk_p': fits[city]['mk_p'],
+            }
+        return {'normalize': normalize, 'years': self.years, 'cities': cities}
+
+    def export(self, path, normalize: str = 'year') -> Dict[str, Any]:
+        """Write trajectories as JSON for the reporter; returns the written payload"""
+        payload = self.trajectories(normalize)
+        payload['output_file'] = str(result_io.write_json(payload, path, compression=None, indent=2))
+        return payload
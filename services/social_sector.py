@@ -4,13 +4,16 @@ Analyzes hospitals, schools, and kindergardens within city boundaries to assess
 social infrastructure coverage, sanitation access, and educational/healthcare capacity.
 """
 
-import json
 import math
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict
 
+import numpy as np
+import pandas as pd
+
 from .utils import UZBEKISTAN_CITIES, create_output_directories
+from . import result_io
 from .climate_data_loader import UZBEK_CITIES_DATA
 
 
@@ -42,49 +45,26 @@ def is_point_in_city_buffer(lat: float, lon: float, city_lat: float, city_lon: f
 
 
 def load_external_data(data_dir: Path) -> Dict[str, Any]:
-    """Load all external data files."""
-    data = {}
-
-    # Load schools data (GeoJSON format)
-    schools_file = data_dir / "Schools_assessed.json"
-    if schools_file.exists():
-        with open(schools_file, 'r', encoding='utf-8') as f:
-            data['schools'] = json.load(f)
-    else:
-        data['schools'] = {"type": "FeatureCollection", "features": []}
-
-    # Load hospitals data
-    hospitals_file = data_dir / "Hospitals.json"
-    if hospitals_file.exists():
-        with open(hospitals_file, 'r', encoding='utf-8') as f:
-            hospitals_data = json.load(f)
-            data['hospitals'] = hospitals_data.get('result', [])
-    else:
-        data['hospitals'] = []
-
-    # Load government kindergardens
-    kg_gov_file = data_dir / "KinderGardenGov.json"
-    if kg_gov_file.exists():
-        with open(kg_gov_file, 'r', encoding='utf-8') as f:
-            kg_gov_data = json.load(f)
-            data['kindergardens_gov'] = kg_gov_data.get('result', [])
-    else:
-        data['kindergardens_gov'] = []
-
-    # Load private kindergardens
-    kg_private_file = data_dir / "KinderGardenPrivate.json"
-    if kg_private_file.exists():
-        with open(kg_private_file, 'r', encoding='utf-8') as f:
-            kg_private_data = json.load(f)
-            data['kindergardens_private'] = kg_private_data.get('result', [])
-    else:
-        data['kindergardens_private'] = []
-
-    return data
-
-
-def analyze_city_social_sector(city: str, external_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Analyze social sector infrastructure for a specific city."""
+    """Load all external data files (via the compiled reference bundle)."""
+    from .reference_bundle import load_bundle
+    return dict(load_bundle(data_dir).external_data)
+
+
+def _city_population(city: str) -> int:
+    """Use real population data from climate data loader, falling back to the city config."""
+    city_info = UZBEKISTAN_CITIES.get(city, {})
+    real_city_data = UZBEK_CITIES_DATA.get(city)
+    if real_city_data:
+        return real_city_data.get('pop_2024', city_info.get('population', 0))
+    return city_info.get('population', 0)
+
+
+def analyze_city_social_sector(city: str, external_data: Dict[str, Any], compute_indicators: bool = True) -> Dict[str, Any]:
+    """Analyze social sector infrastructure for a specific city.
+
+    With ``compute_indicators=False`` only facilities and counts are filled;
+    ``run_batch_social_analysis`` then computes indicators for all cities at once.
+    """
     if city not in UZBEKISTAN_CITIES:
         return {"error": f"City {city} not found in configuration"}
 
@@ -92,13 +72,6 @@ def analyze_city_social_sector(city: str, external_data: Dict[str, Any]) -> Dict
     city_lat, city_lon = city_info['lat'], city_info['lon']
     buffer_m = city_info['buffer_m']
 
-    # Use real population data from climate data loader
-    real_city_data = UZBEK_CITIES_DATA.get(city)
-    if real_city_data:
-        population = real_city_data.get('pop_2024', city_info.get('population', 0))
-    else:
-        population = city_info.get('population', 0)
-
     results = {
         "city": city,
         "city_info": city_info,
@@ -215,95 +188,201 @@ def analyze_city_social_sector(city: str, external_data: Dict[str, Any]) -> Dict
                 results["facilities"]["kindergardens_private"].append(kg_info)
                 results["summary"]["total_kindergardens"] += 1
 
-    # Calculate sanitation and infrastructure indicators
-    results["summary"]["sanitation_indicators"] = _calculate_sanitation_indicators(results["facilities"]["schools"])
-    results["summary"]["infrastructure_quality"] = _calculate_infrastructure_quality(results["facilities"]["schools"])
-
-    # Analyze water availability by administrative divisions
-    results["summary"]["water_by_district"] = _analyze_water_by_district(results["facilities"]["schools"])
-
-    # Calculate per capita social infrastructure metrics
-    results["summary"]["per_capita_metrics"] = _calculate_per_capita_metrics(results["summary"], population)
+    if compute_indicators:
+        indicators = compute_school_indicators(build_school_table({city: results["facilities"]["schools"]}))
+        _apply_school_indicators(results, indicators.get(city, {}))
 
     return results
 
 
-def _calculate_sanitation_indicators(schools: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Calculate sanitation indicators from school data."""
-    if not schools:
-        return {}
-
-    indicators = {
-        "electricity_access": 0.0,
-        "water_access": 0.0,
-        "internet_access": 0.0,
-        "sports_facilities": 0.0,
-        "dining_facilities": 0.0,
-        "activity_halls": 0.0,
-        "water_sources": {},  # Initialize as dict
-        "water_vulnerability_index": 0.0
-    }
+def _apply_school_indicators(results: Dict[str, Any], indicators: Dict[str, Any]) -> None:
+    """Fill sanitation/infrastructure/district indicators and per capita metrics into a city result."""
+    summary = results["summary"]
+    summary["sanitation_indicators"] = indicators.get('sanitation_indicators', {})
+    summary["infrastructure_quality"] = indicators.get('infrastructure_quality', {})
+    # Water availability by administrative divisions
+    summary["water_by_district"] = indicators.get('water_by_district', {})
+    # Per capita social infrastructure metrics
+    summary["per_capita_metrics"] = _calculate_per_capita_metrics(summary, _city_population(results["city"]))
 
-    # Detailed water source categorization
-    water_sources = {
-        "centralized": 0.0,  # ichimlik_suvi_manbaa_markaz
-        "local": 0.0,       # ichimlik_suvi_manbaa_lokal
-        "carried": 0.0,     # ichimlik_suvi_manbaa_olib_kelinadi
-        "none": 0.0         # ichimlik_suvi_yuq or empty
-    }
 
-    total_schools = len(schools)
+# Pre-encoded water source categories (first matching substring wins, as in the source survey values)
+WATER_CENTRALIZED, WATER_LOCAL, WATER_CARRIED, WATER_NONE, WATER_EMPTY, WATER_OTHER = range(6)
+_WATER_PATTERNS = (('markaz', WATER_CENTRALIZED), ('lokal', WATER_LOCAL),
+                   ('olib_kelinadi', WATER_CARRIED), ('yuq', WATER_NONE))
 
-    for school in schools:
-        sanitation = school.get('sanitation', {})
+SCHOOL_TABLE_COLUMNS = [
+    'city', 'district', 'water_code', 'water_present', 'electricity', 'internet',
+    'sports_ok', 'dining_ok', 'activity_ok', 'brick', 'multi_shift',
+    'construction_year', 'renovation_year',
+]
 
-        if sanitation.get('electricity') == 'elektr_bor':
-            indicators["electricity_access"] += 1
 
-        # Enhanced water source analysis
-        water_source = sanitation.get('water_source', '')
-        if water_source:
-            if 'markaz' in water_source.lower():
-                water_sources["centralized"] += 1
-                indicators["water_access"] += 1  # Count as having water access
-            elif 'lokal' in water_source.lower():
-                water_sources["local"] += 1
-                indicators["water_access"] += 1
-            elif 'olib_kelinadi' in water_source.lower():
-                water_sources["carried"] += 1
-                indicators["water_access"] += 1
-            elif 'yuq' in water_source.lower():
-                water_sources["none"] += 1
-        else:
-            water_sources["none"] += 1
+def _encode_water_source(value: str) -> int:
+    if not value:
+        return WATER_EMPTY
+    lowered = value.lower()
+    for pattern, code in _WATER_PATTERNS:
+        if pattern in lowered:
+            return code
+    return WATER_OTHER
 
-        if sanitation.get('internet'):
-            indicators["internet_access"] += 1
 
-        if sanitation.get('sports_hall') == 'sport_zal_qoniqarli':
-            indicators["sports_facilities"] += 1
+def _parse_year(value, empty_as_zero: bool = False) -> float:
+    """int() a year the way the survey parsing always has; NaN when unparsable."""
+    if empty_as_zero and not value:
+        return 0.0
+    try:
+        return float(int(value))
+    except (ValueError, TypeError):
+        return np.nan
 
-        if sanitation.get('dining_hall') == 'oshhona_holati_qoniqarli':
-            indicators["dining_facilities"] += 1
 
-        if sanitation.get('activity_hall') == 'aktiv_zal_qoniqarli':
-            indicators["activity_halls"] += 1
+def build_school_table(schools_by_city: Dict[str, List[Dict[str, Any]]]) -> pd.DataFrame:
+    """Normalize per-city school records into one columnar table with categorical codes.
 
-    # Convert to percentages
-    for key in ["electricity_access", "water_access", "internet_access", "sports_facilities", "dining_facilities", "activity_halls"]:
-        indicators[key] = round((indicators[key] / total_schools) * 100, 1) if total_schools > 0 else 0.0
+    Each school's Uzbek survey strings are matched exactly once here; all
+    indicators are then computed from the encoded columns.
+    """
+    rows = []
+    for city, schools in schools_by_city.items():
+        for school in schools:
+            sanitation = school.get('sanitation', {})
+            water_source = sanitation.get('water_source', '') or ''
+            rows.append((
+                city,
+                f"{school.get('viloyat', 'Unknown')} - {school.get('tuman', 'Unknown')}",
+                _encode_water_source(water_source),
+                bool(water_source) and 'yuq' not in water_source.lower(),
+                sanitation.get('electricity') == 'elektr_bor',
+                bool(sanitation.get('internet')),
+                sanitation.get('sports_hall') == 'sport_zal_qoniqarli',
+                sanitation.get('dining_hall') == 'oshhona_holati_qoniqarli',
+                sanitation.get('activity_hall') == 'aktiv_zal_qoniqarli',
+                school.get('building_material') == 'gisht',
+                school.get('shifts', 1) > 1,
+                _parse_year(school.get('construction_year', 0)),
+                _parse_year(school.get('renovation_year', 0), empty_as_zero=True),
+            ))
+    table = pd.DataFrame.from_records(rows, columns=SCHOOL_TABLE_COLUMNS)
+    table['water_code'] = table['water_code'].astype(np.int8)
+    for col in ('construction_year', 'renovation_year'):
+        # Empty tables come out as object columns; np.isnan needs floats
+        table[col] = pd.to_numeric(table[col], errors='coerce').astype(float)
+    if table.empty:
+        table['building_age_vulnerability'] = pd.Series(dtype=float)
+        return table
+    table['building_age_vulnerability'] = _building_age_vulnerability_column(
+        table['construction_year'].to_numpy(), table['renovation_year'].to_numpy()
+    )
+    return table
+
+
+def _building_age_vulnerability_column(construction_year: np.ndarray, renovation_year: np.ndarray,
+                                       current_year: int = 2024) -> np.ndarray:
+    """Per-school vulnerability scores (see ``_calculate_building_age_vulnerability``)."""
+    conditions = [
+        np.isnan(construction_year) | np.isnan(renovation_year),
+        renovation_year >= 2010,
+        construction_year >= 2000,
+        (renovation_year > 0) & (renovation_year >= 2000),
+        (current_year - construction_year) > 50,
+    ]
+    return np.select(conditions, [0.5, 0.1, 0.3, 0.4, 0.9], default=0.7)
+
+
+def _pct(count, total) -> float:
+    return round((float(count) / total) * 100, 1) if total > 0 else 0.0
+
+
+def compute_school_indicators(table: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """Sanitation, infrastructure and per-district water indicators for every city in one pass.
+
+    Returns ``{city: {'sanitation_indicators', 'infrastructure_quality', 'water_by_district'}}``;
+    cities without schools get empty dicts, matching the per-city helpers.
+    """
+    if table.empty:
+        return {}
+    t = table.assign(
+        water_access=table['water_code'].isin([WATER_CENTRALIZED, WATER_LOCAL, WATER_CARRIED]),
+        modern=table['construction_year'] >= 2000,
+        renovated=table['renovation_year'] >= 2010,
+        sanitation_score=0.25 * (table['electricity'].astype(float) + table['water_present']
+                                 + table['internet'] + table['sports_ok']),
+    )
+    water_onehot = pd.get_dummies(t['water_code']).reindex(columns=range(6), fill_value=0).astype(int)
+    water_onehot.columns = ['w_centralized', 'w_local', 'w_carried', 'w_none', 'w_empty', 'w_other']
+    t = pd.concat([t, water_onehot], axis=1)
+
+    city_sums = t.groupby('city', sort=False).agg(
+        n=('water_code', 'size'),
+        electricity=('electricity', 'sum'), water_access=('water_access', 'sum'),
+        internet=('internet', 'sum'), sports=('sports_ok', 'sum'), dining=('dining_ok', 'sum'),
+        activity=('activity_ok', 'sum'), modern=('modern', 'sum'), renovated=('renovated', 'sum'),
+        brick=('brick', 'sum'), multi_shift=('multi_shift', 'sum'),
+        w_centralized=('w_centralized', 'sum'), w_local=('w_local', 'sum'), w_carried=('w_carried', 'sum'),
+        w_none=('w_none', 'sum'), w_empty=('w_empty', 'sum'),
+        building_age_vulnerability=('building_age_vulnerability', 'mean'),
+    )
+    district_sums = t.groupby(['city', 'district'], sort=False).agg(
+        n=('water_code', 'size'),
+        w_centralized=('w_centralized', 'sum'), w_local=('w_local', 'sum'), w_carried=('w_carried', 'sum'),
+        w_none=('w_none', 'sum'), sanitation_score=('sanitation_score', 'sum'),
+    )
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for city, r in city_sums.iterrows():
+        n = int(r['n'])
+        water_sources = {
+            "centralized": _pct(r['w_centralized'], n),
+            "local": _pct(r['w_local'], n),
+            "carried": _pct(r['w_carried'], n),
+            "none": _pct(r['w_none'] + r['w_empty'], n),
+        }
+        out[city] = {
+            'sanitation_indicators': {
+                "electricity_access": _pct(r['electricity'], n),
+                "water_access": _pct(r['water_access'], n),
+                "internet_access": _pct(r['internet'], n),
+                "sports_facilities": _pct(r['sports'], n),
+                "dining_facilities": _pct(r['dining'], n),
+                "activity_halls": _pct(r['activity'], n),
+                "water_sources": water_sources,
+                "water_vulnerability_index": _calculate_water_vulnerability_index(water_sources),
+            },
+            'infrastructure_quality': {
+                "modern_buildings": _pct(r['modern'], n),
+                "recently_renovated": _pct(r['renovated'], n),
+                "brick_construction": _pct(r['brick'], n),
+                "multiple_shifts": _pct(r['multi_shift'], n),
+                "building_age_vulnerability": round(float(r['building_age_vulnerability']), 3),
+            },
+            'water_by_district': {},
+        }
+    for (city, district), r in district_sums.iterrows():
+        n = int(r['n'])
+        out[city]['water_by_district'][district] = {
+            "total_schools": n,
+            "water_sources_percent": {
+                "centralized": _pct(r['w_centralized'], n),
+                "local": _pct(r['w_local'], n),
+                "carried": _pct(r['w_carried'], n),
+                "none": _pct(r['w_none'], n),
+            },
+            "average_sanitation_score": round(float(r['sanitation_score']) / n, 2) if n > 0 else 0.0,
+        }
+    return out
 
-    # Convert water sources to percentages
-    for key in water_sources:
-        water_sources[key] = round((water_sources[key] / total_schools) * 100, 1) if total_schools > 0 else 0.0
 
-    # Add water source breakdown to indicators
-    indicators["water_sources"] = water_sources
+def _single_city_indicators(schools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return compute_school_indicators(build_school_table({'_': schools})).get('_', {})
 
-    # Calculate water vulnerability index
-    indicators["water_vulnerability_index"] = _calculate_water_vulnerability_index(water_sources)
 
-    return indicators
+def _calculate_sanitation_indicators(schools: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Calculate sanitation indicators from school data."""
+    if not schools:
+        return {}
+    return _single_city_indicators(schools)['sanitation_indicators']
 
 
 def _calculate_water_vulnerability_index(water_sources: Dict[str, float]) -> float:
@@ -343,112 +422,14 @@ def _calculate_infrastructure_quality(schools: List[Dict[str, Any]]) -> Dict[str
     """Calculate infrastructure quality indicators."""
     if not schools:
         return {}
-
-    quality = {
-        "modern_buildings": 0.0,  # Built after 2000
-        "recently_renovated": 0.0,  # Renovated after 2010
-        "brick_construction": 0.0,
-        "multiple_shifts": 0.0,
-        "building_age_vulnerability": 0.0  # Combined age and renovation assessment
-    }
-
-    total_schools = len(schools)
-
-    for school in schools:
-        # Construction year
-        try:
-            year = int(school.get('construction_year', 0))
-            if year >= 2000:
-                quality["modern_buildings"] += 1
-        except (ValueError, TypeError):
-            pass
-
-        # Renovation year
-        try:
-            reno_year = int(school.get('renovation_year', 0))
-            if reno_year >= 2010:
-                quality["recently_renovated"] += 1
-        except (ValueError, TypeError):
-            pass
-
-        # Building material
-        if school.get('building_material') == 'gisht':
-            quality["brick_construction"] += 1
-
-        # Multiple shifts (overcrowding indicator)
-        if school.get('shifts', 1) > 1:
-            quality["multiple_shifts"] += 1
-
-    # Convert to percentages
-    for key in ["modern_buildings", "recently_renovated", "brick_construction", "multiple_shifts"]:
-        quality[key] = round((quality[key] / total_schools) * 100, 1) if total_schools > 0 else 0.0
-
-    # Calculate building age vulnerability index
-    quality["building_age_vulnerability"] = _calculate_building_age_vulnerability(schools)
-
-    return quality
+    return _single_city_indicators(schools)['infrastructure_quality']
 
 
 def _analyze_water_by_district(schools: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Analyze water availability patterns by administrative districts."""
-    district_stats: Dict[str, Dict[str, Any]] = {}
-
-    for school in schools:
-        viloyat = school.get('viloyat', 'Unknown')
-        tuman = school.get('tuman', 'Unknown')
-        district_key = f"{viloyat} - {tuman}"
-
-        if district_key not in district_stats:
-            district_stats[district_key] = {
-                "total_schools": 0,
-                "water_sources": {"centralized": 0, "local": 0, "carried": 0, "none": 0},
-                "sanitation_score": 0.0
-            }
-
-        district_stats[district_key]["total_schools"] += 1
-
-        # Analyze water source
-        water_source = school.get('sanitation', {}).get('water_source', '')
-        if water_source:
-            if 'markaz' in water_source.lower():
-                district_stats[district_key]["water_sources"]["centralized"] += 1
-            elif 'lokal' in water_source.lower():
-                district_stats[district_key]["water_sources"]["local"] += 1
-            elif 'olib_kelinadi' in water_source.lower():
-                district_stats[district_key]["water_sources"]["carried"] += 1
-            elif 'yuq' in water_source.lower():
-                district_stats[district_key]["water_sources"]["none"] += 1
-
-        # Calculate sanitation score for district
-        sanitation = school.get('sanitation', {})
-        score = 0.0
-        if sanitation.get('electricity') == 'elektr_bor':
-            score += 0.25
-        if sanitation.get('water_source') and 'yuq' not in sanitation.get('water_source', '').lower():
-            score += 0.25
-        if sanitation.get('internet'):
-            score += 0.25
-        if sanitation.get('sports_hall') == 'sport_zal_qoniqarli':
-            score += 0.25
-
-        district_stats[district_key]["sanitation_score"] += score
-
-    # Convert to percentages and finalize
-    result = {}
-    for district, stats in district_stats.items():
-        total_schools = stats["total_schools"]
-        result[district] = {
-            "total_schools": total_schools,
-            "water_sources_percent": {
-                "centralized": round((stats["water_sources"]["centralized"] / total_schools) * 100, 1) if total_schools > 0 else 0.0,
-                "local": round((stats["water_sources"]["local"] / total_schools) * 100, 1) if total_schools > 0 else 0.0,
-                "carried": round((stats["water_sources"]["carried"] / total_schools) * 100, 1) if total_schools > 0 else 0.0,
-                "none": round((stats["water_sources"]["none"] / total_schools) * 100, 1) if total_schools > 0 else 0.0
-            },
-            "average_sanitation_score": round(stats["sanitation_score"] / total_schools, 2) if total_schools > 0 else 0.0
-        }
-
-    return result
+    if not schools:
+        return {}
+    return _single_city_indicators(schools)['water_by_district']
 
 
 def _calculate_building_age_vulnerability(schools: List[Dict[str, Any]]) -> float:
@@ -460,47 +441,13 @@ def _calculate_building_age_vulnerability(schools: List[Dict[str, Any]]) -> floa
     - Older buildings with recent renovation: Moderate vulnerability (0.4)
     - Older buildings without renovation: High vulnerability (0.7)
     - Very old buildings: Extreme vulnerability (0.9)
+    - Unparsable years: 0.5
 
     Returns: Vulnerability index from 0.0 (no vulnerability) to 1.0 (extreme vulnerability)
     """
     if not schools:
         return 0.0
-
-    total_vulnerability = 0.0
-    current_year = 2024  # Use current year for age calculation
-
-    for school in schools:
-        try:
-            construction_year = int(school.get('construction_year', 0))
-            renovation_year = int(school.get('renovation_year', 0)) if school.get('renovation_year') else 0
-
-            building_age = current_year - construction_year
-            years_since_renovation = current_year - renovation_year if renovation_year > 0 else float('inf')
-
-            # Determine vulnerability based on age and renovation status
-            if renovation_year >= 2010:
-                # Recently renovated - low vulnerability
-                vulnerability = 0.1
-            elif construction_year >= 2000:
-                # Modern building - moderate vulnerability
-                vulnerability = 0.3
-            elif renovation_year > 0 and renovation_year >= 2000:
-                # Older building but renovated recently - moderate vulnerability
-                vulnerability = 0.4
-            elif building_age > 50:
-                # Very old building - extreme vulnerability
-                vulnerability = 0.9
-            else:
-                # Older building without recent renovation - high vulnerability
-                vulnerability = 0.7
-
-            total_vulnerability += vulnerability
-
-        except (ValueError, TypeError):
-            # If we can't parse the years, assume moderate vulnerability
-            total_vulnerability += 0.5
-
-    return round(total_vulnerability / len(schools), 3)
+    return round(float(build_school_table({'_': schools})['building_age_vulnerability'].mean()), 3)
 
 
 def _calculate_per_capita_metrics(summary: Dict[str, Any], population: int) -> Dict[str, Any]:
@@ -528,8 +475,15 @@ def _calculate_per_capita_metrics(summary: Dict[str, Any], population: int) -> D
     }
 
 
-def run_batch_social_analysis(cities: Optional[List[str]] = None, verbose: bool = False) -> Dict[str, Any]:
-    """Run social sector analysis for multiple cities."""
+def run_batch_social_analysis(cities: Optional[List[str]] = None, verbose: bool = False,
+                              accessibility: bool = False, accessibility_cell_m: float = 200.0,
+                              accessibility_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Run social sector analysis for multiple cities.
+
+    With ``accessibility=True`` each city summary also gets distance-to-nearest
+    facility coverage and percentiles (see ``facility_access``); grids are written
+    as COGs to ``accessibility_dir`` when given.
+    """
     if cities is None:
         cities = list(UZBEKISTAN_CITIES.keys())
 
@@ -544,9 +498,16 @@ def run_batch_social_analysis(cities: Optional[List[str]] = None, verbose: bool
     for city in cities:
         if verbose:
             print(f"Analyzing social sector for {city}")
+        results[city] = analyze_city_social_sector(city, external_data, compute_indicators=False)
 
-        city_results = analyze_city_social_sector(city, external_data)
-        results[city] = city_results
+    # One columnar group-by pass for every city's school indicators
+    school_table = build_school_table({
+        city: r["facilities"]["schools"] for city, r in results.items() if "facilities" in r
+    })
+    indicators = compute_school_indicators(school_table)
+    for city, city_results in results.items():
+        if "summary" in city_results:
+            _apply_school_indicators(city_results, indicators.get(city, {}))
 
         if verbose:
             summary = city_results.get('summary', {})
@@ -554,26 +515,46 @@ def run_batch_social_analysis(cities: Optional[List[str]] = None, verbose: bool
                   f"{summary.get('total_hospitals', 0)} hospitals, "
                   f"{summary.get('total_kindergardens', 0)} kindergardens")
 
+    if accessibility:
+        from .facility_access import run_batch_accessibility
+        if verbose:
+            print(f"Computing facility accessibility grids at {accessibility_cell_m:.0f} m")
+        access = run_batch_accessibility(external_data, [c for c in results if "summary" in results[c]],
+                                         cell_m=accessibility_cell_m, output_dir=accessibility_dir)
+        for city, city_access in access.items():
+            if "summary" in results.get(city, {}):
+                results[city]["summary"]["accessibility"] = city_access
+
     return results
 
 
 def save_social_analysis_results(results: Dict[str, Any], output_dir: Optional[Path] = None) -> None:
-    """Save social analysis results to JSON files."""
+    """Save social analysis results to JSON files.
+
+    Facility lists are written once, column-wise, to each city's
+    ``{city}_social_sector.columns.json`` sidecar; both the city file and the
+    combined file reference it instead of repeating every facility record.
+    Use ``result_io.read_json`` to get the lists back inline.
+    """
     if output_dir is None:
         dirs = create_output_directories()
         output_dir = dirs['base'] / 'social_sector'
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save overall results
-    overall_file = output_dir / 'social_sector_analysis.json'
-    with open(overall_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-
-    # Save individual city files
+    # Save individual city files (facilities go to the columnar sidecar)
+    overall = {}
     for city, city_results in results.items():
         city_file = output_dir / f'{city}_social_sector.json'
-        with open(city_file, 'w', encoding='utf-8') as f:
-            json.dump(city_results, f, indent=2, ensure_ascii=False)
+        result_io.write_json(city_results, city_file, columnar=['facilities.*'])
+        facilities_ref = {
+            name: {result_io.SIDECAR_KEY: result_io.sidecar_name(city_file), 'key': f'facilities.{name}', 'rows': len(items)}
+            if items else []
+            for name, items in city_results.get('facilities', {}).items()
+        }
+        overall[city] = {**city_results, 'facilities': facilities_ref}
+
+    # Save overall results
+    result_io.write_json(overall, output_dir / 'social_sector_analysis.json')
 
     print(f"Saved social sector analysis results to {output_dir}")
@@ -1,9 +1,10 @@
 """SUHI computation functions (pixel and zonal)."""
 import ee
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .utils import GEE_CONFIG, ANALYSIS_CONFIG
 from .utils import rate_limiter
+from . import reduce_controller
 from typing import Any, Dict
 import ee
 
@@ -17,7 +18,7 @@ def compute_pixel_suhi(urban_mask, rural_mask, lst_image, zones):
     return (lst_image.select([ee.String(band)]).toFloat().subtract(rural_reference).updateMask(urban_mask).rename('SUHI_pixel'))
 
 
-def compute_zonal_suhi(zones: Dict, lst_image: ee.Image, classifications: Dict) -> Dict[str, Any]:
+def compute_zonal_suhi(zones: Dict, lst_image: ee.Image, classifications: Dict, city: Optional[str] = None) -> Dict[str, Any]:
     if 'esri' in classifications and len(classifications) > 1:
         w = ANALYSIS_CONFIG['esri_weight']
         urban_mask = classifications['esri'].multiply(w)
@@ -36,6 +37,17 @@ def compute_zonal_suhi(zones: Dict, lst_image: ee.Image, classifications: Dict)
         return {'error':'No LST data available'}
     band = 'LST_Day_MODIS'
     scale = GEE_CONFIG['scale_modis']
+    if city is not None:
+        # Planned scale/tileScale with per-city history instead of fail-then-double
+        stats_reducer = ee.Reducer.mean().combine(ee.Reducer.stdDev(), None, True).combine(ee.Reducer.count(), None, True)
+        try:
+            urban_stats, _ = reduce_controller.reduce_region(lst_image.select(band).updateMask(urban_mask), zones['urban_core'], stats_reducer,
+                                                             city, 'suhi_zonal:urban_core', scale, zone='urban_core')
+            rural_stats, _ = reduce_controller.reduce_region(lst_image.select(band).updateMask(rural_mask), zones['rural_ring'], stats_reducer,
+                                                             city, 'suhi_zonal:rural_ring', scale, zone='rural_ring')
+            return {'urban_stats': urban_stats, 'rural_stats': rural_stats}
+        except Exception as e:
+            return {'error': f'Computation failed: {str(e)}'}
     try:
         urban_mean = lst_image.select(band).updateMask(urban_mask).reduceRegion(reducer=ee.Reducer.mean(), geometry=zones['urban_core'], scale=scale, maxPixels=GEE_CONFIG['max_pixels'], bestEffort=True, tileScale=4)
         urban_stdDev = lst_image.select(band).updateMask(urban_mask).reduceRegion(reducer=ee.Reducer.stdDev(), geometry=zones['urban_core'], scale=scale, maxPixels=GEE_CONFIG['max_pixels'], bestEffort=True, tileScale=4)
@@ -15,7 +15,9 @@ import ee
 
 from . import lulc, classification, suhi as suhi_core
 from . import error_assessment
-from .utils import create_output_directories, make_json_safe, GEE_CONFIG
+from . import raster_io
+from . import result_io
+from . import reduce_controller
 from pathlib import Path
 from .temperature import load_modis_lst, compute_temperature_statistics
 from .utils import UZBEKISTAN_CITIES, create_output_directories, GEE_CONFIG, ANALYSIS_CONFIG, get_optimal_scale_for_city
@@ -23,36 +25,6 @@ import math
 import time
 
 
-def _safe_serialize(obj):
-    """Recursively convert common Earth Engine objects and other non-JSON types
-    into JSON-serializable Python types. Falls back to string representation.
-
-    This avoids json.dump failing when the result dict contains ee.Image, ee.Number,
-    ee.List, ee.Dictionary or Task objects.
-    """
-    from collections.abc import Mapping, Sequence
-    # Primitives
-    if obj is None or isinstance(obj, (str, int, float, bool)):
-        return obj
-    # Mappings
-    if isinstance(obj, Mapping):
-        return {str(k): _safe_serialize(v) for k, v in obj.items()}
-    # Sequences (but not bytes/str)
-    if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
-        return [_safe_serialize(v) for v in obj]
-    # Try Earth Engine getInfo() where available
-    try:
-        if hasattr(obj, 'getInfo'):
-            return obj.getInfo()
-    except Exception:
-        pass
-    # Fallback to string
-    try:
-        return str(obj)
-    except Exception:
-        return None
-
-
 def _make_urban_mask_from_classifications(classifications: Dict[str, ee.Image]) -> ee.Image:
     # Weighted ensemble: ESRI weighted if present
     if 'esri' in classifications and len(classifications) > 1:
@@ -114,35 +86,23 @@ def run_city_suhi(base: Path, city: str, year: int, download_scale: int = 30) ->
                 # Use MODIS scale for region statistics to avoid excessive computation
                 stats_scale = max(GEE_CONFIG.get('scale_modis', 1000), 250)
                 try:
-                    rural_stats_day = day_lst.updateMask(rural_mask).reduceRegion(
-                        reducer=ee.Reducer.mean(), 
-                        geometry=zones['rural_ring'], 
-                        scale=stats_scale, 
-                        maxPixels=GEE_CONFIG['max_pixels'], 
-                        bestEffort=True
+                    rural_stats_day, _ = reduce_controller.reduce_region(
+                        day_lst.updateMask(rural_mask), zones['rural_ring'], ee.Reducer.mean(),
+                        city, 'suhi_unit:rural_mean', stats_scale, zone='rural_ring'
                     )
+                    rural_mean_day_val = rural_stats_day.get(day_band)
                 except Exception:
-                    rural_stats_day = day_lst.updateMask(rural_mask).reduceRegion(
-                        reducer=ee.Reducer.mean(), 
-                        geometry=zones['rural_ring'], 
-                        scale=stats_scale*2, 
-                        maxPixels=GEE_CONFIG['max_pixels'], 
-                        bestEffort=True
-                    )
-                rural_mean_day = rural_stats_day.get(day_band)
-                rural_mean_day_val = rural_mean_day.getInfo() if rural_mean_day else None
+                    rural_mean_day_val = None
                 
                 if rural_mean_day_val is not None:
                     suhi_day_img = day_lst.select(day_band).toFloat().subtract(float(rural_mean_day_val)).rename('SUHI_Day_MODIS')
                     
                     # Zonal stats for day LST
                     try:
-                        urban_mean_day = day_lst.select([day_band]).updateMask(urban_mask).reduceRegion(
-                            reducer=ee.Reducer.mean(), 
-                            geometry=zones['urban_core'], 
-                            scale=stats_scale, 
-                            maxPixels=GEE_CONFIG['max_pixels']
-                        ).get(day_band).getInfo()
+                        urban_mean_day = reduce_controller.reduce_region(
+                            day_lst.select([day_band]).updateMask(urban_mask), zones['urban_core'], ee.Reducer.mean(),
+                            city, 'suhi_unit:urban_mean', stats_scale, zone='urban_core'
+                        )[0].get(day_band)
                         
                         out['stats']['modis_day_urban_mean'] = float(urban_mean_day) if urban_mean_day is not None else None
                         out['stats']['modis_day_rural_mean'] = float(rural_mean_day_val) if rural_mean_day_val is not None else None
@@ -170,35 +130,23 @@ def run_city_suhi(base: Path, city: str, year: int, download_scale: int = 30) ->
             if night_band is not None:
                 night_lst = modis_lst.select([night_band])
                 try:
-                    rural_stats_night = night_lst.updateMask(rural_mask).reduceRegion(
-                        reducer=ee.Reducer.mean(), 
-                        geometry=zones['rural_ring'], 
-                        scale=stats_scale, 
-                        maxPixels=GEE_CONFIG['max_pixels'], 
-                        bestEffort=True
+                    rural_stats_night, _ = reduce_controller.reduce_region(
+                        night_lst.updateMask(rural_mask), zones['rural_ring'], ee.Reducer.mean(),
+                        city, 'suhi_unit:rural_mean', stats_scale, zone='rural_ring'
                     )
+                    rural_mean_night_val = rural_stats_night.get(night_band)
                 except Exception:
-                    rural_stats_night = night_lst.updateMask(rural_mask).reduceRegion(
-                        reducer=ee.Reducer.mean(), 
-                        geometry=zones['rural_ring'], 
-                        scale=stats_scale*2, 
-                        maxPixels=GEE_CONFIG['max_pixels'], 
-                        bestEffort=True
-                    )
-                rural_mean_night = rural_stats_night.get(night_band)
-                rural_mean_night_val = rural_mean_night.getInfo() if rural_mean_night else None
+                    rural_mean_night_val = None
                 
                 if rural_mean_night_val is not None:
                     suhi_night_img = night_lst.select(night_band).toFloat().subtract(float(rural_mean_night_val)).rename('SUHI_Night_MODIS')
                     
                     # Zonal stats for night LST
                     try:
-                        urban_mean_night = night_lst.select([night_band]).updateMask(urban_mask).reduceRegion(
-                            reducer=ee.Reducer.mean(), 
-                            geometry=zones['urban_core'], 
-                            scale=stats_scale, 
-                            maxPixels=GEE_CONFIG['max_pixels']
-                        ).get(night_band).getInfo()
+                        urban_mean_night = reduce_controller.reduce_region(
+                            night_lst.select([night_band]).updateMask(urban_mask), zones['urban_core'], ee.Reducer.mean(),
+                            city, 'suhi_unit:urban_mean', stats_scale, zone='urban_core'
+                        )[0].get(night_band)
                         
                         out['stats']['modis_night_urban_mean'] = float(urban_mean_night) if urban_mean_night is not None else None
                         out['stats']['modis_night_rural_mean'] = float(rural_mean_night_val) if rural_mean_night_val is not None else None
@@ -266,11 +214,7 @@ def run_city_suhi(base: Path, city: str, year: int, download_scale: int = 30) ->
         save_dir = base / 'suhi' / city
         save_dir.mkdir(parents=True, exist_ok=True)
         out_file = save_dir / f"{city}_suhi_{year}.json"
-        # sanitize the result so json.dump doesn't fail on EE objects
-        safe_out = _safe_serialize(out)
-        with open(out_file, 'w', encoding='utf-8') as fh:
-            json.dump(safe_out, fh, indent=2)
-        out['summary_json'] = str(out_file)
+        out['summary_json'] = str(result_io.write_json(out, out_file))
     except Exception:
         # try to preserve reason for failure in the returned dictionary
         import traceback
@@ -310,11 +254,7 @@ def run_batch(cities: Optional[List[str]] = None, years: Optional[List[int]] = N
             save_dir.mkdir(parents=True, exist_ok=True)
             out_file = save_dir / f"{city}_suhi_{y}.json"
             try:
-                # sanitize before saving
-                safe = _safe_serialize(res)
-                with open(out_file, 'w', encoding='utf-8') as fh:
-                    json.dump(safe, fh, indent=2)
-                res['summary_json'] = str(out_file)
+                res['summary_json'] = str(result_io.write_json(res, out_file))
             except Exception:
                 res['summary_json'] = None
             results[city][str(y)] = res
@@ -362,22 +302,16 @@ def run_city_suhi_stats(city: str, year: int, stats_scale: int = 500) -> Dict[st
         if day_band is not None:
             day_lst = modis_lst.select([day_band])
             try:
-                urban_stats_day = day_lst.reduceRegion(
-                    reducer=ee.Reducer.mean(), 
-                    geometry=urban_core, 
-                    scale=modis_scale, 
-                    maxPixels=GEE_CONFIG['max_pixels'], 
-                    bestEffort=True
+                urban_stats_day, _ = reduce_controller.reduce_region(
+                    day_lst, urban_core, ee.Reducer.mean(), city, 'suhi_stats:urban_mean', modis_scale,
+                    area_m2=reduce_controller.zone_area_m2(city, 'urban_core', erosion_m=0)
                 )
-                rural_stats_day = day_lst.reduceRegion(
-                    reducer=ee.Reducer.mean(), 
-                    geometry=rural_ring, 
-                    scale=modis_scale, 
-                    maxPixels=GEE_CONFIG['max_pixels'], 
-                    bestEffort=True
+                rural_stats_day, _ = reduce_controller.reduce_region(
+                    day_lst, rural_ring, ee.Reducer.mean(), city, 'suhi_stats:rural_mean', modis_scale,
+                    area_m2=reduce_controller.zone_area_m2(city, 'rural_ring', erosion_m=0)
                 )
-                urban_mean_day = urban_stats_day.get(day_band).getInfo() if urban_stats_day else None
-                rural_mean_day = rural_stats_day.get(day_band).getInfo() if rural_stats_day else None
+                urban_mean_day = urban_stats_day.get(day_band)
+                rural_mean_day = rural_stats_day.get(day_band)
                 
                 out['stats']['day_urban_mean'] = float(urban_mean_day) if urban_mean_day is not None else None
                 out['stats']['day_rural_mean'] = float(rural_mean_day) if rural_mean_day is not None else None
@@ -390,22 +324,16 @@ def run_city_suhi_stats(city: str, year: int, stats_scale: int = 500) -> Dict[st
         if night_band is not None:
             night_lst = modis_lst.select([night_band])
             try:
-                urban_stats_night = night_lst.reduceRegion(
-                    reducer=ee.Reducer.mean(), 
-                    geometry=urban_core, 
-                    scale=modis_scale, 
-                    maxPixels=GEE_CONFIG['max_pixels'], 
-                    bestEffort=True
+                urban_stats_night, _ = reduce_controller.reduce_region(
+                    night_lst, urban_core, ee.Reducer.mean(), city, 'suhi_stats:urban_mean', modis_scale,
+                    area_m2=reduce_controller.zone_area_m2(city, 'urban_core', erosion_m=0)
                 )
-                rural_stats_night = night_lst.reduceRegion(
-                    reducer=ee.Reducer.mean(), 
-                    geometry=rural_ring, 
-                    scale=modis_scale, 
-                    maxPixels=GEE_CONFIG['max_pixels'], 
-                    bestEffort=True
+                rural_stats_night, _ = reduce_controller.reduce_region(
+                    night_lst, rural_ring, ee.Reducer.mean(), city, 'suhi_stats:rural_mean', modis_scale,
+                    area_m2=reduce_controller.zone_area_m2(city, 'rural_ring', erosion_m=0)
                 )
-                urban_mean_night = urban_stats_night.get(night_band).getInfo() if urban_stats_night else None
-                rural_mean_night = rural_stats_night.get(night_band).getInfo() if rural_stats_night else None
+                urban_mean_night = urban_stats_night.get(night_band)
+                rural_mean_night = rural_stats_night.get(night_band)
                 
                 out['stats']['night_urban_mean'] = float(urban_mean_night) if urban_mean_night is not None else None
                 out['stats']['night_rural_mean'] = float(rural_mean_night) if rural_mean_night is not None else None
@@ -441,17 +369,23 @@ def run_city_suhi_stats(city: str, year: int, stats_scale: int = 500) -> Dict[st
     return out
 
 
-def export_suhi_tiles(base: Path, city: str, year: int, tile_size_m: int = 5000, scale: int = 1000, overlap_m: int = 250) -> Dict[str, Any]:
-    """Export SUHI map in tiles to Google Drive. Returns task ids and summary.
+def export_suhi_tiles(base: Path, city: str, year: int, tile_size_m: int = 5000, scale: int = 1000, overlap_m: int = 250,
+                      mode: str = 'drive', max_workers: int = 4, resume: bool = True, keep_tiles: bool = False) -> Dict[str, Any]:
+    """Export SUHI map in tiles. Returns task ids / local paths and summary.
     Now uses MODIS LST data (day and night) instead of Landsat thermal.
 
     Notes:
-    - Requires GEE and Drive export enabled for the authenticated account.
-    - This will create multiple ee.batch.Export.image.toDrive tasks; monitor them in the GEE Task Manager or Drive.
+    - mode='local' downloads tiles directly (getDownloadURL) with at most ``max_workers``
+      concurrent requests and mosaics them into one COG at
+      ``<base>/suhi/<city>/<city>_suhi_modis_<year>.tif``. Already downloaded tiles are reused.
+    - mode='drive' creates one ee.batch.Export.image.toDrive task per tile. Task ids are kept in
+      a manifest next to the SUHI JSON; with ``resume`` tiles whose task is pending, running or
+      completed are not resubmitted. Use ``monitor_suhi_tile_tasks`` to follow them.
+    - The tile grid is computed client-side, so no per-tile getInfo() round trips are made.
     - tile_size_m controls approximate tile side in meters. overlap_m controls tile overlap to avoid edge artifacts.
     - Default scale is now 1000m to match MODIS LST resolution.
     """
-    out: Dict[str, Any] = {'city': city, 'year': year, 'generated': {'tile_tasks': []}, 'stats': {}}
+    out: Dict[str, Any] = {'city': city, 'year': year, 'mode': mode, 'generated': {'tile_tasks': []}, 'stats': {}}
     if city not in UZBEKISTAN_CITIES:
         out['error'] = 'city not found'
         return out
@@ -526,48 +460,204 @@ def export_suhi_tiles(base: Path, city: str, year: int, tile_size_m: int = 5000,
     # Create SUHI image using day LST
     suhi_img = day_lst.toFloat().subtract(float(rural_mean)).rename('SUHI_Day_MODIS')
 
-    # compute bounding box in degrees using approximate meters->degrees conversion
+    tiles = _suhi_tile_grid(lon, lat, buffer_m, tile_size_m, overlap_m)
+    out['stats']['n_tiles'] = len(tiles)
+    out['stats']['rural_mean_day'] = float(rural_mean)
+    tile_img = suhi_img.updateMask(urban_mask)
+    save_dir = base / 'suhi' / city
+    if mode == 'local':
+        return _export_suhi_tiles_local(out, tile_img, tiles, save_dir, city, year, scale, max_workers, keep_tiles)
+    return _export_suhi_tiles_drive(out, tile_img, tiles, save_dir, city, year, scale, resume)
+
+
+def _suhi_tile_grid(lon: float, lat: float, half_m: float, tile_size_m: int, overlap_m: int) -> List[Dict[str, Any]]:
+    """Client-side tile grid (EPSG:4326 bounds) covering a square of half-side ``half_m`` around a point."""
+    # approximate meters->degrees conversion
     lat_rad = math.radians(lat)
     deg_per_m_lat = 1.0 / 111320.0
     deg_per_m_lon = 1.0 / (111320.0 * math.cos(lat_rad))
-    half = buffer_m
-    min_lon = lon - half * deg_per_m_lon
-    max_lon = lon + half * deg_per_m_lon
-    min_lat = lat - half * deg_per_m_lat
-    max_lat = lat + half * deg_per_m_lat
+    min_lon = lon - half_m * deg_per_m_lon
+    max_lon = lon + half_m * deg_per_m_lon
+    min_lat = lat - half_m * deg_per_m_lat
+    max_lat = lat + half_m * deg_per_m_lat
 
     dx = tile_size_m * deg_per_m_lon
     dy = tile_size_m * deg_per_m_lat
     step_x = dx - overlap_m * deg_per_m_lon
     step_y = dy - overlap_m * deg_per_m_lat
+    # integer tile counts avoid float drift from accumulating steps
+    nx = max(1, math.ceil((max_lon - min_lon) / step_x))
+    ny = max(1, math.ceil((max_lat - min_lat) / step_y))
+
+    tiles = []
+    for ix in range(nx):
+        x = min_lon + ix * step_x
+        for iy in range(ny):
+            y = min_lat + iy * step_y
+            bounds = [x, y, min(x + dx, max_lon), min(y + dy, max_lat)]
+            tiles.append({'tile': (ix, iy), 'bounds': bounds})
+    return tiles
+
+
+def _tile_region(bounds: List[float]) -> List[List[List[float]]]:
+    minx, miny, maxx, maxy = bounds
+    return [[[minx, miny], [maxx, miny], [maxx, maxy], [minx, maxy], [minx, miny]]]
+
+
+def _download_tile(image: ee.Image, bounds: List[float], scale: int, path: Path) -> Optional[Path]:
+    import requests
+    url = image.getDownloadURL({'scale': int(scale), 'crs': 'EPSG:4326', 'region': _tile_region(bounds), 'format': 'GEO_TIFF'})
+    r = requests.get(url, stream=True, timeout=120)
+    if r.status_code != 200:
+        raise RuntimeError(f"download failed: status {r.status_code}")
+    tmp = path.with_suffix('.part')
+    with open(tmp, 'wb') as fh:
+        for chunk in r.iter_content(chunk_size=65536):
+            if chunk:
+                fh.write(chunk)
+    tmp.replace(path)
+    return path
+
+
+def _export_suhi_tiles_local(out: Dict[str, Any], image: ee.Image, tiles: List[Dict[str, Any]], save_dir: Path,
+                             city: str, year: int, scale: int, max_workers: int, keep_tiles: bool) -> Dict[str, Any]:
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    tile_dir = save_dir / 'tiles' / str(year)
+    tile_dir.mkdir(parents=True, exist_ok=True)
+
+    def fetch(t):
+        fname = f"{city}_suhi_modis_{year}_tile_{t['tile'][0]}_{t['tile'][1]}"
+        p = tile_dir / f"{fname}.tif"
+        if p.exists():
+            return {'tile': t['tile'], 'fname': fname, 'path': str(p), 'reused': True}
+        try:
+            _download_tile(image, t['bounds'], scale, p)
+            return {'tile': t['tile'], 'fname': fname, 'path': str(p)}
+        except Exception as e:
+            return {'tile': t['tile'], 'fname': fname, 'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = [pool.submit(fetch, t) for t in tiles]
+        for f in as_completed(futures):
+            out['generated']['tile_tasks'].append(f.result())
+    out['generated']['tile_tasks'].sort(key=lambda r: tuple(r['tile']))
+
+    paths = [r['path'] for r in out['generated']['tile_tasks'] if r.get('path')]
+    failed = [r for r in out['generated']['tile_tasks'] if r.get('error')]
+    if failed:
+        # keep downloaded tiles so a re-run only fetches the missing ones
+        out['error'] = f"{len(failed)} of {len(tiles)} tiles failed; re-run to resume"
+        return out
+    try:
+        from rasterio.merge import merge
+        import rasterio
+        sources = [rasterio.open(p) for p in paths]
+        try:
+            mosaic, transform = merge(sources)
+            profile = sources[0].profile.copy()
+        finally:
+            for src in sources:
+                src.close()
+        profile.update(driver='GTiff', height=mosaic.shape[1], width=mosaic.shape[2], transform=transform)
+        mosaic_path = save_dir / f"{city}_suhi_modis_{year}.tif"
+        with rasterio.open(mosaic_path, 'w', **profile) as dst:
+            dst.write(mosaic)
+        raster_io.to_cog(mosaic_path, resampling='average')
+        out['generated']['mosaic'] = str(mosaic_path)
+        if not keep_tiles:
+            for p in paths:
+                Path(p).unlink()
+    except Exception as e:
+        out['error'] = f'Mosaic failed: {e}'
+    return out
 
-    ix = 0
-    for x in frange(min_lon, max_lon, step_x):
-        iy = 0
-        for y in frange(min_lat, max_lat, step_y):
-            tile_minx = x
-            tile_miny = y
-            tile_maxx = min(x + dx, max_lon)
-            tile_maxy = min(y + dy, max_lat)
-            geom = ee.Geometry.Rectangle([tile_minx, tile_miny, tile_maxx, tile_maxy])
-            tile_img = suhi_img.clip(geom).updateMask(urban_mask)
-            fname = f"{city}_suhi_modis_{year}_tile_{ix}_{iy}"
-            try:
-                task = ee.batch.Export.image.toDrive(image=tile_img, description=fname, folder='SUHI_Exports', fileNamePrefix=fname, region=geom.bounds().getInfo()['coordinates'], scale=scale, crs='EPSG:4326', maxPixels=1e13)
-                task.start()
-                out['generated']['tile_tasks'].append({'tile': (ix, iy), 'task_id': getattr(task, 'id', None), 'fname': fname})
-                # small delay to avoid hammering the API
-                time.sleep(0.5)
-            except Exception as e:
-                out['generated']['tile_tasks'].append({'tile': (ix, iy), 'error': str(e), 'fname': fname})
-            iy += 1
-        ix += 1
+
+def _tile_manifest_path(save_dir: Path, city: str, year: int) -> Path:
+    return save_dir / f"{city}_suhi_tiles_{year}_tasks.json"
+
+
+def _load_tile_manifest(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_tile_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, indent=2)
+    tmp.replace(path)
+
+
+def _task_states(task_ids: List[str]) -> Dict[str, str]:
+    """Fetch states for many EE tasks with a single task-list request."""
+    wanted = set(t for t in task_ids if t)
+    if not wanted:
+        return {}
+    try:
+        return {t['id']: t.get('state') for t in ee.data.getTaskList() if t.get('id') in wanted}
+    except Exception:
+        return {}
+
+
+_LIVE_TASK_STATES = ('READY', 'RUNNING', 'COMPLETED')
+
+
+def _export_suhi_tiles_drive(out: Dict[str, Any], image: ee.Image, tiles: List[Dict[str, Any]], save_dir: Path,
+                             city: str, year: int, scale: int, resume: bool) -> Dict[str, Any]:
+    manifest_path = _tile_manifest_path(save_dir, city, year)
+    manifest = _load_tile_manifest(manifest_path) if resume else {}
+    states = _task_states([m.get('task_id') for m in manifest.values()])
+    for t in tiles:
+        ix, iy = t['tile']
+        fname = f"{city}_suhi_modis_{year}_tile_{ix}_{iy}"
+        prev = manifest.get(fname, {})
+        if prev.get('task_id') and states.get(prev['task_id']) in _LIVE_TASK_STATES:
+            out['generated']['tile_tasks'].append({'tile': (ix, iy), 'task_id': prev['task_id'], 'fname': fname, 'resumed': True})
+            continue
+        try:
+            task = ee.batch.Export.image.toDrive(image=image.clip(ee.Geometry.Rectangle(t['bounds'])), description=fname, folder='SUHI_Exports', fileNamePrefix=fname, region=_tile_region(t['bounds']), scale=scale, crs='EPSG:4326', maxPixels=1e13)
+            task.start()
+            task_id = getattr(task, 'id', None)
+            out['generated']['tile_tasks'].append({'tile': (ix, iy), 'task_id': task_id, 'fname': fname})
+            manifest[fname] = {'tile': [ix, iy], 'task_id': task_id, 'bounds': t['bounds'], 'state': 'READY'}
+            _save_tile_manifest(manifest_path, manifest)
+            # small delay to avoid hammering the API
+            time.sleep(0.5)
+        except Exception as e:
+            out['generated']['tile_tasks'].append({'tile': (ix, iy), 'error': str(e), 'fname': fname})
+    out['generated']['task_manifest'] = str(manifest_path)
     return out
 
 
-def frange(start, stop, step):
-    x = start
-    while x < stop:
-        yield x
-        x += step
-    
+def monitor_suhi_tile_tasks(base: Path, city: str, year: int, poll_interval: int = 30,
+                            timeout: Optional[int] = None) -> Dict[str, Any]:
+    """Poll Drive export tasks recorded by ``export_suhi_tiles`` until all finish (or ``timeout`` seconds pass).
+
+    States are written back to the manifest, so a later ``export_suhi_tiles(..., resume=True)``
+    resubmits only failed or cancelled tiles.
+    """
+    manifest_path = _tile_manifest_path(base / 'suhi' / city, city, year)
+    manifest = _load_tile_manifest(manifest_path)
+    if not manifest:
+        return {'city': city, 'year': year, 'error': 'no task manifest found'}
+    started = time.time()
+    while True:
+        states = _task_states([m.get('task_id') for m in manifest.values()])
+        for m in manifest.values():
+            m['state'] = states.get(m.get('task_id'), m.get('state'))
+        _save_tile_manifest(manifest_path, manifest)
+        counts: Dict[str, int] = {}
+        for m in manifest.values():
+            counts[m.get('state') or 'UNKNOWN'] = counts.get(m.get('state') or 'UNKNOWN', 0) + 1
+        pending = counts.get('READY', 0) + counts.get('RUNNING', 0)
+        print(f"[suhi tiles] {city} {year}: {counts}")
+        if pending == 0 or (timeout is not None and time.time() - started >= timeout):
+            break
+        time.sleep(poll_interval)
+    return {'city': city, 'year': year, 'states': counts, 'done': pending == 0, 'manifest': str(manifest_path)}
@@ -1,11 +1,11 @@
 """Temperature dataset loading functions (MODIS, Landsat, ASTER) with comprehensive statistics."""
 import ee
-import json
 import numpy as np
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
-from .utils import DATASETS, ANALYSIS_CONFIG, UZBEKISTAN_CITIES, GEE_CONFIG, make_json_safe
+from .utils import DATASETS, ANALYSIS_CONFIG, UZBEKISTAN_CITIES, GEE_CONFIG
 from . import error_assessment
+from . import result_io
 
 
 def load_modis_lst_seasonal(start_date: str, end_date: str, geometry: ee.Geometry) -> Optional[ee.Image]:
@@ -140,7 +140,8 @@ def load_landsat_thermal(start_date: str, end_date: str, geometry: ee.Geometry)
         return None
 
 
-def compute_temperature_statistics(city: str, year: int, base_output_dir: Optional[Path] = None) -> Dict[str, Any]:
+def compute_temperature_statistics(city: str, year: int, base_output_dir: Optional[Path] = None,
+                                   seasonal_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Compute comprehensive temperature statistics for urban and rural regions.
     
     This function computes detailed temperature statistics including:
@@ -154,6 +155,7 @@ def compute_temperature_statistics(city: str, year: int, base_output_dir: Option
         city: City name from UZBEKISTAN_CITIES
         year: Year to analyze
         base_output_dir: Optional base directory for output (defaults to suhi_analysis_output)
+        seasonal_stats: Precomputed summer season summary (see `compute_seasonal_stats_all_cities`)
         
     Returns:
         Dictionary with comprehensive temperature statistics
@@ -189,7 +191,7 @@ def compute_temperature_statistics(city: str, year: int, base_output_dir: Option
     
     try:
         # Get summer season statistics only (skip individual monthly computations)
-        warm_season_stats = _compute_seasonal_temperature_stats(
+        warm_season_stats = seasonal_stats or _compute_seasonal_temperature_stats(
             year, urban_core, rural_ring, ANALYSIS_CONFIG['warm_months']
         )
         stats['summer_season_summary'] = warm_season_stats
@@ -228,10 +230,7 @@ def compute_temperature_statistics(city: str, year: int, base_output_dir: Option
     
     output_file = temp_dir / f"{city}_temperature_stats_{year}.json"
     try:
-        safe_stats = make_json_safe(stats)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(safe_stats, f, indent=2, ensure_ascii=False)
-        stats['output_file'] = str(output_file)
+        stats['output_file'] = str(result_io.write_json(stats, output_file))
     except Exception as e:
         stats['save_error'] = str(e)
     
@@ -414,15 +413,7 @@ def _compute_seasonal_temperature_stats(year: int, urban_zone: ee.Geometry,
             day_lst = modis_lst.select([day_band])
             
             # Combined reducer for all statistics in one call
-            combined_reducer = (ee.Reducer.mean().combine(
-                ee.Reducer.stdDev(), sharedInputs=True
-            ).combine(
-                ee.Reducer.minMax(), sharedInputs=True
-            ).combine(
-                ee.Reducer.percentile([5, 10, 25, 50, 75, 90, 95]), sharedInputs=True
-            ).combine(
-                ee.Reducer.count(), sharedInputs=True
-            ))
+            combined_reducer = _seasonal_reducer()
             
             # Single call for urban day stats
             urban_day_result = day_lst.reduceRegion(
@@ -488,6 +479,62 @@ def _compute_seasonal_temperature_stats(year: int, urban_zone: ee.Geometry,
     return seasonal_stats
 
 
+def _seasonal_reducer() -> ee.Reducer:
+    """Mean, stdDev, min/max, percentiles and count in one combined reducer."""
+    return (ee.Reducer.mean().combine(
+        ee.Reducer.stdDev(), sharedInputs=True
+    ).combine(
+        ee.Reducer.minMax(), sharedInputs=True
+    ).combine(
+        ee.Reducer.percentile([5, 10, 25, 50, 75, 90, 95]), sharedInputs=True
+    ).combine(
+        ee.Reducer.count(), sharedInputs=True
+    ))
+
+
+def compute_seasonal_stats_all_cities(cities: List[str], year: int,
+                                      focus_months: Optional[List[int]] = None) -> Dict[str, Dict[str, Any]]:
+    """`_compute_seasonal_temperature_stats` output for every city from one national LST composite.
+
+    The seasonal MODIS median is built once for the country (`composites.CompositeRegistry`)
+    and all cities' urban/rural zones are reduced together. Only whole seasons
+    (`composites.SEASONS`) are supported; other month sets return ``{}``.
+    """
+    from .composites import get_registry, season_for_months
+    focus_months = list(focus_months or ANALYSIS_CONFIG['warm_months'])
+    season = season_for_months(focus_months)
+    if season is None:
+        return {}
+    period = f"{year}-{season}"
+    # Same un-eroded buffers as `compute_temperature_statistics`
+    reduced = get_registry().reduce('modis_lst', [period], cities, reducer=_seasonal_reducer(),
+                                    erosion_m=0)
+    out = {}
+    for city in cities:
+        seasonal_stats = {
+            'focus_months': focus_months,
+            'urban': {'day': {}, 'night': {}},
+            'rural': {'day': {}, 'night': {}},
+            'urban_rural_difference': {'day': None, 'night': None}
+        }
+        zones = reduced.get(city, {}).get(period)
+        if not zones:
+            seasonal_stats['error'] = 'No MODIS LST data for focus months'
+            out[city] = seasonal_stats
+            continue
+        for side, zone in (('urban', 'urban_core'), ('rural', 'rural_ring')):
+            for part, band in (('day', 'LST_Day_MODIS'), ('night', 'LST_Night_MODIS')):
+                stats = zones.get(zone, {}).get(band, {})
+                seasonal_stats[side][part] = _parse_bulk_seasonal_stats(
+                    {f"{band}_{k}": v for k, v in stats.items()}, band)
+        for part in ('day', 'night'):
+            u, r = seasonal_stats['urban'][part].get('mean'), seasonal_stats['rural'][part].get('mean')
+            if u is not None and r is not None:
+                seasonal_stats['urban_rural_difference'][part] = u - r
+        out[city] = seasonal_stats
+    return out
+
+
 def _parse_bulk_seasonal_stats(stats_dict: Dict, band_name: str) -> Dict[str, float]:
     """Parse bulk seasonal statistics from combined reducer results."""
     return {
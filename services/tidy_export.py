@@ -0,0 +1,173 @@
+"""Canonical tidy tables (Feather/Parquet) for the unit summary JSON files.
+
+The R converters in ``suhi_analysis_output/`` walk the nested summaries with
+purrr to rebuild flat tables. The units now also write each summary as one
+long table, one row per city × year × zone × metric, next to the JSON:
+
+    city    string   city name
+    year    int32    analysis year
+    zone    string   'urban_core', 'rural_ring', 'city' or the LULC class
+    metric  string   leaf path below the zone, joined with '_' (e.g. 'uncertainty_day_stdDev')
+    value   float64  numeric value (booleans as 0/1, [lo, hi] intervals split into *_lo / *_hi)
+
+R reads them with ``arrow::read_feather("reports/suhi_batch_tidy.feather")``.
+Writing needs pyarrow; without it the export is skipped with a warning.
+"""
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import importlib.util
+import json
+import os
+
+import pandas as pd
+
+# pyarrow is only the backend for DataFrame.to_feather / to_parquet, never imported here
+HAS_ARROW = importlib.util.find_spec('pyarrow') is not None
+
+TIDY_COLUMNS = ['city', 'year', 'zone', 'metric', 'value']
+ZONES = ('urban_core', 'rural_ring', 'city')
+TIDY_CONFIG = {
+    "formats": ("feather", "parquet"),
+    "parquet_compression": "zstd",
+}
+# Identifier leaves repeated inside the per-year nodes
+_SKIP_KEYS = {'city', 'year'}
+
+Record = Tuple[str, int, str, str, float]
+
+
+def _leaves(node: Any, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], float]]:
+    """Numeric leaves of a nested dict as ``(path, value)``; 2-element lists become ``_lo``/``_hi``."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in _SKIP_KEYS and not path:
+                continue
+            yield from _leaves(value, path + (str(key),))
+    elif isinstance(node, (list, tuple)):
+        if len(node) == 2 and path:
+            for suffix, item in zip(('lo', 'hi'), node):
+                if isinstance(item, (int, float)):
+                    yield path[:-1] + (f"{path[-1]}_{suffix}",), float(item)
+    elif isinstance(node, (bool, int, float)) and path:
+        yield path, float(node)
+
+
+def _records(city: str, year: Any, node: Any, zone: str = 'city') -> Iterator[Record]:
+    """Rows for one city-year node; the first zone name in a leaf path becomes its zone."""
+    for path, value in _leaves(node):
+        leaf_zone = next((p for p in path if p in ZONES), zone)
+        metric = '_'.join(p for p in path if p != leaf_zone) or 'value'
+        yield city, int(year), leaf_zone, metric, value
+
+
+def suhi_batch_records(summary: Dict[str, Dict[str, Any]]) -> Iterator[Record]:
+    """``suhi_batch_summary.json``: ``{city: {year: {'stats': {...}}}}``."""
+    for city, years in summary.items():
+        for year, year_obj in (years or {}).items():
+            if isinstance(year_obj, dict):
+                yield from _records(city, year_obj.get('year', year), year_obj.get('stats', {}))
+
+
+def nightlights_records(summary: List[Dict[str, Any]]) -> Iterator[Record]:
+    """``nightlights_summary.json``: ``[{'city', 'years': {year: {'stats': {...}}}}]``."""
+    for entry in summary:
+        for year, year_obj in (entry.get('years') or {}).items():
+            yield from _records(entry.get('city'), year, (year_obj or {}).get('stats', {}))
+
+
+def lulc_records(summary: List[Dict[str, Any]]) -> Iterator[Record]:
+    """``lulc_analysis_summary.json``: class areas per year (zone = class), entropy and built-up area."""
+    for entry in summary:
+        city = entry.get('city')
+        for year, classes in (entry.get('areas_m2') or {}).items():
+            for cls, rec in (classes or {}).items():
+                if cls == '_entropy':
+                    yield from _records(city, year, {'entropy': rec})
+                else:
+                    yield from _records(city, year, rec, zone=cls)
+        for year, area in (entry.get('built_up_area_m2') or {}).items():
+            yield from _records(city, year, {'built_up_area_m2': area})
+
+
+def spatial_records(report: Dict[str, Any]) -> Iterator[Record]:
+    """``spatial_relationships_report.json``: the ``per_year`` block (temporal changes stay in JSON)."""
+    for city, years in (report.get('per_year') or {}).items():
+        for year, node in (years or {}).items():
+            yield from _records(city, year, node)
+
+
+# Tidy table name -> (summary file name, record builder)
+TIDY_SOURCES = {
+    'suhi_batch': ('suhi_batch_summary.json', suhi_batch_records),
+    'nightlights': ('nightlights_summary.json', nightlights_records),
+    'lulc_analysis': ('lulc_analysis_summary.json', lulc_records),
+    'spatial_relationships': ('spatial_relationships_report.json', spatial_records),
+}
+
+
+def build_tidy_table(records: Iterable[Record]) -> pd.DataFrame:
+    """Typed, sorted long table with TIDY_COLUMNS."""
+    df = pd.DataFrame.from_records(list(records), columns=TIDY_COLUMNS)
+    df = df.astype({'city': 'string', 'year': 'int32', 'zone': 'string', 'metric': 'string', 'value': 'float64'})
+    return df.sort_values(TIDY_COLUMNS[:4], kind='stable').reset_index(drop=True)
+
+
+def tidy_table(name: str, summary: Any) -> pd.DataFrame:
+    """Tidy table for a loaded summary of TIDY_SOURCES[name]."""
+    return build_tidy_table(TIDY_SOURCES[name][1](summary))
+
+
+def write_tidy(df: pd.DataFrame, stem: Path, formats: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Write ``df`` as ``<stem>.feather`` / ``<stem>.parquet``; returns {format: path}."""
+    if not HAS_ARROW:
+        print(f"Warning: pyarrow not installed; skipping tidy export {stem}")
+        return {}
+    stem = Path(stem)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for fmt in formats or TIDY_CONFIG["formats"]:
+        path = stem.with_name(f"{stem.name}.{fmt}")
+        tmp = path.with_name(path.name + ".tmp")
+        if fmt == "feather":
+            df.to_feather(tmp)
+        elif fmt == "parquet":
+            df.to_parquet(tmp, index=False, compression=TIDY_CONFIG["parquet_compression"])
+        else:
+            raise ValueError(f"Unknown tidy format: {fmt}")
+        os.replace(tmp, path)
+        written[fmt] = str(path)
+    return written
+
+
+def export_tidy(name: str, summary: Any, out_dir: Path, formats: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Write the tidy table of a summary next to its JSON as ``<name>_tidy.{feather,parquet}``."""
+    try:
+        df = tidy_table(name, summary)
+        written = write_tidy(df, Path(out_dir) / f"{name}_tidy", formats)
+    except Exception as e:
+        print(f"Warning: tidy export of {name} failed: {e}")
+        return {}
+    if written:
+        print(f"Wrote tidy {name} table ({len(df)} rows): {', '.join(written.values())}")
+    return written
+
+
+def export_all(reports_dir: Path, formats: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, str]]:
+    """Tidy tables for every summary JSON in ``reports_dir`` or its parent (the base output dir).
+
+    The nightlight unit writes its summary to the base output dir, the others
+    to ``reports/``; each tidy table is written next to the JSON it came from.
+    """
+    reports_dir = Path(reports_dir)
+    out = {}
+    for name, (filename, _) in TIDY_SOURCES.items():
+        path = next((d / filename for d in (reports_dir, reports_dir.parent) if (d / filename).exists()), None)
+        if path is None:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            out[name] = export_tidy(name, json.load(f), path.parent, formats)
+    return out
+
+
+if __name__ == '__main__':
+    export_all(Path(__file__).parent.parent / 'suhi_analysis_output' / 'reports')
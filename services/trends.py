@@ -0,0 +1,159 @@
+"""Vectorized trend statistics shared across analysis units.
+
+`batch_trends` fits every series of a ``(..., year)`` array in one call — e.g.
+a city × variable × year cube — and returns OLS slope/intercept/R²/p-value,
+the Theil–Sen slope, Mann–Kendall S/Z/p (with tie correction) and optional
+percentile-bootstrap confidence intervals for the OLS slope. Missing years
+are NaN and are skipped per series, so ragged city histories share one call.
+
+`trends_for_series` aligns a dict of ``(years, values)`` series onto a common
+year axis and unpacks the batched result per key; `series_trend` is the
+single-series convenience wrapper.
+"""
+from typing import Dict, Any, Optional, Sequence, Tuple, Hashable
+import warnings
+
+import numpy as np
+from scipy import stats
+
+TREND_CONFIG = {
+    "min_points": 2,      # fewer valid years -> NaN statistics
+    "n_boot": 0,          # bootstrap resamples for slope CIs (0 disables)
+    "alpha": 0.05,        # CI level is 1 - alpha; also the significance cut-off
+    "seed": 0,
+}
+
+TREND_KEYS = ("n", "ols_slope", "ols_intercept", "r_squared", "p_value", "stderr",
+              "theil_sen_slope", "mk_s", "mk_z", "mk_p", "slope_ci_low", "slope_ci_high")
+
+
+def _masked_ols(x: np.ndarray, y: np.ndarray, w: np.ndarray):
+    """Least-squares fit along the last axis using weights ``w`` (1 = observed, 0 = missing)."""
+    n = w.sum(-1)
+    mx = (w * x).sum(-1) / n
+    my = (w * y).sum(-1) / n
+    dx = (x - mx[..., None]) * w
+    dy = (y - my[..., None]) * w
+    sxx = (dx * dx).sum(-1)
+    sxy = (dx * dy).sum(-1)
+    syy = (dy * dy).sum(-1)
+    slope = sxy / sxx
+    return n, slope, my - slope * mx, sxx, sxy, syy
+
+
+def batch_trends(values, years: Optional[Sequence[float]] = None, axis: int = -1,
+                 n_boot: Optional[int] = None, alpha: Optional[float] = None,
+                 seed: Optional[int] = None, min_points: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Trend statistics for every series of ``values`` along ``axis`` (the year axis).
+
+    Returns a dict of arrays shaped like ``values`` without the year axis
+    (keys in ``TREND_KEYS``; the CI keys only when ``n_boot > 0``).
+    """
+    n_boot = TREND_CONFIG["n_boot"] if n_boot is None else int(n_boot)
+    alpha = TREND_CONFIG["alpha"] if alpha is None else alpha
+    seed = TREND_CONFIG["seed"] if seed is None else seed
+    min_points = TREND_CONFIG["min_points"] if min_points is None else min_points
+
+    y = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    T = y.shape[-1]
+    x = np.arange(T, dtype=float) if years is None else np.asarray(years, dtype=float)
+    valid = np.isfinite(y)
+    w = valid.astype(float)
+    yz = np.where(valid, y, 0.0)
+
+    out: Dict[str, np.ndarray] = {}
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        # Ordinary least squares with t-test on the slope
+        n, slope, intercept, sxx, sxy, syy = _masked_ols(x, yz, w)
+        df = n - 2
+        ss_res = np.maximum(syy - slope * sxy, 0.0)
+        stderr = np.where(df > 0, np.sqrt(ss_res / df / sxx), np.nan)
+        t_stat = slope / stderr
+        out["n"] = n.astype(int)
+        out["ols_slope"] = slope
+        out["ols_intercept"] = intercept
+        out["r_squared"] = np.where(syy > 0, sxy ** 2 / (sxx * syy), 0.0)
+        out["stderr"] = stderr
+        out["p_value"] = np.where(df > 0, 2.0 * stats.t.sf(np.abs(t_stat), np.maximum(df, 1)), np.nan)
+
+        # Theil–Sen: median of all pairwise slopes
+        i, j = np.triu_indices(T, 1)
+        pair_dy = y[..., j] - y[..., i]
+        pair_dx = x[j] - x[i]
+        pair_dx = np.where(pair_dx != 0, pair_dx, np.nan)
+        out["theil_sen_slope"] = (np.nanmedian(pair_dy / pair_dx, axis=-1) if i.size
+                                  else np.full(y.shape[:-1], np.nan))
+
+        # Mann–Kendall with tie-corrected variance and continuity correction
+        s = np.nan_to_num(np.sign(pair_dy)).sum(-1)
+        ties = (y[..., :, None] == y[..., None, :]).sum(-1)
+        tie_term = np.where(valid, (ties - 1) * (2 * ties + 5), 0).sum(-1)
+        var_s = (n * (n - 1) * (2 * n + 5) - tie_term) / 18.0
+        z = np.where(var_s > 0, (s - np.sign(s)) / np.sqrt(var_s), 0.0)
+        out["mk_s"] = s
+        out["mk_z"] = z
+        out["mk_p"] = np.where(n >= 3, 2.0 * stats.norm.sf(np.abs(z)), np.nan)
+
+        # Percentile bootstrap of the OLS slope (one shared set of year resamples)
+        if n_boot > 0 and T > 1:
+            idx = np.random.default_rng(seed).integers(0, T, size=(n_boot, T))
+            yb = y[..., idx]
+            vb = np.isfinite(yb)
+            _, boot_slope, _, _, _, _ = _masked_ols(x[idx], np.where(vb, yb, 0.0), vb.astype(float))
+            boot_slope = np.where(np.isfinite(boot_slope), boot_slope, np.nan)
+            out["slope_ci_low"] = np.nanpercentile(boot_slope, 100 * alpha / 2, axis=-1)
+            out["slope_ci_high"] = np.nanpercentile(boot_slope, 100 * (1 - alpha / 2), axis=-1)
+
+    short = n < min_points
+    for key, arr in out.items():
+        if key != "n":
+            out[key] = np.where(short, np.nan, arr)
+    return out
+
+
+def _as_float(v) -> Optional[float]:
+    v = float(v)
+    return v if np.isfinite(v) else None
+
+
+def trends_for_series(series: Dict[Hashable, Tuple[Sequence[float], Sequence[float]]],
+                      **kwargs) -> Dict[Hashable, Dict[str, Any]]:
+    """Fit many ragged ``{key: (years, values)}`` series in one batched call.
+
+    Series are aligned on the union of their years (missing -> NaN). Each key
+    maps to a dict of plain floats (``None`` where undefined) plus ``n``.
+    """
+    if not series:
+        return {}
+    keys = list(series.keys())
+    all_years = sorted({float(yr) for yrs, _ in series.values() for yr in yrs})
+    col = {yr: k for k, yr in enumerate(all_years)}
+    cube = np.full((len(keys), len(all_years)), np.nan)
+    for r, key in enumerate(keys):
+        yrs, vals = series[key]
+        for yr, v in zip(yrs, vals):
+            if v is not None:
+                cube[r, col[float(yr)]] = float(v)
+    res = batch_trends(cube, all_years, **kwargs)
+    return {key: {name: (int(arr[r]) if name == "n" else _as_float(arr[r])) for name, arr in res.items()}
+            for r, key in enumerate(keys)}
+
+
+def series_trend(years: Sequence[float], values: Sequence[float], **kwargs) -> Dict[str, Any]:
+    """Trend statistics for one series (see `trends_for_series`)."""
+    return trends_for_series({0: (years, values)}, **kwargs)[0]
+
+
+def trend_table(df, by, year_col: str, value_cols: Sequence[str], **kwargs):
+    """Batched trends for a tidy DataFrame: one row per ``by`` group × value column."""
+    import pandas as pd
+    by = [by] if isinstance(by, str) else list(by)
+    wide = df.pivot_table(index=by, columns=year_col, values=list(value_cols), aggfunc="mean")
+    years = sorted(wide.columns.get_level_values(1).unique())
+    cube = np.stack([wide[v].reindex(columns=years).to_numpy(dtype=float) for v in value_cols], axis=1)
+    res = batch_trends(cube, years, **kwargs)  # group × variable
+    index = pd.MultiIndex.from_tuples([(*((g,) if len(by) == 1 else g), v)
+                                       for g in wide.index for v in value_cols], names=by + ["variable"])
+    return pd.DataFrame({k: np.asarray(a).reshape(-1) for k, a in res.items()}, index=index)
@@ -126,41 +126,93 @@ def create_output_directories() -> Dict[str, Path]:
     return dirs
 
 
-def make_json_safe(v):
-    """Recursively convert common EE objects and non-JSON types to JSON-serializable Python types.
+_UNRESOLVED = object()
 
-    This helper attempts to call getInfo() on Earth Engine objects when available
-    and falls back to safe Python casts. It is intentionally permissive to avoid
-    write-time failures when saving analysis summaries.
-    """
+
+def _is_deferred_ee_value(v, _ee) -> bool:
+    """True for server-side values worth fetching (numbers, strings, lists, dictionaries,
+    computed ``.get()`` results); images, features, collections and geometries are not."""
+    return (isinstance(v, _ee.ComputedObject)
+            and not isinstance(v, (_ee.Element, _ee.Collection, _ee.Geometry)))
+
+
+def collect_ee_values(tree) -> list:
+    """Return every deferred EE leaf in a nested dict/list tree (deduplicated, in walk order)."""
+    from collections.abc import Mapping, Sequence
     try:
         import ee as _ee
     except Exception:
-        _ee = None
+        return []
+    leaves, seen, stack = [], set(), [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Mapping):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, Sequence) and not isinstance(node, (str, bytes, bytearray)):
+            stack.extend(reversed(list(node)))
+        elif _is_deferred_ee_value(node, _ee) and id(node) not in seen:
+            seen.add(id(node))
+            leaves.append(node)
+    return leaves
+
+
+def _fetch_ee_values(leaves: list, _ee) -> list:
+    # One request for the whole batch; on failure bisect so a single bad leaf
+    # only costs log2(n) extra requests instead of failing every value
+    try:
+        return _ee.List(leaves).getInfo()
+    except Exception:
+        if len(leaves) == 1:
+            return [_UNRESOLVED]
+        mid = len(leaves) // 2
+        return _fetch_ee_values(leaves[:mid], _ee) + _fetch_ee_values(leaves[mid:], _ee)
+
+
+def resolve_ee_values(tree) -> Dict[int, object]:
+    """Fetch all deferred EE leaves of ``tree`` with a single ``getInfo()``.
+
+    Returns a mapping ``id(leaf) -> value`` (``_UNRESOLVED`` for leaves that failed);
+    it is only valid while ``tree`` is alive.
+    """
+    leaves = collect_ee_values(tree)
+    if not leaves:
+        return {}
+    import ee as _ee
+    values = _fetch_ee_values(leaves, _ee)
+    return {id(leaf): val for leaf, val in zip(leaves, values)}
+
+
+def make_json_safe(v, _resolved: Dict[int, object] = None):
+    """Recursively convert common EE objects and non-JSON types to JSON-serializable Python types.
+
+    Deferred EE values (ee.Number, ee.Dictionary, ...) anywhere in the tree are
+    fetched together in one batched getInfo() and spliced back; values that fail
+    fall back to their string form. It is intentionally permissive to avoid
+    write-time failures when saving analysis summaries.
+    """
+    if _resolved is None:
+        _resolved = resolve_ee_values(v)
 
     # primitive types
     if v is None or isinstance(v, (str, bool, int, float)):
         return v
     # containers
     if isinstance(v, dict):
-        return {k: make_json_safe(val) for k, val in v.items()}
+        return {k: make_json_safe(val, _resolved) for k, val in v.items()}
     if isinstance(v, (list, tuple)):
-        return [make_json_safe(x) for x in v]
+        return [make_json_safe(x, _resolved) for x in v]
 
     # Earth Engine types
-    if _ee is not None:
-        try:
-            if isinstance(v, (_ee.Number, _ee.String, _ee.List, _ee.Dictionary)):
-                try:
-                    info = v.getInfo()
-                    return make_json_safe(info)
-                except Exception:
-                    return str(v)
-            if isinstance(v, (_ee.Image, _ee.Geometry, _ee.FeatureCollection, _ee.Feature)):
-                return str(v)
-        except Exception:
-            # If ee is not behaving as expected, continue to fallbacks
-            pass
+    if id(v) in _resolved:
+        info = _resolved[id(v)]
+        return str(v) if info is _UNRESOLVED else make_json_safe(info, {})
+    try:
+        import ee as _ee
+        if isinstance(v, (_ee.Image, _ee.Geometry, _ee.FeatureCollection, _ee.Feature)):
+            return str(v)
+    except Exception:
+        # If ee is not behaving as expected, continue to fallbacks
+        pass
 
     # numpy scalars
     try:
@@ -12,6 +12,8 @@ from typing import Dict, Any, List, Optional
 import warnings
 from datetime import datetime
 import seaborn as sns
+from .chart_rendering import ChartRenderer
+from .analyzer import build_suhi_table
 
 # Configure Plotly
 warnings.filterwarnings('ignore')
@@ -28,14 +30,17 @@ class SUHIChartGenerator:
     Individual chart generator for SUHI analysis reporting.
     """
     
-    def __init__(self, data_path, output_path):
+    def __init__(self, data_path, output_path, render_workers: Optional[int] = None):
         """Initialize the chart generator."""
         self.data_path = Path(data_path)
         self.output_path = Path(output_path)
         self.output_path.mkdir(exist_ok=True)
+        self.render_workers = render_workers
+        self.renderer = None
         
         self.cities_data = {}
         self.temporal_data = {}
+        self.table = build_suhi_table({})
         self.summary_stats = {}
         
         # Professional color palette
@@ -87,6 +92,7 @@ class SUHIChartGenerator:
                 with open(trends_file, 'r') as f:
                     self.temporal_data[city] = json.load(f)
         
+        self.table = build_suhi_table(self.cities_data)
         self._calculate_summary_stats()
         print(f"Loaded data for {len(cities)} cities")
 
@@ -104,44 +110,29 @@ class SUHIChartGenerator:
             'strongest_cooling': ''
         }
         
-        suhi_2017_values = []
-        suhi_2024_values = []
-        changes = []
-        city_changes = {}
-        
-        for city, years_data in self.cities_data.items():
-            if 2017 in years_data and 2024 in years_data:
-                self.summary_stats['cities_with_both_years'] += 1
-                
-                suhi_2017 = years_data[2017].get('suhi', {}).get('intensity', 0)
-                suhi_2024 = years_data[2024].get('suhi', {}).get('intensity', 0)
-                
-                if suhi_2017 and suhi_2024:
-                    suhi_2017_values.append(suhi_2017)
-                    suhi_2024_values.append(suhi_2024)
-                    change = suhi_2024 - suhi_2017
-                    changes.append(change)
-                    city_changes[city] = change
-        
-        if suhi_2017_values:
-            self.summary_stats['avg_suhi_2017'] = np.mean(suhi_2017_values)
-        if suhi_2024_values:
-            self.summary_stats['avg_suhi_2024'] = np.mean(suhi_2024_values)
-        if changes:
-            self.summary_stats['avg_change'] = np.mean(changes)
-            self.summary_stats['max_change'] = max(changes)
-            self.summary_stats['min_change'] = min(changes)
+        table = self.table
+        pair = table[table['year'].isin([2017, 2024])]
+        self.summary_stats['cities_with_both_years'] = int((pair.groupby('city')['year'].nunique() == 2).sum())
+        wide = pair.pivot_table(index='city', columns='year', values='suhi', aggfunc='first').reindex(columns=[2017, 2024])
+        wide = wide.dropna()
+        wide = wide[(wide[2017] != 0) & (wide[2024] != 0)]
+        
+        if not wide.empty:
+            changes = wide[2024] - wide[2017]
+            self.summary_stats['avg_suhi_2017'] = float(wide[2017].mean())
+            self.summary_stats['avg_suhi_2024'] = float(wide[2024].mean())
+            self.summary_stats['avg_change'] = float(changes.mean())
+            self.summary_stats['max_change'] = float(changes.max())
+            self.summary_stats['min_change'] = float(changes.min())
             
             # Find cities with strongest warming/cooling
-            if city_changes:
-                max_warming_city = max(city_changes, key=city_changes.get)
-                max_cooling_city = min(city_changes, key=city_changes.get)
-                self.summary_stats['strongest_warming'] = max_warming_city
-                self.summary_stats['strongest_cooling'] = max_cooling_city
+            self.summary_stats['strongest_warming'] = changes.idxmax()
+            self.summary_stats['strongest_cooling'] = changes.idxmin()
 
     def generate_all_charts(self):
         """Generate all individual charts."""
         print("Generating all SUHI analysis charts...")
+        self.renderer = ChartRenderer(self.output_path, max_workers=self.render_workers)
         
         # Generate each chart type
         self.create_suhi_comparison_chart()
@@ -154,8 +145,18 @@ class SUHIChartGenerator:
         self.create_accuracy_assessment_chart()
         self.create_comprehensive_overview_chart()
         
+        self.renderer.render_all()
+        self.renderer = None
         print(f"✅ All charts generated in: {self.output_path}")
 
+    def _save_chart(self, fig, chart_name: str, width: int, height: int, scale: float = 1):
+        """Queue the chart on the active renderer, or write it directly."""
+        if self.renderer is not None:
+            self.renderer.submit(fig, chart_name, width=width, height=height, scale=scale)
+            return
+        fig.write_html(self.output_path / f"{chart_name}.html")
+        fig.write_image(self.output_path / f"{chart_name}.png", width=width, height=height, scale=scale)
+
     def create_suhi_comparison_chart(self):
         """Create comparison chart for 2017 vs 2024 SUHI values."""
         cities = []
@@ -218,8 +219,7 @@ class SUHIChartGenerator:
         
         # Save chart
         chart_name = "01_suhi_comparison_2017_vs_2024"
-        fig.write_html(self.output_path / f"{chart_name}.html")
-        fig.write_image(self.output_path / f"{chart_name}.png", width=1200, height=600)
+        self._save_chart(fig, chart_name, width=1200, height=600)
         print(f"📊 Created: {chart_name}")
 
 
@@ -364,12 +364,16 @@ def get_city_boundaries(city_name: str, city_info: Dict, buffer_km: Optional[flo
 
 def create_professional_heat_map(temp_data: np.ndarray, city_name: str, city_info: Dict, 
                                   output_path: Path, city_boundaries: Optional[Dict] = None) -> bool:
-    """Create professional GIS-style heat map."""
+    """Create professional GIS-style heat map.
+
+    For many city/year maps use `heat_map_atlas.render_heat_maps`, which
+    prepares the basemap once and reuses one figure per worker.
+    """
     try:
+        from .heat_map_atlas import heat_map_extent, temperature_cmap
         import cartopy.crs as ccrs
         import cartopy.feature as cfeature
         from matplotlib.patches import Rectangle
-        import matplotlib.colors as mcolors
         from mpl_toolkits.axes_grid1 import make_axes_locatable
         
         # Set up the figure and projection
@@ -380,16 +384,7 @@ def create_professional_heat_map(temp_data: np.ndarray, city_name: str, city_inf
         # Get city coordinates
         lat = city_info.get('lat', 0)
         lon = city_info.get('lon', 0)
-        buffer_km = city_info.get('buffer_km', 10)
-        
-        # Calculate extent (rough approximation)
-        lat_buffer = buffer_km / 111  # 1 degree lat ≈ 111 km
-        lon_buffer = buffer_km / (111 * np.cos(np.radians(lat)))
-        
-        extent = [
-            lon - lon_buffer, lon + lon_buffer,
-            lat - lat_buffer, lat + lat_buffer
-        ]
+        extent = heat_map_extent(city_info)
         ax.set_extent(extent, crs=projection)
         
         # Add map features
@@ -399,10 +394,7 @@ def create_professional_heat_map(temp_data: np.ndarray, city_name: str, city_inf
         ax.add_feature(cfeature.RIVERS, color='lightblue', linewidth=0.5)
         
         # Create temperature colormap
-        colors = ['#2166ac', '#4393c3', '#92c5de', '#d1e5f0', 
-                 '#f7f7f7', '#fdbf6f', '#ff7f00', '#e31a1c', '#800026']
-        n_bins = 256
-        cmap = mcolors.LinearSegmentedColormap.from_list('temperature', colors, N=n_bins)
+        cmap = temperature_cmap()
         
         # Create dummy temperature data if none provided
         if temp_data is None or temp_data.size == 0:
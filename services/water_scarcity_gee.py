@@ -15,7 +15,7 @@ from pathlib import Path
 import json
 import numpy as np
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 try:
     import ee
@@ -24,7 +24,6 @@ except Exception:
 
 from services.utils import UZBEKISTAN_CITIES
 from dataclasses import dataclass
-import math
 
 # Define the metrics dataclass here to avoid circular imports
 @dataclass
@@ -58,6 +57,96 @@ class WaterScarcityMetrics:
 CACHE_DIR = Path('suhi_analysis_output') / 'data' / 'water_scarcity'
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Raw monthly series cache (bump SERIES_VERSION when the extraction itself changes)
+SERIES_VERSION = 1
+SERIES_START = '2001-01-01'
+SERIES_MONTHS = 240
+SERIES_BUFFER_M = 5000
+SERIES_SCALE = 2500
+
+# Local derivation parameters; any of these can be swept without re-fetching
+DERIVATION_DEFAULTS = {
+    'start_year': 2001,
+    'end_year': 2020,
+    'summer_months': (6, 7, 8),
+    'summer_diurnal_range': 12.0,  # Uzbekistan diurnal range: ~12-15°C in summer
+    'winter_diurnal_range': 10.0,  # ~8-10°C in winter
+    'drought_z_threshold': -1.0,   # PDSI < -1 indicates drought
+}
+
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=float)
+
+
+def hargreaves_pet(temp_c: np.ndarray, month: np.ndarray, lat: float,
+                   summer_months=(6, 7, 8), summer_diurnal_range: float = 12.0,
+                   winter_diurnal_range: float = 10.0) -> np.ndarray:
+    """Monthly Hargreaves PET (mm/month) from mean temperature, estimating Tmax-Tmin from the season."""
+    temp_c = np.asarray(temp_c, dtype=float)
+    month = np.asarray(month, dtype=int)
+    diurnal_range = np.where(np.isin(month, summer_months), summer_diurnal_range, winter_diurnal_range)
+
+    # Extraterrestrial radiation (Ra) in MJ/m²/day for the middle of each month
+    day_of_year = np.concatenate([[0.0], np.cumsum(_DAYS_IN_MONTH)[:-1]])[month - 1] + 15
+    solar_declination = 0.409 * np.sin(2 * np.pi * (284 + day_of_year) / 365.0)
+    lat_rad = float(lat) * np.pi / 180.0
+    sunset_angle = np.arccos(np.clip(-np.tan(lat_rad) * np.tan(solar_declination), -1.0, 1.0))
+    Ra = (24.0 * 60.0 / np.pi) * 0.082 * (sunset_angle * np.sin(lat_rad) * np.sin(solar_declination) +
+                                         np.cos(lat_rad) * np.cos(solar_declination) * np.sin(sunset_angle))
+    Ra = np.maximum(0.0, Ra)
+
+    # PET = 0.0023 * Ra * (Tmax - Tmin)^0.5 * (Tmean + 17.8) * days
+    pet_daily = 0.0023 * Ra * np.sqrt(diurnal_range) * (temp_c + 17.8)
+    return np.where(temp_c <= 0, 0.0, pet_daily * _DAYS_IN_MONTH[month - 1])
+
+
+def derive_water_indicators(precip_mm: np.ndarray, temp_c: np.ndarray, lat: float,
+                            params: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """Derive aridity index, climatic water deficit and drought frequency from monthly series.
+
+    Series are monthly from SERIES_START; ``params`` (merged over
+    DERIVATION_DEFAULTS) may narrow the period or change PET/drought settings.
+    """
+    p = dict(DERIVATION_DEFAULTS)
+    p.update(params or {})
+    series_start_year = int(SERIES_START[:4])
+    start_year, end_year = int(p['start_year']), int(p['end_year'])
+    precip = np.asarray(precip_mm, dtype=float)
+    temp = np.asarray(temp_c, dtype=float)
+    n_months = min(SERIES_MONTHS, precip.size, temp.size)
+    i0 = (start_year - series_start_year) * 12
+    i1 = (end_year - series_start_year + 1) * 12
+    if not series_start_year <= start_year <= end_year or i1 > n_months:
+        last_year = series_start_year + n_months // 12 - 1
+        raise ValueError(f"Period {start_year}-{end_year} outside cached series "
+                         f"{series_start_year}-{last_year}")
+    precip = precip[i0:i1]
+    temp = temp[i0:i1]
+    month = np.arange(precip.size) % 12 + 1
+
+    pet = hargreaves_pet(temp, month, lat, p['summer_months'],
+                         p['summer_diurnal_range'], p['winter_diurnal_range'])
+    D_values = precip - pet  # Palmer Drought Severity Index proxy
+
+    # Compute annual averages
+    n_years = precip.size / 12.0
+    mean_annual_precip = precip.sum() / n_years
+    mean_annual_pet = pet.sum() / n_years
+    aridity_index = float(max(0.001, min(1.0, mean_annual_precip / max(1e-6, mean_annual_pet))))
+
+    # Climatic water deficit (average annual unmet demand)
+    climatic_water_deficit = float(np.clip(pet - precip, 0.0, None).sum() / n_years)
+
+    # Drought frequency using PDSI proxy (z-score of D values)
+    stdev_D = D_values.std()
+    z = (D_values - D_values.mean()) / stdev_D if stdev_D > 0 else np.zeros_like(D_values)
+    drought_frequency = float(np.mean(z < p['drought_z_threshold']))
+
+    return {
+        'aridity_index': aridity_index,
+        'climatic_water_deficit': climatic_water_deficit,
+        'drought_frequency': drought_frequency,
+    }
+
 
 class WaterScarcityGEEAssessment:
     """Load water indicators from GEE and compute water scarcity scores.
@@ -126,19 +215,11 @@ class WaterScarcityGEEAssessment:
         return lulc_data
     
     def _load_city_population_data(self):
-        """Load population and area data from climate data loader"""
+        """Population, area and density per city from the compiled reference bundle"""
         # Import here to avoid circular imports
-        from services.climate_data_loader import UZBEK_CITIES_DATA
+        from services.reference_bundle import load_bundle
         
-        pop_data = {}
-        for city, data in UZBEK_CITIES_DATA.items():
-            pop_data[city] = {
-                'population': data.get('pop_2024', 100000),
-                'area_km2': data.get('area_km2', 50.0),
-                'density': data.get('pop_2024', 100000) / data.get('area_km2', 50.0) if data.get('area_km2', 50.0) > 0 else 1000.0
-            }
-        
-        return pop_data
+        return load_bundle().city_population()
 
     def _cache_path(self, city: str) -> Path:
         return CACHE_DIR / f"{city.replace(' ', '_')}_water_indicators.json"
@@ -157,10 +238,194 @@ class WaterScarcityGEEAssessment:
         with open(p, 'w', encoding='utf-8') as fh:
             json.dump(data, fh, indent=2)
 
-    def _fetch_city_indicators(self, city: str) -> Dict[str, Any]:
-        """Fetch indicators for a single city from GEE and return a JSON-serializable dict.
+    def _series_path(self, city: str) -> Path:
+        return CACHE_DIR / f"{city.replace(' ', '_')}_climate_series_v{SERIES_VERSION}.npz"
+
+    def _series_metadata(self, city: str) -> Dict[str, Any]:
+        return {
+            'version': SERIES_VERSION,
+            'city': city,
+            'datasets': dict(self.DATASETS),
+            'start': SERIES_START,
+            'n_months': SERIES_MONTHS,
+            'buffer_m': SERIES_BUFFER_M,
+            'scale': SERIES_SCALE,
+        }
+
+    def _load_climate_series(self, city: str):
+        """Return the cached raw series for ``city`` if it matches the current datasets/period."""
+        p = self._series_path(city)
+        if not p.exists():
+            return None
+        try:
+            with np.load(p, allow_pickle=False) as z:
+                meta = json.loads(str(z['metadata']))
+                if meta != self._series_metadata(city):
+                    return None
+                return {
+                    'precip_mm': z['precip_mm'].astype(float),
+                    'temp_k': z['temp_k'].astype(float),
+                    'jrc_occurrence': float(z['jrc_occurrence']),
+                    'lat': float(z['lat']),
+                    'metadata': meta,
+                }
+        except Exception:
+            return None
+
+    def _save_climate_series(self, city: str, series: Dict[str, Any]):
+        p = self._series_path(city)
+        tmp = p.with_name(p.stem + '.tmp.npz')
+        np.savez_compressed(
+            tmp,
+            precip_mm=np.asarray(series['precip_mm'], dtype=np.float32),
+            temp_k=np.asarray(series['temp_k'], dtype=np.float32),
+            jrc_occurrence=np.float64(series['jrc_occurrence']),
+            lat=np.float64(series['lat']),
+            metadata=np.array(json.dumps(self._series_metadata(city))),
+        )
+        tmp.replace(p)
+
+    def _fetch_climate_series(self, city: str) -> Dict[str, Any]:
+        """Fetch raw monthly CHIRPS precipitation, ERA5 temperature and JRC occurrence for ``city``.
 
-        Indicators produced:
+        Uses the local series cache when present; otherwise runs one GEE
+        round trip for the monthly arrays and one for JRC, then caches them.
+        """
+        cached = self._load_climate_series(city)
+        if cached is not None:
+            return cached
+
+        # Create a point geometry from data_loader city definitions when available
+        if city in self.city_definitions:
+            cd = self.city_definitions[city]
+            geom = ee.Geometry.Point([cd['lon'], cd['lat']])
+            lat = float(cd.get('lat', 0.0))
+        else:
+            # Fallback: try to use a city centroid from utils mapping
+            geom = ee.Geometry.Point([0, 0])
+            lat = 0.0
+
+        # Collections
+        series_start = ee.Date(SERIES_START)
+        chirps = ee.ImageCollection(self.DATASETS['chirps']).filterDate(series_start, series_start.advance(SERIES_MONTHS, 'month').advance(-1, 'day'))
+        era5 = ee.ImageCollection(self.DATASETS['era5']).select(['mean_2m_air_temperature'])
+        jrc = ee.Image(self.DATASETS['jrc_gsw']).select('occurrence')
+
+        # Use circular buffer, not bounds (smaller area)
+        buf = geom.buffer(SERIES_BUFFER_M)
+
+        # Build monthly images server-side (240 months: 2001-01 to 2020-12)
+        months = ee.List.sequence(0, SERIES_MONTHS - 1)
+
+        def month_img(m):
+            m = ee.Number(m)
+            start = series_start.advance(m, 'month')
+            end = start.advance(1, 'month')
+            # Monthly precipitation total
+            p = chirps.filterDate(start, end).sum().rename('P')
+            # Monthly mean temperature
+            t = era5.filterDate(start, end).mean().rename('T')
+            return p.addBands(t).set({'start': start, 'month': m})
+
+        monthly = ee.ImageCollection(months.map(month_img))
+
+        # Reduce to region once per image, collect on server
+        def region_stats(img):
+            stats = img.reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=buf,
+                scale=SERIES_SCALE,  # coarser scale for speed
+                bestEffort=True,
+                maxPixels=1e9
+            )
+            return ee.Feature(None, stats).set({'month': img.get('month')})
+
+        fc = monthly.map(region_stats)
+
+        # Pull arrays in ONE getInfo() call
+        vals = ee.Dictionary({
+            'P': fc.aggregate_array('P'),
+            'T': fc.aggregate_array('T'),  # Kelvin
+            'months': fc.aggregate_array('month')
+        }).getInfo()
+
+        # Extract to Python lists
+        monthly_precip = [float(x) if x is not None else 0.0 for x in vals['P']]
+        monthly_temp_k = [float(x) if x is not None else 273.15 for x in vals['T']]
+
+        if len(monthly_precip) != SERIES_MONTHS or len(monthly_temp_k) != SERIES_MONTHS:
+            # Fill missing values with reasonable defaults
+            while len(monthly_precip) < SERIES_MONTHS:
+                monthly_precip.append(0.0)
+            while len(monthly_temp_k) < SERIES_MONTHS:
+                monthly_temp_k.append(273.15 + 15.0)  # 15°C default
+
+            # Trim if too many (shouldn't happen but be safe)
+            monthly_precip = monthly_precip[:SERIES_MONTHS]
+            monthly_temp_k = monthly_temp_k[:SERIES_MONTHS]
+
+        try:
+            jrc_occurrence = jrc.reduceRegion(
+                ee.Reducer.mean(), buf, SERIES_SCALE,
+                bestEffort=True, maxPixels=1e9
+            )
+            occurrence_val = jrc_occurrence.get('occurrence').getInfo() if jrc_occurrence.get('occurrence') else None
+            jrc_val = float(occurrence_val) if occurrence_val is not None else 0.0
+        except Exception as e:
+            print(f"Warning: JRC data failed for {city}: {e}")
+            jrc_val = 0.0
+
+        series = {
+            'precip_mm': np.asarray(monthly_precip, dtype=float),
+            'temp_k': np.asarray(monthly_temp_k, dtype=float),
+            'jrc_occurrence': jrc_val,
+            'lat': lat,
+            'metadata': self._series_metadata(city),
+        }
+        self._save_climate_series(city, series)
+        return series
+
+    def _demand_indicators(self, city: str, verbose: bool = True) -> Dict[str, float]:
+        # Use existing LULC data for cropland fraction (preferred over satellite-derived data)
+        existing_cropland = self.lulc_data.get(city, {}).get('cropland_fraction', None)
+        if existing_cropland is not None:
+            cropland_fraction = existing_cropland
+            if verbose:
+                print(f"Debug {city}: Using existing LULC cropland fraction={cropland_fraction}")
+        else:
+            if verbose:
+                print(f"Warning: No LULC cropland data available for {city}")
+            cropland_fraction = 0.0
+
+        # Use existing population data directly (no satellite imagery needed)
+        existing_pop_data = self.city_population_data.get(city, {})
+        if existing_pop_data:
+            pop_val = existing_pop_data.get('density', 100.0)
+            if verbose:
+                print(f"Debug {city}: Using user-provided population density={pop_val}")
+        else:
+            if verbose:
+                print(f"Warning: No population data available for {city}")
+            pop_val = 100.0
+        return {'cropland_fraction': float(cropland_fraction), 'population_density': float(pop_val)}
+
+    def _indicators_from_series(self, city: str, series: Dict[str, Any],
+                                params: Optional[Dict[str, Any]] = None, verbose: bool = True) -> Dict[str, Any]:
+        indicators = derive_water_indicators(series['precip_mm'], series['temp_k'] - 273.15,
+                                             series['lat'], params)
+        jrc_val = series['jrc_occurrence']
+        indicators['surface_water_change'] = -float(jrc_val) if jrc_val is not None else 0.0  # negative = loss
+        indicators.update(self._demand_indicators(city, verbose=verbose))
+        # Aqueduct data removed due to availability issues - set to None
+        indicators['aqueduct_bws_score'] = None
+        return indicators
+
+    def _fetch_city_indicators(self, city: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch indicators for a single city and return a JSON-serializable dict.
+
+        Raw monthly series come from the local series cache (or one GEE fetch
+        that fills it); the indicators are then derived locally with ``params``
+        (see DERIVATION_DEFAULTS):
           - aridity_index (P/PET, median multi-year)
           - climatic_water_deficit (proxy, mm/yr)
           - drought_frequency (fraction months with very low precip)
@@ -169,206 +434,45 @@ class WaterScarcityGEEAssessment:
           - population_density (from user-provided data)
           - aqueduct_bws_score (from WRI Aqueduct when available)
         """
-        # Try cache first
-        cached = self._load_cached(city)
-        if cached:
-            return cached
+        default_params = not params
+        # Legacy derived-only cache: still valid for default parameters when no raw series is cached
+        if default_params and not self._series_path(city).exists():
+            cached = self._load_cached(city)
+            if cached:
+                return cached
 
-        # Use optimized EE workflow: build monthly time series server-side, one getInfo() call
         try:
-            # Create a point geometry from data_loader city definitions when available
-            if city in self.city_definitions:
-                cd = self.city_definitions[city]
-                geom = ee.Geometry.Point([cd['lon'], cd['lat']])
-                lat = float(cd.get('lat', 0.0))
-            else:
-                # Fallback: try to use a city centroid from utils mapping
-                geom = ee.Geometry.Point([0, 0])
-                lat = 0.0
-
-            # Collections
-            chirps = ee.ImageCollection(self.DATASETS['chirps']).filterDate('2001-01-01', '2020-12-31')
-            era5 = ee.ImageCollection(self.DATASETS['era5']).select(['mean_2m_air_temperature'])
-            jrc = ee.Image(self.DATASETS['jrc_gsw']).select('occurrence')
-
-            # Use circular buffer, not bounds (smaller area)
-            buf = geom.buffer(5000)
-
-            # Build monthly images server-side (240 months: 2001-01 to 2020-12)
-            months = ee.List.sequence(0, 239)
-
-            def month_img(m):
-                m = ee.Number(m)
-                start = ee.Date('2001-01-01').advance(m, 'month')
-                end = start.advance(1, 'month')
-                # Monthly precipitation total
-                p = chirps.filterDate(start, end).sum().rename('P')
-                # Monthly mean temperature
-                t = era5.filterDate(start, end).mean().rename('T')
-                return p.addBands(t).set({'start': start, 'month': m})
-
-            monthly = ee.ImageCollection(months.map(month_img))
-
-            # Reduce to region once per image, collect on server
-            def region_stats(img):
-                stats = img.reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=buf,
-                    scale=2500,  # coarser scale for speed
-                    bestEffort=True,
-                    maxPixels=1e9
-                )
-                return ee.Feature(None, stats).set({'month': img.get('month')})
-
-            fc = monthly.map(region_stats)
-
-            # Pull arrays in ONE getInfo() call
-            P_array = fc.aggregate_array('P')
-            T_array = fc.aggregate_array('T')  # Kelvin
-            month_array = fc.aggregate_array('month')
-
-            vals = ee.Dictionary({
-                'P': P_array,
-                'T': T_array,
-                'months': month_array
-            }).getInfo()
-
-            # Extract to Python lists
-            monthly_precip = [float(x) if x is not None else 0.0 for x in vals['P']]
-            monthly_temp_k = [float(x) if x is not None else 273.15 for x in vals['T']]
-
-            if len(monthly_precip) != 240 or len(monthly_temp_k) != 240:
-                # Fill missing values with reasonable defaults
-                while len(monthly_precip) < 240:
-                    monthly_precip.append(0.0)
-                while len(monthly_temp_k) < 240:
-                    monthly_temp_k.append(273.15 + 15.0)  # 15°C default
-                
-                # Trim if too many (shouldn't happen but be safe)
-                monthly_precip = monthly_precip[:240]
-                monthly_temp_k = monthly_temp_k[:240]
-
-            # Convert temp to Celsius
-            monthly_temp_c = [t - 273.15 for t in monthly_temp_k]
-
-            # Compute PET and water balance locally (fast) using Hargreaves method
-            days_in_month = [31,28,31,30,31,30,31,31,30,31,30,31]
-            monthly_pet = []
-            D_values = []  # Palmer Drought Severity Index proxy
-
-            # Compute PET for each year using Hargreaves method
-            for yy in range(2001, 2021):
-                year_idx = (yy - 2001) * 12
-                temps_year_c = monthly_temp_c[year_idx:year_idx+12]
-
-                for m_idx in range(12):
-                    T_mean = temps_year_c[m_idx]
-                    m = m_idx + 1
-                    P = monthly_precip[year_idx + m_idx]
-
-                    if T_mean <= 0:
-                        pet = 0.0
-                    else:
-                        # Estimate Tmax and Tmin from Tmean (typical for arid regions)
-                        # Uzbekistan diurnal range: ~12-15°C in summer, ~8-10°C in winter
-                        diurnal_range = 12.0 if m in [6,7,8] else 10.0  # Summer vs winter
-                        T_max = T_mean + diurnal_range / 2.0
-                        T_min = T_mean - diurnal_range / 2.0
-
-                        # Calculate extraterrestrial radiation (Ra) in MJ/m²/day
-                        # Based on latitude and day of year
-                        day_of_year = sum(days_in_month[:m-1]) + 15
-                        solar_declination = 0.409 * math.sin(2 * math.pi * (284 + day_of_year) / 365.0)
-                        lat_rad = float(lat) * math.pi / 180.0
-
-                        sunset_angle = math.acos(-math.tan(lat_rad) * math.tan(solar_declination))
-                        Ra = (24.0 * 60.0 / math.pi) * 0.082 * (sunset_angle * math.sin(lat_rad) * math.sin(solar_declination) +
-                                                              math.cos(lat_rad) * math.cos(solar_declination) * math.sin(sunset_angle))
-                        Ra = max(0.0, Ra)  # Ensure non-negative
-
-                        # Hargreaves PET formula: PET = 0.0023 * Ra * (Tmax - Tmin)^0.5 * (Tmean + 17.8) * days
-                        pet_daily = 0.0023 * Ra * (T_max - T_min)**0.5 * (T_mean + 17.8)
-                        pet = pet_daily * days_in_month[m-1]
-
-                    monthly_pet.append(pet)
-                    D_values.append(P - pet)
-
-            # Compute annual averages
-            n_years = 20
-            mean_annual_precip = sum(monthly_precip) / n_years
-            mean_annual_pet = sum(monthly_pet) / n_years
-            aridity_index = float(max(0.001, min(1.0, mean_annual_precip / max(1e-6, mean_annual_pet))))
-
-            # Climatic water deficit (average annual unmet demand)
-            cwd_total = 0.0
-            for p, pet in zip(monthly_precip, monthly_pet):
-                if pet > p:
-                    cwd_total += (pet - p)
-            climatic_water_deficit = float(cwd_total / n_years)
-
-            # Drought frequency using PDSI proxy (z-score of D values)
-            import statistics
-            mean_D = statistics.mean(D_values)
-            stdev_D = statistics.pstdev(D_values) if len(D_values) > 1 else 0.0
-            drought_months = 0
-            for D in D_values:
-                z = (D - mean_D) / stdev_D if stdev_D > 0 else 0.0
-                if z < -1.0:  # PDSI < -1 indicates drought
-                    drought_months += 1
-            drought_frequency = float(drought_months / len(D_values))
-
-            # Fetch one-off indicators with single calls - use larger buffer for land cover
-            land_buf = geom.buffer(10000)  # Larger buffer for land cover data
-            
-            try:
-                jrc_occurrence = jrc.reduceRegion(
-                    ee.Reducer.mean(), buf, 2500,
-                    bestEffort=True, maxPixels=1e9
-                )
-                occurrence_val = jrc_occurrence.get('occurrence').getInfo() if jrc_occurrence.get('occurrence') else None
-                jrc_val = float(occurrence_val) if occurrence_val is not None else 0.0
-            except Exception as e:
-                print(f"Warning: JRC data failed for {city}: {e}")
-                jrc_val = 0.0
+            series = self._fetch_climate_series(city)
+        except Exception as e:
+            # If GEE calls fail, raise a runtime error so caller can fallback
+            raise RuntimeError(f"GEE data fetch failed for {city}: {e}")
 
-            # Use existing LULC data for cropland fraction (preferred over satellite-derived data)
-            existing_cropland = self.lulc_data.get(city, {}).get('cropland_fraction', None)
-            if existing_cropland is not None:
-                cropland_fraction = existing_cropland
-                print(f"Debug {city}: Using existing LULC cropland fraction={cropland_fraction}")
-            else:
-                print(f"Warning: No LULC cropland data available for {city}")
-                cropland_fraction = 0.0
+        indicators = self._indicators_from_series(city, series, params)
+        if default_params:
+            self._save_cached(city, indicators)
+        return indicators
 
-            # Use existing population data directly (no satellite imagery needed)
-            existing_pop_data = self.city_population_data.get(city, {})
-            if existing_pop_data:
-                pop_val = existing_pop_data.get('density', 100.0)
-                print(f"Debug {city}: Using user-provided population density={pop_val}")
-            else:
-                print(f"Warning: No population data available for {city}")
-                pop_val = 100.0
-
-            # Aqueduct data removed due to availability issues - set to None
-            aqueduct_val = None
-
-            indicators = {
-                'aridity_index': aridity_index,
-                'climatic_water_deficit': climatic_water_deficit,
-                'drought_frequency': drought_frequency,
-                'surface_water_change': -float(jrc_val) if jrc_val is not None else 0.0,  # negative = loss
-                'cropland_fraction': float(cropland_fraction),
-                'population_density': float(pop_val),
-                'aqueduct_bws_score': aqueduct_val
-            }
+    def derive_from_cache(self, params: Optional[Dict[str, Any]] = None,
+                          cities: Optional[List[str]] = None) -> Dict[str, WaterScarcityMetrics]:
+        """Re-derive indicators and scores for cities with a cached raw series (no network).
 
-            # Cache and return
-            self._save_cached(city, indicators)
-            return indicators
+        ``params`` overrides DERIVATION_DEFAULTS, e.g. ``{'drought_z_threshold': -1.5,
+        'start_year': 2011}``. Cities without a cached series are skipped.
+        """
+        results = {}
+        for city in (cities or list(UZBEKISTAN_CITIES.keys())):
+            series = self._load_climate_series(city)
+            if series is None:
+                continue
+            raw = self._indicators_from_series(city, series, params, verbose=False)
+            results[city] = self._compute_scores(raw, city)
+        return results
 
-        except Exception as e:
-            # If GEE calls fail, raise a runtime error so caller can fallback
-            raise RuntimeError(f"GEE data fetch failed for {city}: {e}")
+    def sweep_parameters(self, param_grid: List[Dict[str, Any]],
+                         cities: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Run ``derive_from_cache`` for each parameter set; returns one entry per set."""
+        return [{'params': dict(params), 'results': self.derive_from_cache(params, cities)}
+                for params in param_grid]
 
     def _compute_scores(self, raw: Dict[str, Any], city: str) -> WaterScarcityMetrics:
         # Map raw indicators into normalized risk components and final score
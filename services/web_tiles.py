@@ -0,0 +1,471 @@
+"""Pre-rendered XYZ (and optional PMTiles) pyramids from the analysis GeoTIFFs.
+
+Dashboards embed 300 dpi PNGs and full GeoTIFFs, which load slowly and cannot
+zoom. This stage renders each downloaded raster into 256 px Web Mercator PNG
+tiles that a static Leaflet/MapLibre viewer can serve straight from disk:
+
+    <out_dir>/<layer>/<city>/<year>/<z>/<x>/<y>.png
+    <out_dir>/<layer>/<city>/<year>/manifest.json   source fingerprint, style, tile hashes
+    <out_dir>/<layer>/<city>/<year>.pmtiles         (optional, needs the ``pmtiles`` package)
+    <out_dir>/index.json                            layers, cities, years, bounds and zooms
+
+Layers (see LAYERS) are the SUHI mosaics, the summer LST and NDVI composites,
+the VIIRS stacks and the ESRI land-cover maps. Colours follow the maps in
+`visualization` and `nightlight`.
+
+Each tile is reprojected from a windowed read of the source. GDAL reads only
+the source window under the tile; below the native zoom the source is opened
+at the coarsest COG overview that is still at least as fine as the tile
+pixels (sources without overviews are read at full resolution).
+One source (layer × city × year) is rendered per worker process.
+
+Regeneration is incremental:
+- A source whose file fingerprint and style are unchanged is skipped.
+- A changed source is re-rendered, but only tiles whose PNG content hash
+  changed are rewritten.
+- Tiles that became empty are removed.
+- Pyramids in the run's scope whose source GeoTIFF is gone are deleted and
+  dropped from the index.
+
+rasterio and Pillow are required; without rasterio the export is skipped
+with a warning.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+import hashlib
+import io
+import json
+import math
+import os
+import re
+
+import numpy as np
+
+from .raster_io import HAS_RASTERIO
+from . import result_io
+
+try:
+    from pmtiles.tile import zxy_to_tileid, TileType, Compression
+    from pmtiles.writer import Writer as PMTilesWriter
+    HAS_PMTILES = True
+except ImportError:
+    HAS_PMTILES = False
+
+TILES_VERSION = 2
+
+TILE_CONFIG = {
+    "base_dir": Path(__file__).parent.parent / "suhi_analysis_output",
+    "out_dirname": "tiles",
+    "tile_size": 256,
+    "min_zoom": 8,
+    "max_zoom": 14,          # cap for 10-30 m sources
+    "pmtiles": False,
+}
+
+WEB_MERCATOR_HALF = 20037508.342789244
+GROUND_RES_Z0 = 2 * WEB_MERCATOR_HALF / 256   # metres per pixel at zoom 0 on the equator
+
+# ESRI 10 m land cover class colours (Esri/Impact Observatory legend), keyed like utils.ESRI_CLASSES
+ESRI_COLORS = {
+    1: '#419bdf', 2: '#397d49', 4: '#7a87c6', 5: '#e49635', 7: '#c4281b',
+    8: '#a59b8f', 9: '#a8ebff', 10: '#616161', 11: '#e3e2c3',
+}
+
+
+@dataclass(frozen=True)
+class LayerSpec:
+    """One tiled layer: where its GeoTIFFs live (relative to base_dir) and how to colour band ``band``.
+
+    ``pattern`` may use ``{city}`` and ``{year}``; stacked files use ``{first}``/``{last}``
+    and carry one band per year (band ``viirs_<year>`` or ``year - first + 1``).
+    """
+    pattern: str
+    cmap: str
+    vmin: float = 0.0
+    vmax: float = 1.0
+    band: int = 1
+    resampling: str = 'bilinear'
+    categorical: bool = False
+    stacked: bool = False
+    unit: str = ''
+
+
+LAYERS: Dict[str, LayerSpec] = {
+    'suhi': LayerSpec('suhi/{city}/{city}_suhi_modis_{year}.tif', 'temperature', -5.0, 5.0, unit='°C'),
+    'lst_summer': LayerSpec('temperature/{city}/{city}_lst_summer_{year}.tif', 'temperature', 20.0, 55.0, unit='°C'),
+    'ndvi_summer': LayerSpec('vegetation/{city}/{city}_ndvi_evi_summer_{year}.tif', 'RdYlGn', -0.2, 0.8),
+    'viirs': LayerSpec('nightlights/{city}/viirs_stack_{first}_{last}.tif', 'viirs', 0.0, 50.0,
+                       stacked=True, unit='nW/cm²/sr'),
+    'esri_lulc': LayerSpec('lulc/{city}/esri_full_{year}_coarse.tif', 'esri', resampling='nearest',
+                           categorical=True),
+}
+
+
+# Colour lookup -------------------------------------------------------------------------
+def _hex_rgba(color: str) -> Tuple[int, int, int, int]:
+    c = color.lstrip('#')
+    return int(c[0:2], 16), int(c[2:4], 16), int(c[4:6], 16), 255
+
+
+def colour_lut(spec: LayerSpec) -> np.ndarray:
+    """256 × 4 uint8 RGBA table: class value -> colour (categorical) or scaled value -> colour."""
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    if spec.categorical:
+        for value, color in ESRI_COLORS.items():
+            lut[value] = _hex_rgba(color)
+        return lut
+    if spec.cmap == 'temperature':
+        from .heat_map_atlas import temperature_cmap
+        cmap = temperature_cmap()
+    elif spec.cmap == 'viirs':
+        from matplotlib.colors import LinearSegmentedColormap
+        from .nightlight import VIIRS_PALETTE
+        cmap = LinearSegmentedColormap.from_list('viirs', VIIRS_PALETTE)
+    else:
+        import matplotlib
+        cmap = matplotlib.colormaps[spec.cmap]
+    return (cmap(np.linspace(0, 1, 256)) * 255).round().astype(np.uint8)
+
+
+def colourize(values: np.ndarray, spec: LayerSpec, lut: np.ndarray) -> np.ndarray:
+    """RGBA tile (h × w × 4); NaN and unknown classes are transparent."""
+    valid = np.isfinite(values)
+    if spec.categorical:
+        idx = np.where(valid, values, 0).astype(np.int64)
+        idx = np.where((idx >= 0) & (idx < 256), idx, 0)
+    else:
+        scaled = (values - spec.vmin) / (spec.vmax - spec.vmin)
+        idx = np.clip(np.nan_to_num(scaled) * 255, 0, 255).astype(np.int64)
+    rgba = lut[idx]
+    rgba[~valid, 3] = 0
+    return rgba
+
+
+def style_hash(spec: LayerSpec) -> str:
+    payload = json.dumps([TILES_VERSION, TILE_CONFIG["tile_size"], asdict(spec)], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# Tile math ---------------------------------------------------------------------------
+def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    n = 2 ** z
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Web Mercator ``(minx, miny, maxx, maxy)`` of an XYZ tile."""
+    size = 2 * WEB_MERCATOR_HALF / 2 ** z
+    minx = -WEB_MERCATOR_HALF + x * size
+    maxy = WEB_MERCATOR_HALF - y * size
+    return minx, maxy - size, minx + size, maxy
+
+
+def tiles_for_bounds(bounds: Tuple[float, float, float, float], z: int) -> Iterator[Tuple[int, int]]:
+    """XYZ tiles at zoom ``z`` covering lon/lat ``bounds`` (W, S, E, N)."""
+    w, s, e, n = bounds
+    x0, y0 = lonlat_to_tile(w, n, z)
+    x1, y1 = lonlat_to_tile(e, s, z)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+
+def native_zoom(res_m: float, lat: float) -> int:
+    """Smallest zoom whose tile pixels are at least as fine as ``res_m`` at latitude ``lat``."""
+    return int(math.ceil(math.log2(GROUND_RES_Z0 * math.cos(math.radians(lat)) / max(res_m, 1e-6))))
+
+
+def overview_level(factors: List[int], factor: int) -> Optional[int]:
+    """Index of the coarsest overview decimating by at most ``factor`` (None: full resolution)."""
+    usable = [i for i, f in enumerate(factors) if f <= factor]
+    return usable[-1] if usable else None
+
+
+# Sources -----------------------------------------------------------------------------
+def _pattern_regex(pattern: str, city: str) -> re.Pattern:
+    rx = re.escape(pattern.replace('{city}', city))
+    for key in ('year', 'first', 'last'):
+        rx = rx.replace(re.escape('{' + key + '}'), rf'(?P<{key}>\d{{4}})')
+    return re.compile(rx + '$')
+
+
+def find_sources(base_dir: Path, layers: Optional[Iterable[str]] = None, cities: Optional[Iterable[str]] = None,
+                 years: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+    """``[{layer, city, year, path, band}]`` for every GeoTIFF matching a layer pattern."""
+    from .utils import UZBEKISTAN_CITIES
+    base_dir = Path(base_dir)
+    years = {int(y) for y in years} if years else None
+    sources = []
+    for layer in layers or LAYERS:
+        spec = LAYERS[layer]
+        for city in cities or UZBEKISTAN_CITIES:
+            glob = re.sub(r'\{(year|first|last)\}', '*', spec.pattern.replace('{city}', city))
+            rx = _pattern_regex(spec.pattern, city)
+            for path in sorted(base_dir.glob(glob)):
+                m = rx.search(path.relative_to(base_dir).as_posix())
+                if not m:
+                    continue
+                if spec.stacked:
+                    first, last = int(m.group('first')), int(m.group('last'))
+                    found = [(y, None) for y in range(first, last + 1)]
+                else:
+                    found = [(int(m.group('year')), spec.band)]
+                for year, band in found:
+                    if years is None or year in years:
+                        sources.append({'layer': layer, 'city': city, 'year': year, 'path': str(path),
+                                        'band': band, 'first': int(m.group('first')) if spec.stacked else None})
+    return sources
+
+
+def _source_band(src, source: Dict[str, Any]) -> Optional[int]:
+    """Band index for a source; stacked files are matched by band description, then by position."""
+    if source['band'] is not None:
+        return source['band']
+    names = list(src.descriptions or ())
+    for i, name in enumerate(names, start=1):
+        if name and name.endswith(str(source['year'])):
+            return i
+    band = source['year'] - source['first'] + 1
+    return band if 1 <= band <= src.count else None
+
+
+def source_fingerprint(path: Path) -> List[int]:
+    st = Path(path).stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+# Rendering ---------------------------------------------------------------------------
+def _encode_png(rgba: np.ndarray) -> bytes:
+    from PIL import Image
+    buf = io.BytesIO()
+    Image.fromarray(rgba, mode='RGBA').save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def source_dir(out_dir: Path, source: Dict[str, Any]) -> Path:
+    return Path(out_dir) / source['layer'] / source['city'].replace(' ', '_') / str(source['year'])
+
+
+def render_source(source: Dict[str, Any], out_dir: Path, force: bool = False,
+                  pmtiles: Optional[bool] = None) -> Dict[str, Any]:
+    """Render (or incrementally update) the pyramid of one source; returns its index entry."""
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.transform import from_bounds
+    from rasterio.warp import reproject, transform_bounds
+
+    spec = LAYERS[source['layer']]
+    tile_dir = source_dir(out_dir, source)
+    manifest_path = tile_dir / 'manifest.json'
+    fingerprint = source_fingerprint(source['path'])
+    style = style_hash(spec)
+    entry = {k: source[k] for k in ('layer', 'city', 'year', 'path')}
+    try:
+        previous = result_io.read_json(manifest_path)
+    except Exception:
+        previous = {}
+    if not force and previous.get('fingerprint') == fingerprint and previous.get('style') == style:
+        entry.update({k: previous.get(k) for k in ('bounds', 'min_zoom', 'max_zoom')}, tiles=len(previous.get('tiles', {})),
+                     written=0, skipped=True)
+        return entry
+
+    size = TILE_CONFIG["tile_size"]
+    lut = colour_lut(spec)
+    old_tiles: Dict[str, str] = previous.get('tiles', {}) if previous.get('style') == style else {}
+    tiles: Dict[str, str] = {}
+    written = 0
+    with rasterio.open(source['path']) as src:
+        band = _source_band(src, source)
+        if band is None:
+            entry['error'] = f"no band for {source['year']}"
+            return entry
+        bounds = transform_bounds(src.crs, 'EPSG:4326', *src.bounds)
+        lat = (bounds[1] + bounds[3]) / 2
+        res = abs(src.transform.a)
+        res_m = res * 111320.0 * math.cos(math.radians(lat)) if src.crs and src.crs.is_geographic else res
+        native = native_zoom(res_m, lat)
+        max_zoom = max(TILE_CONFIG["min_zoom"], min(TILE_CONFIG["max_zoom"], native))
+        resampling = Resampling[spec.resampling]
+        factors = src.overviews(band)
+        for z in range(TILE_CONFIG["min_zoom"], max_zoom + 1):
+            level = overview_level(factors, 2 ** max(native - z, 0))
+            opened = rasterio.open(source['path'], overview_level=level) if level is not None else nullcontext(src)
+            with opened as level_src:
+                for x, y in tiles_for_bounds(bounds, z):
+                    values = np.full((size, size), np.nan, dtype=np.float32)
+                    # Windowed read of the source (or its overview) under this tile
+                    reproject(source=rasterio.band(level_src, band), destination=values,
+                              dst_transform=from_bounds(*tile_bounds(z, x, y), size, size), dst_crs='EPSG:3857',
+                              dst_nodata=np.nan, resampling=resampling)
+                    if not np.isfinite(values).any():
+                        continue
+                    payload = _encode_png(colourize(values, spec, lut))
+                    key = f"{z}/{x}/{y}"
+                    tiles[key] = hashlib.sha1(payload).hexdigest()
+                    path = tile_dir / str(z) / str(x) / f"{y}.png"
+                    if old_tiles.get(key) != tiles[key] or not path.exists():
+                        _write_atomic(path, payload)
+                        written += 1
+
+    for key in set(previous.get('tiles', {})) - set(tiles):
+        z, x, y = key.split('/')
+        stale = tile_dir / z / x / f"{y}.png"
+        if stale.exists():
+            stale.unlink()
+
+    if pmtiles if pmtiles is not None else TILE_CONFIG["pmtiles"]:
+        write_pmtiles(tile_dir, tiles, bounds, TILE_CONFIG["min_zoom"], max_zoom, f"{source['layer']} {source['city']} {source['year']}")
+
+    manifest = {'version': TILES_VERSION, 'source': source['path'], 'band': band, 'fingerprint': fingerprint,
+                'style': style, 'bounds': list(bounds), 'min_zoom': TILE_CONFIG["min_zoom"], 'max_zoom': max_zoom,
+                'tiles': tiles}
+    result_io.write_json(manifest, manifest_path, compression=None, indent=None)
+    entry.update(bounds=list(bounds), min_zoom=TILE_CONFIG["min_zoom"], max_zoom=max_zoom, tiles=len(tiles),
+                 written=written, skipped=False)
+    return entry
+
+
+def write_pmtiles(tile_dir: Path, tiles: Dict[str, str], bounds, min_zoom: int, max_zoom: int,
+                  name: str) -> Optional[Path]:
+    """Pack a rendered XYZ directory into ``<tile_dir>.pmtiles`` (tiles written in tile-id order)."""
+    if not HAS_PMTILES:
+        print("Warning: pmtiles not installed; skipping PMTiles archive")
+        return None
+    ids = sorted((zxy_to_tileid(*map(int, key.split('/'))), key) for key in tiles)
+    path = tile_dir.with_name(tile_dir.name + '.pmtiles')
+    tmp = path.with_name(path.name + '.tmp')
+    w, s, e, n = bounds
+    with open(tmp, 'wb') as f:
+        writer = PMTilesWriter(f)
+        for tile_id, key in ids:
+            z, x, y = key.split('/')
+            writer.write_tile(tile_id, (tile_dir / z / x / f"{y}.png").read_bytes())
+        writer.finalize({
+            'tile_type': TileType.PNG, 'tile_compression': Compression.NONE,
+            'min_zoom': min_zoom, 'max_zoom': max_zoom,
+            'min_lon_e7': int(w * 1e7), 'min_lat_e7': int(s * 1e7),
+            'max_lon_e7': int(e * 1e7), 'max_lat_e7': int(n * 1e7),
+            'center_zoom': min_zoom, 'center_lon_e7': int((w + e) / 2 * 1e7), 'center_lat_e7': int((s + n) / 2 * 1e7),
+        }, {'name': name})
+    os.replace(tmp, path)
+    return path
+
+
+def _render_job(source: Dict[str, Any], out_dir: str, force: bool, pmtiles: Optional[bool]) -> Dict[str, Any]:
+    try:
+        return render_source(source, Path(out_dir), force, pmtiles)
+    except Exception as e:
+        return dict({k: source[k] for k in ('layer', 'city', 'year', 'path')}, error=str(e))
+
+
+def export_tiles(base_dir: Optional[Path] = None, layers: Optional[Iterable[str]] = None,
+                 cities: Optional[Iterable[str]] = None, years: Optional[Iterable[int]] = None,
+                 max_workers: Optional[int] = None, force: bool = False,
+                 pmtiles: Optional[bool] = None) -> Dict[str, Any]:
+    """Render every matching source in a process pool and write ``index.json``; returns the index."""
+    if not HAS_RASTERIO:
+        print("Warning: rasterio not installed; skipping tile export")
+        return {}
+    base_dir = Path(base_dir or TILE_CONFIG["base_dir"])
+    out_dir = base_dir / TILE_CONFIG["out_dirname"]
+    sources = find_sources(base_dir, layers, cities, years)
+    max_workers = max_workers if max_workers is not None else max(1, min(len(sources), (os.cpu_count() or 2) - 1))
+
+    entries: List[Dict[str, Any]] = []
+    if sources:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_render_job, s, str(out_dir), force, pmtiles) for s in sources]
+            for fut in as_completed(futures):
+                entries.append(fut.result())
+    entries.sort(key=lambda e: (e['layer'], e['city'], e['year']))
+
+    scope = _Scope(layers, cities, years)
+    removed = prune_stale(out_dir, sources, scope)
+    index = _merge_index(out_dir / 'index.json', entries, sources, scope)
+    result_io.write_json(index, out_dir / 'index.json', compression=None, indent=2)
+    failed = [e for e in entries if e.get('error')]
+    written = sum(e.get('written', 0) for e in entries)
+    print(f"[OK] Tiles: {len(entries) - len(failed)} sources, {written} tiles written "
+          f"({sum(1 for e in entries if e.get('skipped'))} unchanged, {len(removed)} stale removed) in {out_dir}"
+          + (f"; {len(failed)} failed" if failed else ""))
+    return index
+
+
+class _Scope:
+    """The (layer, city, year) filter of one export run; keys use tile directory names."""
+
+    def __init__(self, layers, cities, years):
+        self.layers = set(layers or LAYERS)
+        self.cities = {c.replace(' ', '_') for c in cities} if cities else None
+        self.years = {int(y) for y in years} if years else None
+
+    def __contains__(self, key: Tuple[str, str, int]) -> bool:
+        layer, city_dir, year = key
+        return (layer in self.layers and (self.cities is None or city_dir in self.cities)
+                and (self.years is None or year in self.years))
+
+
+def _key(item: Dict[str, Any]) -> Tuple[str, str, int]:
+    return item['layer'], item['city'].replace(' ', '_'), int(item['year'])
+
+
+def prune_stale(out_dir: Path, sources: List[Dict[str, Any]], scope: _Scope) -> List[Tuple[str, str, int]]:
+    """Delete pyramids (and .pmtiles) in ``scope`` whose source GeoTIFF no longer exists."""
+    import shutil
+    live = {_key(s) for s in sources}
+    removed = []
+    for layer in sorted(scope.layers):
+        for city_dir in sorted(p for p in (Path(out_dir) / layer).glob('*') if p.is_dir()):
+            for year_dir in sorted(p for p in city_dir.glob('*') if p.is_dir() and p.name.isdigit()):
+                key = (layer, city_dir.name, int(year_dir.name))
+                if key in scope and key not in live:
+                    shutil.rmtree(year_dir, ignore_errors=True)
+                    archive = year_dir.with_name(year_dir.name + '.pmtiles')
+                    if archive.exists():
+                        archive.unlink()
+                    removed.append(key)
+    return removed
+
+
+def _merge_index(path: Path, entries: List[Dict[str, Any]], sources: List[Dict[str, Any]],
+                 scope: _Scope) -> Dict[str, Any]:
+    """Index of all rendered pyramids; entries outside ``scope`` are kept from earlier partial runs,
+    entries inside it are dropped once their source is gone."""
+    try:
+        index = result_io.read_json(path)
+    except Exception:
+        index = {}
+    layers = index.get('layers', {})
+    for name, spec in LAYERS.items():
+        layers.setdefault(name, {}).update(vmin=spec.vmin, vmax=spec.vmax, unit=spec.unit, cmap=spec.cmap,
+                                           categorical=spec.categorical)
+    live = {_key(s) for s in sources}
+    sources = {(s['layer'], s['city'], s['year']): s for s in index.get('sources', [])
+               if _key(s) not in scope or _key(s) in live}
+    for e in entries:
+        if e.get('error') or e.get('bounds') is None:
+            continue
+        rel = source_dir(Path('.'), e).as_posix()
+        sources[(e['layer'], e['city'], e['year'])] = {
+            'layer': e['layer'], 'city': e['city'], 'year': e['year'], 'bounds': e['bounds'],
+            'min_zoom': e['min_zoom'], 'max_zoom': e['max_zoom'], 'url': f"{rel}/{{z}}/{{x}}/{{y}}.png"}
+    return {'version': TILES_VERSION, 'tile_size': TILE_CONFIG["tile_size"], 'layers': layers,
+            'sources': [sources[k] for k in sorted(sources)]}
+
+
+if __name__ == '__main__':
+    export_tiles()